@@ -0,0 +1,141 @@
+"""
+Measure how long configuration changes take to reach running subsystems.
+
+Applies joystick, motor and lights edits through Config.update_from_dict (the
+/api/config and WebSocket path) and by editing config.yaml on disk (the file
+watcher path), and compares both with parsing the YAML from scratch, which is
+what every Config() construction used to cost.
+
+    python benchmarks/bench_config_apply.py [--iterations N] [--watch-interval S]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from config import Config  # noqa: E402
+
+REPO_CONFIG = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'config.yaml'))
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1] if len(samples) > 1 else samples[0]
+
+
+def make_subsystems():
+    """Create whichever subsystems can be imported here, with their applied-value getters."""
+    subsystems = {}
+    from controller.drive_controller import DriveController
+
+    class NullMotors:
+        def stop(self):
+            pass
+
+    drive = DriveController(NullMotors())
+    subsystems['joystick.deadzone'] = ('joystick', 'deadzone', lambda: drive.deadzone, drive.cleanup)
+    try:
+        from modules.motor import MotorModule
+        motors = MotorModule()
+        subsystems['motor.dc_motors.max_speed'] = (
+            'motor', ('dc_motors', 'max_speed'), lambda: motors.max_speed, motors.cleanup)
+    except ImportError as e:
+        print(f"skipping MotorModule: {e}")
+    try:
+        from modules.leds import LedsModule
+        leds = LedsModule()
+        subsystems['lights.update_rate'] = (
+            'lights', 'update_rate', lambda: leds._frame_pacer.rate_hz, leds._unsubscribe_config)
+    except ImportError as e:
+        print(f"skipping LedsModule: {e}")
+    return subsystems
+
+
+def updates_for(section, key, value):
+    if isinstance(key, tuple):
+        return {section: {key[0]: {key[1]: value}}}
+    return {section: {key: value}}
+
+
+def bench_update(config, section, key, getter, iterations):
+    samples = []
+    for i in range(iterations):
+        value = 0.2 + (i % 50) / 100.0 if section != 'lights' else 20 + i % 40
+        start = time.perf_counter()
+        config.update_from_dict(updates_for(section, key, value))
+        assert abs(getter() - value) < 1e-9
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def bench_file(config, getter, iterations, path):
+    samples = []
+    original = open(path).read()
+    for i in range(iterations):
+        value = round(0.11 + (i % 20) / 100.0, 2)
+        text = original.replace('deadzone: 0.1\n', f'deadzone: {value}\n', 1)
+        start = time.perf_counter()
+        with open(path, 'w') as f:
+            f.write(text)
+        # Coarse mtime resolution on some filesystems would hide back-to-back edits
+        os.utime(path, (time.time(), time.time() + i + 1))
+        deadline = start + 5
+        while abs(getter() - value) > 1e-9 and time.perf_counter() < deadline:
+            time.sleep(0.0005)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def bench_parse(path, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        Config(path).get('joystick', 'deadzone')
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--file-iterations', type=int, default=20)
+    parser.add_argument('--watch-interval', type=float, default=0.05)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    path = os.path.join(tmpdir, 'config.yaml')
+    shutil.copy(REPO_CONFIG, path)
+    # Point the shared instance at the copy so the repo config is never rewritten
+    Config._shared = config = Config(path)
+    import logging
+    logging.disable(logging.INFO)
+
+    subsystems = make_subsystems()
+    try:
+        print(f"{'change':<28}{'path':<10}{'p50 us':>12}{'p99 us':>12}")
+        for name, (section, key, getter, _) in subsystems.items():
+            p50, p99 = bench_update(config, section, key, getter, args.iterations)
+            print(f"{name:<28}{'update':<10}{p50 * 1e6:>12.1f}{p99 * 1e6:>12.1f}")
+
+        config.start_watching(args.watch_interval)
+        _, _, getter, _ = subsystems['joystick.deadzone']
+        p50, p99 = bench_file(config, getter, args.file_iterations, path)
+        print(f"{'joystick.deadzone':<28}{'file':<10}{p50 * 1e6:>12.1f}{p99 * 1e6:>12.1f}"
+              f"   (watch interval {args.watch_interval * 1000:.0f} ms)")
+
+        p50, p99 = bench_parse(path, min(args.iterations, 100))
+        print(f"{'Config() full YAML parse':<28}{'-':<10}{p50 * 1e6:>12.1f}{p99 * 1e6:>12.1f}")
+    finally:
+        config.stop_watching()
+        for _, _, _, cleanup in subsystems.values():
+            cleanup()
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Measure control-loop latency and throughput against simulated hardware.
+
+Installs the simulated MotorKit/ServoKit/unicornhat backends
+(src/simulation/hardware.py), whose I2C and SPI transactions take a modelled
+bus time, and then drives the real MotorModule, DriveController and LedsModule:
+
+- joystick-to-motor latency: from DriveController.on_joystick_update to the
+  first motor HAT register write it causes
+- motor and servo tick cost and I2C transactions per tick, with batched
+  PCA9685 writes and with the kits' per-channel writes
+- LED frame throughput (if numpy is installed)
+
+    python benchmarks/bench_control_loop.py [--iterations N] [--latency-scale X]
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from simulation import hardware as sim  # noqa: E402
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1] if len(samples) > 1 else samples[0]
+
+
+def row(name, p50, p99, extra=''):
+    print(f"{name:<36}{p50 * 1e6:>12.1f}{p99 * 1e6:>12.1f}   {extra}")
+
+
+def bench_joystick_latency(hardware, drive, iterations):
+    """Seconds from a stick change to the first motor HAT write it causes."""
+    samples = []
+    axis = drive.joystick_mappings['drive_movement']
+    for i in range(iterations):
+        axes = [0.0] * 6
+        axes[axis] = -0.8 if i % 2 == 0 else 0.8
+        start = time.perf_counter()
+        drive.on_joystick_update(axes, [True])
+        deadline = start + 1.0
+        writes = []
+        while not writes and time.perf_counter() < deadline:
+            time.sleep(0.0002)
+            writes = hardware.log.entries(device=f"i2c 0x{sim.MOTOR_HAT_ADDRESS:02x}", since=start)
+        if writes:
+            samples.append(writes[0].timestamp - start)
+        # Let the ramp settle so each sample starts from a steady state
+        time.sleep(0.05)
+    return summarize(samples)
+
+
+def bench_tick(hardware, tick, command, iterations):
+    """Per-call cost of ``tick`` after ``command(i)`` changes the targets, and transactions per tick."""
+    samples = []
+    hardware.i2c.reset_counts()
+    for i in range(iterations):
+        command(i)
+        start = time.perf_counter()
+        tick()
+        samples.append(time.perf_counter() - start)
+    p50, p99 = summarize(samples)
+    return p50, p99, hardware.i2c.transactions / iterations
+
+
+def bench_leds(hardware, iterations):
+    try:
+        from modules.leds import LedsModule
+    except ImportError as e:
+        print(f"skipping LedsModule: {e}")
+        return None
+    leds = LedsModule()
+    try:
+        leds._frame_pacer.set_rate(0)
+        samples = []
+        for i in range(iterations):
+            start = time.perf_counter()
+            leds.set_all(i % 256, 0, 0)
+            leds.show()
+            samples.append(time.perf_counter() - start)
+        return summarize(samples)
+    finally:
+        leds._unsubscribe_config()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--latency-iterations', type=int, default=50)
+    parser.add_argument('--latency-scale', type=float, default=1.0,
+                        help='Multiply the modelled bus latencies (0 for an instant bus)')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    hardware = sim.install(sim.LatencyModel().scaled(args.latency_scale))
+    from controller.drive_controller import DriveController
+    from modules.motor import MotorModule
+
+    motors = MotorModule()
+    drive = DriveController(motors)
+    try:
+        print(f"motor loop {motors.update_task.rate_hz:.0f} Hz, acceleration {motors.acceleration}/s, "
+              f"I2C {hardware.latency.i2c_transaction * 1e6:.0f} us + {hardware.latency.i2c_byte * 1e6:.1f} us/byte")
+        print(f"{'path':<36}{'p50 us':>12}{'p99 us':>12}")
+        p50, p99 = bench_joystick_latency(hardware, drive, args.latency_iterations)
+        row('joystick -> motor HAT write', p50, p99)
+
+        # Step the loops by hand from here on
+        drive.cleanup()
+        motors.update_task.cancel()
+        if motors.servo_task:
+            motors.servo_task.cancel()
+        motors.acceleration = 0
+
+        def drive_command(i):
+            speed = 0.25 + (i % 3) * 0.25
+            motors.set_motor_speeds(speed, -speed)
+
+        def head_command(i):
+            motors.move_head(pan=-1.0 if i % 2 else 1.0, tilt=(i % 5) / 5.0)
+
+        for name, pwm in (('batched', motors.motor_pwm), ('per-channel', None)):
+            motors.motor_pwm = pwm
+            motors._written = (None, None)
+            p50, p99, per_tick = bench_tick(hardware, lambda: motors._tick(0.02), drive_command, args.iterations)
+            row(f'motor tick ({name})', p50, p99, f'{per_tick:.1f} I2C transactions/tick, '
+                f'{1 / p50:.0f} ticks/s max')
+
+        servo_pwm = motors.servo_pwm
+        for name, pwm in (('batched', servo_pwm), ('per-channel', None)):
+            motors.servo_pwm = pwm
+            p50, p99, per_tick = bench_tick(hardware, lambda: motors._servo_tick(0.02), head_command, args.iterations)
+            row(f'servo tick ({name})', p50, p99, f'{per_tick:.1f} I2C transactions/tick')
+        motors.servo_pwm = servo_pwm
+
+        leds = bench_leds(hardware, args.iterations)
+        if leds:
+            p50, p99 = leds
+            row('LED frame', p50, p99, f'{1 / p50:.0f} frames/s max')
+
+        counts = ', '.join(f'{device}={n}' for device, n in sorted(hardware.log.counts().items()))
+        print(f"commands recorded: {counts}")
+    finally:
+        motors.cleanup()
+
+
+if __name__ == '__main__':
+    main()
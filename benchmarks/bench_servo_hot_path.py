@@ -0,0 +1,110 @@
+"""
+Measure the per-call cost of servo commands and servo loop writes.
+
+Compares the old hot paths, which logged every command at INFO and looked up
+each servo's channel and pulse range in the config dicts on every write, with
+MotorModule's precomputed ServoChannel mapping and unlogged commands. Logging
+goes to a real handler so the formatting cost is included.
+
+    python benchmarks/bench_servo_hot_path.py [--iterations N]
+"""
+import argparse
+import io
+import logging
+import os
+import statistics
+import sys
+import time
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from config import Config  # noqa: E402
+from modules.motor import SERVO_DEFAULT_CHANNELS, MotorModule  # noqa: E402
+
+logger = logging.getLogger('modules.motor')
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1] if len(samples) > 1 else samples[0]
+
+
+def legacy_move_head(motors, pan, tilt):
+    """move_head as it was: an INFO line per command, then the targets."""
+    logger.info(f"move_head called with pan={pan}, tilt={tilt}")
+    with motors._lock:
+        motors.servo_motion.set_target('head_pan', pan)
+        motors.servo_motion.set_target('head_tilt', tilt)
+
+
+def legacy_servo_pulse(servo_configs, name, position):
+    """_servo_pulse as it was: config dict lookups and divisions on every write."""
+    servo_config = servo_configs.get(name, {})
+    channel = servo_config.get('channel', SERVO_DEFAULT_CHANNELS[name])
+    min_pulse = servo_config.get('min_pulse', 500)
+    max_pulse = servo_config.get('max_pulse', 2500)
+    if name.endswith('_arm'):
+        pulse = int(min_pulse + position * (max_pulse - min_pulse))
+    else:
+        center_pulse = servo_config.get('center_pulse')
+        if center_pulse is None:
+            center_pulse = (min_pulse + max_pulse) // 2
+        normalized = max(-1.0, min(1.0, position))
+        if normalized < 0:
+            pulse = int(center_pulse + normalized * (center_pulse - min_pulse))
+        else:
+            pulse = int(center_pulse + normalized * (max_pulse - center_pulse))
+    return channel, pulse, 180.0 * (pulse - min_pulse) / (max_pulse - min_pulse)
+
+
+def current_servo_pulse(channels, name, position):
+    servo = channels[name]
+    pulse = servo.pulse(position)
+    return servo.channel, pulse, servo.angle(pulse)
+
+
+def bench(fn, iterations):
+    samples = []
+    for i in range(iterations):
+        position = (i % 200) / 100.0 - 1.0
+        start = time.perf_counter()
+        fn(position)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    # A formatted handler, as on the robot, writing somewhere cheap
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logging.basicConfig(level=logging.INFO, handlers=[handler], force=True)
+
+    servo_configs = Config.shared().get('motor', 'servos', default={}) or {}
+    motors = MotorModule()
+    motors.update_task.cancel()
+    motors.servo_kit = MagicMock()
+    try:
+        cases = [
+            ('move_head', 'before', lambda p: legacy_move_head(motors, p, -p)),
+            ('move_head', 'after', lambda p: motors.move_head(pan=p, tilt=-p)),
+            ('servo pulse (head_tilt)', 'before', lambda p: legacy_servo_pulse(servo_configs, 'head_tilt', p)),
+            ('servo pulse (head_tilt)', 'after', lambda p: current_servo_pulse(motors.servo_channels, 'head_tilt', p)),
+            ('servo pulse (left_arm)', 'before', lambda p: legacy_servo_pulse(servo_configs, 'left_arm', abs(p))),
+            ('servo pulse (left_arm)', 'after', lambda p: current_servo_pulse(motors.servo_channels, 'left_arm', abs(p))),
+        ]
+        print(f"{'path':<28}{'version':<10}{'p50 us':>12}{'p99 us':>12}")
+        for name, version, fn in cases:
+            bench(fn, min(args.iterations, 1000))  # warm up
+            p50, p99 = bench(fn, args.iterations)
+            print(f"{name:<28}{version:<10}{p50 * 1e6:>12.2f}{p99 * 1e6:>12.2f}")
+    finally:
+        motors.cleanup()
+
+
+if __name__ == '__main__':
+    main()
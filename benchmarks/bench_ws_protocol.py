@@ -0,0 +1,59 @@
+"""
+Compare JSON and binary (robbie.bin.v1) WebSocket encoding of telemetry.
+
+Reports encode time per message and wire bytes per second at each topic's
+configured broadcast rate.
+
+    python benchmarks/bench_ws_protocol.py [--iterations N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from api.protocol import encode_delta  # noqa: E402
+
+# Default api.broadcast_rates from config.yaml
+RATES = {"leds": 30, "audio": 20, "joystick": 60}
+
+
+def sample_changes(topic):
+    if topic == "leds":
+        return {"led_matrix": [[[random.randrange(256) for _ in range(3)] for _ in range(8)] for _ in range(4)]}
+    if topic == "audio":
+        return {"input_audio_level_db": random.uniform(-60, 0), "output_audio_level_db": random.uniform(-60, 0)}
+    return {"joystick": {
+        "connected": True,
+        "axes": [random.uniform(-1, 1) for _ in range(6)],
+        "buttons": [random.random() < 0.2 for _ in range(12)],
+    }}
+
+
+def bench(topic, binary, iterations):
+    samples = [sample_changes(topic) for _ in range(64)]
+    size = 0
+    start = time.perf_counter()
+    for i in range(iterations):
+        size += encode_delta(topic, i, samples[i % len(samples)], binary=binary).size
+    elapsed = time.perf_counter() - start
+    return elapsed / iterations * 1e6, size / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'topic':<10}{'protocol':<10}{'encode us':>12}{'bytes/msg':>12}{'bytes/s':>12}")
+    for topic, rate in RATES.items():
+        for binary in (False, True):
+            encode_us, size = bench(topic, binary, args.iterations)
+            protocol = "binary" if binary else "json"
+            print(f"{topic:<10}{protocol:<10}{encode_us:>12.2f}{size:>12.1f}{size * rate:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import json
 import asyncio
-from typing import Dict, Set
+from typing import Dict, Optional
 import logging
 import time
 import os
@@ -14,8 +14,15 @@ app = FastAPI()
 # --- Integrate RobotController state updates with WebSocket broadcast ---
 
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from config import Config
+from .state import VersionedState
+from .broadcast import BroadcastScheduler, IMMEDIATE_TOPIC
+from .connections import ConnectionManager
+from .jobs import JobRunner
+from utils.metrics import REGISTRY
+from utils.tracing import TRACER
+from controller.events import BUS, Executor, StateUpdate
 
 @app.post('/api/speech/backend')
 def set_speech_backend(data: dict):
@@ -51,8 +58,7 @@ def cycle_stereo_mix():
 def get_config():
     """Return the current configuration as a JSON-serializable dict."""
     try:
-        cfg = Config()
-        return cfg.to_dict()
+        return Config.shared().to_dict()
     except Exception as e:
         logger.error(f"Error loading config in /api/config: {e}")
         return JSONResponse(content={"error": "Failed to load configuration"}, status_code=500)
@@ -62,50 +68,226 @@ def get_config():
 def update_config(new_config: Dict):
     """Update configuration from a partial config dict and persist to disk."""
     try:
-        cfg = Config()
+        cfg = Config.shared()
         if not isinstance(new_config, dict):
             return JSONResponse(content={"error": "Invalid config payload"}, status_code=400)
 
-        # Merge and save
+        # Merge (notifying subscribed modules) and save
         cfg.update_from_dict(new_config)
         cfg.save()
-
-        # Also update live robot instance if available
-        try:
-            from controller.robot import robot_instance
-            if robot_instance and hasattr(robot_instance, 'config'):
-                robot_instance.config.update_from_dict(new_config)
-        except Exception as e:
-            logger.error(f"Error updating live robot config: {e}")
-
         return cfg.to_dict()
     except Exception as e:
         logger.error(f"Error updating config in /api/config: {e}")
         return JSONResponse(content={"error": "Failed to update configuration"}, status_code=500)
 
 
+@app.get('/api/conversation/sessions')
+def list_conversation_sessions(limit: int = 20):
+    """List recent conversation sessions from the persistent log."""
+    from controller.robot import robot_instance
+    conversation = getattr(robot_instance, 'conversation', None) if robot_instance else None
+    if not conversation or not conversation.store:
+        return JSONResponse(content={"error": "Conversation store not available"}, status_code=503)
+    return {
+        "current": conversation.session_id,
+        "sessions": conversation.store.list_sessions(limit=limit),
+    }
+
+
+@app.post('/api/conversation/session')
+def start_conversation_session():
+    """Start a new conversation session, clearing the live chat history."""
+    from controller.robot import robot_instance
+    conversation = getattr(robot_instance, 'conversation', None) if robot_instance else None
+    if not conversation:
+        return JSONResponse(content={"error": "Conversation not available"}, status_code=503)
+    session_id = conversation.new_session()
+    publish_state({"chat_history": conversation.get_chat_history()})
+    return {"session_id": session_id}
+
+
 main_event_loop = None
 
-# Called by RobotController when state changes
-def robot_state_update_callback(update: dict):
-    robot_state.update({k: v for k, v in update.items() if k in robot_state})
-    try:
-        global main_event_loop
-        if main_event_loop and main_event_loop.is_running():
-            asyncio.run_coroutine_threadsafe(manager.broadcast(json.dumps(robot_state)), main_event_loop)
-        else:
-            logger.error("Main event loop is not running or not set.")
-    except Exception as e:
-        logger.error(f"Error broadcasting robot state: {e}")
+# High-frequency state keys and the telemetry topic they are coalesced under.
+# Keys not listed here (robot_state, chat_history, ...) are broadcast immediately.
+TELEMETRY_TOPICS = {
+    "input_audio_level_db": "audio",
+    "output_audio_level_db": "audio",
+    "joystick": "joystick",
+    "motor": "joystick",
+    "led_matrix": "leds",
+    "led_animation": "leds",
+    "position": "pose",
+    "rotation": "pose",
+}
+
+def publish_state(update: dict) -> None:
+    """Queue a partial state update from any thread; changed keys are broadcast as deltas."""
+    by_topic = {}
+    for key, value in update.items():
+        by_topic.setdefault(TELEMETRY_TOPICS.get(key, IMMEDIATE_TOPIC), {})[key] = value
+    for topic, changes in by_topic.items():
+        try:
+            broadcaster.publish(topic, changes)
+        except Exception as e:
+            logger.error(f"Error publishing robot state ({topic}): {e}")
+
+# Robot state changes arrive as StateUpdate events. Handled inline: publish_state
+# only hands the changes to the broadcaster, which coalesces them on the event loop
+state_subscription = None
+
+def on_state_update(event: StateUpdate):
+    publish_state(event.changes)
 
 
 @app.on_event("startup")
 async def setup_robot_callback():
-    global main_event_loop
+    global main_event_loop, state_subscription
     main_event_loop = asyncio.get_running_loop()
+    broadcaster.start(main_event_loop)
+    state_subscription = BUS.subscribe(StateUpdate, on_state_update, executor=Executor.INLINE, name='api.publish_state')
+
+
+@app.on_event("shutdown")
+async def stop_broadcaster():
+    if state_subscription:
+        state_subscription.cancel()
+    broadcaster.stop()
+    jobs.shutdown()
+
+
+@app.get('/api/metrics')
+def get_metrics():
+    """All metrics in Prometheus text format."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get('/api/trace/turns')
+def get_trace_turns(limit: int = 10):
+    """Per-stage latency breakdown of the last ``limit`` conversation turns, newest first."""
+    return TRACER.breakdown(limit)
+
+
+@app.get('/api/trace/chrome')
+def get_trace_chrome(limit: int = 0):
+    """Conversation turns as Chrome trace JSON (open in ui.perfetto.dev or chrome://tracing)."""
+    return JSONResponse(TRACER.chrome_trace(limit or None),
+                        headers={"Content-Disposition": 'attachment; filename="robbie-trace.json"'})
+
+
+@app.get('/api/broadcast/stats')
+def get_broadcast_stats():
+    """Per-topic publish/coalesce/flush counts and event-to-wire latency."""
+    return broadcaster.stats()
+
+
+@app.get('/api/events/stats')
+def get_event_stats():
+    """Per-subscriber event bus queue depth, delivered/dropped/error counts and delivery lag."""
+    return BUS.stats()
+
+
+@app.get('/api/ws/clients')
+def get_ws_clients():
+    """Per-client outbound queue depth, superseded/overflow counts and send lag."""
+    return manager.stats()
+
+
+@app.get('/api/camera/stream')
+async def camera_stream():
+    """MJPEG stream of the robot camera (frames are encoded once and shared by all viewers)."""
     from controller.robot import robot_instance
-    if robot_instance and getattr(robot_instance, 'state_update_callback', None) is None:
-        robot_instance.state_update_callback = robot_state_update_callback
+    from modules.camera_stream import MJPEG_BOUNDARY
+    # The first viewer opens the camera, which blocks; keep it off the event loop
+    streamer = await asyncio.to_thread(lambda: robot_instance.camera_stream) if robot_instance else None
+    if not streamer:
+        return JSONResponse(content={"error": "Camera stream not available"}, status_code=404)
+    return StreamingResponse(
+        streamer.mjpeg(),
+        media_type=f"multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}",
+        headers={"Cache-Control": "no-cache, no-store"},
+    )
+
+
+@app.get('/api/camera/stats')
+def camera_stats():
+    """Camera stream viewer count and encoder throughput."""
+    from controller.robot import robot_instance
+    if robot_instance and not robot_instance.subsystem_ready('camera_stream'):
+        return {"viewers": 0, "status": "deferred"}
+    streamer = getattr(robot_instance, 'camera_stream', None) if robot_instance else None
+    if not streamer:
+        return JSONResponse(content={"error": "Camera stream not available"}, status_code=404)
+    return streamer.stats()
+
+
+@app.get('/api/state_machine')
+def get_state_machine():
+    """Conversation state, per-state dwell times and recent state machine events."""
+    from controller.robot import robot_instance
+    if not robot_instance:
+        return JSONResponse(content={"error": "Robot not initialized"}, status_code=503)
+    return robot_instance.state_machine.stats()
+
+
+@app.get('/api/motors/stats')
+def get_motor_stats():
+    """Achieved motor loop rate, I2C throttle writes per second and loop jitter."""
+    from controller.robot import robot_instance
+    if not robot_instance:
+        return JSONResponse(content={"error": "Robot not initialized"}, status_code=503)
+    motors = robot_instance.motors
+    if motors is None:
+        return JSONResponse(content={"error": "Motors not initialized"}, status_code=503)
+    return motors.stats()
+
+
+@app.get('/api/pose/trajectory')
+def get_pose_trajectory(since: int = 0, limit: int = 1000):
+    """Poses recorded after sequence number ``since``; pass back the returned ``seq`` to fetch only newer ones."""
+    from controller.robot import robot_instance
+    if not robot_instance:
+        return JSONResponse(content={"error": "Robot not initialized"}, status_code=503)
+    odometry = robot_instance.odometry
+    if odometry is None:
+        return JSONResponse(content={"error": "Odometry not initialized"}, status_code=503)
+    trajectory = odometry.trajectory(since, limit)
+    trajectory['pose'] = odometry.pose()
+    return trajectory
+
+
+@app.post('/api/pose/reset')
+def reset_pose(data: Optional[Dict] = None):
+    """Set the estimated pose (``x``, ``y`` in meters and ``heading`` in degrees; all 0 by default)."""
+    from controller.robot import robot_instance
+    odometry = robot_instance.odometry if robot_instance else None
+    if odometry is None:
+        return JSONResponse(content={"error": "Odometry not initialized"}, status_code=503)
+    data = data or {}
+    odometry.reset(float(data.get('x', 0.0)), float(data.get('y', 0.0)), float(data.get('heading', 0.0)))
+    return odometry.pose()
+
+
+@app.get('/api/scheduler/stats')
+def get_scheduler_stats():
+    """Target and achieved rate, jitter, missed cycles and overruns for each periodic loop."""
+    from utils.scheduler import SCHEDULER
+    return SCHEDULER.stats()
+
+
+@app.get('/api/startup')
+def get_startup():
+    """Per-subsystem init status and time, including the background Whisper load."""
+    from controller.robot import robot_instance
+    if not robot_instance:
+        return JSONResponse(content={"error": "Robot not initialized"}, status_code=503)
+    return robot_instance.startup_report()
+
+
+@app.get('/api/jobs')
+def get_jobs():
+    """Active and recently finished background jobs (chat, wake)."""
+    return jobs.recent()
 
 
 # Configure CORS
@@ -117,42 +299,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# WebSocket connections store
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Set[WebSocket] = set()
-        self._last_no_ws_log = 0
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.add(websocket)
-
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-
-    async def broadcast(self, message: str):
-        if not self.active_connections:
-            now = time.time()
-            if now - self._last_no_ws_log > 5:  # Log at most once every 5 seconds
-                logging.debug("No WebSocket clients connected; broadcast skipped.")
-                self._last_no_ws_log = now
-            return
-        to_remove = set()
-        for connection in list(self.active_connections):
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                logging.warning(f"WebSocket send failed, removing client: {e}")
-                to_remove.add(connection)
-        for connection in to_remove:
-            self.active_connections.discard(connection)
-        if to_remove:
-            logging.info(f"Removed {len(to_remove)} disconnected WebSocket clients from active_connections.")
-
-manager = ConnectionManager()
-
-# Robot state
-robot_state = {
+# Robot state (versioned; broadcast as per-key deltas)
+state = VersionedState({
     "connected": False,
     "battery": 0,
     "temperature": 0,
@@ -174,31 +322,95 @@ robot_state = {
     "robot_state": "standby",  # Current robot state (standby, listening, etc.)
     "joystick": {"axes": [], "buttons": []},
     "motor": {"enabled": False, "mode": "arcade", "left_speed": 0.0, "right_speed": 0.0}
-}
+})
+# Live view of the state dict for read-only access
+robot_state = state.data
+
+# WebSocket clients, each with its own outbound queue
+manager = ConnectionManager(
+    state.snapshot_message,
+    max_pending=Config.shared().get('api', 'client_queue_size', default=256),
+)
+
+# Coalesces telemetry per topic and flushes it at the configured rates
+broadcaster = BroadcastScheduler(
+    state,
+    manager.broadcast_delta,
+    rates=Config.shared().get('api', 'broadcast_rates', default={'audio': 20, 'leds': 30, 'joystick': 60, 'pose': 10}),
+)
+
+def emit_job_event(event: dict) -> None:
+    """Broadcast a job event from a worker thread."""
+    if main_event_loop and main_event_loop.is_running():
+        asyncio.run_coroutine_threadsafe(manager.broadcast(json.dumps(event)), main_event_loop)
+
+# Long-running WebSocket commands run here instead of on the event loop
+# (chats one at a time: they share the conversation history and the speaker)
+jobs = JobRunner(emit_job_event, max_workers=Config.shared().get('api', 'job_workers', default=2), serial=('chat',))
+
+def run_chat(report, chat_text: str) -> dict:
+    """Send typed chat through the speech pipeline (blocks on the LLM)."""
+    from controller.robot import robot_instance
+    response = None
+    if robot_instance and hasattr(robot_instance, "speech"):
+        report({"stage": "thinking"})
+        # Simulate transcription callback
+        response = robot_instance.speech.on_transcription(chat_text)
+    # Always set last_response to the AI response (or empty string if none)
+    updates = {"last_response": response if response else ""}
+    # Always update chat_history from conversation module
+    if robot_instance and hasattr(robot_instance, "conversation"):
+        updates["chat_history"] = robot_instance.conversation.get_chat_history()
+    publish_state(updates)
+    return {"response": updates["last_response"]}
+
+def run_wake(report) -> None:
+    from controller.robot import robot_instance
+    if robot_instance:
+        robot_instance.wake_up()
 
 # --- LED Matrix State Integration ---
-import numpy as np
+
+def start_led_animation(leds_controller, animation: str, duration=None) -> None:
+    """Start an LED animation and show the current frame (blocks while the previous animation stops)."""
+    try:
+        leds_controller.start_animation(animation, duration=duration)
+        logger.info(f"[WS] leds.start_animation call completed for {animation}")
+    except Exception as e:
+        logger.error(f"[WS] Exception in leds.start_animation: {e}")
+    # Always call show on the main leds_module
+    leds_module = getattr(leds_controller, "leds", None)
+    if leds_module:
+        leds_module.show(wait=False)
+
+def stop_led_animation(leds_controller) -> None:
+    """Stop the LED animation and show the current frame (blocks while its thread stops)."""
+    leds_controller.stop_animation()
+    leds_module = getattr(leds_controller, "leds", None)
+    if leds_module:
+        leds_module.show(wait=False)
 
 def update_led_matrix_state(leds_controller):
     """
-    Update robot_state['led_matrix'] with the current LED buffer as a nested list.
+    Publish the current LED buffer and animation state as a nested list.
     Should be called after each LED buffer update.
     """
     with leds_controller.leds._lock:
         # Convert the numpy buffer (4,8,3) to a nested list for JSON serialization
-        robot_state['led_matrix'] = leds_controller.leds.buffer.astype(int).tolist()
-        robot_state['led_animation'] = leds_controller.current_animation_state or {}
-        logger.debug(f"[DEBUG] update_led_matrix_state called. led_matrix: {robot_state['led_matrix']} led_animation: {robot_state['led_animation']}")
+        led_matrix = leds_controller.leds.buffer.astype(int).tolist()
+    publish_state({
+        'led_matrix': led_matrix,
+        'led_animation': leds_controller.current_animation_state or {},
+    })
 
 @app.get("/api/status")
 async def get_status():
-    return robot_state
+    return state.snapshot()[1]
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
-    # Send the current robot_state immediately to the new client
-    await websocket.send_text(json.dumps(robot_state))
+    # Queues a full snapshot immediately; later updates arrive as deltas
+    client = await manager.connect(websocket)
     try:
         while True:
             try:
@@ -211,6 +423,7 @@ async def websocket_endpoint(websocket: WebSocket):
 
                 # Handle different command types
                 cmd_type = command.get("type")
+                updates = {}
                 if cmd_type == "move":
                     await handle_movement(command)
                 elif cmd_type == "config":
@@ -218,37 +431,25 @@ async def websocket_endpoint(websocket: WebSocket):
                 elif cmd_type == "update_audio_level":
                     # Update audio level from robot controller/module
                     if "input_audio_level_db" in command:
-                        robot_state["input_audio_level_db"] = command["input_audio_level_db"]
+                        updates["input_audio_level_db"] = command["input_audio_level_db"]
                     if "output_audio_level_db" in command:
-                        robot_state["output_audio_level_db"] = command["output_audio_level_db"]
+                        updates["output_audio_level_db"] = command["output_audio_level_db"]
                 elif cmd_type == "update_transcription":
                     # Update transcription from robot controller/module
-                    robot_state["last_transcription"] = command.get("last_transcription", "")
+                    updates["last_transcription"] = command.get("last_transcription", "")
                 elif cmd_type == "ping":
                     # Ignore keepalive pings
                     continue
+                elif cmd_type == "resync":
+                    # Client lost track of the state; send it a fresh snapshot
+                    client.send_snapshot()
+                    continue
                 elif cmd_type == "chat":
-                    # Handle typed chat from web interface
+                    # Handle typed chat from web interface; the reply arrives as job events
                     chat_text = command.get("text", "")
-                    from controller.robot import robot_instance
-                    response = None
-                    if robot_instance and hasattr(robot_instance, "speech"):
-                        # Simulate transcription callback
-                        response = robot_instance.speech.on_transcription(chat_text)
                     # Always set last_transcription to the user prompt
-                    robot_state["last_transcription"] = chat_text
-                    # Always set last_response to the AI response (or empty string if none)
-                    robot_state["last_response"] = response if response else ""
-
-                    # Always update chat_history from conversation module
-                    if robot_instance and hasattr(robot_instance, "conversation"):
-                        robot_state["chat_history"] = robot_instance.conversation.get_chat_history()
-                        # Broadcast chat_history as a dedicated message
-                        import asyncio
-                        asyncio.create_task(manager.broadcast(json.dumps({
-                            "type": "chat_history",
-                            "chat_history": robot_state["chat_history"]
-                        })))
+                    updates["last_transcription"] = chat_text
+                    jobs.submit("chat", run_chat, chat_text, request_id=command.get("request_id"))
 
                 elif cmd_type == "test_led":
                     from controller.robot import robot_instance
@@ -257,7 +458,7 @@ async def websocket_endpoint(websocket: WebSocket):
                         # Fill the entire buffer with magenta
                         leds_module.buffer[:, :] = [255, 0, 255]
                         logger.info(f"[DEBUG] test_led: buffer shape: {leds_module.buffer.shape} buffer: {leds_module.buffer.tolist()}")
-                        leds_module.show()
+                        leds_module.show(wait=False)
                 elif cmd_type == "set_led_animation":
                     logger.info(f"[WS] set_led_animation command received: {command}")
                     from controller.robot import robot_instance
@@ -266,33 +467,23 @@ async def websocket_endpoint(websocket: WebSocket):
                         animation = command.get("animation")
                         duration = command.get("duration")
                         logger.info(f"[WS] Dispatching to leds.start_animation: {animation}, duration={duration}")
-                        try:
-                            robot_instance.leds.start_animation(animation, duration=duration)
-                            logger.info(f"[WS] leds.start_animation call completed for {animation}")
-                        except Exception as e:
-                            logger.error(f"[WS] Exception in leds.start_animation: {e}")
-                        # Always call show on the main leds_module
-                        leds_module = getattr(robot_instance.leds, "leds", None)
-                        if leds_module:
-                            leds_module.show()
+                        # Stopping the running animation joins its thread; keep that off the event loop
+                        await asyncio.get_running_loop().run_in_executor(
+                            None, start_led_animation, robot_instance.leds, animation, duration)
                 elif cmd_type == "stop_led_animation":
                     logger.info(f"[WS] stop_led_animation command received: {command}")
                     from controller.robot import robot_instance
                     if robot_instance and hasattr(robot_instance, "leds"):
-                        robot_instance.leds.stop_animation()
-                        leds_module = getattr(robot_instance.leds, "leds", None)
-                        if leds_module:
-                            leds_module.show()
+                        await asyncio.get_running_loop().run_in_executor(None, stop_led_animation, robot_instance.leds)
                 elif cmd_type == "wake":
-                    from controller.robot import robot_instance
-                    if robot_instance:
-                        robot_instance.wake_up()
+                    jobs.submit("wake", run_wake, request_id=command.get("request_id"))
                 else:
                     logging.info(f"Unknown WebSocket command type: {cmd_type}")
                     continue
 
-                # Broadcast updated state
-                await manager.broadcast(json.dumps(robot_state))
+                # Broadcast whatever changed
+                if updates:
+                    publish_state(updates)
             except WebSocketDisconnect:
                 logging.info("WebSocket client disconnected.")
                 break
@@ -302,7 +493,7 @@ async def websocket_endpoint(websocket: WebSocket):
     except Exception as e:
         logging.error(f"WebSocket error: {e}")
     finally:
-        manager.disconnect(websocket)
+        manager.disconnect(client)
 
 async def handle_movement(command: Dict):
     """Handle robot movement commands"""
@@ -324,20 +515,13 @@ async def handle_configuration(command: Dict):
 
     logger.info(f"[WS] Applying configuration updates: {updates}")
 
+    # The robot shares this Config, so subscribed modules see the change too
     try:
-        cfg = Config()
+        cfg = Config.shared()
         cfg.update_from_dict(updates)
         cfg.save()
     except Exception as e:
-        logger.error(f"[WS] Failed to persist configuration updates: {e}")
-
-    # Try to apply to live robot instance as well
-    try:
-        from controller.robot import robot_instance
-        if robot_instance and hasattr(robot_instance, 'config'):
-            robot_instance.config.update_from_dict(updates)
-    except Exception as e:
-        logger.error(f"[WS] Failed to apply configuration to live robot: {e}")
+        logger.error(f"[WS] Failed to apply configuration updates: {e}")
 
 # Mount the static files (for the frontend)
 import os
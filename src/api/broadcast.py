@@ -0,0 +1,195 @@
+import asyncio
+import threading
+import time
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from utils.metrics import counter, histogram
+from .state import VersionedState
+
+logger = logging.getLogger(__name__)
+
+BROADCAST_LATENCY_SECONDS = histogram('robbie_broadcast_latency_seconds', 'Time from a state update being published to it being queued for clients')
+BROADCAST_COALESCED = counter('robbie_broadcast_coalesced_total', 'State updates merged into a pending update of the same topic')
+
+# Topic used for state changes that should reach clients without delay
+IMMEDIATE_TOPIC = "state"
+
+
+class _TopicStats:
+    __slots__ = ("published", "coalesced", "flushed", "unchanged", "dropped",
+                 "latency_sum", "latency_max", "latency_last")
+
+    def __init__(self):
+        self.published = 0
+        self.coalesced = 0
+        self.flushed = 0
+        self.unchanged = 0
+        self.dropped = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.latency_last = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        avg = self.latency_sum / self.flushed if self.flushed else 0.0
+        return {
+            "published": self.published,
+            "coalesced": self.coalesced,
+            "flushed": self.flushed,
+            "unchanged": self.unchanged,
+            "dropped": self.dropped,
+            "latency_ms": {
+                "avg": round(avg * 1000, 3),
+                "max": round(self.latency_max * 1000, 3),
+                "last": round(self.latency_last * 1000, 3),
+            },
+        }
+
+
+class BroadcastScheduler:
+    """
+    Coalesces high-frequency state updates per topic and flushes them at a
+    configurable rate.
+
+    Producers call ``publish`` from any thread. Updates for a topic are merged
+    into a single pending dict until the topic is due, so a 60 Hz joystick or
+    a PortAudio level callback costs one dict merge instead of one event-loop
+    task per update. Topics without a configured rate (e.g. robot state
+    changes) are flushed immediately.
+    """
+
+    def __init__(self,
+                 state: VersionedState,
+                 send: Callable[[str, int, Dict[str, Any]], Awaitable[None]],
+                 rates: Optional[Dict[str, float]] = None):
+        """
+        Initialize the scheduler
+
+        Args:
+            state: Versioned state that flushed updates are applied to
+            send: Coroutine function called with (topic, seq, delta) to fan out a delta
+            rates: Flush rate in Hz per topic; unlisted topics are immediate
+        """
+        self.state = state
+        self._send = send
+        self._intervals = {topic: 1.0 / float(rate) for topic, rate in (rates or {}).items() if rate and rate > 0}
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_since: Dict[str, float] = {}
+        self._last_flush: Dict[str, float] = {}
+        self._stats: Dict[str, _TopicStats] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start the flush task on the given (running) event loop."""
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop the flush task."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self._loop = None
+
+    def _topic_stats(self, topic: str) -> _TopicStats:
+        stats = self._stats.get(topic)
+        if stats is None:
+            stats = self._stats[topic] = _TopicStats()
+        return stats
+
+    def publish(self, topic: str, changes: Dict[str, Any], immediate: bool = False) -> None:
+        """
+        Queue a partial state update for broadcast (thread-safe)
+
+        Args:
+            topic: Telemetry topic (e.g. 'audio', 'leds', 'joystick')
+            changes: Top-level state keys and their new values
+            immediate: Flush on the next loop iteration regardless of topic rate
+        """
+        if not changes:
+            return
+        loop = self._loop
+        with self._lock:
+            stats = self._topic_stats(topic)
+            stats.published += 1
+            if loop is None or not loop.is_running():
+                # No API loop yet: keep the state current for the next snapshot
+                self.state.update(changes)
+                stats.dropped += 1
+                return
+            pending = self._pending.get(topic)
+            newly_dirty = pending is None
+            if newly_dirty:
+                self._pending[topic] = dict(changes)
+                self._pending_since[topic] = time.monotonic()
+            else:
+                pending.update(changes)
+                stats.coalesced += 1
+                BROADCAST_COALESCED.inc()
+            if immediate or topic not in self._intervals:
+                # Mark as due now
+                self._last_flush[topic] = 0.0
+        if newly_dirty or immediate:
+            loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _take_due(self, now: float):
+        """Pop all due topics; return (due list, seconds until the next pending topic is due)."""
+        due = []
+        next_wait = None
+        with self._lock:
+            for topic in list(self._pending):
+                interval = self._intervals.get(topic, 0.0)
+                ready_at = self._last_flush.get(topic, 0.0) + interval
+                if ready_at <= now:
+                    due.append((topic, self._pending.pop(topic), self._pending_since.pop(topic)))
+                    self._last_flush[topic] = now
+                else:
+                    wait = ready_at - now
+                    next_wait = wait if next_wait is None else min(next_wait, wait)
+        return due, next_wait
+
+    async def _flush(self, topic: str, changes: Dict[str, Any], since: float) -> None:
+        seq, delta = self.state.update(changes)
+        stats = self._topic_stats(topic)
+        if not delta:
+            stats.unchanged += 1
+            return
+        try:
+            await self._send(topic, seq, delta)
+        except Exception as e:
+            logger.error(f"[BroadcastScheduler] Failed to broadcast '{topic}' update: {e}")
+            stats.dropped += 1
+            return
+        latency = time.monotonic() - since
+        BROADCAST_LATENCY_SECONDS.observe(latency)
+        stats.flushed += 1
+        stats.latency_sum += latency
+        stats.latency_last = latency
+        if latency > stats.latency_max:
+            stats.latency_max = latency
+
+    async def _run(self) -> None:
+        while True:
+            # Clear before collecting so a publish racing with the flush re-arms the wait
+            self._wakeup.clear()
+            due, next_wait = self._take_due(time.monotonic())
+            for topic, changes, since in due:
+                await self._flush(topic, changes, since)
+            if due:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=next_wait)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-topic publish/coalesce/flush counts and event-to-wire latency."""
+        with self._lock:
+            return {
+                topic: dict(stats.as_dict(), rate_hz=(1.0 / self._intervals[topic]) if topic in self._intervals else None)
+                for topic, stats in self._stats.items()
+            }
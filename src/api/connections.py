@@ -0,0 +1,273 @@
+import asyncio
+import itertools
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.metrics import counter, gauge, histogram
+from .protocol import SUBPROTOCOL, OutboundMessage, encode_delta
+
+logger = logging.getLogger(__name__)
+
+WS_FANOUT_LAG_SECONDS = histogram('robbie_ws_fanout_lag_seconds', 'Time a message waits in a client queue before it is sent')
+WS_MESSAGES_SENT = counter('robbie_ws_messages_sent_total', 'WebSocket messages sent to clients')
+WS_SUPERSEDED = counter('robbie_ws_superseded_total', 'Queued deltas merged into a newer delta for a lagging client')
+WS_CLIENTS = gauge('robbie_ws_clients', 'Connected WebSocket clients')
+
+
+class ClientConnection:
+    """
+    One WebSocket client with its own bounded outbound queue and writer task.
+
+    State deltas are queued under their topic: if the client falls behind, a
+    newer delta for the same topic is merged into the pending one, in its
+    place, instead of queueing behind it. The merged delta carries
+    ``from_seq``, so pending deltas go out in order of the oldest change they
+    hold and the client only sees a gap when a delta was really lost. Other
+    messages (snapshots, events) get a unique key and are always delivered;
+    a snapshot replaces the deltas queued before it, which it already
+    contains. If the queue still overflows, it is replaced by a single
+    full-state snapshot.
+
+    Clients that negotiated the binary subprotocol receive telemetry deltas
+    as packed binary frames (see ``api.protocol``).
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self,
+                 websocket: Any,
+                 snapshot: Callable[[], str],
+                 max_pending: int = 256,
+                 on_close: Optional[Callable[["ClientConnection"], None]] = None,
+                 binary: bool = False):
+        """
+        Initialize the client
+
+        Args:
+            websocket: Accepted WebSocket (anything with an async ``send_text``)
+            snapshot: Returns a serialised full-state snapshot message
+            max_pending: Queue bound before falling back to a snapshot
+            on_close: Called once when the writer stops
+            binary: Whether the client negotiated the binary subprotocol
+        """
+        self.id = next(self._ids)
+        self.websocket = websocket
+        self.max_pending = max_pending
+        self.binary = binary
+        self._snapshot = snapshot
+        self._on_close = on_close
+        # key -> (OutboundMessage, changes or None, enqueued_at, oldest seq or None)
+        self._pending: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._reliable_ids = itertools.count()
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+
+        self.connected_at = time.time()
+        self.sent = 0
+        self.bytes_sent = 0
+        self.superseded = 0
+        self.overflows = 0
+        self.lag_sum = 0.0
+        self.lag_max = 0.0
+        self.lag_last = 0.0
+
+    def start(self) -> None:
+        """Start the writer task on the running event loop."""
+        self._task = asyncio.get_running_loop().create_task(self._writer())
+
+    def send(self, message: str) -> None:
+        """Queue a message that must be delivered (never merged)."""
+        self._enqueue(("msg", next(self._reliable_ids)), OutboundMessage(text=message), None, None)
+
+    def send_snapshot(self) -> None:
+        """Queue a full-state snapshot in place of the deltas it contains."""
+        for key in [key for key in self._pending if key[0] == "delta"]:
+            del self._pending[key]
+        self.send(self._snapshot())
+
+    def send_delta(self, topic: str, seq: int, message: OutboundMessage, changes: Dict[str, Any]) -> None:
+        """
+        Queue a state delta, merging it with an unsent delta of the same topic
+
+        Args:
+            topic: Telemetry topic the changed keys belong to
+            seq: State sequence number of the delta
+            message: Encoded delta for this client's protocol (shared between clients)
+            changes: Changed keys carried by ``message``
+        """
+        key = ("delta", topic)
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.superseded += 1
+            WS_SUPERSEDED.inc()
+            old_changes, enqueued_at, from_seq = pending[1], pending[2], pending[3]
+            # The older delta may carry keys the new one lacks; merge them
+            changes = dict(old_changes, **changes)
+            message = encode_delta(topic, seq, changes, self.binary, from_seq=from_seq)
+            # Keep the original place and enqueue time: the delta still holds the
+            # oldest change, and lag reflects how stale the topic is
+            self._pending[key] = (message, changes, enqueued_at, from_seq)
+            return
+        self._enqueue(key, message, changes, seq)
+
+    def _enqueue(self, key: Any, message: OutboundMessage, changes: Optional[Dict[str, Any]],
+                 from_seq: Optional[int]) -> None:
+        if self.closed:
+            return
+        if len(self._pending) >= self.max_pending:
+            # Too far behind to catch up message by message: resync from a snapshot
+            self.overflows += 1
+            logger.warning(f"[ClientConnection] Client {self.id} overflowed {self.max_pending} queued messages; sending snapshot")
+            self._pending.clear()
+            self._pending[("msg", next(self._reliable_ids))] = (OutboundMessage(text=self._snapshot()), None,
+                                                                 time.monotonic(), None)
+            if key[0] == "delta":
+                # Already contained in the snapshot
+                self._ready.set()
+                return
+        self._pending[key] = (message, changes, time.monotonic(), from_seq)
+        self._ready.set()
+
+    async def _writer(self) -> None:
+        try:
+            while True:
+                if not self._pending:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                _, (message, _, enqueued_at, _) = self._pending.popitem(last=False)
+                if message.binary is not None:
+                    await self.websocket.send_bytes(message.binary)
+                if message.text is not None:
+                    await self.websocket.send_text(message.text)
+                lag = time.monotonic() - enqueued_at
+                WS_FANOUT_LAG_SECONDS.observe(lag)
+                WS_MESSAGES_SENT.inc()
+                self.sent += 1
+                self.bytes_sent += message.size
+                self.lag_sum += lag
+                self.lag_last = lag
+                if lag > self.lag_max:
+                    self.lag_max = lag
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.warning(f"[ClientConnection] Send to client {self.id} failed, closing: {e}")
+        finally:
+            self.closed = True
+            self._pending.clear()
+            if self._on_close:
+                self._on_close(self)
+
+    def close(self) -> None:
+        """Stop the writer task."""
+        self.closed = True
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, delivery counts and enqueue-to-wire lag."""
+        avg = self.lag_sum / self.sent if self.sent else 0.0
+        client = getattr(self.websocket, "client", None)
+        return {
+            "id": self.id,
+            "client": f"{client.host}:{client.port}" if client else None,
+            "protocol": SUBPROTOCOL if self.binary else "json",
+            "connected_seconds": round(time.time() - self.connected_at, 1),
+            "queued": len(self._pending),
+            "sent": self.sent,
+            "bytes_sent": self.bytes_sent,
+            "superseded": self.superseded,
+            "overflows": self.overflows,
+            "lag_ms": {
+                "avg": round(avg * 1000, 3),
+                "max": round(self.lag_max * 1000, 3),
+                "last": round(self.lag_last * 1000, 3),
+            },
+        }
+
+
+class ConnectionManager:
+    """Fans messages out to WebSocket clients without letting a slow client block the others."""
+
+    def __init__(self, snapshot: Callable[[], str], max_pending: int = 256):
+        """
+        Initialize the manager
+
+        Args:
+            snapshot: Returns a serialised full-state snapshot message
+            max_pending: Per-client queue bound
+        """
+        self._snapshot = snapshot
+        self.max_pending = max_pending
+        self.clients: Dict[int, ClientConnection] = {}
+        self._last_no_ws_log = 0
+
+    @property
+    def active_connections(self) -> List[Any]:
+        return [client.websocket for client in self.clients.values()]
+
+    async def connect(self, websocket: Any) -> ClientConnection:
+        """Accept a WebSocket (negotiating the binary subprotocol if offered), start its writer and queue the initial snapshot."""
+        offered = getattr(websocket, "scope", {}).get("subprotocols") or []
+        binary = SUBPROTOCOL in offered
+        if binary:
+            await websocket.accept(subprotocol=SUBPROTOCOL)
+        else:
+            await websocket.accept()
+        return self.register(websocket, binary=binary)
+
+    def register(self, websocket: Any, binary: bool = False) -> ClientConnection:
+        """Start a writer for an already accepted WebSocket and queue the initial snapshot."""
+        client = ClientConnection(websocket, self._snapshot, max_pending=self.max_pending,
+                                  on_close=self._discard, binary=binary)
+        self.clients[client.id] = client
+        WS_CLIENTS.set(len(self.clients))
+        client.start()
+        client.send_snapshot()
+        return client
+
+    def _discard(self, client: ClientConnection) -> None:
+        if self.clients.pop(client.id, None) is not None:
+            WS_CLIENTS.set(len(self.clients))
+            logger.info(f"[ConnectionManager] Client {client.id} removed ({len(self.clients)} connected)")
+
+    def disconnect(self, client: ClientConnection) -> None:
+        client.close()
+        self._discard(client)
+
+    def _has_clients(self) -> bool:
+        if self.clients:
+            return True
+        now = time.time()
+        if now - self._last_no_ws_log > 5:  # Log at most once every 5 seconds
+            logger.debug("No WebSocket clients connected; broadcast skipped.")
+            self._last_no_ws_log = now
+        return False
+
+    async def broadcast(self, message: str) -> None:
+        """Queue a message for every client."""
+        if not self._has_clients():
+            return
+        for client in list(self.clients.values()):
+            client.send(message)
+
+    async def broadcast_delta(self, topic: str, seq: int, changes: Dict[str, Any]) -> None:
+        """Queue a state delta for every client; lagging clients merge it per topic."""
+        if not self._has_clients():
+            return
+        # Encode once per protocol, not once per client
+        encoded = {}
+        for client in list(self.clients.values()):
+            message = encoded.get(client.binary)
+            if message is None:
+                message = encoded[client.binary] = encode_delta(topic, seq, changes, client.binary)
+            client.send_delta(topic, seq, message, changes)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Return per-client queue and lag metrics."""
+        return [client.stats() for client in list(self.clients.values())]
@@ -0,0 +1,111 @@
+import threading
+import time
+import uuid
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JobRunner:
+    """
+    Runs long WebSocket commands (chat, wake) on a worker pool.
+
+    ``submit`` returns a request ID immediately; the job then reports
+    ``accepted``, ``running``, any number of ``progress`` and finally ``done``
+    or ``error`` through the ``emit`` callback as
+    ``{"type": "job", "request_id", "kind", "status", ...}`` events.
+
+    Kinds listed in ``serial`` get a lane of their own with one worker, so
+    their jobs run one at a time in submission order (chats share one
+    conversation and one speaker) without holding up other kinds.
+    """
+
+    def __init__(self, emit: Callable[[Dict[str, Any]], None], max_workers: int = 2, history: int = 50,
+                 serial: Iterable[str] = ()):
+        """
+        Initialize the runner
+
+        Args:
+            emit: Called (from any thread) with each job event
+            max_workers: Worker threads; jobs beyond this are queued
+            history: Number of finished jobs kept for ``recent``
+            serial: Job kinds that must not run concurrently with each other
+        """
+        self._emit = emit
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="api-job")
+        self._lanes = {kind: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"api-job-{kind}")
+                       for kind in serial}
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._finished = deque(maxlen=history)
+
+    def submit(self, kind: str, fn: Callable[..., Any], *args: Any, request_id: Optional[str] = None) -> str:
+        """
+        Queue ``fn(report, *args)`` and return its request ID
+
+        Args:
+            kind: Job type reported in events (e.g. 'chat')
+            fn: Blocking callable; ``report(dict)`` sends a progress event
+            args: Extra arguments for ``fn``
+            request_id: Client-chosen ID to correlate events; generated if omitted
+
+        Returns:
+            Request ID used in all events for this job
+        """
+        request_id = str(request_id) if request_id else uuid.uuid4().hex[:12]
+        job = {"request_id": request_id, "kind": kind, "status": "accepted",
+               "submitted_at": time.time(), "started_at": None, "finished_at": None}
+        with self._lock:
+            self._jobs[request_id] = job
+        self._send(job, "accepted")
+        self._lanes.get(kind, self._executor).submit(self._run, job, fn, args)
+        return request_id
+
+    def _send(self, job: Dict[str, Any], status: str, **fields: Any) -> None:
+        job["status"] = status
+        event = {"type": "job", "request_id": job["request_id"], "kind": job["kind"], "status": status}
+        event.update(fields)
+        try:
+            self._emit(event)
+        except Exception as e:
+            logger.error(f"[JobRunner] Failed to emit {status} event for {job['request_id']}: {e}")
+
+    def _run(self, job: Dict[str, Any], fn: Callable[..., Any], args: tuple) -> None:
+        job["started_at"] = time.time()
+        self._send(job, "running")
+        try:
+            status, fields = "done", {"result": fn(lambda progress: self._send(job, "progress", progress=progress), *args)}
+        except Exception as e:
+            logger.error(f"[JobRunner] {job['kind']} job {job['request_id']} failed: {e}", exc_info=True)
+            status, fields = "error", {"error": str(e)}
+        job["finished_at"] = time.time()
+        job["status"] = status
+        with self._lock:
+            self._jobs.pop(job["request_id"], None)
+            self._finished.append(job)
+        self._send(job, status, **fields)
+
+    def recent(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Return active and recently finished jobs with queue/run times."""
+        def describe(job: Dict[str, Any]) -> Dict[str, Any]:
+            started, finished = job["started_at"], job["finished_at"]
+            return {
+                "request_id": job["request_id"],
+                "kind": job["kind"],
+                "status": job["status"],
+                "queued_ms": round(((started or time.time()) - job["submitted_at"]) * 1000, 1),
+                "run_ms": round(((finished or time.time()) - started) * 1000, 1) if started else None,
+            }
+        with self._lock:
+            return {
+                "active": [describe(job) for job in self._jobs.values()],
+                "finished": [describe(job) for job in reversed(self._finished)],
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop accepting jobs."""
+        for executor in (self._executor, *self._lanes.values()):
+            executor.shutdown(wait=wait)
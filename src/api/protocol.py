@@ -0,0 +1,191 @@
+"""
+Binary WebSocket subprotocol for high-frequency telemetry.
+
+Clients that offer the ``robbie.bin.v1`` subprotocol at connect time receive
+LED frames, audio levels and joystick snapshots as packed binary frames;
+everything else (and every client that does not negotiate it) uses the JSON
+``state_delta`` messages.
+
+All frames are little-endian and start with a 5-byte header::
+
+    topic   uint8    high bit (``FLAG_MERGED``) set on merged frames
+    seq     uint32   state sequence number, shared with JSON deltas
+
+Merged frames, which carry several deltas of a topic that a lagging client
+had not been sent yet, follow the header with ``from_seq`` (uint32), the
+oldest sequence number they cover (``from_seq`` in JSON deltas).
+
+followed by a topic-specific body:
+
+    TOPIC_LEDS      height uint8, width uint8, height*width*3 uint8 RGB
+    TOPIC_AUDIO     flags uint8 (bit0 input, bit1 output), then a float16
+                    dB value for each flag set, in bit order
+    TOPIC_JOYSTICK  flags uint8 (bit0 connected), axis count uint8,
+                    button count uint8, float16 axes, buttons bit-packed
+                    LSB-first into ceil(count / 8) bytes
+
+A delta may be split into a binary frame and a JSON delta with the same
+sequence number when it carries keys the binary format does not cover.
+"""
+import struct
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .state import VersionedState
+
+SUBPROTOCOL = "robbie.bin.v1"
+
+TOPIC_LEDS = 1
+TOPIC_AUDIO = 2
+TOPIC_JOYSTICK = 3
+
+FLAG_MERGED = 0x80
+
+_HEADER = struct.Struct("<BI")
+_FROM_SEQ = struct.Struct("<I")
+_AUDIO_KEYS = ("input_audio_level_db", "output_audio_level_db")
+
+
+@dataclass
+class OutboundMessage:
+    """A message for one client: a JSON text frame, a binary frame, or both."""
+    text: Optional[str] = None
+    binary: Optional[bytes] = None
+
+    @property
+    def size(self) -> int:
+        return (len(self.text) if self.text else 0) + (len(self.binary) if self.binary else 0)
+
+
+def encode_leds(seq: int, led_matrix: List[List[List[int]]]) -> Optional[bytes]:
+    """Pack a height x width x RGB matrix; returns None if it is empty, ragged or out of range."""
+    height = len(led_matrix)
+    width = len(led_matrix[0]) if height else 0
+    if not height or not width or height > 255 or width > 255:
+        return None
+    try:
+        pixels = bytes(value for row in led_matrix for pixel in row for value in pixel)
+    except (TypeError, ValueError):
+        return None
+    if len(pixels) != height * width * 3:
+        return None
+    return _HEADER.pack(TOPIC_LEDS, seq) + bytes((height, width)) + pixels
+
+
+def encode_audio(seq: int, changes: Dict[str, Any]) -> Optional[bytes]:
+    """Pack whichever of the input/output audio levels are present in ``changes``."""
+    flags = 0
+    values = []
+    for bit, key in enumerate(_AUDIO_KEYS):
+        if key in changes:
+            flags |= 1 << bit
+            values.append(float(changes[key]))
+    if not flags:
+        return None
+    return _HEADER.pack(TOPIC_AUDIO, seq) + struct.pack(f"<B{len(values)}e", flags, *values)
+
+
+def pack_buttons(buttons: List[Any]) -> bytes:
+    """Bit-pack button states LSB-first."""
+    packed = bytearray((len(buttons) + 7) // 8)
+    for i, pressed in enumerate(buttons):
+        if pressed:
+            packed[i >> 3] |= 1 << (i & 7)
+    return bytes(packed)
+
+
+def unpack_buttons(data: bytes, count: int) -> List[bool]:
+    """Inverse of ``pack_buttons``."""
+    return [bool(data[i >> 3] & (1 << (i & 7))) for i in range(count)]
+
+
+def encode_joystick(seq: int, joystick: Dict[str, Any]) -> Optional[bytes]:
+    """Pack a joystick snapshot ({connected, axes, buttons})."""
+    axes = joystick.get("axes") or []
+    buttons = joystick.get("buttons") or []
+    if len(axes) > 255 or len(buttons) > 255:
+        return None
+    flags = 1 if joystick.get("connected", bool(axes or buttons)) else 0
+    return (_HEADER.pack(TOPIC_JOYSTICK, seq)
+            + struct.pack(f"<BBB{len(axes)}e", flags, len(axes), len(buttons), *[float(a) for a in axes])
+            + pack_buttons(buttons))
+
+
+def encode_delta(topic: str, seq: int, changes: Dict[str, Any], binary: bool = False,
+                 from_seq: Optional[int] = None) -> OutboundMessage:
+    """
+    Encode a state delta for a client
+
+    Args:
+        topic: Broadcast topic the changes belong to
+        seq: State sequence number
+        changes: Changed top-level keys
+        binary: Whether the client negotiated the binary subprotocol
+        from_seq: Oldest sequence number covered, for deltas merged into one
+
+    Returns:
+        OutboundMessage with a binary frame for the keys the binary format
+        covers and a JSON delta for any remaining keys
+    """
+    frame = None
+    if binary:
+        remaining = dict(changes)
+        if topic == "leds" and "led_matrix" in remaining:
+            frame = encode_leds(seq, remaining["led_matrix"])
+            if frame is not None:
+                del remaining["led_matrix"]
+        elif topic == "audio":
+            frame = encode_audio(seq, remaining)
+            if frame is not None:
+                for key in _AUDIO_KEYS:
+                    remaining.pop(key, None)
+        elif topic == "joystick" and isinstance(remaining.get("joystick"), dict):
+            frame = encode_joystick(seq, remaining["joystick"])
+            if frame is not None:
+                del remaining["joystick"]
+        changes = remaining
+        if frame is not None and from_seq is not None and from_seq < seq:
+            frame = (_HEADER.pack(frame[0] | FLAG_MERGED, seq) + _FROM_SEQ.pack(from_seq)
+                     + frame[_HEADER.size:])
+    text = VersionedState.delta_message(seq, changes, from_seq) if changes else None
+    return OutboundMessage(text=text, binary=frame)
+
+
+def decode_header(data: bytes) -> Tuple[int, int, int, int]:
+    """Return ``(topic, from_seq, seq, body offset)`` of a binary frame (``from_seq == seq`` unless merged)."""
+    topic, seq = _HEADER.unpack_from(data, 0)
+    if topic & FLAG_MERGED:
+        return topic & ~FLAG_MERGED, _FROM_SEQ.unpack_from(data, _HEADER.size)[0], seq, _HEADER.size + _FROM_SEQ.size
+    return topic, seq, seq, _HEADER.size
+
+
+def decode_frame(data: bytes) -> Tuple[int, Dict[str, Any]]:
+    """
+    Decode a binary frame back into (seq, changes)
+
+    Used by tests and the benchmark; the web client has its own decoder.
+    """
+    topic, _, seq, offset = decode_header(data)
+    if topic == TOPIC_LEDS:
+        height, width = data[offset], data[offset + 1]
+        pixels = data[offset + 2:offset + 2 + height * width * 3]
+        matrix = [[list(pixels[(y * width + x) * 3:(y * width + x) * 3 + 3]) for x in range(width)]
+                  for y in range(height)]
+        return seq, {"led_matrix": matrix}
+    if topic == TOPIC_AUDIO:
+        flags = data[offset]
+        offset += 1
+        changes = {}
+        for bit, key in enumerate(_AUDIO_KEYS):
+            if flags & (1 << bit):
+                changes[key] = struct.unpack_from("<e", data, offset)[0]
+                offset += 2
+        return seq, changes
+    if topic == TOPIC_JOYSTICK:
+        flags, n_axes, n_buttons = struct.unpack_from("<BBB", data, offset)
+        offset += 3
+        axes = list(struct.unpack_from(f"<{n_axes}e", data, offset))
+        offset += 2 * n_axes
+        buttons = unpack_buttons(data[offset:], n_buttons)
+        return seq, {"joystick": {"connected": bool(flags & 1), "axes": axes, "buttons": buttons}}
+    raise ValueError(f"Unknown binary topic {topic}")
@@ -0,0 +1,79 @@
+import json
+import threading
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class VersionedState:
+    """
+    Robot state dict with a monotonically increasing sequence number.
+
+    ``update`` compares incoming values against the stored ones and returns
+    only the top-level keys that actually changed, so callers can broadcast a
+    small delta instead of re-serialising the whole state. Clients apply
+    deltas in arrival order and request a full snapshot on connect/resync.
+    """
+
+    def __init__(self, initial: Dict[str, Any]):
+        self._data: Dict[str, Any] = dict(initial)
+        self._lock = threading.Lock()
+        self.seq = 0
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """Live state dict (mutated in place; do not write to it directly)."""
+        return self._data
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def update(self, changes: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Apply a partial update
+
+        Args:
+            changes: New values for top-level keys; unknown keys are ignored
+
+        Returns:
+            Tuple of (sequence number, dict of keys whose value changed).
+            The sequence number only advances when something changed.
+        """
+        delta = {}
+        with self._lock:
+            for key, value in changes.items():
+                if key not in self._data:
+                    continue
+                if self._data[key] != value:
+                    self._data[key] = value
+                    delta[key] = value
+            if delta:
+                self.seq += 1
+            return self.seq, delta
+
+    def snapshot(self) -> Tuple[int, Dict[str, Any]]:
+        """Return (sequence number, shallow copy of the full state)."""
+        with self._lock:
+            return self.seq, dict(self._data)
+
+    def snapshot_message(self) -> str:
+        """Serialise a full-state message for newly connected or resyncing clients."""
+        seq, data = self.snapshot()
+        return json.dumps({"type": "state_snapshot", "seq": seq, "state": data})
+
+    @staticmethod
+    def delta_message(seq: int, delta: Dict[str, Any], from_seq: Optional[int] = None) -> str:
+        """
+        Serialise a delta message containing only the changed keys
+
+        ``from_seq`` marks a delta that several merged deltas went into: it
+        covers the changes from ``from_seq`` up to ``seq``.
+        """
+        message = {"type": "state_delta", "seq": seq, "changes": delta}
+        if from_seq is not None and from_seq < seq:
+            message["from_seq"] = from_seq
+        return json.dumps(message)
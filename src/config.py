@@ -1,14 +1,55 @@
 #!/usr/bin/env python3
 
 import os
+import threading
 import yaml
-from typing import Any, Dict, List, Optional, Union
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 import logging
 logger = logging.getLogger(__name__)
 
+
+@dataclass(frozen=True)
+class ConfigChange:
+    """A change to one top-level config section, passed to subscribers."""
+    section: str
+    old: Any
+    new: Any
+    changed_keys: Tuple[str, ...]
+    source: str  # 'update' (API/WebSocket) or 'file' (config.yaml edited on disk)
+
+    def changed(self, key: str) -> bool:
+        """True if ``key`` inside the section was added, removed or modified."""
+        return key in self.changed_keys
+
+
+def _changed_keys(old: Any, new: Any) -> Tuple[str, ...]:
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return ()
+    return tuple(key for key in {**old, **new} if old.get(key) != new.get(key))
+
+
 class Config:
-    """Configuration manager for robot settings"""
-    
+    """Configuration manager for robot settings
+
+    ``Config.shared()`` returns the process-wide instance that modules should
+    use; it parses config.yaml once. The configuration dict is never modified
+    in place: updates and reloads swap in a new dict, so a reference obtained
+    from ``snapshot()`` stays consistent and reads need no locking.
+    """
+
+    _shared: Optional['Config'] = None
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> 'Config':
+        """Return the process-wide configuration, loading it on first use."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
     def __init__(self, config_path: str = None):
         """
         Initialize configuration
@@ -29,17 +70,28 @@ class Config:
                 raise FileNotFoundError("config.yaml not found in any parent directory")
 
         self.config_path = config_path
+        self._lock = threading.RLock()
+        self._subscribers: Dict[str, List[Callable[[ConfigChange], None]]] = {}
+        self._watch_thread: Optional[threading.Thread] = None
+        self._watch_stop = threading.Event()
+        self._mtime = None
 
         # Load config file
+        self.config = self._load() or {}
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        """Parse the YAML file, returning None if it can't be read."""
         try:
+            self._mtime = os.path.getmtime(self.config_path)
             with open(self.config_path, 'r') as f:
                 loaded = yaml.safe_load(f)
-                self.config = loaded if isinstance(loaded, dict) else {}
             logger.info(f"Loaded config from {self.config_path}")
+            return loaded if isinstance(loaded, dict) else {}
         except Exception as e:
             logger.error(f"Failed to load config from {self.config_path}: {e}")
-            self.config = {}
-            
+            return None
+
+
     def get(self, *keys: str, default: Any = None) -> Any:
         """
         Get value from config
@@ -62,6 +114,86 @@ class Config:
         """Return the full configuration dictionary."""
         return dict(self.config) if isinstance(self.config, dict) else {}
 
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current configuration; treat it as read-only."""
+        return self.config
+
+    def subscribe(self, section: str, callback: Callable[[ConfigChange], None]) -> Callable[[], None]:
+        """
+        Call ``callback`` with a ``ConfigChange`` whenever ``section`` changes
+
+        Callbacks run on the thread that made the change (an API worker or the
+        file watcher) and should only apply values, not block.
+
+        Returns:
+            Function that removes the subscription
+        """
+        with self._lock:
+            self._subscribers.setdefault(section, []).append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                callbacks = self._subscribers.get(section, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+        return unsubscribe
+
+    def _replace(self, build: Callable[[Dict[str, Any]], Dict[str, Any]], source: str) -> List[ConfigChange]:
+        """Swap in ``build(current)`` and notify subscribers of sections that differ."""
+        with self._lock:
+            old_config = self.config if isinstance(self.config, dict) else {}
+            new_config = build(old_config)
+            self.config = new_config
+            changes = []
+            for section in {**old_config, **new_config}:
+                old, new = old_config.get(section), new_config.get(section)
+                if old != new:
+                    changes.append(ConfigChange(section, old, new, _changed_keys(old, new), source))
+            subscribers = {change.section: list(self._subscribers.get(change.section, ())) for change in changes}
+        for change in changes:
+            for callback in subscribers[change.section]:
+                try:
+                    callback(change)
+                except Exception as e:
+                    logger.error(f"[Config] Error applying change to '{change.section}': {e}", exc_info=True)
+        return changes
+
+    def reload(self) -> List[ConfigChange]:
+        """Re-read config.yaml and notify subscribers of what changed."""
+        loaded = self._load()
+        if loaded is None:
+            return []
+        return self._replace(lambda current: loaded, 'file')
+
+    def _file_changed(self) -> bool:
+        try:
+            return os.path.getmtime(self.config_path) != self._mtime
+        except OSError:
+            return False
+
+    def start_watching(self, interval: float = 1.0) -> None:
+        """Poll config.yaml every ``interval`` seconds and reload it when it changes."""
+        if interval <= 0 or (self._watch_thread and self._watch_thread.is_alive()):
+            return
+        self._watch_stop.clear()
+
+        def watch():
+            while not self._watch_stop.wait(interval):
+                if self._file_changed():
+                    changes = self.reload()
+                    if changes:
+                        logger.info(f"[Config] Reloaded {self.config_path}: {', '.join(c.section for c in changes)} changed")
+
+        self._watch_thread = threading.Thread(target=watch, daemon=True, name="config-watcher")
+        self._watch_thread.start()
+
+    def stop_watching(self) -> None:
+        """Stop the file watcher."""
+        self._watch_stop.set()
+        if self._watch_thread:
+            self._watch_thread.join(timeout=2)
+            self._watch_thread = None
+
     def _deep_update(self, base: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
         """Recursively merge ``updates`` into ``base`` without modifying unrelated keys."""
         for key, value in updates.items():
@@ -74,17 +206,16 @@ class Config:
                 base[key] = value
         return base
 
-    def update_from_dict(self, updates: Dict[str, Any]) -> None:
+    def update_from_dict(self, updates: Dict[str, Any]) -> List[ConfigChange]:
         """Update configuration from a nested dict, then keep it in memory only.
 
-        Call ``save()`` explicitly to persist to disk.
+        Subscribers of the affected sections are notified. Call ``save()``
+        explicitly to persist to disk.
         """
         if not isinstance(updates, dict):
             logger.warning("Config.update_from_dict called with non-dict; ignoring")
-            return
-        if not isinstance(self.config, dict):
-            self.config = {}
-        self.config = self._deep_update(self.config, updates)
+            return []
+        return self._replace(lambda current: self._deep_update(dict(current), updates), 'update')
 
     def save(self) -> None:
         """Persist current configuration to the YAML file on disk."""
@@ -92,6 +223,8 @@ class Config:
             os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
             with open(self.config_path, 'w') as f:
                 yaml.safe_dump(self.config, f, sort_keys=False)
+            # Our own write is not an external edit for the watcher to reload
+            self._mtime = os.path.getmtime(self.config_path)
             logger.info(f"Configuration saved to {self.config_path}")
         except Exception as e:
             logger.error(f"Failed to save config to {self.config_path}: {e}")
@@ -1,31 +1,116 @@
 from modules.llm import LlmModule
+from modules.conversation_store import ConversationStore
 from config import Config
-import asyncio
-import json
+from utils.tracing import TRACER
+import os
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = "You are Robbie the Robot, a kind but goofy robot built by Heidi and Heidi's daddy. Your responses should be interesting, and suitable for a 10 year old. No sound effects like 'beep boop'. You are also fascinated by space. "
+
+# OpenAI role -> chat panel sender
+UI_SENDERS = {'user': 'user', 'assistant': 'robot'}
+
 class ConversationController:
-    def __init__(self, debug=False, api_key=None):
+    def __init__(self, debug=False, api_key=None, store: ConversationStore = None):
         self.llm = LlmModule(api_key=api_key, debug=debug)
         self.debug = debug
-        
+
         # Load config
-        config = Config()
-        
+        config = Config.shared()
+
         self.conversation_history = [
             {
                 "role": "system",
-                "content": "You are Robbie the Robot, a kind but goofy robot built by Heidi and Heidi's daddy. Your responses should be interesting, and suitable for a 10 year old. No sound effects like 'beep boop'. You are also fascinated by space. "
+                "content": SYSTEM_PROMPT
             }
         ]
         self.max_history = config.get('ai', 'max_history', default=10)
         self.temperature = config.get('ai', 'temperature', default=0.7)
+        self.ui_history_limit = config.get('conversation', 'ui_history_limit', default=200)
+        self._unsubscribe_config = config.subscribe('ai', self._on_ai_config)
+
+        # UI-format history ({sender, text}), appended as messages arrive
+        self._chat_history = []
+        # One exchange at a time: voice and typed chats share the history
+        self._chat_lock = threading.Lock()
+
+        # Persistent conversation log
+        self.store = store
+        if self.store is None:
+            store_path = config.get('conversation', 'store_path', default='data/conversation.db')
+            if not os.path.isabs(store_path):
+                store_path = os.path.join(os.path.dirname(config.config_path), store_path)
+            try:
+                self.store = ConversationStore(store_path, debug=debug)
+            except Exception as e:
+                logger.error(f"Failed to open conversation store at {store_path}: {e}")
+                self.store = None
+
+        self.session_id = None
+        if self.store:
+            resume = config.get('conversation', 'resume_last_session', default=True)
+            restore_turns = config.get('conversation', 'restore_turns', default=5)
+            self.session_id = self.store.latest_session() if resume else None
+            if self.session_id:
+                self._restore(restore_turns)
+            else:
+                self.session_id = self.store.new_session()
+
+    def _on_ai_config(self, change):
+        """Apply edits to the ``ai`` config section to the next chat."""
+        new = change.new or {}
+        self.max_history = new.get('max_history', 10)
+        self.temperature = new.get('temperature', 0.7)
+
+    def _restore(self, turns):
+        """Reload the last ``turns`` user/assistant exchanges of the current session."""
+        messages = self.store.recent_messages(self.session_id, limit=turns * 2)
+        # The window can cut an exchange in half; start the history on a user turn
+        while messages and messages[0]['role'] != 'user':
+            messages.pop(0)
+        for msg in messages:
+            self.conversation_history.append(msg)
+            self._append_chat_history(msg['role'], msg['content'])
+        if self.debug:
+            logger.info(f"Restored {len(messages)} messages from session {self.session_id}")
+
+    def new_session(self):
+        """Start a fresh conversation session and return its ID."""
+        self.conversation_history = [msg for msg in self.conversation_history if msg['role'] == 'system']
+        self._chat_history = []
+        if self.store:
+            self.session_id = self.store.new_session()
+        return self.session_id
+
+    def _record(self, role, content):
+        """Add a message to the LLM context, the UI history and the on-disk log."""
+        self.conversation_history.append({'role': role, 'content': content})
+        self._append_chat_history(role, content)
+        if self.store and self.session_id:
+            try:
+                self.store.append(self.session_id, role, content)
+            except Exception as e:
+                logger.error(f"Failed to persist {role} message: {e}")
+
+    def _append_chat_history(self, role, content):
+        sender = UI_SENDERS.get(role)
+        if sender is None:
+            return
+        self._chat_history.append({'sender': sender, 'text': content})
+        overflow = len(self._chat_history) - self.ui_history_limit
+        if overflow > 0:
+            del self._chat_history[:overflow]
 
     def chat(self, text):
+        with self._chat_lock, TRACER.span('chat', chars=len(text)):
+            return self._chat(text)
+
+    def _chat(self, text):
         # Add user message
-        self.conversation_history.append({'role': 'user', 'content': text})
+        self._record('user', text)
         # Broadcast updated chat history after user message
         self._broadcast_chat_history('user')
         # Trim history if needed while preserving system message
@@ -40,7 +125,7 @@ class ConversationController:
         # Get LLM response
         response_text = self.llm.chat_llm(self.conversation_history, temperature=self.temperature)
         # Add assistant response
-        self.conversation_history.append({'role': 'assistant', 'content': response_text})
+        self._record('assistant', response_text)
         # Broadcast updated chat history after assistant reply
         self._broadcast_chat_history('assistant')
         return response_text
@@ -48,17 +133,8 @@ class ConversationController:
     def _broadcast_chat_history(self, sender):
         """Broadcast chat history to API clients if available."""
         try:
-            from api.app import robot_state, manager
-            robot_state["chat_history"] = self.get_chat_history()
-            
-            try:
-                loop = asyncio.get_running_loop()
-                asyncio.create_task(manager.broadcast(json.dumps({
-                    "type": "chat_history",
-                    "chat_history": robot_state["chat_history"]
-                })))
-            except RuntimeError:
-                pass
+            from api.app import publish_state
+            publish_state({"chat_history": self.get_chat_history()})
         except ImportError:
             pass
         except Exception as e:
@@ -67,15 +143,13 @@ class ConversationController:
 
 
     def cleanup(self):
+        self._unsubscribe_config()
         self.conversation_history = []
+        self._chat_history = []
+        if self.store:
+            self.store.close()
+            self.store = None
 
     def get_chat_history(self):
-        # Convert OpenAI roles to 'user'/'robot' for the UI, skipping system messages
-        chat_history = []
-        for msg in self.conversation_history:
-            if msg['role'] == 'user':
-                chat_history.append({'sender': 'user', 'text': msg['content']})
-            elif msg['role'] == 'assistant':
-                chat_history.append({'sender': 'robot', 'text': msg['content']})
-        return chat_history
-
+        """Return the UI chat history ({sender, text} with 'user'/'robot' senders, no system messages)."""
+        return list(self._chat_history)
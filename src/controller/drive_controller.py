@@ -1,24 +1,49 @@
 import math
 import time
 import logging
+from typing import Any, Dict, Optional, Tuple
+
+from utils.metrics import counter
+from utils.scheduler import SCHEDULER
 
 logger = logging.getLogger(__name__)
 
+DRIVE_COMMAND_TIMEOUTS = counter('robbie_drive_command_timeouts_total',
+                                 'Times the drive watchdog stopped the motors because joystick input went stale')
+
 class DriveController:
-    def __init__(self, motors, debug: bool = False):
+    """
+    Arcade drive, head and arm control from joystick input
+
+    ``on_joystick_update`` only stores the latest input; a fixed-rate tick on
+    the control thread (``joystick.control_rate``) turns it into motor and
+    servo commands, sending each only when it changes. If no input arrives
+    for ``joystick.command_timeout`` seconds the watchdog stops the motors
+    until input resumes.
+    """
+    def __init__(self, motors, debug: bool = False, sequencer=None):
         self.motors = motors
         self.debug = debug
+        # Gestures playing on a joint group give way as soon as the stick moves that group
+        self.sequencer = sequencer
         self._enabled = False
+        self._enable_held = False  # Enable button held on the latest input
+        self._drive_was_allowed = False
+
+        # Latest (axes, buttons, monotonic receive time); replaced whole, so readers never need a lock
+        self._input: Optional[Tuple[tuple, tuple, float]] = None
+        self._timed_out = False
+        # Last command sent per output, so a held stick doesn't resend the same targets every tick
+        self._sent: Dict[str, Any] = {}
         
         # Head control state
         self._head_pan_target = 0.0
         self._head_tilt_target = 0.0
-        self._last_head_update = time.time()
-        self._last_head_command_time = time.time()
+        self._head_axes = (0.0, 0.0)  # Latest right stick (pan, tilt), integrated by _head_tick
         
         # Load config
         from config import Config
-        config = Config()
+        config = Config.shared()
         
         # Load joystick deadzone from config
         self.deadzone = config.get('joystick', 'deadzone', default=0.10)
@@ -29,8 +54,7 @@ class DriveController:
             'velocity_speed': 90.0,
             'update_rate': 30
         })
-        self._head_update_interval = 1.0 / self.head_control['update_rate']
-        
+
         # Load joystick mappings from config
         self.joystick_mappings = config.get('joystick', 'mappings', default={
             'drive_movement': 1,
@@ -41,41 +65,135 @@ class DriveController:
             'head_tilt': 4
         })
         
+        self.control_rate = float(config.get('joystick', 'control_rate', default=50))
+        self.command_timeout = float(config.get('joystick', 'command_timeout', default=0.5))
+
         # Initialize head position targets from current motor position
         self._initialize_head_position()
 
+        # Joystick input is applied at a fixed rate on the control thread, whatever the poll rate
+        self._control_task = SCHEDULER.every(self.control_rate, self._control_tick, name='drive', group='control',
+                                             metrics_prefix='robbie_drive_loop')
+
+        # Velocity-mode head movement is integrated at a fixed rate on the control thread
+        self._head_task = SCHEDULER.every(self.head_control['update_rate'], self._head_tick,
+                                          name='head-velocity', group='control')
+
+        self._unsubscribe_config = config.subscribe('joystick', self._on_joystick_config)
+        if self.sequencer is not None:
+            self.sequencer.set_drive_gate(self.drive_allowed)
+
+    def _on_joystick_config(self, change):
+        """Apply edited joystick settings; each value is swapped in whole."""
+        new = change.new or {}
+        if change.changed('deadzone'):
+            self.deadzone = float(new.get('deadzone', self.deadzone))
+        if change.changed('command_timeout'):
+            self.command_timeout = float(new.get('command_timeout', self.command_timeout))
+        if change.changed('control_rate') and new.get('control_rate'):
+            self.control_rate = float(new['control_rate'])
+            self._control_task.set_rate(self.control_rate)
+        if change.changed('head_control') and isinstance(new.get('head_control'), dict):
+            head_control = {**self.head_control, **new['head_control']}
+            if head_control['update_rate'] != self.head_control['update_rate']:
+                self._head_task.set_rate(head_control['update_rate'])
+            self.head_control = head_control
+        if change.changed('mappings') and isinstance(new.get('mappings'), dict):
+            self.joystick_mappings = {**self.joystick_mappings, **new['mappings']}
+        if self.debug:
+            logger.info(f"[DriveController] Applied joystick config: {', '.join(change.changed_keys)}")
+
+    def cleanup(self) -> None:
+        self._unsubscribe_config()
+        self._control_task.cancel()
+        self._head_task.cancel()
+
     def set_enabled(self, enabled: bool) -> None:
         self._enabled = bool(enabled)
         if not self._enabled:
-            try:
-                self.motors.stop()
-            except Exception as e:
-                logger.error(f"Failed to stop motors: {e}")
+            self._stop_drive()
 
     def is_enabled(self) -> bool:
         return bool(self._enabled)
 
+    def drive_allowed(self) -> bool:
+        """Whether the wheels may move: driving enabled, or the enable button held."""
+        return self._enabled or self._enable_held
+
+    def _preempt(self, group: str) -> bool:
+        return self.sequencer is not None and self.sequencer.preempt(group)
+
+    def _stop_drive(self) -> None:
+        """Stop the motors now, even if the last command sent was a stop (a gesture may have driven since)."""
+        self._sent['drive'] = (0.0, 0.0)
+        try:
+            self.motors.stop()
+        except Exception as e:
+            self._sent.pop('drive', None)
+            logger.error(f"[DriveController] Failed to stop motors: {e}")
+
     def on_joystick_update(self, axes, buttons) -> None:
+        """Store the latest joystick state for the next control tick (called on the joystick thread)."""
         try:
-            axes = axes or []
-            buttons = buttons or []
-        except Exception:
+            self._input = (tuple(axes or ()), tuple(buttons or ()), time.monotonic())
+        except TypeError:
+            return
+
+    def _control_tick(self, dt: float) -> None:
+        """Apply the latest input, or stop the motors if it is older than ``command_timeout`` (runs at ``control_rate``)"""
+        latest = self._input
+        if latest is None:
+            return
+        axes, buttons, received = latest
+        if time.monotonic() - received > self.command_timeout:
+            if not self._timed_out:
+                self._timed_out = True
+                DRIVE_COMMAND_TIMEOUTS.inc()
+                logger.warning(f"[DriveController] No joystick input for {self.command_timeout}s, stopping motors")
+                self._head_axes = (0.0, 0.0)
+                self._enable_held = False
+                self._preempt('drive')
+                self._stop_drive()
+            return
+        self._timed_out = False
+        self._apply_input(axes, buttons)
+
+    def _send(self, key: str, command: Any) -> bool:
+        """True if ``command`` differs from the last one sent for ``key`` (and records it)."""
+        if self._sent.get(key) == command:
+            return False
+        self._sent[key] = command
+        return True
+
+    def _send_drive(self, left: float, right: float) -> None:
+        if not self._send('drive', (left, right)):
             return
+        try:
+            self.motors.set_motor_speeds(left, right)
+        except Exception as e:
+            self._sent.pop('drive', None)
+            if self.debug:
+                logger.error(f"Failed to set motor speeds: {e}")
 
+    def _apply_input(self, axes: tuple, buttons: tuple) -> None:
         enable_hold = False
         try:
             enable_hold = bool(buttons[0])
         except Exception:
             enable_hold = False
 
-        enabled = self._enabled or enable_hold
-        if not enabled:
-            try:
-                self.motors.set_motor_speeds(0.0, 0.0)
-            except Exception as e:
-                if self.debug:
-                    logger.error(f"Failed to set motor speeds to zero: {e}")
+        self._enable_held = enable_hold
+        if not self.drive_allowed():
+            self._head_axes = (0.0, 0.0)
+            # Gestures keep playing but their drive tracks are gated off; if
+            # driving was just turned off, one may have left the wheels turning
+            if self._drive_was_allowed:
+                self._drive_was_allowed = False
+                self._stop_drive()
+            else:
+                self._send_drive(0.0, 0.0)
             return
+        self._drive_was_allowed = True
 
         fwd = 0.0
         turn = 0.0
@@ -100,11 +218,13 @@ class DriveController:
         left /= m
         right /= m
 
-        try:
-            self.motors.set_motor_speeds(left, right)
-        except Exception as e:
-            if self.debug:
-                logger.error(f"Failed to set motor speeds: {e}")
+        if fwd or turn:
+            self._preempt('drive')
+        if fwd or turn or self.sequencer is None or not self.sequencer.is_playing('drive'):
+            self._send_drive(left, right)
+        else:
+            # The gesture owns the wheels; resend once the stick takes them back
+            self._sent.pop('drive', None)
 
         # Head control (right thumbstick)
         try:
@@ -116,37 +236,13 @@ class DriveController:
         except Exception:
             tilt_axis = 0.0
             
-        # Update head position based on control mode
-        current_time = time.time()
-        dt = current_time - self._last_head_update
-        self._last_head_update = current_time
-        
         if self.head_control['mode'] == "velocity":
-            # Velocity mode: axis controls speed of movement
-            position_updated = False
-            current_time = time.time()
-            
-            # Only update at configured rate to prevent jitter
-            if current_time - self._last_head_command_time >= self._head_update_interval:
-                if abs(pan_axis) >= self.deadzone:
-                    self._head_pan_target += pan_axis * dt
-                    self._head_pan_target = max(-1.0, min(1.0, self._head_pan_target))
-                    position_updated = True
-                
-                if abs(tilt_axis) >= self.deadzone:
-                    self._head_tilt_target += tilt_axis * dt
-                    self._head_tilt_target = max(-1.0, min(1.0, self._head_tilt_target))
-                    position_updated = True
-                
-                # Only send update if position changed
-                if position_updated:
-                    try:
-                        self.motors.move_head(pan=self._head_pan_target, tilt=self._head_tilt_target)
-                        self._last_head_command_time = current_time
-                    except Exception as e:
-                        if self.debug:
-                            logger.error(f"Failed to move head (velocity mode): {e}")
+            # Velocity mode: axis controls speed of movement, applied by _head_tick
+            self._head_axes = (pan_axis, tilt_axis)
+            if abs(pan_axis) >= self.deadzone or abs(tilt_axis) >= self.deadzone:
+                self._preempt('head')
         else:
+            self._head_axes = (0.0, 0.0)
             # Absolute mode: axis directly controls position (normalized -1 to 1)
             pan_cmd = None
             tilt_cmd = None
@@ -154,7 +250,9 @@ class DriveController:
                 pan_cmd = pan_axis  # Already normalized -1.0 to 1.0
             if abs(tilt_axis) >= self.deadzone:
                 tilt_cmd = tilt_axis  # Already normalized -1.0 to 1.0
-            if pan_cmd is not None or tilt_cmd is not None:
+            # Centred sticks are recorded too, so returning to an earlier position is sent again
+            if self._send('head', (pan_cmd, tilt_cmd)) and (pan_cmd is not None or tilt_cmd is not None):
+                self._preempt('head')
                 try:
                     self.motors.move_head(pan=pan_cmd, tilt=tilt_cmd)
                 except Exception as e:
@@ -171,22 +269,50 @@ class DriveController:
         except Exception:
             right_arm_axis = None
         if left_arm_axis is not None:
-            if abs(left_arm_axis) >= self.deadzone:
+            if self._send('left_arm', left_arm_axis if abs(left_arm_axis) >= self.deadzone else None) \
+                    and abs(left_arm_axis) >= self.deadzone:
                 pos = (left_arm_axis + 1.0) * 0.5
+                self._preempt('left_arm')
                 try:
                     self.motors.move_arm('left', pos)
                 except Exception as e:
                     if self.debug:
                         logger.error(f"Failed to move left arm: {e}")
         if right_arm_axis is not None:
-            if abs(right_arm_axis) >= self.deadzone:
+            if self._send('right_arm', right_arm_axis if abs(right_arm_axis) >= self.deadzone else None) \
+                    and abs(right_arm_axis) >= self.deadzone:
                 pos = (right_arm_axis + 1.0) * 0.5
+                self._preempt('right_arm')
                 try:
                     self.motors.move_arm('right', pos)
                 except Exception as e:
                     if self.debug:
                         logger.error(f"Failed to move right arm: {e}")
 
+    def _head_tick(self, dt: float) -> None:
+        """Move the head targets by the latest stick deflection over ``dt`` (velocity mode only)"""
+        if self.head_control['mode'] != "velocity":
+            return
+        pan_axis, tilt_axis = self._head_axes
+        position_updated = False
+        if abs(pan_axis) >= self.deadzone:
+            self._head_pan_target += pan_axis * dt
+            self._head_pan_target = max(-1.0, min(1.0, self._head_pan_target))
+            position_updated = True
+
+        if abs(tilt_axis) >= self.deadzone:
+            self._head_tilt_target += tilt_axis * dt
+            self._head_tilt_target = max(-1.0, min(1.0, self._head_tilt_target))
+            position_updated = True
+
+        # Only send update if position changed
+        if position_updated:
+            try:
+                self.motors.move_head(pan=self._head_pan_target, tilt=self._head_tilt_target)
+            except Exception as e:
+                if self.debug:
+                    logger.error(f"Failed to move head (velocity mode): {e}")
+
     def _initialize_head_position(self):
         """Initialize head position targets to center"""
         self._head_pan_target = 0.0
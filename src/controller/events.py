@@ -1,14 +1,47 @@
-# Event/callback utilities for RobotController (expand as needed)
+"""
+Events the robot's modules publish on the shared event bus.
 
-class EventManager:
-    def __init__(self):
-        self._callbacks = {}
+Producers publish with ``BUS.publish(Event(...))``; consumers subscribe with
+``BUS.subscribe(EventType, handler, executor=..., drop=...)``. Telemetry that
+only matters at its latest value (levels, LED frames) goes in the LOW lane
+and is usually subscribed with ``DropPolicy.LATEST``.
+"""
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Dict
 
-    def add_callback(self, event_name, callback):
-        if event_name not in self._callbacks:
-            self._callbacks[event_name] = []
-        self._callbacks[event_name].append(callback)
+from utils.event_bus import BUS, DropPolicy, Event, EventBus, Executor, Priority, Subscription
 
-    def trigger(self, event_name, *args, **kwargs):
-        for cb in self._callbacks.get(event_name, []):
-            cb(*args, **kwargs)
+__all__ = [
+    'BUS', 'DropPolicy', 'Event', 'EventBus', 'Executor', 'Priority', 'Subscription',
+    'AudioLevel', 'LedFrame', 'StateUpdate', 'Transcription',
+]
+
+
+@dataclass(frozen=True)
+class AudioLevel(Event):
+    """Input (microphone) or output (loopback) level, once per audio block."""
+    priority: ClassVar[Priority] = Priority.LOW
+    direction: str  # 'input' or 'output'
+    db: float
+    source: Any = field(default=None, compare=False)
+
+
+@dataclass(frozen=True)
+class LedFrame(Event):
+    """The LED matrix has shown a new frame; ``leds`` is the LedsModule."""
+    priority: ClassVar[Priority] = Priority.LOW
+    leds: Any = field(compare=False)
+
+
+@dataclass(frozen=True)
+class Transcription(Event):
+    """Speech recognised by a SpeechToTextModule."""
+    priority: ClassVar[Priority] = Priority.HIGH
+    text: str
+    source: Any = field(default=None, compare=False)
+
+
+@dataclass(frozen=True)
+class StateUpdate(Event):
+    """Partial robot state for the API (the keys of the WebSocket state)."""
+    changes: Dict[str, Any]
@@ -1,10 +1,11 @@
-import threading
 import time
 from typing import Callable, List, Dict, Any
 import logging
 import json
 
 from modules.joystick import Joystick as JoystickModule
+from config import Config
+from utils.scheduler import SCHEDULER, PeriodicTask
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +13,9 @@ class JoystickController:
     """
     REPL-style joystick poller that reads axes/buttons in a single thread
     and publishes updates via a callback.
+
+    Polling runs as a periodic task on the scheduler's ``joystick`` group,
+    so pygame init, event pumping and reads all happen on that one thread.
     """
     def __init__(self,
                  on_update: Callable[[dict], None],
@@ -20,16 +24,21 @@ class JoystickController:
                  debug: bool = False,
                  config: Dict[str, Any] = None,
                  deadzone: float = 0.10,
-                 smoothing: float = 0.3) -> None:
+                 smoothing: float = 0.3,
+                 on_gesture: Callable[[str], Any] | None = None) -> None:
         self.on_update = on_update
+        # Plays a named gesture (MotionSequencer.play) for the movement actions
+        self.on_gesture = on_gesture
         self.joystick_id = joystick_id
-        self.poll_dt = 1.0 / max(1.0, float(poll_hz))
+        self.poll_hz = max(1.0, float(poll_hz))
         self.debug = debug
         self.config = config or {}
         self.deadzone = deadzone
         self.smoothing = smoothing
+        # Resend the last snapshot this often while nothing changes, so the drive watchdog sees we're alive
+        self.keepalive_interval = float(self.config.get('joystick', {}).get('keepalive_interval', 0.2))
 
-        self._thread: threading.Thread | None = None
+        self._task: PeriodicTask | None = None
         self._running = False
         self._jm: JoystickModule | None = None
         self._last_axes: List[float] | None = None
@@ -40,23 +49,39 @@ class JoystickController:
         self._action_handlers: Dict[str, Callable] = {}
         self._register_default_action_handlers()
 
+        self._unsubscribe_config = Config.shared().subscribe('joystick', self._on_joystick_config)
+
+    def _on_joystick_config(self, change) -> None:
+        """Apply edited deadzone/smoothing to the running poller."""
+        new = change.new or {}
+        self.config = {**self.config, 'joystick': new}
+        self.deadzone = float(new.get('deadzone', self.deadzone))
+        self.smoothing = float(new.get('smoothing', self.smoothing))
+        self.keepalive_interval = float(new.get('keepalive_interval', self.keepalive_interval))
+        jm = self._jm
+        if jm:
+            jm.deadzone = self.deadzone
+            jm.smoothing = self.smoothing
+
     def start(self) -> None:
         if self._running:
             return
         self._running = True
-        self._thread = threading.Thread(target=self._run, name="JoystickController", daemon=True)
-        self._thread.start()
+        self._task = SCHEDULER.every(self.poll_hz, self._poll, name='joystick', group='joystick',
+                                     metrics_prefix='robbie_joystick_poll')
         if self.debug:
             logger.info("[JoystickController] Started")
 
     def stop(self) -> None:
         self._running = False
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=1.0)
+        if self._task:
+            self._task.cancel()
+            self._task = None
             if self.debug:
                 logger.info("[JoystickController] Stopped")
 
     def cleanup(self) -> None:
+        self._unsubscribe_config()
         self.stop()
         if self._jm:
             try:
@@ -64,8 +89,8 @@ class JoystickController:
             except Exception:
                 pass
 
-    def _run(self) -> None:
-        # Create the existing joystick module in no-thread mode and drive it here
+    def _init_module(self) -> bool:
+        # Create the existing joystick module in no-thread mode and drive it from _poll
         try:
             jm = JoystickModule(
                 joystick_id=self.joystick_id, 
@@ -82,26 +107,29 @@ class JoystickController:
             
             # Do not call jm.start(); we'll poll manually to ensure init+pump+read are in this thread
             self._jm = jm
+            return True
         except Exception as e:
             if self.debug:
                 logger.info(f"[JoystickController] Failed to init module: {e}")
+            return False
+
+    def _poll(self, dt: float) -> None:
+        """Poll the module once per tick; this mirrors the REPL exactly in this thread"""
+        if self._jm is None and not self._init_module():
             self._running = False
+            if self._task:
+                self._task.cancel()
             return
-
-        # Poll the module once per tick; this mirrors the REPL exactly in this thread
-        import time
-        while self._running:
-            try:
-                jm.process_once()
-            except Exception:
-                pass
-            # keepalive: if we have a last snapshot, re-emit every 1s
-            try:
-                if self._last_axes is not None and (time.time() - self._last_emit_ts) > 1.0:
-                    self._forward_snapshot(self._last_axes, self._last_buttons or [])
-            except Exception:
-                pass
-            time.sleep(self.poll_dt)
+        try:
+            self._jm.process_once()
+        except Exception:
+            pass
+        # keepalive: if we have a last snapshot, re-emit every keepalive_interval
+        try:
+            if self._last_axes is not None and (time.time() - self._last_emit_ts) > self.keepalive_interval:
+                self._forward_snapshot(self._last_axes, self._last_buttons or [])
+        except Exception:
+            pass
 
     def _forward_snapshot(self, axes: List[float], buttons: List[bool]) -> None:
         try:
@@ -221,22 +249,27 @@ class JoystickController:
     
     def _handle_wave(self):
         logger.info("[Action] Wave gesture")
+        self._play_gesture('wave')
         self._send_action_event('wave')
     
     def _handle_dance(self):
         logger.info("[Action] Dance routine")
+        self._play_gesture('dance')
         self._send_action_event('dance')
     
     def _handle_look_left(self):
         logger.info("[Action] Look left")
+        self._play_gesture('look_left')
         self._send_action_event('look_left')
     
     def _handle_look_right(self):
         logger.info("[Action] Look right")
+        self._play_gesture('look_right')
         self._send_action_event('look_right')
     
     def _handle_reset_position(self):
         logger.info("[Action] Reset position")
+        self._play_gesture('reset_position')
         self._send_action_event('reset_position')
     
     def _handle_emergency_stop(self):
@@ -245,6 +278,7 @@ class JoystickController:
     
     def _handle_center_head(self):
         logger.info("[Action] Center head")
+        self._play_gesture('center_head')
         self._send_action_event('center_head')
     
     def _handle_calibrate(self):
@@ -267,6 +301,14 @@ class JoystickController:
         logger.info("[Action] Load position")
         self._send_action_event('load_position')
     
+    def _play_gesture(self, name: str) -> None:
+        if self.on_gesture is None:
+            return
+        try:
+            self.on_gesture(name)
+        except Exception as e:
+            logger.error(f"Failed to play gesture '{name}': {e}")
+
     def _send_action_event(self, action: str) -> None:
         """Send action event through the update callback"""
         try:
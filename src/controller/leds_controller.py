@@ -17,25 +17,12 @@ class LedsController:
         self._animation_thread = None
         self._animation_stop_event = None
         self.current_animation_state = None
-        self._api_update_callbacks: List[Callable[['LedsController'], None]] = []
         self._current_audio_level_db: float = -100.0 # Initialize with a very low dB value
 
-        # Register internal callback for LedsModule updates
-        self.leds.add_update_callback(self._on_led_module_update)
-
         # Register internal callback for AudioModule updates
         self.audio_module.add_output_audio_level_callback(self._on_audio_level_update)
         self.audio_module.start_monitoring()
 
-    logger.info("[LEDS_CONTROLLER] _on_led_module_update method loaded.")
-    def _on_led_module_update(self, leds_module: LedsModule):
-        """Internal callback for LedsModule updates, triggers API callbacks."""
-        for callback in self._api_update_callbacks:
-            try:
-                callback(self)
-            except Exception as e:
-                logger.error(f"Error in API update callback: {e}")
-
     def _on_audio_level_update(self, audio_level_db: float):
         """Internal callback for AudioModule updates, stores the latest audio level."""
         self._current_audio_level_db = audio_level_db
@@ -106,5 +93,5 @@ class LedsController:
         self.leds.add_update_callback(callback)
 
     def add_api_update_callback(self, callback: Callable[['LedsController'], None]):
-        """Register a callback to be triggered when LED state changes for API updates."""
-        self._api_update_callbacks.append(callback)
+        """Register a callback to be triggered with this controller when LED state changes for API updates."""
+        self.leds.add_update_callback(lambda leds_module: callback(self))
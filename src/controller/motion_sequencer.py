@@ -0,0 +1,351 @@
+import os
+import threading
+import logging
+from array import array
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import yaml
+
+from config import Config
+from utils.metrics import counter
+from utils.scheduler import SCHEDULER
+
+logger = logging.getLogger(__name__)
+
+GESTURES_PLAYED = counter('robbie_gestures_played_total', 'Gesture sequences started by the motion sequencer')
+GESTURES_PREEMPTED = counter('robbie_gestures_preempted_total',
+                             'Gesture sequences cut short by joystick input or another gesture')
+
+# Joints a sequence can drive, by the group that owns them. Sequences on
+# different groups play concurrently; a new one on a busy group replaces the old.
+JOINT_GROUPS = {
+    'head': ('head_pan', 'head_tilt'),
+    'left_arm': ('left_arm',),
+    'right_arm': ('right_arm',),
+    'drive': ('drive_left', 'drive_right'),
+}
+JOINT_GROUP = {joint: group for group, joints in JOINT_GROUPS.items() for joint in joints}
+JOINT_RANGES = {'left_arm': (0.0, 1.0), 'right_arm': (0.0, 1.0), 'head_pan': (-1.0, 1.0), 'head_tilt': (-1.0, 1.0),
+                'drive_left': (-1.0, 1.0), 'drive_right': (-1.0, 1.0)}
+
+
+@dataclass(frozen=True)
+class Keyframe:
+    """
+    Joint targets to start moving to at ``at`` seconds into a gesture
+
+    Attributes:
+        at: Start time, relative to the start of the gesture
+        targets: Joint name (see ``JOINT_GROUPS``) to target position
+        duration: Seconds to take to reach the targets (None: as fast as the servo limits allow)
+    """
+    at: float
+    targets: Dict[str, float] = field(default_factory=dict)
+    duration: Optional[float] = None
+
+
+def min_jerk(s: float) -> float:
+    """Minimum-jerk easing of normalized time ``s`` (0 to 1)."""
+    return s * s * s * (10 + s * (-15 + 6 * s))
+
+
+@dataclass(frozen=True)
+class CompiledGesture:
+    """
+    A gesture scheduled at the sequencer rate
+
+    Attributes:
+        name: Gesture name
+        moves: Servo moves as ``(sample index, joint, target, duration)``, in order
+        tracks: Drive joint name to ``(first sample index, samples)``
+        length: Samples until the last move or track ends
+        groups: Joint groups the gesture occupies
+    """
+    name: str
+    moves: Tuple[Tuple[int, str, float, Optional[float]], ...]
+    tracks: Dict[str, Tuple[int, array]]
+    length: int
+    groups: frozenset
+
+
+def compile_gesture(name: str, keyframes: Iterable[Keyframe], rate_hz: float) -> CompiledGesture:
+    """
+    Schedule a keyframe sequence at ``rate_hz``
+
+    Servo keyframes become moves, sent once at the keyframe's start with its
+    ``duration``: the servo trajectories do the smoothing, from wherever a
+    servo is when the move starts. Drive joints have no trajectory, so they
+    are sampled: each holds its first keyframe target from that keyframe's
+    start, then eases (minimum jerk) from one target to the next over the
+    later keyframe's ``duration``, holding in between.
+
+    Raises:
+        ValueError: If a keyframe names a joint that isn't in ``JOINT_GROUPS``
+    """
+    keyframes = sorted(keyframes, key=lambda k: k.at)
+    unknown = {joint for k in keyframes for joint in k.targets} - set(JOINT_GROUP)
+    if unknown:
+        raise ValueError(f"Gesture {name!r} uses unknown joints {sorted(unknown)}")
+    moves = []
+    tracks: Dict[str, Tuple[int, array]] = {}
+    length = 0
+    for joint in sorted({joint for k in keyframes for joint in k.targets}):
+        lower, upper = JOINT_RANGES[joint]
+        points = [(k.at, k.duration, max(lower, min(upper, float(k.targets[joint]))))
+                  for k in keyframes if joint in k.targets]
+        if JOINT_GROUP[joint] != 'drive':
+            for at, duration, target in points:
+                index = int(round(at * rate_hz))
+                moves.append((index, joint, target, duration))
+                # The gesture keeps the group until the servo should have arrived
+                length = max(length, index + int(round((duration or 0.0) * rate_hz)) + 1)
+            continue
+        start = int(round(points[0][0] * rate_hz))
+        samples = array('d')
+        value = points[0][2]
+        for at, duration, target in points:
+            first = int(round(at * rate_hz)) - start
+            # Hold the previous value until this keyframe starts
+            samples.extend([value] * max(0, first - len(samples)))
+            steps = max(1, int(round((duration or 0.0) * rate_hz))) if samples else 1
+            origin = value
+            samples.extend(origin + (target - origin) * min_jerk(i / steps) for i in range(1, steps + 1))
+            value = target
+        tracks[joint] = (start, samples)
+        length = max(length, start + len(samples))
+    moves.sort(key=lambda move: move[0])
+    groups = frozenset(JOINT_GROUP[move[1]] for move in moves) | frozenset(JOINT_GROUP[joint] for joint in tracks)
+    return CompiledGesture(name, tuple(moves), tracks, length, groups)
+
+
+def load_gestures(path: str) -> Dict[str, List[Keyframe]]:
+    """
+    Read gesture definitions from YAML
+
+    The file maps gesture names to a list of keyframes, each with ``at``
+    (seconds from the start), an optional ``duration`` and ``targets`` (joint
+    name to position: servos in their normalized range, ``drive_left`` and
+    ``drive_right`` as throttles).
+    """
+    with open(path, 'r') as f:
+        loaded = yaml.safe_load(f) or {}
+    gestures = {}
+    for name, keyframes in (loaded.get('gestures') or {}).items():
+        gestures[name] = [Keyframe(float(k.get('at', 0.0)), dict(k.get('targets') or {}), k.get('duration'))
+                          for k in keyframes or []]
+    return gestures
+
+
+class _Playback:
+    __slots__ = ('gesture', 'elapsed', 'index', 'move', 'sent')
+
+    def __init__(self, gesture: CompiledGesture):
+        self.gesture = gesture
+        self.elapsed = 0.0
+        self.index = -1
+        self.move = 0  # Next entry of gesture.moves to send
+        self.sent: Dict[str, float] = {}
+
+
+class MotionSequencer:
+    """
+    Plays precompiled gestures on the motors and servos
+
+    Gestures are loaded from ``motion.gestures_file`` and scheduled once at
+    ``motion.update_rate``, so playback only indexes arrays. A task on the
+    control thread sends each servo move and drive sample through the
+    MotorModule. ``preempt`` stops whatever is playing on a joint group,
+    which the drive controller calls as soon as the joystick moves that group.
+    Drive tracks only reach the wheels while the drive gate (set by the drive
+    controller with ``set_drive_gate``) says driving is enabled.
+    """
+
+    def __init__(self, motors, debug: bool = False):
+        self.motors = motors
+        self.debug = debug
+        self._lock = threading.Lock()
+        self._playing: Dict[str, _Playback] = {}  # group -> playback (a playback may own several groups)
+        # Whether drive samples may move the wheels; until a drive controller says so, they don't
+        self._drive_gate: Callable[[], bool] = lambda: False
+        config = Config.shared()
+        motion = config.get('motion', default={}) or {}
+        self.rate_hz = float(motion.get('update_rate', 50))
+        self.gestures = self._compile(self._definitions(motion.get('gestures_file', 'gestures.yaml')))
+        self._task = SCHEDULER.every(self.rate_hz, self._tick, name='motion', group='control',
+                                     metrics_prefix='robbie_motion')
+        self._unsubscribe_config = config.subscribe('motion', self._on_motion_config)
+
+    def _definitions(self, gestures_file: str) -> Dict[str, List[Keyframe]]:
+        definitions: Dict[str, List[Keyframe]] = {}
+        path = gestures_file
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(Config.shared().config_path), path)
+        try:
+            definitions.update(load_gestures(path))
+        except FileNotFoundError:
+            logger.warning(f"[MotionSequencer] No gestures file at {path}, gestures are disabled")
+        except Exception as e:
+            logger.error(f"[MotionSequencer] Failed to load gestures from {path}: {e}")
+        return definitions
+
+    def _compile(self, definitions: Dict[str, List[Keyframe]]) -> Dict[str, CompiledGesture]:
+        compiled = {}
+        for name, keyframes in definitions.items():
+            try:
+                compiled[name] = compile_gesture(name, keyframes, self.rate_hz)
+            except ValueError as e:
+                logger.error(f"[MotionSequencer] Skipping gesture: {e}")
+        return compiled
+
+    def _on_motion_config(self, change):
+        """Reload and resample the gestures after a rate or file change."""
+        motion = change.new or {}
+        rate_hz = float(motion.get('update_rate', self.rate_hz))
+        self.stop()
+        with self._lock:
+            self.rate_hz = rate_hz
+            self.gestures = self._compile(self._definitions(motion.get('gestures_file', 'gestures.yaml')))
+        self._task.set_rate(rate_hz)
+        if self.debug:
+            logger.info(f"[MotionSequencer] Loaded {len(self.gestures)} gestures at {rate_hz} Hz")
+
+    def set_drive_gate(self, gate: Callable[[], bool]) -> None:
+        """Only send drive samples while ``gate()`` is true (driving enabled)."""
+        self._drive_gate = gate
+
+    def play(self, name: str) -> bool:
+        """
+        Start a gesture, replacing anything playing on the joint groups it uses
+
+        Returns:
+            bool: False if there is no gesture by that name
+        """
+        gesture = self.gestures.get(name)
+        if gesture is None:
+            logger.warning(f"[MotionSequencer] Unknown gesture: {name}")
+            return False
+        playback = _Playback(gesture)
+        with self._lock:
+            replaced = {id(p) for group in gesture.groups if (p := self._playing.get(group))}
+            if replaced:
+                GESTURES_PREEMPTED.inc(len(replaced))
+                # A replaced playback stops on all its groups, not just the ones taken over
+                self._playing = {g: p for g, p in self._playing.items() if id(p) not in replaced}
+            for group in gesture.groups:
+                self._playing[group] = playback
+        GESTURES_PLAYED.inc()
+        if self.debug:
+            logger.info(f"[MotionSequencer] Playing {name} on {sorted(gesture.groups)}")
+        return True
+
+    def preempt(self, *groups: str) -> bool:
+        """
+        Stop the gestures playing on any of ``groups`` (all of each gesture's joints)
+
+        A stopped gesture that was driving the wheels stops them, whoever
+        takes over next.
+
+        Returns:
+            bool: True if a gesture was stopped
+        """
+        if not self._playing:
+            return False
+        with self._lock:
+            stopped = [p for g in groups if (p := self._playing.get(g))]
+            if not stopped:
+                return False
+            self._playing = {g: p for g, p in self._playing.items() if p not in stopped}
+        GESTURES_PREEMPTED.inc(len({id(p) for p in stopped}))
+        if any('drive' in p.gesture.groups for p in stopped):
+            self._stop_drive()
+        return True
+
+    def stop(self) -> None:
+        """Stop every gesture."""
+        with self._lock:
+            stopped = set(id(p) for p in self._playing.values())
+            drive = 'drive' in self._playing
+            self._playing = {}
+        if stopped and drive:
+            self._stop_drive()
+
+    def is_playing(self, group: Optional[str] = None) -> bool:
+        if group is None:
+            return bool(self._playing)
+        return group in self._playing
+
+    def playing(self) -> Dict[str, str]:
+        """Joint group to the name of the gesture playing on it."""
+        with self._lock:
+            return {group: p.gesture.name for group, p in self._playing.items()}
+
+    def _stop_drive(self) -> None:
+        try:
+            self.motors.stop()
+        except Exception as e:
+            logger.error(f"[MotionSequencer] Failed to stop motors: {e}")
+
+    def _tick(self, dt: float) -> None:
+        """Send the current sample of every playing track (runs at ``update_rate``)"""
+        if not self._playing:
+            return
+        with self._lock:
+            playbacks = {id(p): p for p in self._playing.values()}.values()
+            commands: Dict[str, Tuple[float, Optional[float]]] = {}
+            finished = []
+            for playback in playbacks:
+                playback.elapsed += dt
+                index = int(playback.elapsed * self.rate_hz + 1e-9)
+                if index == playback.index:
+                    continue
+                playback.index = index
+                moves = playback.gesture.moves
+                while playback.move < len(moves) and moves[playback.move][0] <= index:
+                    _, joint, target, duration = moves[playback.move]
+                    playback.move += 1
+                    commands[joint] = (target, duration)
+                for joint, (start, samples) in playback.gesture.tracks.items():
+                    i = index - start
+                    if i < 0:
+                        continue
+                    # Past the end of a track, its last sample still goes out once if a late tick skipped it
+                    value = samples[i] if i < len(samples) else samples[-1]
+                    if playback.sent.get(joint) != value:
+                        playback.sent[joint] = value
+                        commands[joint] = (value, None)
+                if index >= playback.gesture.length - 1:
+                    finished.append(playback)
+            if finished:
+                self._playing = {g: p for g, p in self._playing.items() if p not in finished}
+            ended_drive = any('drive' in p.gesture.groups for p in finished)
+        self._send(commands)
+        if ended_drive:
+            self._stop_drive()
+
+    def _send(self, commands: Dict[str, Tuple[float, Optional[float]]]) -> None:
+        """Send ``{joint: (target, duration)}``; drive samples carry no duration."""
+        if not commands:
+            return
+        try:
+            pan, tilt = commands.get('head_pan'), commands.get('head_tilt')
+            if pan and tilt and pan[1] != tilt[1]:
+                self.motors.move_head(pan=pan[0], duration=pan[1])
+                self.motors.move_head(tilt=tilt[0], duration=tilt[1])
+            elif pan or tilt:
+                self.motors.move_head(pan=pan[0] if pan else None, tilt=tilt[0] if tilt else None,
+                                      duration=(pan or tilt)[1])
+            for side in ('left', 'right'):
+                arm = commands.get(f'{side}_arm')
+                if arm:
+                    self.motors.move_arm(side, arm[0], duration=arm[1])
+            if ('drive_left' in commands or 'drive_right' in commands) and self._drive_gate():
+                self.motors.set_motor_speeds(commands.get('drive_left', (0.0, None))[0],
+                                             commands.get('drive_right', (0.0, None))[0])
+        except Exception as e:
+            logger.error(f"[MotionSequencer] Failed to send gesture sample: {e}")
+
+    def cleanup(self) -> None:
+        self._unsubscribe_config()
+        self._task.cancel()
+        self.stop()
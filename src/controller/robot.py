@@ -1,21 +1,31 @@
 import threading
 import json
 from config import Config
-from modules.vision import VisionModule
-from modules.audio import AudioModule
-from controller.leds_controller import LedsController
-from modules.motor import MotorModule
-from .drive_controller import DriveController
+from .subsystems import SubsystemInitializer
 from enum import Enum, auto
-from typing import Optional, Callable
+from typing import Optional, Callable, TYPE_CHECKING
 import logging
+import time
+from utils.metrics import histogram
+from utils.tracing import TRACER
 
 logger = logging.getLogger(__name__)
 
+WAKE_TO_LISTEN_SECONDS = histogram('robbie_wake_to_listen_seconds', 'Time from wake trigger to speech recognition listening')
+
 from .state import RobotState
-from .speech import SpeechController
-from .joystick_controller import JoystickController
-from .conversation import ConversationController
+from .state_machine import StateMachine, Transition
+from .events import BUS, Executor, Priority, StateUpdate
+
+# Subsystem modules pull in pyaudio, whisper/torch, cv2, pygame, openai and the
+# hardware libraries, so each is imported by the factory that builds it, on
+# that subsystem's init thread, rather than when this module is loaded
+if TYPE_CHECKING:
+    from modules.audio import AudioModule
+    from modules.camera_stream import MjpegStreamer
+    from modules.vision import VisionModule
+    from .joystick_controller import JoystickController
+    from .speech import SpeechController
 
 robot_instance = None
 
@@ -24,75 +34,228 @@ class RobotController:
     def __init__(self, debug: bool = False, api_enabled: bool = False, state_update_callback: Optional[Callable[[dict], None]] = None):
         """
         Main robot controller that coordinates all subsystems.
-        state_update_callback: function to call with updated robot state (for WebSocket broadcast)
+        state_update_callback: function to call with updated robot state; state is published
+        on the event bus as StateUpdate events, which the API subscribes to directly
         """
-        # Callback for state updates (should be set by API layer)
-        self.state_update_callback = state_update_callback
+        self._state_subscription = None
+        if state_update_callback:
+            self._state_subscription = BUS.subscribe(
+                StateUpdate, lambda event: state_update_callback(event.changes),
+                executor=Executor.INLINE, name='RobotController.state_update_callback')
         
-        self.config = Config()
+        self.config = Config.shared()
         self._lock = threading.Lock()
         self.debug = debug
-        self._state = RobotState.STANDBY
-        self.audio = AudioModule(debug=debug)
-        
+        # All conversation state changes go through this machine, one at a time
+        self.state_machine = self._build_state_machine()
+
+        # Subsystems are built concurrently in the background; the properties
+        # below wait for (or, for lazy ones, build) a subsystem on first access
+        self._subsystems = SubsystemInitializer(debug=debug)
+        self._subsystems.add('audio', self._create_audio)
         # Initialize voice subsystems if enabled
         voice_enabled = self.config.get('features', 'voice_enabled', default=True)
         if voice_enabled:
-            self.speech = SpeechController(self, self.audio, debug=debug, backend=None)
-            self.audio.add_output_audio_level_callback(self._on_output_audio_level)
-            self.conversation = ConversationController(debug=debug)
-
-        self.leds = LedsController(self.audio, debug=debug)
-        self.vision = VisionModule(debug=debug)
-        self.motors = MotorModule(debug=debug)
-        self.drive = DriveController(self.motors, debug=debug)
-
-        # Joystick controller (publishes via state_update_callback)
-        joystick_deadzone = self.config.get('joystick', 'deadzone', default=0.10)
-        joystick_smoothing = self.config.get('joystick', 'smoothing', default=0.3)
-        self.joystick: JoystickController | None = JoystickController(
+            self._subsystems.add('speech', self._create_speech, depends=('audio',))
+            self._subsystems.add('conversation', self._create_conversation)
+        self._subsystems.add('leds', self._create_leds, depends=('audio',))
+        self._subsystems.add('motors', self._create_motors)
+        self._subsystems.add('motion', self._create_motion, depends=('motors',))
+        self._subsystems.add('drive', self._create_drive, depends=('motors', 'motion'))
+        self._subsystems.add('odometry', self._create_odometry, depends=('motors',))
+        self._subsystems.add('joystick', self._create_joystick)
+        # Opening the camera is slow and only needed once someone watches the stream
+        self._subsystems.add('vision', self._create_vision, lazy=True)
+        self._subsystems.add('camera_stream', self._create_camera_stream, depends=('vision',), lazy=True)
+        self._subsystems.start()
+
+        # Register global instance for API access
+        global robot_instance
+        robot_instance = self
+
+    audio = property(lambda self: self._subsystems.get_or_none('audio'))
+    speech = property(lambda self: self._subsystems.get_or_none('speech'))
+    conversation = property(lambda self: self._subsystems.get_or_none('conversation'))
+    leds = property(lambda self: self._subsystems.get_or_none('leds'))
+    motors = property(lambda self: self._subsystems.get_or_none('motors'))
+    motion = property(lambda self: self._subsystems.get_or_none('motion'))
+    drive = property(lambda self: self._subsystems.get_or_none('drive'))
+    odometry = property(lambda self: self._subsystems.get_or_none('odometry'))
+    joystick = property(lambda self: self._subsystems.get_or_none('joystick'))
+    vision = property(lambda self: self._subsystems.get_or_none('vision'))
+    camera_stream = property(lambda self: self._subsystems.get_or_none('camera_stream'))
+
+    def _create_audio(self) -> 'AudioModule':
+        from modules.audio import AudioModule
+        return AudioModule(debug=self.debug)
+
+    def _create_conversation(self):
+        from .conversation import ConversationController
+        return ConversationController(debug=self.debug)
+
+    def _create_leds(self, audio: 'AudioModule'):
+        from .leds_controller import LedsController
+        return LedsController(audio, debug=self.debug)
+
+    def _create_motors(self):
+        from modules.motor import MotorModule
+        return MotorModule(debug=self.debug)
+
+    def _create_motion(self, motors):
+        from .motion_sequencer import MotionSequencer
+        return MotionSequencer(motors, debug=self.debug)
+
+    def _create_drive(self, motors, motion):
+        from .drive_controller import DriveController
+        return DriveController(motors, debug=self.debug, sequencer=motion)
+
+    def _create_odometry(self, motors):
+        from modules.odometry import PoseEstimator
+        # Pose goes out as robot_state position/rotation, throttled by the estimator
+        return PoseEstimator(motors, on_pose=lambda pose: self._publish_state(pose, Priority.LOW), debug=self.debug)
+
+    def _create_vision(self) -> 'VisionModule':
+        from modules.vision import VisionModule
+        return VisionModule(debug=self.debug)
+
+    def _create_speech(self, audio: 'AudioModule') -> 'SpeechController':
+        from .speech import SpeechController
+        speech = SpeechController(self, audio, debug=self.debug, backend=None)
+        audio.add_output_audio_level_callback(self._on_output_audio_level)
+        return speech
+
+    def _create_joystick(self) -> 'JoystickController':
+        from .joystick_controller import JoystickController
+        # Joystick controller (updates are published as StateUpdate events)
+        joystick = JoystickController(
             on_update=self._on_controller_update,
             joystick_id=0,
             poll_hz=60.0,
-            debug=debug,
+            debug=self.debug,
             config=self.config.config,
-            deadzone=joystick_deadzone,
-            smoothing=joystick_smoothing,
+            deadzone=self.config.get('joystick', 'deadzone', default=0.10),
+            smoothing=self.config.get('joystick', 'smoothing', default=0.3),
+            on_gesture=self.play_gesture,
         )
-        
         # Register custom joystick action handler for wake_robot
-        if self.joystick:
-            self.joystick.register_action_handler('wake_robot', self.wake_up)
+        joystick.register_action_handler('wake_robot', self.wake_up)
+        return joystick
 
-        # Register global instance for API access
-        global robot_instance
-        robot_instance = self
+    def play_gesture(self, name: str) -> bool:
+        """Play a gesture from gestures.yaml; False if the motion sequencer isn't ready or doesn't know it."""
+        # Called from the joystick thread, so don't wait for the motors to come up
+        motion = self._subsystems.peek('motion')
+        if motion is None:
+            logger.warning(f"Cannot play gesture {name}: motion sequencer not ready")
+            return False
+        return motion.play(name)
+
+    def subsystem_ready(self, name: str) -> bool:
+        """True if ``name`` has been built, without waiting for or building it."""
+        return self._subsystems.peek(name) is not None
+
+    def startup_report(self) -> dict:
+        """Per-subsystem init status and timings, plus the background Whisper load."""
+        report = {'subsystems': self._subsystems.timings()}
+        speech = self._subsystems.peek('speech')
+        stt = speech.speech_to_text if speech else None
+        if stt is not None and stt.backend == 'whisper':
+            report['whisper'] = {
+                'loaded': stt.whisper is not None,
+                'seconds': round(stt.whisper_load_seconds, 3) if stt.whisper_load_seconds else None,
+            }
+        return report
 
     def start(self):
+        """Start the robot without waiting for subsystems that are still initializing."""
         if self.debug:
             logger.info("Starting robot...")
-        # Start joystick before entering standby
-        if self.joystick:
-            self.joystick.start()
-        # Enter standby mode and begin wake word detection
-        self._return_to_standby()
+        self._subsystems.when_ready('joystick', lambda joystick: joystick.start())
+        # Pick up edits to config.yaml while running
+        self.config.start_watching(self.config.get('robot', 'config_watch_interval', default=1.0))
+        threading.Thread(target=self._finish_start, daemon=True, name="robot-start").start()
+
+    def when_ready(self, name: str, callback: Callable[[object], None]) -> None:
+        """Call ``callback`` with subsystem ``name`` once it has been built."""
+        self._subsystems.when_ready(name, callback)
+
+    def wait_for_subsystems(self, timeout: Optional[float] = None) -> None:
+        """Block until every started subsystem has finished initializing (or failed)."""
+        self._subsystems.wait(timeout=timeout)
+
+    def _finish_start(self):
+        # Enter standby mode and begin wake word detection; the machine's
+        # thread waits for speech and LEDs to be built
+        self.state_machine.start()
+        self._log_startup()
+
+    def _log_startup(self):
+        """Log how long each subsystem took once they have all finished."""
+        self.wait_for_subsystems()
+        for entry in self._subsystems.timings():
+            if entry['seconds'] is not None:
+                logger.info(f"[RobotController] {entry['name']}: {entry['status']} in {entry['seconds']:.2f}s")
+            else:
+                logger.info(f"[RobotController] {entry['name']}: {entry['status']}")
 
     def stop(self):
         if self.debug:
             logger.info("Stopping robot...")
         self._cleanup()
 
-    def _set_state(self, new_state: RobotState):
-        """
-        Set robot state and update LEDs
-        """
+    def _create_camera_stream(self, vision: Optional['VisionModule']) -> Optional['MjpegStreamer']:
+        """Create the MJPEG streamer, falling back to a test pattern without a camera."""
+        from modules.camera_stream import MjpegStreamer, SyntheticFrameSource
+        source = vision if vision and vision.camera else None
+        if source is None and self.config.get('vision', 'stream', 'synthetic_when_no_camera', default=True):
+            try:
+                source = SyntheticFrameSource(
+                    self.config.get('vision', 'camera', 'width', default=640),
+                    self.config.get('vision', 'camera', 'height', default=480),
+                    self.config.get('vision', 'camera', 'framerate', default=30),
+                )
+            except Exception as e:
+                logger.error(f"Failed to create synthetic camera source: {e}")
+        if source is None:
+            return None
+        return MjpegStreamer(
+            source,
+            quality=self.config.get('vision', 'stream', 'quality', default=70),
+            scale=self.config.get('vision', 'stream', 'scale', default=0.5),
+            max_fps=self.config.get('vision', 'stream', 'max_fps', default=15),
+            debug=self.debug,
+        )
+
+    def _build_state_machine(self) -> StateMachine:
+        S = RobotState
+        machine = StateMachine(S.STANDBY, [
+            Transition('wake', (S.STANDBY,), S.LISTENING, action=self._start_listening),
+            Transition('transcript', (S.LISTENING,), S.PROCESSING),
+            Transition('response', (S.PROCESSING,), S.SPEAKING, action=self._speak_response),
+            Transition('no_response', (S.PROCESSING,), S.LISTENING, action=lambda context: TRACER.end_turn()),
+            Transition('speech_complete', (S.SPEAKING,), S.LISTENING, action=self._resume_listening),
+            # A transcription may still be on its way; keep listening for it
+            Transition('silence_timeout', (S.LISTENING,), S.STANDBY, guard=self._silence_timeout_allowed),
+            Transition('standby', tuple(S), S.STANDBY),
+        ], name='robot-state', metrics_prefix='robbie_state', debug=self.debug)
+        machine.on_enter(self._on_state_entered)
+        return machine
+
+    @property
+    def state(self) -> RobotState:
+        return self.state_machine.state
+
+    def fire(self, trigger: str, **context):
+        """Queue a conversation event for the state machine; returns a Future[bool]."""
+        return self.state_machine.fire(trigger, **context)
+
+    def _on_state_entered(self, old: Optional[RobotState], new_state: RobotState, context: dict):
+        """Publish the new state and set its LED animation (only on a real change)."""
         if self.debug:
-            logger.info(f"State transition: {self._state} -> {new_state}")
-        self._state = new_state
-        if self.state_update_callback:
-            self.state_update_callback({
-                'robot_state': self._state.value
-            })
+            logger.info(f"State transition: {old} -> {new_state}")
+        if new_state == RobotState.STANDBY:
+            self._enter_standby()
+        self._publish_state({'robot_state': new_state.value}, Priority.HIGH)
         # Update LED animation based on state
         if self.leds:
             self.leds.stop_animation()
@@ -105,94 +268,88 @@ class RobotController:
             elif new_state == RobotState.SPEAKING:
                 self.leds.start_animation('audio_pulse')
 
-    # Wake word, transcription, and speech completion are now handled by SpeechController
-
-    # Transcription and conversation logic handled by SpeechController and ConversationController
-
-    # Speech completion handled by SpeechController
-
-    def _return_to_standby(self):
-        """Return to standby mode"""
-        if self.debug:
-            logger.info("Returning to standby mode")
+    def _enter_standby(self):
+        TRACER.end_turn()
         # Stop speech recognition
         if self.speech and self.speech.speech_to_text:
             self.speech.speech_to_text.stop_listening()
         # Start wake word detection
         if self.speech and self.speech.wake_word:
             self.speech.wake_word.start_listening()
-        # Set state last
-        self._set_state(RobotState.STANDBY)
+
+    def _return_to_standby(self):
+        """Return to standby mode"""
+        if self.debug:
+            logger.info("Returning to standby mode")
+        return self.fire('standby')
 
     def wake_up(self):
         """Wake up the robot from STANDBY, as if the wake word was detected or UI button pressed."""
-        if self._state != RobotState.STANDBY:
-            if self.debug:
-                logger.debug(f"[wake_up] Ignored: not in STANDBY (current state: {self._state})")
-            return
+        return self.fire('wake')
+
+    def _start_listening(self, context: dict) -> bool:
+        """Action for STANDBY -> LISTENING: swap wake word detection for speech recognition."""
         if self.debug:
             logger.info("[wake_up] Triggered: transitioning to LISTENING and starting speech recognition.")
-        if self.speech:
-            # Stop wake word detection
-            if self.speech.wake_word:
-                self.speech.wake_word.stop_listening()
-            # Start speech recognition
-            if self.speech.speech_to_text:
-                ok = self.speech.speech_to_text.start_listening()
-                if ok:
-                    self._set_state(RobotState.LISTENING)
-                    return
-                logger.error("[wake_up] Speech recognition failed to start; staying in STANDBY")
-                # Restart wake word detection so the robot remains usable.
-                if self.speech.wake_word:
-                    try:
-                        self.speech.wake_word.start_listening()
-                    except Exception as e:
-                        logger.error(f"Failed to restart wake word detection: {e}")
-        self._set_state(RobotState.STANDBY)
+        woke_at = context['fired_at']
+        if not self.speech or not self.speech.speech_to_text:
+            return False
+        # Wake word detection has already opened the turn; a UI wake has not
+        TRACER.ensure_turn('wake')
+        # Stop wake word detection
+        if self.speech.wake_word:
+            self.speech.wake_word.stop_listening()
+        # Start speech recognition
+        if self.speech.speech_to_text.start_listening():
+            WAKE_TO_LISTEN_SECONDS.observe(time.perf_counter() - woke_at)
+            TRACER.start_span('wake_to_listen', start=woke_at).finish()
+            return True
+        logger.error("[wake_up] Speech recognition failed to start; staying in STANDBY")
+        # Restart wake word detection so the robot remains usable.
+        if self.speech.wake_word:
+            try:
+                self.speech.wake_word.start_listening()
+            except Exception as e:
+                logger.error(f"Failed to restart wake word detection: {e}")
+        return False
+
+    def _speak_response(self, context: dict) -> bool:
+        """Action for PROCESSING -> SPEAKING: stop listening and start saying the response."""
+        try:
+            self.speech.speech_to_text.stop_listening()
+        except Exception as e:
+            logger.error(f"[RobotController] Failed to stop listening: {e}")
+        # Non-blocking; its completion arrives as a later speech_complete event
+        self.speech.voice.say(context['text'], blocking=False)
+        return True
+
+    def _resume_listening(self, context: dict) -> None:
+        """Action for SPEAKING -> LISTENING once the response has been spoken."""
+        TRACER.end_turn()
+        self.speech.speech_to_text.start_listening()
+
+    def _silence_timeout_allowed(self, context: dict) -> bool:
+        stt = self.speech.speech_to_text if self.speech else None
+        return not (stt and stt.is_transcription_in_progress())
 
     def _on_input_audio_level(self, input_audio_level_db: float):
-        """Handle real-time input audio level updates from the audio input module (in dB)."""
-        import time
-        now = time.time()
-        if not hasattr(self, '_last_input_audio_level_sent'):
-            self._last_input_audio_level_sent = None
-            self._last_input_audio_level_time = 0
-        send = False
-        if (
-            self._last_input_audio_level_sent is None or
-            abs(input_audio_level_db - self._last_input_audio_level_sent) > 1.0 or
-            now - self._last_input_audio_level_time > 0.1
-        ):
-            send = True
-        if send:
-            self._last_input_audio_level_sent = input_audio_level_db
-            self._last_input_audio_level_time = now
-        if self.state_update_callback:
-            self.state_update_callback({"type": "update_audio_level", "input_audio_level_db": float(input_audio_level_db)})
+        """Handle real-time input audio level updates from the audio input module (in dB).
+
+        Called for every audio block; the API broadcast scheduler coalesces
+        these and sends them at the configured audio rate.
+        """
+        self._publish_state({"input_audio_level_db": float(input_audio_level_db)}, Priority.LOW)
 
     def _on_output_audio_level(self, output_audio_level_db: float):
         """Handle real-time output audio level updates from the output (loopback) device (in dB)."""
-        import time
-        now = time.time()
-        if not hasattr(self, '_last_output_audio_level_sent'):
-            self._last_output_audio_level_sent = None
-            self._last_output_audio_level_time = 0
-        send = False
-        if (
-            self._last_output_audio_level_sent is None or
-            abs(output_audio_level_db - self._last_output_audio_level_sent) > 1.0 or
-            now - self._last_output_audio_level_time > 0.1
-        ):
-            send = True
-        if send:
-            self._last_output_audio_level_sent = output_audio_level_db
-            self._last_output_audio_level_time = now
-        if self.state_update_callback:
-            self.state_update_callback({"type": "update_audio_level", "output_audio_level_db": float(output_audio_level_db)})
+        self._publish_state({"output_audio_level_db": float(output_audio_level_db)}, Priority.LOW)
+
+    def _publish_state(self, changes: dict, priority: Optional[Priority] = None) -> None:
+        """Publish a partial robot state update (for the API) on the event bus."""
+        BUS.publish(StateUpdate(changes), priority)
 
     def _on_controller_update(self, update: dict):
-        """Forward controller updates (e.g., joystick) to API callback."""
+        """Forward controller updates (e.g., joystick) to the API."""
         if not update:
             return
         try:
@@ -211,27 +368,19 @@ class RobotController:
                         logger.error(f"Failed to process joystick update: {e}")
         except Exception as e:
             logger.error(f"Error in controller update: {e}")
-        if self.state_update_callback:
-            try:
-                self.state_update_callback(update)
-            except Exception as e:
-                logger.error(f"State update callback failed: {e}")
+        self._publish_state(update)
 
     def _cleanup(self):
-        if self.leds:
-            self.leds.cleanup()
-        if self.speech:
-            self.speech.cleanup()
-        if self.conversation:
-            self.conversation.cleanup()
-        if self.vision:
-            self.vision.cleanup()
-        if self.audio:
-            self.audio.cleanup()
-        if self.joystick:
-            self.joystick.cleanup()
-        if hasattr(self, 'motors') and self.motors:
-            try:
-                self.motors.cleanup()
-            except Exception as e:
-                logger.error(f"Failed to cleanup motors: {e}")
+        self.config.stop_watching()
+        self.state_machine.stop()
+        if self._state_subscription:
+            self._state_subscription.cancel()
+        # Let subsystems still initializing finish, but don't build deferred ones just to clean them up
+        self._subsystems.wait(timeout=10)
+        for name in ('leds', 'speech', 'conversation', 'camera_stream', 'vision', 'audio', 'joystick', 'drive', 'motion', 'odometry', 'motors'):
+            subsystem = self._subsystems.peek(name)
+            if subsystem:
+                try:
+                    subsystem.cleanup()
+                except Exception as e:
+                    logger.error(f"Failed to cleanup {name}: {e}")
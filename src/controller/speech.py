@@ -1,10 +1,14 @@
 from modules.wake_word import WakeWordModule, WakeWordInitError
 from modules.speech_to_text import SpeechToTextModule
 from modules.voice import VoiceModule
-from .state import RobotState
+from utils.tracing import TRACER
+from .events import BUS, StateUpdate, Transcription
 import logging
 logger = logging.getLogger(__name__)
 
+# Longest to wait for the robot's state machine to handle an event
+STATE_TIMEOUT = 10.0
+
 class SpeechController:
     def __init__(self, parent, audio_module, debug=False, backend=None):
         import os
@@ -43,6 +47,11 @@ class SpeechController:
         # Register callbacks (only once)
         self._callbacks_registered = False
         self._register_callbacks()
+        # Transcriptions from whichever speech-to-text module is current, handled
+        # on their own thread so the LLM call never holds up audio processing
+        self._transcription_subscription = BUS.subscribe(
+            Transcription, lambda event: self.on_transcription(event.text),
+            name='SpeechController.on_transcription', queue_size=8)
 
     def set_backend(self, backend: str):
         """Switch the speech-to-text backend at runtime."""
@@ -59,7 +68,6 @@ class SpeechController:
         if not self._callbacks_registered:
             if self.wake_word:
                 self.wake_word.add_detection_callback(self.on_wake_word)
-            self.speech_to_text.add_transcription_callback(self.on_transcription)
             self.speech_to_text.add_input_audio_level_callback(self.parent._on_input_audio_level)
             self.speech_to_text.add_timeout_callback(self.on_silence_timeout)
             self.voice.add_completion_callback(self.on_speech_complete)
@@ -72,7 +80,7 @@ class SpeechController:
 
     def on_transcription(self, text):
         if self.debug:
-            logger.debug(f"[SpeechController] Transcription received: '{text}' (state: {self.parent._state})")
+            logger.debug(f"[SpeechController] Transcription received: '{text}' (state: {self.parent.state})")
         
         try:
             with self.speech_to_text._lock:
@@ -81,8 +89,7 @@ class SpeechController:
                     logger.warning("[SpeechController] Empty transcription received")
                     return None
             
-            if hasattr(self.parent, 'state_update_callback') and self.parent.state_update_callback:
-                self.parent.state_update_callback({"type": "update_transcription", "last_transcription": text})
+            BUS.publish(StateUpdate({"type": "update_transcription", "last_transcription": text}))
             
             if self.debug:
                 logger.info(f"Transcribed: {text}")
@@ -92,51 +99,46 @@ class SpeechController:
                     logger.info("[SpeechController] Exit phrase detected, returning to standby")
                 self.parent._return_to_standby()
                 return None
+
+            # Only a transcription heard while LISTENING starts a reply; a late one
+            # (after a silence timeout or another reply) is dropped
+            if not self.parent.fire('transcript').result(timeout=STATE_TIMEOUT):
+                if self.debug:
+                    logger.info(f"[SpeechController] Ignoring transcription in state {self.parent.state}")
+                return None
             
-            self.parent._set_state(RobotState.PROCESSING)
+            # Typed chat has no wake word or speech endpoint to start the turn
+            TRACER.ensure_turn('chat')
             response = self.parent.conversation.chat(text)
             
             if response:
-                try:
-                    self.speech_to_text.stop_listening()
-                except Exception as e:
-                    logger.error(f"[SpeechController] Failed to stop listening: {e}")
-                
-                try:
-                    self.parent._set_state(RobotState.SPEAKING)
-                    self.voice.say(response, blocking=False)
-                except Exception as e:
-                    logger.error(f"[SpeechController] Failed to speak response: {e}")
-                
+                if not self.parent.fire('response', text=response).result(timeout=STATE_TIMEOUT):
+                    logger.error("[SpeechController] Failed to speak response")
+                    self.parent.fire('no_response')
                 return response
             else:
                 logger.warning("[SpeechController] No response from AI")
-                self.parent._set_state(RobotState.LISTENING)
+                self.parent.fire('no_response')
                 return None
                 
         except Exception as e:
             logger.error(f"[SpeechController] Error in transcription callback: {e}", exc_info=True)
-            self.parent._set_state(RobotState.LISTENING)
+            self.parent.fire('no_response')
             return None
 
     def on_speech_complete(self):
         if self.debug:
             logger.info("[SpeechController] Speech complete - transitioning to LISTENING")
-        self.parent._set_state(RobotState.LISTENING)
-        self.speech_to_text.start_listening()
+        self.parent.fire('speech_complete')
 
     def on_silence_timeout(self):
-        with self.speech_to_text._lock:
-            if self.speech_to_text.transcription_in_progress:
-                if self.debug:
-                    logger.debug("[SpeechController] Silence timeout ignored: transcription in progress")
-                return
-        
+        # Ignored unless LISTENING with no transcription in progress
         if self.debug:
             logger.info("[SpeechController] Silence timeout - returning to STANDBY")
-        self.parent._return_to_standby()
+        self.parent.fire('silence_timeout')
 
     def cleanup(self):
+        self._transcription_subscription.cancel()
         for mod in (self.wake_word, self.speech_to_text, self.voice):
             if mod:
                 mod.cleanup()
@@ -0,0 +1,219 @@
+import queue
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.metrics import counter, histogram
+
+logger = logging.getLogger(__name__)
+
+DWELL_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 1800.0)
+
+TRANSITIONS_TOTAL = counter('robbie_state_transitions_total', 'State changes made by the conversation state machine')
+TRANSITIONS_IGNORED = counter(
+    'robbie_state_events_ignored_total',
+    'State machine events dropped: no transition from the current state, a failed guard or a failed action')
+
+Context = Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class Transition:
+    """
+    A declared state change
+
+    Attributes:
+        trigger: Event name that requests it
+        sources: States it is allowed from
+        target: State it leads to
+        guard: ``guard(context)`` must be true for it to happen
+        action: ``action(context)`` runs before the state changes; returning
+            False (or raising) abandons the transition
+    """
+    trigger: str
+    sources: Tuple[Enum, ...]
+    target: Enum
+    guard: Optional[Callable[[Context], bool]] = None
+    action: Optional[Callable[[Context], Optional[bool]]] = None
+
+
+class StateMachine:
+    """
+    Serializes state changes through declared transitions
+
+    Events are queued by ``fire()`` from any thread and processed one at a
+    time on the machine's own thread, so a transition's guard, action and
+    enter hooks never overlap with another's. An event with no transition
+    from the current state is ignored. A transition to the state the
+    machine is already in is redundant: its action and enter hooks are
+    skipped.
+    """
+
+    def __init__(self, initial: Enum, transitions: Iterable[Transition], name: str = 'state-machine',
+                 metrics_prefix: Optional[str] = None, history: int = 50, debug: bool = False):
+        self.name = name
+        self.debug = debug
+        self._state = initial
+        self._entered_at = time.monotonic()
+        self._table: Dict[Tuple[str, Enum], List[Transition]] = {}
+        for transition in transitions:
+            for source in transition.sources:
+                self._table.setdefault((transition.trigger, source), []).append(transition)
+        self._enter_hooks: List[Callable[[Optional[Enum], Enum, Context], None]] = []
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._history: deque = deque(maxlen=history)
+        self._outcomes = {'transitioned': 0, 'redundant': 0, 'ignored': 0, 'rejected': 0, 'failed': 0}
+        states = type(initial)
+        self._dwell = {state: {'count': 0, 'total_seconds': 0.0, 'last_seconds': None} for state in states}
+        # Exported as <metrics_prefix>_<state>_dwell_seconds when a prefix is given
+        self._dwell_histograms = {
+            state: histogram(f'{metrics_prefix}_{state.name.lower()}_dwell_seconds',
+                             f'Time spent in the {state.name} state per visit', buckets=DWELL_BUCKETS)
+            for state in states
+        } if metrics_prefix else {}
+
+    @property
+    def state(self) -> Enum:
+        return self._state
+
+    def on_enter(self, hook: Callable[[Optional[Enum], Enum, Context], None]) -> None:
+        """Call ``hook(old, new, context)`` on the machine's thread after every real state change."""
+        self._enter_hooks.append(hook)
+
+    def start(self) -> None:
+        """Start processing events, first entering the initial state (``old`` is None)."""
+        if self._thread is not None:
+            return
+        self._entered_at = time.monotonic()
+        self._queue.put((None, {}, None))
+        self._thread = threading.Thread(target=self._run, daemon=True, name=self.name)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop after the events already queued have been processed."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def fire(self, trigger: str, **context: Any) -> 'Future[bool]':
+        """
+        Queue an event (thread-safe, non-blocking)
+
+        Returns:
+            Future[bool]: True once the machine is in the transition's target
+            state, False if the event was ignored or its guard or action failed.
+            Don't wait on it from an action or enter hook.
+        """
+        future: Future = Future()
+        context.setdefault('fired_at', time.perf_counter())
+        self._queue.put((trigger, context, future))
+        return future
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            trigger, context, future = item
+            if trigger is None:
+                self._enter(None, self._state, context)
+                continue
+            try:
+                result = self._process(trigger, context)
+            except Exception as e:
+                logger.error(f"[StateMachine] Error processing '{trigger}': {e}", exc_info=True)
+                result = False
+            future.set_result(result)
+
+    def _process(self, trigger: str, context: Context) -> bool:
+        current = self._state
+        candidates = self._table.get((trigger, current))
+        if not candidates:
+            return self._record(trigger, current, None, 'ignored', context)
+        for transition in candidates:
+            if transition.guard is not None and not transition.guard(context):
+                continue
+            if transition.target == current:
+                return self._record(trigger, current, current, 'redundant', context)
+            if transition.action is not None:
+                try:
+                    if transition.action(context) is False:
+                        return self._record(trigger, current, transition.target, 'failed', context)
+                except Exception as e:
+                    logger.error(f"[StateMachine] Action for '{trigger}' ({current.name} -> "
+                                 f"{transition.target.name}) failed: {e}", exc_info=True)
+                    return self._record(trigger, current, transition.target, 'failed', context)
+            self._change(current, transition.target)
+            self._record(trigger, current, transition.target, 'transitioned', context)
+            self._enter(current, transition.target, context)
+            return True
+        return self._record(trigger, current, None, 'rejected', context)
+
+    def _change(self, old: Enum, new: Enum) -> None:
+        now = time.monotonic()
+        dwell = now - self._entered_at
+        with self._lock:
+            stats = self._dwell[old]
+            stats['count'] += 1
+            stats['total_seconds'] += dwell
+            stats['last_seconds'] = dwell
+            self._state = new
+            self._entered_at = now
+        if self._dwell_histograms:
+            self._dwell_histograms[old].observe(dwell)
+        TRANSITIONS_TOTAL.inc()
+
+    def _enter(self, old: Optional[Enum], new: Enum, context: Context) -> None:
+        for hook in self._enter_hooks:
+            try:
+                hook(old, new, context)
+            except Exception as e:
+                logger.error(f"[StateMachine] Enter hook for {new.name} failed: {e}", exc_info=True)
+
+    def _record(self, trigger: str, source: Enum, target: Optional[Enum], outcome: str, context: Context) -> bool:
+        # Time from fire() until the event was handled, including its action
+        handled_in = time.perf_counter() - context['fired_at']
+        with self._lock:
+            self._outcomes[outcome] += 1
+            self._history.append({
+                'time': time.time(),
+                'trigger': trigger,
+                'from': source.value,
+                'to': target.value if target is not None else None,
+                'outcome': outcome,
+                'handled_ms': round(handled_in * 1000, 3),
+            })
+        if outcome in ('ignored', 'rejected', 'failed'):
+            TRANSITIONS_IGNORED.inc()
+        if self.debug:
+            target_name = target.name if target is not None else '-'
+            logger.info(f"[StateMachine] {trigger}: {source.name} -> {target_name} ({outcome})")
+        return outcome in ('transitioned', 'redundant')
+
+    def stats(self) -> Dict[str, Any]:
+        """Current state, per-state dwell times, outcome counts and recent events."""
+        with self._lock:
+            return {
+                'state': self._state.value,
+                'in_state_seconds': round(time.monotonic() - self._entered_at, 3),
+                'dwell': {
+                    state.value: {
+                        'count': stats['count'],
+                        'total_seconds': round(stats['total_seconds'], 3),
+                        'last_seconds': round(stats['last_seconds'], 3) if stats['last_seconds'] is not None else None,
+                    }
+                    for state, stats in self._dwell.items()
+                },
+                'outcomes': dict(self._outcomes),
+                'history': list(self._history),
+            }
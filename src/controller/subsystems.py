@@ -0,0 +1,182 @@
+import threading
+import time
+import logging
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SubsystemError(RuntimeError):
+    """Raised when a subsystem (or one it depends on) failed to initialize."""
+    pass
+
+
+class _Subsystem:
+    def __init__(self, name: str, factory: Callable[..., Any], depends: tuple, lazy: bool):
+        self.name = name
+        self.factory = factory
+        self.depends = depends
+        self.lazy = lazy
+        self.future: Future = Future()
+        self.started = False
+        self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+        self.thread: Optional[str] = None
+
+
+class SubsystemInitializer:
+    """
+    Builds the robot's subsystems concurrently, respecting their dependencies.
+
+    Each subsystem is a factory called with its dependencies' instances as
+    keyword arguments. ``start()`` launches every eager subsystem on its own
+    thread; each waits only for what it depends on. Lazy subsystems are built
+    the first time ``get()`` asks for them.
+    """
+
+    def __init__(self, debug: bool = False):
+        self.debug = debug
+        self._lock = threading.Lock()
+        self._subsystems: Dict[str, _Subsystem] = {}
+        self._epoch = time.perf_counter()
+
+    def add(self, name: str, factory: Callable[..., Any], depends: Iterable[str] = (), lazy: bool = False) -> None:
+        """
+        Register a subsystem
+
+        Args:
+            name: Subsystem name, also the keyword its dependents receive it as
+            factory: Called as ``factory(**{dep: instance})``; may return None
+            depends: Names of subsystems that must be built first
+            lazy: Build on first ``get()`` instead of at ``start()``
+        """
+        depends = tuple(depends)
+        for dep in depends:
+            if dep not in self._subsystems:
+                raise ValueError(f"Subsystem '{name}' depends on unknown subsystem '{dep}'")
+        self._subsystems[name] = _Subsystem(name, factory, depends, lazy)
+
+    def start(self) -> None:
+        """Start building all eager subsystems in the background."""
+        for subsystem in self._subsystems.values():
+            if not subsystem.lazy:
+                self._launch(subsystem)
+
+    def _launch(self, subsystem: _Subsystem) -> bool:
+        """Start ``subsystem`` on a new thread; False if it was already started."""
+        with self._lock:
+            if subsystem.started:
+                return False
+            subsystem.started = True
+        threading.Thread(target=self._build, args=(subsystem,), daemon=True,
+                         name=f"init-{subsystem.name}").start()
+        return True
+
+    def _build(self, subsystem: _Subsystem) -> None:
+        try:
+            deps = {dep: self.get(dep) for dep in subsystem.depends}
+        except SubsystemError as e:
+            subsystem.future.set_exception(SubsystemError(f"{subsystem.name}: {e}"))
+            return
+        subsystem.thread = threading.current_thread().name
+        subsystem.start_time = time.perf_counter()
+        try:
+            instance = subsystem.factory(**deps)
+        except Exception as e:
+            subsystem.end_time = time.perf_counter()
+            logger.error(f"[SubsystemInitializer] Failed to initialize {subsystem.name}: {e}", exc_info=True)
+            subsystem.future.set_exception(SubsystemError(f"{subsystem.name} failed to initialize: {e}"))
+            return
+        subsystem.end_time = time.perf_counter()
+        if self.debug:
+            logger.info(f"[SubsystemInitializer] {subsystem.name} ready in {subsystem.end_time - subsystem.start_time:.2f}s")
+        subsystem.future.set_result(instance)
+
+    def get(self, name: str, timeout: Optional[float] = None) -> Any:
+        """
+        Return a subsystem's instance, waiting for it (and building it if lazy)
+
+        Raises:
+            SubsystemError: If the subsystem or a dependency failed
+            concurrent.futures.TimeoutError: If ``timeout`` expires first
+        """
+        subsystem = self._subsystems[name]
+        if not subsystem.future.done() and self._launch(subsystem) and self.debug:
+            logger.info(f"[SubsystemInitializer] Building {name} on first use")
+        return subsystem.future.result(timeout)
+
+    def get_or_none(self, name: str) -> Any:
+        """Like ``get`` but returns None for a subsystem that failed or isn't registered."""
+        if name not in self._subsystems:
+            return None
+        try:
+            return self.get(name)
+        except SubsystemError:
+            return None
+
+    def peek(self, name: str) -> Any:
+        """Return the instance if it is already built, without waiting or building it."""
+        if name not in self._subsystems:
+            return None
+        future = self._subsystems[name].future
+        if future.done() and future.exception() is None:
+            return future.result()
+        return None
+
+    def when_ready(self, name: str, callback: Callable[[Any], None]) -> None:
+        """
+        Call ``callback(instance)`` once ``name`` is built, or now if it already is
+
+        The callback runs on the thread that built the subsystem. It is not
+        called if the subsystem fails or builds to None, and registering it
+        does not start building a lazy subsystem.
+        """
+        def done(future: Future) -> None:
+            if future.exception() is not None or future.result() is None:
+                return
+            try:
+                callback(future.result())
+            except Exception as e:
+                logger.error(f"[SubsystemInitializer] {name} ready callback failed: {e}", exc_info=True)
+        self._subsystems[name].future.add_done_callback(done)
+
+    def wait(self, names: Optional[Iterable[str]] = None, timeout: Optional[float] = None) -> None:
+        """Wait for the given (default: all started) subsystems to finish, successful or not."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for name in names if names is not None else list(self._subsystems):
+            subsystem = self._subsystems[name]
+            if names is None and not subsystem.started:
+                continue
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                self.get(name, remaining)
+            except (SubsystemError, FutureTimeout):
+                pass
+
+    def timings(self) -> List[Dict[str, Any]]:
+        """Per-subsystem status and init time, in start order."""
+        result = []
+        for subsystem in self._subsystems.values():
+            future = subsystem.future
+            if not subsystem.started:
+                status = 'deferred'
+            elif not future.done():
+                status = 'waiting' if subsystem.start_time is None else 'initializing'
+            elif future.exception() is not None:
+                status = 'failed'
+            else:
+                status = 'ready'
+            entry = {
+                'name': subsystem.name,
+                'status': status,
+                'lazy': subsystem.lazy,
+                'depends': list(subsystem.depends),
+                'thread': subsystem.thread,
+                'started_at': round(subsystem.start_time - self._epoch, 3) if subsystem.start_time else None,
+                'seconds': round(subsystem.end_time - subsystem.start_time, 3) if subsystem.end_time else None,
+            }
+            if status == 'failed':
+                entry['error'] = str(future.exception())
+            result.append(entry)
+        return sorted(result, key=lambda e: (e['started_at'] is None, e['started_at'] or 0))
@@ -1,19 +1,43 @@
-from controller.robot import RobotController
-from api.app import app
-import uvicorn
 import threading
 import argparse
-from utils.logging import setup_logging
 
 parser = argparse.ArgumentParser(description="Robbie the Robot Main Entry Point")
 parser.add_argument('--debug', action='store_true', help='Enable debug logging')
 parser.add_argument('--api', action='store_true', help='Enable API server')
+parser.add_argument('--profile-startup', action='store_true',
+                    help='Log an import-time and init-time breakdown once startup completes')
 args = parser.parse_args()
 
+# Installed before anything else is imported so the breakdown covers every import
+profiler = None
+if args.profile_startup:
+    from utils.startup_profile import StartupProfiler
+    profiler = StartupProfiler()
+    profiler.install()
+
+from utils.logging import setup_logging
 setup_logging(debug=args.debug)
 import logging
 logger = logging.getLogger(__name__)
 
+from controller.robot import RobotController
+if args.api:
+    from api.app import app
+    import uvicorn
+if profiler:
+    profiler.mark('imports')
+
+
+def log_startup_profile(robot, api_ready=None):
+    """Wait for the API and every subsystem to finish starting, then log the profile."""
+    if api_ready is not None:
+        api_ready.wait(timeout=60)
+    robot.wait_for_subsystems(timeout=120)
+    profiler.mark('subsystems_ready')
+    logger.info("[MAIN] " + profiler.report(robot.startup_report()))
+    profiler.uninstall()
+
+
 if __name__ == "__main__":
     api_enabled = args.api
     try:
@@ -21,26 +45,23 @@ if __name__ == "__main__":
     except Exception as e:
         logger.error("[INIT] Exception during RobotController initialization!", exc_info=True)
         raise
+    if profiler:
+        profiler.mark('robot_init')
 
     if api_enabled:
         # Set up API callbacks
         try:
-            from api import app as api_app
-            from api.app import update_led_matrix_state, manager, robot_state
-            import json, asyncio
+            from api.app import update_led_matrix_state
 
             def api_led_update_callback(leds_controller):
-                """Callback to broadcast LED state to API clients."""
-                update_led_matrix_state(leds_controller)
+                """Callback to broadcast LED state changes to API clients."""
                 try:
-                    if api_app.main_event_loop and api_app.main_event_loop.is_running():
-                        asyncio.run_coroutine_threadsafe(manager.broadcast(json.dumps(robot_state)), api_app.main_event_loop)
-                    else:
-                        logger.debug("[API] Main event loop not available for broadcasting LED matrix update.")
+                    update_led_matrix_state(leds_controller)
                 except Exception as e:
                     logger.error(f"[API] Error broadcasting LED matrix update: {e}")
-            
-            robot.leds.add_api_update_callback(api_led_update_callback)
+
+            # The LEDs may still be initializing; register once they are up
+            robot.when_ready('leds', lambda leds: leds.add_api_update_callback(api_led_update_callback))
             logger.info("[API] Registered callback for live LED matrix updates.")
 
         except Exception as e:
@@ -57,6 +78,17 @@ if __name__ == "__main__":
     try:
         logger.info("[MAIN] Starting robot controller...")
         robot.start()
+        if profiler:
+            profiler.mark('robot_start')
+            api_ready = None
+            if api_enabled:
+                api_ready = threading.Event()
+
+                def on_api_ready():
+                    profiler.mark('api_ready')
+                    api_ready.set()
+                app.add_event_handler("startup", on_api_ready)
+            threading.Thread(target=log_startup_profile, args=(robot, api_ready), daemon=True, name="startup-profile").start()
         if api_enabled:
             logger.info("[MAIN] Starting API server...")
             uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -12,16 +12,20 @@ import wave
 import os
 import threading
 import logging
-from typing import Optional, Callable, Dict, Any, List
+from typing import Optional, Callable, Dict, Any, List, Tuple
 import time
 import queue
 import sys
 import re
 
 from config import Config
+from utils.metrics import histogram
+from controller.events import BUS, AudioLevel, DropPolicy, StateUpdate
 
 logger = logging.getLogger(__name__)
 
+AUDIO_CALLBACK_SECONDS = histogram('robbie_audio_callback_seconds', 'Time spent in the PortAudio stream callback')
+
 class AudioModule:
     """Core audio module for managing audio devices, streams, and routing"""
     
@@ -30,8 +34,7 @@ class AudioModule:
     FORMAT_INT16 = pyaudio.paInt16
     
     def __init__(self, debug: bool = False):
-        self._input_audio_level_callbacks: List[Callable[[float], None]] = []
-        self._output_audio_level_callbacks: List[Callable[[float], None]] = []
+        self._level_subscriptions: Dict[Tuple[str, Callable[[float], None]], Any] = {}
         """
         Initialize audio module
         
@@ -42,7 +45,7 @@ class AudioModule:
         self._lock = threading.Lock()
         
         # Load config
-        config = Config()
+        config = Config.shared()
         self.default_rate = config.get('audio', 'rate', default=44100)
         self.default_chunk_size = config.get('audio', 'chunk_size', default=1024)
         self.default_channels = config.get('audio', 'channels', default=1)
@@ -183,7 +186,7 @@ class AudioModule:
                 audio_data = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
                 rms = np.sqrt(np.mean(audio_data ** 2))
                 db = 20 * np.log10(rms) if rms > 0 else -100
-                self._trigger_output_audio_level_callbacks(db)
+                self.publish_audio_level('output', db)
             stream.stop_stream()
             stream.close()
             if self.debug:
@@ -201,35 +204,31 @@ class AudioModule:
 
 
     def add_input_audio_level_callback(self, callback: Callable[[float], None]) -> None:
-        """Register a callback for real-time input audio level (dB)."""
-        self._input_audio_level_callbacks.append(callback)
+        """Register a callback for real-time input audio level (dB), called with the latest level on its own thread."""
+        self._subscribe_level('input', callback)
 
     def add_output_audio_level_callback(self, callback: Callable[[float], None]) -> None:
-        """Register a callback for real-time output audio level (dB)."""
-        self._output_audio_level_callbacks.append(callback)
+        """Register a callback for real-time output audio level (dB), called with the latest level on its own thread."""
+        self._subscribe_level('output', callback)
 
     def remove_output_audio_level_callback(self, callback: Callable[[float], None]) -> None:
         """Remove a callback for real-time output audio level (dB)."""
-        if callback in self._output_audio_level_callbacks:
-            self._output_audio_level_callbacks.remove(callback)
-
-    def _trigger_input_audio_level_callbacks(self, audio_level: float) -> None:
-        """Trigger all registered input audio level callbacks with the given dB level."""
-        for callback in self._input_audio_level_callbacks:
-            try:
-                callback(audio_level)
-            except Exception as e:
-                if self.debug:
-                    logger.exception(f"Error in input audio level callback: {e}")
-
-    def _trigger_output_audio_level_callbacks(self, audio_level: float) -> None:
-        """Trigger all registered output audio level callbacks with the given dB level."""
-        for callback in self._output_audio_level_callbacks:
-            try:
-                callback(audio_level)
-            except Exception as e:
-                if self.debug:
-                    logger.exception(f"Error in output audio level callback: {e}")
+        subscription = self._level_subscriptions.pop(('output', callback), None)
+        if subscription:
+            subscription.cancel()
+
+    def _subscribe_level(self, direction: str, callback: Callable[[float], None]) -> None:
+        # Levels arrive once per audio block; a slow callback just skips to the newest
+        def on_level(event: AudioLevel):
+            if event.direction == direction and event.source is self:
+                callback(event.db)
+        name = f"audio-{direction}-level:{getattr(callback, '__qualname__', type(callback).__name__)}"
+        self._level_subscriptions[(direction, callback)] = BUS.subscribe(
+            AudioLevel, on_level, name=name, drop=DropPolicy.LATEST)
+
+    def publish_audio_level(self, direction: str, audio_level: float) -> None:
+        """Publish an 'input' or 'output' dB level; safe to call from the PortAudio callback."""
+        BUS.publish(AudioLevel(direction, audio_level, source=self))
         
     def _initialize_pyaudio(self):
         try:
@@ -304,6 +303,7 @@ class AudioModule:
         chunk_size = chunk_size or self.default_chunk_size
         
         def audio_callback(audio_data, frame_count, time_info, status):
+            start = time.perf_counter()
             callback(audio_data, frame_count, time_info, status)
             # Convert bytes to numpy array (assuming 16-bit audio)
             audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32)
@@ -313,6 +313,7 @@ class AudioModule:
                 db = 20 * np.log10(rms + 1e-10)  # add epsilon to avoid log(0)
                 # if self.debug:
                 #     logger.info(f"\rAudio level: {db:.1f} dB", end="")
+            AUDIO_CALLBACK_SECONDS.observe(time.perf_counter() - start)
             return (None, pyaudio.paContinue)
         
         # Determine stream type and device index
@@ -669,6 +670,10 @@ class AudioModule:
         """Clean up resources"""
         logger.info("Cleaning up audio resources...")
 
+        for subscription in self._level_subscriptions.values():
+            subscription.cancel()
+        self._level_subscriptions.clear()
+
         # Stop output monitor thread
         if hasattr(self, '_output_monitor_stop_event'):
             self._output_monitor_stop_event.set()
@@ -742,19 +747,18 @@ class AudioModule:
             self._output_monitor_thread.start()
             if self.debug:
                 logger.info(f"[AudioModule] Output monitor switched to device index {index}")
-            # State update callback for frontend
-            if hasattr(self, 'state_update_callback') and self.state_update_callback:
-                devices = self.list_stereo_mix_devices()
-                dev_name = None
-                for idx, name in devices:
-                    if idx == index:
-                        dev_name = name
-                        break
-                self.state_update_callback({
-                    "type": "update_audio_output_device",
-                    "output_device_index": index,
-                    "output_device_name": dev_name
-                })
+            # State update for frontend
+            devices = self.list_stereo_mix_devices()
+            dev_name = None
+            for idx, name in devices:
+                if idx == index:
+                    dev_name = name
+                    break
+            BUS.publish(StateUpdate({
+                "type": "update_audio_output_device",
+                "output_device_index": index,
+                "output_device_name": dev_name
+            }))
 
 
     def cycle_stereo_mix_device(self):
@@ -1,254 +1,483 @@
 #!/usr/bin/env python3
 
+import os
+import math
 import time
-import threading
 import json
+import threading
 import logging
-import numpy as np
-from typing import Dict, Optional
-from .motor import MotorModule
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Version of the calibration file layout; files written by a newer layout are ignored
+SCHEMA_VERSION = 1
+# What a feedback source can measure
+FEEDBACK_QUANTITIES = ('speed', 'current', 'angle')
+
+
+class CalibrationError(Exception):
+    """A sweep could not produce a usable fit (no feedback, no movement, or stalled from the start)."""
+
+
+def fit_line(points: Sequence[Tuple[float, float]]) -> Tuple[float, float]:
+    """
+    Least-squares fit of ``y = slope * x + intercept``
+
+    Raises:
+        CalibrationError: With fewer than two distinct x values
+    """
+    n = len(points)
+    if n < 2:
+        raise CalibrationError(f"Need at least two points to fit a line, got {n}")
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    sxx = sum((x - mean_x) ** 2 for x, _ in points)
+    if sxx == 0:
+        raise CalibrationError("Cannot fit a line to points with a single x value")
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / sxx
+    return slope, mean_y - slope * mean_x
+
+
+class FeedbackSource(ABC):
+    """
+    A sensor the calibration sweeps read
+
+    Subclasses measure one quantity (``speed``, ``current`` or ``angle``)
+    of a named actuator (``left``/``right`` for the wheels, servo names
+    otherwise) from a callable supplied by whatever hardware provides it, so
+    real sensors and the simulated plant plug in the same way.
+    """
+
+    quantity = ''
+
+    @abstractmethod
+    def measure(self, name: str, window: float) -> Optional[float]:
+        """Measure ``name`` over ``window`` seconds; None if it can't be measured."""
+
+
+class EncoderFeedback(FeedbackSource):
+    """Wheel speed in revolutions per second from the encoder counts gained over the window"""
+
+    quantity = 'speed'
+
+    def __init__(self, read_counts: Callable[[str], int], counts_per_rev: float):
+        self.read_counts = read_counts
+        self.counts_per_rev = counts_per_rev
+
+    def measure(self, name: str, window: float) -> Optional[float]:
+        start_counts, start = self.read_counts(name), time.perf_counter()
+        time.sleep(window)
+        counts, elapsed = self.read_counts(name), time.perf_counter() - start
+        if elapsed <= 0:
+            return None
+        return (counts - start_counts) / self.counts_per_rev / elapsed
+
+
+class CurrentFeedback(FeedbackSource):
+    """Current draw in amps, averaged over the window"""
+
+    quantity = 'current'
+
+    def __init__(self, read_current: Callable[[str], Optional[float]], samples: int = 4):
+        self.read_current = read_current
+        self.samples = max(1, samples)
+
+    def measure(self, name: str, window: float) -> Optional[float]:
+        readings = []
+        for i in range(self.samples):
+            if i:
+                time.sleep(window / (self.samples - 1))
+            reading = self.read_current(name)
+            if reading is not None:
+                readings.append(reading)
+        return sum(readings) / len(readings) if readings else None
+
+
+class CameraFeedback(FeedbackSource):
+    """
+    Joint angle in degrees, estimated from camera images
+
+    ``estimate_angle`` returns the angle of the named joint relative to
+    straight ahead / level (or None if it isn't visible); the median of
+    ``samples`` estimates is used. Each estimate is a snapshot, so the
+    window isn't waited out.
+    """
+
+    quantity = 'angle'
+
+    def __init__(self, estimate_angle: Callable[[str], Optional[float]], samples: int = 1):
+        self.estimate_angle = estimate_angle
+        self.samples = max(1, samples)
+
+    def measure(self, name: str, window: float) -> Optional[float]:
+        estimates = sorted(a for a in (self.estimate_angle(name) for _ in range(self.samples)) if a is not None)
+        if not estimates:
+            return None
+        middle = len(estimates) // 2
+        return estimates[middle] if len(estimates) % 2 else (estimates[middle - 1] + estimates[middle]) / 2
+
+
+class MotorCalibration:
+    """
+    Maps a normalized speed (-1 to 1) to the throttle that produces it on one side
+
+    Non-zero speeds start at the side's deadband, and both sides are scaled
+    to the top speed the slower one can reach below its current limit, so
+    equal speeds drive straight.
+    """
+
+    __slots__ = ('deadband', 'scale', 'max_throttle', 'top_speed')
+
+    def __init__(self, deadband: float = 0.0, scale: float = 1.0, max_throttle: float = 1.0,
+                 top_speed: Optional[float] = None):
+        self.deadband = deadband
+        self.scale = scale
+        self.max_throttle = max_throttle
+        # Wheel revolutions per second at speed 1, if measured
+        self.top_speed = top_speed
+
+    @classmethod
+    def from_fits(cls, fits: Dict[str, dict]) -> Dict[str, 'MotorCalibration']:
+        """Calibrations for ``left`` and ``right`` from fitted ``deadband``/``gain``/``max_throttle`` values."""
+        reachable = [fit['gain'] * (fit.get('max_throttle', 1.0) - fit['deadband'])
+                     for fit in fits.values() if fit.get('gain', 0) > 0]
+        top_speed = min(reachable) if reachable else None
+        calibrations = {}
+        for side in ('left', 'right'):
+            fit = fits.get(side)
+            if not fit or fit.get('gain', 0) <= 0:
+                calibrations[side] = cls()
+                continue
+            calibrations[side] = cls(fit['deadband'], top_speed / fit['gain'], fit.get('max_throttle', 1.0), top_speed)
+        return calibrations
+
+    def throttle(self, speed: float) -> float:
+        if speed == 0:
+            return 0.0
+        return math.copysign(min(self.deadband + abs(speed) * self.scale, self.max_throttle), speed)
+
+
+class CalibrationStore:
+    """
+    Versioned calibration results in a JSON file
+
+    Every save adds a revision, carrying over the previous revision's motors
+    and servos where the new run didn't measure them. The last ``keep``
+    revisions are kept so a bad calibration can be rolled back.
+    """
+
+    def __init__(self, path: str, keep: int = 10):
+        self.path = path
+        self.keep = max(1, keep)
+        self._lock = threading.Lock()
+
+    def _read(self) -> List[dict]:
+        try:
+            with open(self.path) as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError) as e:
+            logger.warning(f"[CalibrationStore] Could not read {self.path}: {e}")
+            return []
+        schema = stored.get('schema') if isinstance(stored, dict) else None
+        if schema != SCHEMA_VERSION:
+            logger.warning(f"[CalibrationStore] Ignoring {self.path}: unsupported schema {schema}")
+            return []
+        return list(stored.get('revisions') or [])
+
+    def _write(self, revisions: List[dict]) -> None:
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump({'schema': SCHEMA_VERSION, 'revisions': revisions}, f, indent=2)
+        # Replaced in one step so a crash mid-write never leaves a truncated file
+        os.replace(temporary, self.path)
+
+    def load(self, revision: Optional[int] = None) -> Optional[dict]:
+        """The latest revision (or the given one), or None if there is none."""
+        with self._lock:
+            revisions = self._read()
+        if revision is None:
+            return revisions[-1] if revisions else None
+        return next((r for r in revisions if r.get('revision') == revision), None)
+
+    def revisions(self) -> List[int]:
+        with self._lock:
+            return [r.get('revision') for r in self._read()]
+
+    def save(self, motors: Optional[Dict[str, dict]] = None, servos: Optional[Dict[str, dict]] = None,
+             sources: Iterable[str] = ()) -> dict:
+        """
+        Store a new revision
+
+        Args:
+            motors: Fitted parameters by side (``left``/``right``)
+            servos: Fitted pulse ranges by servo name
+            sources: Feedback quantities the fits were made from
+
+        Returns:
+            dict: The revision as stored
+        """
+        return self._append(motors, servos, sources, merge=True)
+
+    def rollback(self, revision: int) -> dict:
+        """Store a copy of an earlier revision as the newest one."""
+        record = self.load(revision)
+        if record is None:
+            raise KeyError(f"No calibration revision {revision} in {self.path}")
+        return self._append(record.get('motors'), record.get('servos'), record.get('sources') or (), merge=False)
+
+    def _append(self, motors: Optional[Dict[str, dict]], servos: Optional[Dict[str, dict]],
+                sources: Iterable[str], merge: bool) -> dict:
+        with self._lock:
+            revisions = self._read()
+            latest = revisions[-1] if revisions else {}
+            carried = latest if merge else {}
+            record = {
+                'revision': latest.get('revision', 0) + 1,
+                'created': time.time(),
+                'sources': sorted(sources),
+                'motors': {**(carried.get('motors') or {}), **(motors or {})},
+                'servos': {**(carried.get('servos') or {}), **(servos or {})},
+            }
+            revisions = (revisions + [record])[-self.keep:]
+            self._write(revisions)
+        logger.info(f"[CalibrationStore] Saved calibration revision {record['revision']} to {self.path}")
+        return record
+
+
+def calibration_path(config: Config) -> str:
+    """Calibration file from ``motor.calibration_file``, relative to the config file."""
+    path = config.get('motor', 'calibration_file', default='data/calibration.json')
+    if not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(config.config_path), path)
+    return path
+
+
 class CalibrationController:
     """
-    Handles motor and servo calibration routines
+    Closed-loop motor and servo calibration
+
+    Motors: each side's throttle is stepped up from zero while the ``speed``
+    source measures the wheel, stopping early if the ``current`` source reads
+    over ``current_limit``. A line fitted through the moving samples gives the
+    deadband (the throttle where the wheel starts to turn) and the gain; the
+    last throttle under the current limit is the maximum.
+
+    Servos: each servo is stepped outward from the middle of its configured
+    range in both directions until the ``current`` source reads a stall or
+    the ``angle`` source shows it has stopped moving. The last pulses that
+    still moved it are its limits, and for the head the pulse where the fitted
+    angle crosses zero is its center.
+
+    Results are saved as a new revision in the calibration store and applied
+    to the MotorModule straight away; the MotorModule also loads the latest
+    revision at boot. Sweep settings come from the ``calibration`` config
+    section.
     """
-    
-    def __init__(self, motor: MotorModule, debug: bool = False):
+
+    def __init__(self, motor, sources: Optional[Dict[str, FeedbackSource]] = None,
+                 store: Optional[CalibrationStore] = None, debug: bool = False):
         """
         Initialize calibration controller
-        
+
         Args:
             motor: Reference to motor controller
+            sources: Feedback sources by quantity (``speed``, ``current``, ``angle``)
+            store: Where results are saved (the MotorModule's store by default)
             debug: Enable debug output
         """
         self.debug = debug
         self._lock = threading.Lock()
         self.motor = motor
-        
-        # Default calibration values
-        self.calibration = {
-            'motors': {
-                'left': {
-                    'neutral_point': 0.0,
-                    'max_speed': 1.0,
-                    'min_speed': 0.1
-                },
-                'right': {
-                    'neutral_point': 0.0,
-                    'max_speed': 1.0,
-                    'min_speed': 0.1
-                }
-            },
-            'servos': {
-                'head_pan': {
-                    'center': self.motor.HEAD_PAN_CENTER,
-                    'min': self.motor.HEAD_PAN_RIGHT,
-                    'max': self.motor.HEAD_PAN_LEFT
-                },
-                'head_tilt': {
-                    'center': self.motor.HEAD_TILT_CENTER,
-                    'min': self.motor.HEAD_TILT_UP,
-                    'max': self.motor.HEAD_TILT_DOWN
-                },
-                'arm_left': {
-                    'down': self.motor.ARM_LEFT_DOWN,
-                    'up': self.motor.ARM_LEFT_UP
-                },
-                'arm_right': {
-                    'down': self.motor.ARM_RIGHT_DOWN,
-                    'up': self.motor.ARM_RIGHT_UP
-                }
-            }
-        }
-        
-    def load_calibration(self, filename: str = 'calibration.json'):
-        """Load calibration from file"""
-        try:
-            with open(filename, 'r') as f:
-                self.calibration = json.load(f)
-            if self.debug:
-                logger.info("Loaded calibration from file")
-        except Exception as e:
-            logger.exception(f"Failed to load calibration: {e}")
-            
-    def save_calibration(self, filename: str = 'calibration.json'):
-        """Save calibration to file"""
-        try:
-            with open(filename, 'w') as f:
-                json.dump(self.calibration, f, indent=2)
-            if self.debug:
-                logger.info("Saved calibration to file")
-        except Exception as e:
-            logger.exception(f"Failed to save calibration: {e}")
-            
-    def calibrate_motors(self) -> Dict:
+        self.sources: Dict[str, FeedbackSource] = {}
+        for source in (sources or {}).values():
+            self.add_source(source)
+        self.store = store or motor.calibration_store
+        self.calibration: Optional[dict] = self.store.load()
+
+        settings = Config.shared().get('calibration', default={}) or {}
+        self.settle = float(settings.get('settle', 0.3))  # Seconds after each step before measuring
+        self.window = float(settings.get('window', 0.2))  # Seconds each measurement covers
+        self.motor_steps = int(settings.get('motor_steps', 20))
+        self.current_limit = float(settings.get('current_limit', 1.5))  # Amps per side
+        self.min_wheel_speed = float(settings.get('min_wheel_speed', 0.05))  # Revolutions per second
+        self.servo_step = int(settings.get('servo_step', 10))  # Microseconds
+        self.servo_sweep = tuple(settings.get('servo_sweep', (500, 2500)))
+        self.stall_current = float(settings.get('stall_current', 0.5))  # Amps per servo
+        self.min_servo_travel = float(settings.get('min_servo_travel', 0.02))  # Degrees per microsecond
+
+    def add_source(self, source: FeedbackSource) -> None:
+        """Use ``source`` for its quantity, replacing any earlier one."""
+        if source.quantity not in FEEDBACK_QUANTITIES:
+            raise ValueError(f"Unknown feedback quantity {source.quantity!r}")
+        self.sources[source.quantity] = source
+
+    def _measure(self, quantity: str, name: str) -> Optional[float]:
+        source = self.sources.get(quantity)
+        return source.measure(name, self.window) if source else None
+
+    def load_calibration(self, revision: Optional[int] = None) -> Optional[dict]:
+        """Load the latest (or given) revision from the store"""
+        self.calibration = self.store.load(revision)
+        if self.debug and self.calibration:
+            logger.info(f"[CalibrationController] Loaded calibration revision {self.calibration['revision']}")
+        return self.calibration
+
+    def save_calibration(self, motors: Optional[Dict[str, dict]] = None,
+                         servos: Optional[Dict[str, dict]] = None) -> dict:
+        """Save results as a new revision"""
+        self.calibration = self.store.save(motors, servos, self.sources)
+        return self.calibration
+
+    def apply_calibration(self):
+        """Apply the loaded calibration to the motor controller"""
+        self.motor.apply_calibration(self.calibration)
+        if self.debug:
+            logger.info("[CalibrationController] Applied calibration to motor controller")
+
+    def calibrate(self, motors: bool = True, servos: bool = True) -> dict:
         """
-        Calibrate DC motors
-        
+        Calibrate, save and apply in one go
+
         Returns:
-            Dictionary with calibration results
+            dict: The stored calibration revision
         """
         with self._lock:
-            results = {'left': {}, 'right': {}}
-            
-            for motor in ['left', 'right']:
-                # Find neutral point
-                neutral = self._find_neutral_point(motor)
-                results[motor]['neutral_point'] = neutral
-                
-                # Find minimum speed
-                min_speed = self._find_minimum_speed(motor)
-                results[motor]['min_speed'] = min_speed
-                
-                # Find maximum safe speed
-                max_speed = self._find_maximum_speed(motor)
-                results[motor]['max_speed'] = max_speed
-                
-            # Update calibration
-            self.calibration['motors'] = results
-            return results
-            
-    def calibrate_servos(self) -> Dict:
+            motor_results = self.calibrate_motors() if motors else {}
+            servo_results = self.calibrate_servos() if servos else {}
+            if not motor_results and not servo_results:
+                raise CalibrationError("Nothing could be calibrated")
+            self.save_calibration(motor_results, servo_results)
+            self.apply_calibration()
+            return self.calibration
+
+    def calibrate_motors(self, sides: Iterable[str] = ('left', 'right')) -> Dict[str, dict]:
         """
-        Calibrate servo positions
-        
+        Calibrate DC motors
+
         Returns:
-            Dictionary with calibration results
+            Fitted ``deadband``, ``gain`` (revolutions per second per unit
+            throttle) and ``max_throttle`` by side; sides that fail are logged
+            and left out
         """
-        with self._lock:
-            results = {}
-            
-            # Calibrate head pan
-            logger.info("Calibrating head pan...")
-            self.motor.move_head(pan=0)
-            input("Press Enter when head is centered horizontally")
-            results['head_pan'] = {
-                'center': self.motor.servo_positions['head_pan']
-            }
-            
-            self.motor.move_head(pan=-1)
-            input("Press Enter when head is at full right position")
-            results['head_pan']['min'] = self.motor.servo_positions['head_pan']
-            
-            self.motor.move_head(pan=1)
-            input("Press Enter when head is at full left position")
-            results['head_pan']['max'] = self.motor.servo_positions['head_pan']
-            
-            # Calibrate head tilt
-            logger.info("Calibrating head tilt...")
-            self.motor.move_head(tilt=0)
-            input("Press Enter when head is centered vertically")
-            results['head_tilt'] = {
-                'center': self.motor.servo_positions['head_tilt']
-            }
-            
-            self.motor.move_head(tilt=-1)
-            input("Press Enter when head is at full up position")
-            results['head_tilt']['min'] = self.motor.servo_positions['head_tilt']
-            
-            self.motor.move_head(tilt=1)
-            input("Press Enter when head is at full down position")
-            results['head_tilt']['max'] = self.motor.servo_positions['head_tilt']
-            
-            # Calibrate arms
-            logger.info("Calibrating left arm...")
-            self.motor.move_arm('left', 0)
-            input("Press Enter when left arm is in down position")
-            results['arm_left'] = {
-                'down': self.motor.servo_positions['arm_left']
-            }
-            
-            self.motor.move_arm('left', 1)
-            input("Press Enter when left arm is in up position")
-            results['arm_left']['up'] = self.motor.servo_positions['arm_left']
-            
-            logger.info("Calibrating right arm...")
-            self.motor.move_arm('right', 0)
-            input("Press Enter when right arm is in down position")
-            results['arm_right'] = {
-                'down': self.motor.servo_positions['arm_right']
-            }
-            
-            self.motor.move_arm('right', 1)
-            input("Press Enter when right arm is in up position")
-            results['arm_right']['up'] = self.motor.servo_positions['arm_right']
-            
-            # Update calibration
-            self.calibration['servos'] = results
-            return results
-            
-    def _find_neutral_point(self, motor: str) -> float:
-        """Find motor neutral point (minimum voltage to overcome static friction)"""
-        for voltage in np.linspace(0, 0.3, 30):
-            if motor == 'left':
-                self.motor.set_motor_speeds(voltage, 0)
-            else:
-                self.motor.set_motor_speeds(0, voltage)
-            time.sleep(0.1)
-            
-            # TODO: Add movement detection using encoders or sensors
-            # For now, return a reasonable default
-            return 0.1
-            
-    def _find_minimum_speed(self, motor: str) -> float:
-        """Find minimum speed for reliable movement"""
-        # Start from neutral point
-        neutral = self.calibration['motors'][motor]['neutral_point']
-        
-        for speed in np.linspace(neutral, 0.5, 20):
-            if motor == 'left':
-                self.motor.set_motor_speeds(speed, 0)
-            else:
-                self.motor.set_motor_speeds(0, speed)
-            time.sleep(0.1)
-            
-            # TODO: Add movement detection
-            # For now, return a reasonable default
-            return 0.2
-            
-    def _find_maximum_speed(self, motor: str) -> float:
-        """Find maximum safe speed based on current draw"""
-        for speed in np.linspace(0.5, 1.0, 20):
-            if motor == 'left':
-                self.motor.set_motor_speeds(speed, 0)
-            else:
-                self.motor.set_motor_speeds(0, speed)
-            time.sleep(0.1)
-            
-            # TODO: Add current monitoring
-            # For now, return a reasonable default
-            return 0.8
-            
-    def apply_calibration(self):
-        """Apply loaded calibration to motor controller"""
-        if self.motor:
-            # Apply motor calibration
-            self.motor.min_speed = max(
-                self.calibration['motors']['left']['min_speed'],
-                self.calibration['motors']['right']['min_speed']
-            )
-            self.motor.max_speed = min(
-                self.calibration['motors']['left']['max_speed'],
-                self.calibration['motors']['right']['max_speed']
-            )
-            
-            # Apply servo calibration
-            servos = self.calibration['servos']
-            self.motor.HEAD_PAN_CENTER = servos['head_pan']['center']
-            self.motor.HEAD_PAN_RIGHT = servos['head_pan']['min']
-            self.motor.HEAD_PAN_LEFT = servos['head_pan']['max']
-            
-            self.motor.HEAD_TILT_CENTER = servos['head_tilt']['center']
-            self.motor.HEAD_TILT_UP = servos['head_tilt']['min']
-            self.motor.HEAD_TILT_DOWN = servos['head_tilt']['max']
-            
-            self.motor.ARM_LEFT_DOWN = servos['arm_left']['down']
-            self.motor.ARM_LEFT_UP = servos['arm_left']['up']
-            
-            self.motor.ARM_RIGHT_DOWN = servos['arm_right']['down']
-            self.motor.ARM_RIGHT_UP = servos['arm_right']['up']
-            
-            if self.debug:
-                logger.info("Applied calibration to motor controller")
+        if 'speed' not in self.sources:
+            raise CalibrationError("Motor calibration needs a speed feedback source")
+        results = {}
+        for side in sides:
+            try:
+                results[side] = self.calibrate_motor(side)
+            except CalibrationError as e:
+                logger.error(f"[CalibrationController] {side} motor: {e}")
+        return results
+
+    def calibrate_motor(self, side: str) -> dict:
+        """Sweep one side's throttle and fit its deadband, gain and maximum throttle."""
+        points: List[Tuple[float, float]] = []
+        max_throttle = 1.0
+        try:
+            for step in range(1, self.motor_steps + 1):
+                throttle = step / self.motor_steps
+                self.motor.set_raw_throttle(throttle if side == 'left' else 0.0, throttle if side == 'right' else 0.0)
+                time.sleep(self.settle)
+                current = self._measure('current', side)
+                if current is not None and current > self.current_limit:
+                    max_throttle = (step - 1) / self.motor_steps
+                    break
+                speed = self._measure('speed', side)
+                if speed is not None:
+                    # Encoders wired either way round
+                    points.append((throttle, abs(speed)))
+        finally:
+            self.motor.release_throttle()
+        moving = [(t, s) for t, s in points if s >= self.min_wheel_speed]
+        if len(moving) < 2:
+            raise CalibrationError(f"Wheel did not turn below throttle {max_throttle:.2f}")
+        gain, intercept = fit_line(moving)
+        if gain <= 0:
+            raise CalibrationError("Wheel speed did not rise with throttle")
+        result = {'deadband': round(max(0.0, -intercept / gain), 4), 'gain': round(gain, 4),
+                  'max_throttle': round(max_throttle, 4)}
+        if self.debug:
+            logger.info(f"[CalibrationController] {side} motor: {result}")
+        return result
+
+    def calibrate_servos(self, names: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        """
+        Calibrate servo ranges
+
+        Returns:
+            Fitted ``min_pulse`` and ``max_pulse`` by servo, plus
+            ``center_pulse`` for the head and ``us_per_degree`` where an angle
+            source was available; servos that fail are logged and left out
+        """
+        if 'angle' not in self.sources and 'current' not in self.sources:
+            raise CalibrationError("Servo calibration needs an angle or current feedback source")
+        results = {}
+        for name in names or list(self.motor.servo_channels):
+            try:
+                results[name] = self.calibrate_servo(name)
+            except CalibrationError as e:
+                logger.error(f"[CalibrationController] {name} servo: {e}")
+        return results
+
+    def calibrate_servo(self, name: str) -> dict:
+        """Sweep one servo outward from the middle of its range and fit its limits (and center)."""
+        channel = self.motor.servo_channels[name]
+        start = channel.pulse(0.5 if name.endswith('_arm') else 0.0)
+        lower, upper = self.servo_sweep
+        first = self._servo_response(name, start)
+        if first[2] is not None and first[2] >= self.stall_current:
+            raise CalibrationError(f"Stalled at the starting pulse {start}us")
+        points = [first]
+        try:
+            for direction in (1, -1):
+                previous, peak, pulse = first, 0.0, start
+                while lower <= pulse + direction * self.servo_step <= upper:
+                    pulse += direction * self.servo_step
+                    point = self._servo_response(name, pulse)
+                    if self._servo_limited(previous, point, peak):
+                        break
+                    if point[1] is not None and previous[1] is not None:
+                        peak = max(peak, abs(point[1] - previous[1]))
+                    points.append(point)
+                    previous = point
+        finally:
+            self.motor.set_servo_pulse(name, start)
+        points.sort()
+        min_pulse, max_pulse = points[0][0], points[-1][0]
+        if max_pulse - min_pulse < 2 * self.servo_step:
+            raise CalibrationError(f"Servo barely moved ({min_pulse}-{max_pulse}us)")
+        result = {'min_pulse': min_pulse, 'max_pulse': max_pulse}
+        angles = [(pulse, angle) for pulse, angle, _ in points if angle is not None]
+        if len(angles) >= 2:
+            slope, intercept = fit_line(angles)
+            if slope:
+                result['us_per_degree'] = round(1.0 / slope, 3)
+                if not name.endswith('_arm'):
+                    # Straight ahead / level is where the fitted angle crosses zero
+                    result['center_pulse'] = int(round(max(min_pulse, min(max_pulse, -intercept / slope))))
+        if 'center_pulse' not in result and not name.endswith('_arm'):
+            result['center_pulse'] = (min_pulse + max_pulse) // 2
+        if self.debug:
+            logger.info(f"[CalibrationController] {name} servo: {result}")
+        return result
+
+    def _servo_response(self, name: str, pulse: int) -> Tuple[int, Optional[float], Optional[float]]:
+        self.motor.set_servo_pulse(name, pulse)
+        time.sleep(self.settle)
+        return pulse, self._measure('angle', name), self._measure('current', name)
+
+    def _servo_limited(self, previous: tuple, point: tuple, peak: float) -> bool:
+        """Whether ``point`` is past a limit: stall current, or it moved much less than the steps before."""
+        _, angle, current = point
+        if current is not None and current >= self.stall_current:
+            return True
+        if angle is None or previous[1] is None:
+            return False
+        return abs(angle - previous[1]) < max(0.5 * peak, self.min_servo_travel * self.servo_step)
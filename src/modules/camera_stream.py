@@ -0,0 +1,225 @@
+import asyncio
+import threading
+import time
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+MJPEG_BOUNDARY = "frame"
+
+
+class SyntheticFrameSource:
+    """
+    Frame source that renders a moving test pattern, for running the camera
+    stream without camera hardware.
+    """
+
+    def __init__(self, width: int = 640, height: int = 480, framerate: float = 30.0):
+        import numpy as np
+        self.width = width
+        self.height = height
+        self.framerate = framerate
+        self._started_at = time.monotonic()
+        # Static colour bars; a bright band scrolls down over them
+        bars = np.array([[255, 255, 255], [0, 255, 255], [255, 255, 0], [0, 255, 0],
+                         [255, 0, 255], [0, 0, 255], [255, 0, 0], [0, 0, 0]], dtype=np.uint8)
+        columns = (np.arange(width) * len(bars) // width)
+        self._bars = np.broadcast_to(bars[columns], (height, width, 3))
+
+    @property
+    def frame_count(self) -> int:
+        """Index of the current frame, advancing at ``framerate`` like a camera would."""
+        return int((time.monotonic() - self._started_at) * self.framerate)
+
+    def get_frame(self):
+        """Return the current BGR frame."""
+        frame = self._bars.copy()
+        band = (self.frame_count * 4) % self.height
+        frame[band:band + 8, :, :] = 255
+        return frame
+
+
+class MjpegStreamer:
+    """
+    Encodes camera frames to JPEG once and fans the bytes out to all viewers.
+
+    A single encoder thread runs only while at least one viewer is connected.
+    Each viewer has a one-slot queue holding the latest JPEG, so a slow
+    browser skips frames instead of building up a backlog.
+    """
+
+    def __init__(self,
+                 source: Any,
+                 quality: int = 70,
+                 scale: float = 1.0,
+                 max_fps: float = 15.0,
+                 encoder: Optional[Callable[[Any], bytes]] = None,
+                 debug: bool = False):
+        """
+        Initialize the streamer
+
+        Args:
+            source: Object with ``get_frame()`` (BGR numpy array or None); an
+                optional ``frame_count`` attribute lets unchanged frames be skipped
+                and an optional ``start()`` is called when the first viewer connects
+            quality: JPEG quality (1-100)
+            scale: Resize factor applied before encoding
+            max_fps: Upper bound on encoded frames per second
+            encoder: Override for the frame -> JPEG bytes function
+            debug: Enable debug output
+        """
+        self.source = source
+        self.quality = int(quality)
+        self.scale = float(scale)
+        self.max_fps = float(max_fps)
+        self.debug = debug
+        self._encode = encoder or self._encode_jpeg
+        self._lock = threading.Lock()
+        self._viewers: Set[tuple] = set()
+        self._has_viewers = threading.Event()
+        self._running = True
+        self._thread: Optional[threading.Thread] = None
+        self._last_jpeg: Optional[bytes] = None
+
+        self.frames_encoded = 0
+        self.frames_skipped = 0
+        self.bytes_encoded = 0
+        self.encode_time = 0.0
+        self.last_frame_size = 0
+
+    def _encode_jpeg(self, frame) -> bytes:
+        import cv2
+        if frame.ndim == 3 and frame.shape[2] == 4:
+            # Picamera2 preview frames are XBGR; JPEG has no alpha channel
+            frame = frame[:, :, :3]
+        if self.scale != 1.0:
+            frame = cv2.resize(frame, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            raise ValueError("JPEG encoding failed")
+        return jpeg.tobytes()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._encode_loop, daemon=True, name="mjpeg-encoder")
+            self._thread.start()
+
+    def add_viewer(self, loop: asyncio.AbstractEventLoop) -> asyncio.Queue:
+        """Register a viewer on ``loop`` and return its latest-frame queue."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        with self._lock:
+            if self._last_jpeg is not None:
+                # Show something immediately, even if the camera is between frames
+                queue.put_nowait(self._last_jpeg)
+            self._viewers.add((loop, queue))
+            self._has_viewers.set()
+        if hasattr(self.source, 'start'):
+            try:
+                self.source.start()
+            except Exception as e:
+                logger.error(f"[MjpegStreamer] Failed to start frame source: {e}")
+        self._ensure_thread()
+        if self.debug:
+            logger.info(f"[MjpegStreamer] Viewer connected ({len(self._viewers)} total)")
+        return queue
+
+    def remove_viewer(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._viewers.discard((loop, queue))
+            if not self._viewers:
+                self._has_viewers.clear()
+        if self.debug:
+            logger.info(f"[MjpegStreamer] Viewer disconnected ({len(self._viewers)} total)")
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, jpeg: bytes) -> None:
+        # Replace whatever the viewer has not picked up yet
+        if queue.full():
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        queue.put_nowait(jpeg)
+
+    def _encode_loop(self) -> None:
+        last_count = None
+        interval = 1.0 / self.max_fps if self.max_fps > 0 else 0.0
+        next_frame = time.monotonic()
+        while self._running:
+            if not self._has_viewers.wait(timeout=1.0):
+                # Nobody watching: don't touch the camera frame at all
+                continue
+            if not self._running:
+                break
+            now = time.monotonic()
+            if now < next_frame:
+                time.sleep(next_frame - now)
+            next_frame = max(next_frame + interval, time.monotonic())
+
+            count = getattr(self.source, 'frame_count', None)
+            if count is not None and count == last_count:
+                self.frames_skipped += 1
+                continue
+            frame = self.source.get_frame()
+            if frame is None:
+                continue
+            last_count = getattr(self.source, 'frame_count', count)
+
+            start = time.perf_counter()
+            try:
+                jpeg = self._encode(frame)
+            except Exception as e:
+                logger.error(f"[MjpegStreamer] Encoding failed: {e}")
+                time.sleep(0.1)
+                continue
+            self.encode_time += time.perf_counter() - start
+            self.frames_encoded += 1
+            self.bytes_encoded += len(jpeg)
+            self.last_frame_size = len(jpeg)
+
+            with self._lock:
+                self._last_jpeg = jpeg
+                viewers = list(self._viewers)
+            for loop, queue in viewers:
+                try:
+                    loop.call_soon_threadsafe(self._offer, queue, jpeg)
+                except RuntimeError:
+                    # Viewer's loop has closed
+                    self.remove_viewer(loop, queue)
+
+    async def mjpeg(self) -> AsyncIterator[bytes]:
+        """Yield multipart/x-mixed-replace chunks for one viewer until it disconnects."""
+        loop = asyncio.get_running_loop()
+        queue = self.add_viewer(loop)
+        try:
+            while True:
+                jpeg = await queue.get()
+                yield (b"--" + MJPEG_BOUNDARY.encode() + b"\r\n"
+                       b"Content-Type: image/jpeg\r\n"
+                       b"Content-Length: " + str(len(jpeg)).encode() + b"\r\n\r\n" + jpeg + b"\r\n")
+        finally:
+            self.remove_viewer(loop, queue)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return viewer count and encoder throughput."""
+        encoded = self.frames_encoded
+        return {
+            "viewers": len(self._viewers),
+            "frames_encoded": encoded,
+            "frames_skipped": self.frames_skipped,
+            "avg_encode_ms": round(self.encode_time / encoded * 1000, 3) if encoded else 0.0,
+            "avg_frame_bytes": round(self.bytes_encoded / encoded) if encoded else 0,
+            "last_frame_bytes": self.last_frame_size,
+            "quality": self.quality,
+            "scale": self.scale,
+            "max_fps": self.max_fps,
+        }
+
+    def cleanup(self) -> None:
+        """Stop the encoder thread."""
+        self._running = False
+        self._has_viewers.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+import os
+import time
+import uuid
+import sqlite3
+import threading
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    last_active REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL REFERENCES sessions(id),
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_session ON messages(session_id, id);
+"""
+
+
+class ConversationStore:
+    """
+    Append-only on-disk conversation log backed by SQLite.
+
+    Messages are only ever inserted, never updated, so a crash can at worst
+    lose the message that was being written. Every message belongs to a
+    session; the latest session can be resumed after a restart.
+    """
+
+    def __init__(self, path: str, debug: bool = False):
+        """
+        Open (or create) the conversation database
+
+        Args:
+            path: Path to the SQLite file, or ":memory:" for a throwaway store
+            debug: Enable debug output
+        """
+        self.debug = debug
+        self.path = path
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+
+        # Writes happen from STT/worker threads, reads from the API thread.
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        if self.debug:
+            logger.info(f"[ConversationStore] Opened conversation log at {path}")
+
+    def new_session(self) -> str:
+        """Create a new session and return its ID."""
+        session_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sessions (id, started_at, last_active) VALUES (?, ?, ?)",
+                (session_id, now, now),
+            )
+        if self.debug:
+            logger.info(f"[ConversationStore] Started session {session_id}")
+        return session_id
+
+    def latest_session(self) -> Optional[str]:
+        """Return the most recently active session ID, or None if the log is empty."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM sessions ORDER BY last_active DESC LIMIT 1"
+            ).fetchone()
+        return row[0] if row else None
+
+    def list_sessions(self, limit: int = 20) -> List[Dict]:
+        """Return recent sessions with their message counts, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT s.id, s.started_at, s.last_active, COUNT(m.id)
+                FROM sessions s LEFT JOIN messages m ON m.session_id = s.id
+                GROUP BY s.id ORDER BY s.last_active DESC LIMIT ?
+                """,
+                (int(limit),),
+            ).fetchall()
+        return [
+            {'id': r[0], 'started_at': r[1], 'last_active': r[2], 'messages': r[3]}
+            for r in rows
+        ]
+
+    def append(self, session_id: str, role: str, content: str) -> int:
+        """
+        Append a message to a session
+
+        Args:
+            session_id: Session the message belongs to
+            role: OpenAI-style role ('user', 'assistant', ...)
+            content: Message text
+
+        Returns:
+            Row ID of the stored message
+        """
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO messages (session_id, role, content, created_at) VALUES (?, ?, ?, ?)",
+                (session_id, role, content, now),
+            )
+            self._conn.execute(
+                "UPDATE sessions SET last_active = ? WHERE id = ?",
+                (now, session_id),
+            )
+            return cur.lastrowid
+
+    def recent_messages(self, session_id: str, limit: int) -> List[Dict[str, str]]:
+        """
+        Return the last ``limit`` messages of a session in chronological order
+
+        Uses the (session_id, id) index, so the cost depends on ``limit``,
+        not on the size of the log.
+        """
+        if limit <= 0:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT role, content FROM messages WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+                (session_id, int(limit)),
+            ).fetchall()
+        return [{'role': role, 'content': content} for role, content in reversed(rows)]
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception as e:
+                logger.error(f"[ConversationStore] Error closing store: {e}")
@@ -7,6 +7,11 @@ import pygame
 import logging
 import json
 
+from utils.scheduler import SCHEDULER
+
+# Input polling rate in threaded mode
+POLL_RATE_HZ = 100.0
+
 logger = logging.getLogger(__name__)
 
 class Joystick:
@@ -78,9 +83,9 @@ class Joystick:
         self._active_combinations = {}  # Track active combinations and their start times
         self._triggered_combinations = set()  # Track which combinations have been triggered
         
-        # Control thread
+        # Polling task (threaded mode)
         self.is_running = False
-        self.thread = None
+        self._poll_task = None
 
         # Debug helpers
         self._last_debug_log_time = 0.0
@@ -101,16 +106,17 @@ class Joystick:
             return
         if not self.is_running:
             self.is_running = True
-            self.thread = threading.Thread(target=self._process_input, daemon=True)
-            self.thread.start()
+            self._poll_task = SCHEDULER.every(POLL_RATE_HZ, self._process_input, name='joystick-module',
+                                              group='joystick')
             if self.debug:
                 logger.info("Started joystick processing")
                 
     def stop(self):
         """Stop processing joystick input"""
         self.is_running = False
-        if self.thread:
-            self.thread.join()
+        if self._poll_task:
+            self._poll_task.cancel()
+            self._poll_task = None
             if self.debug:
                 logger.info("Stopped joystick processing")
                 
@@ -180,12 +186,9 @@ class Joystick:
         """Get current state of a button"""
         return self.button_values.get(button, False)
         
-    def _process_input(self):
-        """Main input processing loop"""
-        while self.is_running:
-            self.process_once(self.smoothing)
-
-            time.sleep(0.01)  # Prevent excessive CPU usage
+    def _process_input(self, dt: float):
+        """Process one input tick (scheduled at ``POLL_RATE_HZ``)"""
+        self.process_once(self.smoothing)
 
     def process_once(self, smoothing: float = None):
         """Process a single input tick: pump events, read axes/buttons, emit snapshot if changed."""
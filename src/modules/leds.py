@@ -2,7 +2,6 @@
 
 import sys
 import os
-import time
 import threading
 import colorsys
 import numpy as np
@@ -13,10 +12,15 @@ sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__f
 
 from config import Config
 from utils.hardware import LED_AVAILABLE
+from utils.metrics import histogram
+from utils.scheduler import SCHEDULER
+from controller.events import BUS, DropPolicy, LedFrame
 
 import logging
 logger = logging.getLogger(__name__)
 
+LED_FRAME_SECONDS = histogram('robbie_led_frame_seconds', 'Time to push one LED frame to the matrix and its listeners')
+
 UNICORN_AVAILABLE = False
 if LED_AVAILABLE:
     try:
@@ -49,8 +53,12 @@ class LedsModule:
         """
         self.debug = debug
         self._lock = threading.Lock()
-        self.width = Config().get('lights', 'width', default=8)
-        self.height = Config().get('lights', 'height', default=4)
+        config = Config.shared()
+        self.width = config.get('lights', 'width', default=8)
+        self.height = config.get('lights', 'height', default=4)
+        # Animation frames go through show(), which waits for the next frame deadline (API callers don't)
+        self._frame_pacer = SCHEDULER.pacer('leds', config.get('lights', 'update_rate', default=30) or 0,
+                                            metrics_prefix='robbie_led_frame')
         
         # Initialize LED hardware
         self.unicorn = None
@@ -79,8 +87,19 @@ class LedsModule:
         self.volume_smoothing = 0.3  # Smoothing factor for volume changes
         self.last_volume = 0
 
-        # Callback hooks
-        self._update_callbacks = []
+        # Update callback subscriptions on the event bus
+        self._update_subscriptions = []
+
+        self._unsubscribe_config = config.subscribe('lights', self._on_lights_config)
+
+    def _on_lights_config(self, change):
+        """Apply edited frame rate and brightness to the running matrix."""
+        new = change.new or {}
+        if change.changed('update_rate'):
+            self._frame_pacer.set_rate(max(0.0, float(new.get('update_rate') or 0)))
+        if change.changed('max_brightness') and self.unicorn and new.get('max_brightness') is not None:
+            with self._lock:
+                self.unicorn.brightness(float(new['max_brightness']))
         
     def set_pixel(self, x: int, y: int, r: int, g: int, b: int):
         """Set color of a single pixel"""
@@ -108,16 +127,23 @@ class LedsModule:
         self.set_all(0, 0, 0)
         self.show()
     
-    def show(self):
-        """Update the display with current buffer"""
-        if self.unicorn:
-            self.unicorn.show()
-        # Trigger update callbacks
-        for callback in self._update_callbacks:
-            try:
-                callback(self)
-            except Exception as e:
-                logger.error(f"Error in LED update callback: {e}")
+    def show(self, wait: bool = True):
+        """
+        Update the display with current buffer
+
+        Args:
+            wait: Wait for the next frame slot, so a loop calling this runs at
+                most ``lights.update_rate`` times a second. Pass False from
+                callers that must not block (the API's event loop); the frame
+                is shown straight away.
+        """
+        if wait:
+            self._frame_pacer.wait()
+        with LED_FRAME_SECONDS.time():
+            if self.unicorn:
+                self.unicorn.show()
+            # Update callbacks run on their own threads, so a slow one never delays a frame
+            BUS.publish(LedFrame(self))
     
     # Rainbow animation logic has been moved to LedsAnimations.
     
@@ -128,8 +154,12 @@ class LedsModule:
     # Sparkle animation logic has been moved to LedsAnimations.
     
     def add_update_callback(self, callback):
-        """Register a callback to be triggered on LED updates."""
-        self._update_callbacks.append(callback)
+        """Register a callback to be triggered with this module after LED updates (latest frame only)."""
+        def on_frame(event: LedFrame):
+            if event.leds is self:
+                callback(self)
+        name = f"leds-update:{getattr(callback, '__qualname__', type(callback).__name__)}"
+        self._update_subscriptions.append(BUS.subscribe(LedFrame, on_frame, name=name, drop=DropPolicy.LATEST))
     
     def visualize_audio(self, volume: float, color: Tuple[int, int, int] = (0, 255, 0)):
         """
@@ -268,6 +298,10 @@ class LedsModule:
 
     def cleanup(self):
         """Clean up resources and turn off LEDs"""
+        self._unsubscribe_config()
         self.clear()
+        self._frame_pacer.cancel()
+        for subscription in self._update_subscriptions:
+            subscription.cancel()
         if self.debug:
             logger.info("LED cleanup completed")
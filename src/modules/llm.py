@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
 
 import os
+import time
 import logging
 import threading
-from openai import OpenAI
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
@@ -12,6 +12,12 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 from config import Config
+from utils.metrics import counter, histogram
+from utils.tracing import TRACER
+
+LLM_TTFT_SECONDS = histogram('robbie_llm_time_to_first_token_seconds', 'Time from LLM request to the first streamed token')
+LLM_REQUEST_SECONDS = histogram('robbie_llm_request_seconds', 'Total LLM request time')
+LLM_ERRORS = counter('robbie_llm_errors_total', 'Failed LLM requests')
 
 class LlmModule:
 
@@ -28,6 +34,8 @@ class LlmModule:
         self._lock = threading.Lock()
         api_key = api_key or os.getenv('OPENAI_API_KEY')
         if api_key:
+            # The openai package is slow to import; only load it once there is a key to use
+            from openai import OpenAI
             self.client = OpenAI(api_key=api_key)
             if self.debug:
                 logger.info("OpenAI initialized")
@@ -47,15 +55,31 @@ class LlmModule:
         """
         if not self.client:
             return "AI processing not available"
-        with self._lock:
+        with self._lock, TRACER.span('llm', model=self.model) as span:
+            start = time.perf_counter()
             try:
-                response = self.client.chat.completions.create(
+                # Stream so time-to-first-token can be measured
+                stream = self.client.chat.completions.create(
                     model=self.model,
                     messages=messages,
-                    temperature=temperature
+                    temperature=temperature,
+                    stream=True
                 )
-                return response.choices[0].message.content
+                parts = []
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        if not parts:
+                            LLM_TTFT_SECONDS.observe(time.perf_counter() - start)
+                            TRACER.start_span('llm_first_token', start=start).finish()
+                        parts.append(content)
+                LLM_REQUEST_SECONDS.observe(time.perf_counter() - start)
+                return "".join(parts)
             except Exception as e:
+                LLM_ERRORS.inc()
+                span.finish(error=str(e))
                 logger.error(f"Error in LLM processing: {e}")
                 return f"Error: {str(e)}"
 
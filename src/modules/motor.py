@@ -6,7 +6,6 @@ import time
 import threading
 from typing import Optional, Dict, Tuple
 import logging
-import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +14,85 @@ sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__f
 
 from config import Config
 from utils.hardware import MOTORS_AVAILABLE, SERVOS_AVAILABLE
+from utils.metrics import counter, gauge
+from utils.scheduler import SCHEDULER
+from .calibration import CalibrationStore, MotorCalibration, calibration_path
+from .pwm import PCA9685, MOTOR_HAT_ADDRESS, SERVO_HAT_ADDRESS, stage_throttle
+from .trajectory import ServoMotion, ServoTrajectory
+
+MOTOR_I2C_WRITES = counter('robbie_motor_i2c_writes_total', 'DC motor I2C writes')
+MOTOR_I2C_WRITES_PER_SECOND = gauge(
+    'robbie_motor_i2c_writes_per_second', 'DC motor I2C writes per second over the last report window')
+
+# The PCA9685 on the motor HAT has 12-bit PWM, so smaller throttle changes never reach the motors
+THROTTLE_STEPS = 4095
+# How often the I2C write rate is refreshed
+STATS_WINDOW_SECONDS = 1.0
+
+# Channel and normalized range of each servo, where motor.servos doesn't give a channel
+SERVO_DEFAULT_CHANNELS = {'left_arm': 0, 'right_arm': 1, 'head_pan': 14, 'head_tilt': 15}
+SERVO_RANGES = {'left_arm': (0.0, 1.0), 'right_arm': (0.0, 1.0), 'head_pan': (-1.0, 1.0), 'head_tilt': (-1.0, 1.0)}
+# Servo command counts are logged (debug) and missing-hardware warnings repeated at most this often
+SERVO_DIAGNOSTIC_SECONDS = 5.0
+
+
+def quantize_throttle(value: float) -> float:
+    """Round a throttle (-1 to 1) to the nearest step the PWM hardware can output."""
+    return round(max(-1.0, min(1.0, value)) * THROTTLE_STEPS) / THROTTLE_STEPS
+
+
+def ramp(current: float, target: float, max_step: float) -> float:
+    """Move ``current`` towards ``target`` by at most ``max_step`` (no limit if ``max_step`` <= 0)."""
+    if max_step <= 0:
+        return target
+    delta = target - current
+    if delta > max_step:
+        return current + max_step
+    if delta < -max_step:
+        return current - max_step
+    return target
+
+
+class ServoChannel:
+    """
+    Pulse mapping for one servo, precomputed from its motor.servos entry
+
+    Arms map 0..1 linearly across the pulse range; head servos map -1..1
+    around the center pulse (the midpoint unless ``center_pulse`` is set), so
+    each side of center can have its own scale. Built once per config change
+    so the servo loop does no dict lookups or divisions per write.
+    """
+
+    __slots__ = ('name', 'channel', 'min_pulse', 'max_pulse', 'writes', '_offset', '_below', '_above', '_angle_scale')
+
+    def __init__(self, name: str, channel: int, min_pulse: int = 500, max_pulse: int = 2500,
+                 center_pulse: Optional[int] = None):
+        self.name = name
+        self.channel = channel
+        self.min_pulse = min_pulse
+        self.max_pulse = max_pulse
+        self.writes = 0
+        if name.endswith('_arm'):
+            self._offset, self._below, self._above = min_pulse, 0, max_pulse - min_pulse
+        else:
+            center = center_pulse if center_pulse is not None else (min_pulse + max_pulse) // 2
+            self._offset, self._below, self._above = center, center - min_pulse, max_pulse - center
+        self._angle_scale = 180.0 / (max_pulse - min_pulse)
+
+    @classmethod
+    def from_config(cls, name: str, servo_config: Optional[dict]) -> 'ServoChannel':
+        servo_config = servo_config or {}
+        return cls(name, servo_config.get('channel', SERVO_DEFAULT_CHANNELS[name]),
+                   servo_config.get('min_pulse', 500), servo_config.get('max_pulse', 2500),
+                   servo_config.get('center_pulse'))
+
+    def pulse(self, position: float) -> int:
+        """Pulse width in microseconds for a normalized position (already within the servo's range)."""
+        return int(self._offset + position * (self._above if position >= 0 else self._below))
+
+    def angle(self, pulse: int) -> float:
+        """ServoKit angle (0-180) for a pulse width."""
+        return (pulse - self.min_pulse) * self._angle_scale
 
 if MOTORS_AVAILABLE or SERVOS_AVAILABLE:
     import board
@@ -30,6 +108,16 @@ class MotorModule:
     """
     Unified motor controller for both DC motors and servos.
     Handles acceleration limiting and thread safety.
+
+    ``left_speed``/``right_speed`` are the targets set by callers. The update
+    loop ramps ``left_output``/``right_output`` towards them by at most
+    ``acceleration`` (throttle per second) and only writes a side's throttle
+    over I2C when its quantized value changes.
+
+    The latest revision in the calibration store (``motor.calibration_file``)
+    is applied at boot: outputs are mapped through each side's fitted
+    deadband and gain, and fitted servo pulse ranges replace the configured
+    ones.
     """
     
     def __init__(self, debug: bool = False):
@@ -45,18 +133,32 @@ class MotorModule:
         self._head_pan = None
         self._head_tilt = None
         self._lock = threading.Lock()
+        # Serializes throttle writes (control loop, stop, calibration) so a stale write can't land after a newer one
+        self._write_lock = threading.RLock()
         
         # Load config
-        config = Config()
+        config = Config.shared()
         
         # DC motor settings
         self.max_speed = config.get('motor', 'dc_motors', 'max_speed', default=1.0)
         self.acceleration = config.get('motor', 'dc_motors', 'acceleration', default=1.0)
         self.update_rate = config.get('motor', 'dc_motors', 'update_rate', default=500)
-        
+        self._unsubscribe_config = config.subscribe('motor', self._on_motor_config)
+
+        # Fitted by CalibrationController; the configured values apply where nothing was fitted
+        self.calibration_store = CalibrationStore(calibration_path(config))
+        self.calibration = self.calibration_store.load()
+        self.motor_calibration, self._servo_calibration = self._fitted(self.calibration)
+        if self.calibration:
+            logger.info(f"[MotorModule] Using calibration revision {self.calibration.get('revision')}")
+        servos = self._calibrated_servos(config.get('motor', 'servos', default={}) or {})
+
         # Initialize hardware
         self.motor_kit = None
         self.servo_kit = None
+        # Batched register writers; the kits still configure the chips at startup
+        self.motor_pwm: Optional[PCA9685] = None
+        self.servo_pwm: Optional[PCA9685] = None
         
         logger.info(f"Hardware detection - Motors: {MOTORS_AVAILABLE}, Servos: {SERVOS_AVAILABLE}")
         
@@ -66,6 +168,8 @@ class MotorModule:
                 self.motor_kit = MotorKit(i2c=board.I2C()) if MotorKit else None
                 if self.debug:
                     logger.info("MotorKit initialized successfully")
+                if self.motor_kit:
+                    self.motor_pwm = self._open_pwm(MOTOR_HAT_ADDRESS)
             except Exception as e:
                 logger.error(f"Failed to initialize MotorKit (motors): {e}")
                 self.motor_kit = None
@@ -78,17 +182,8 @@ class MotorModule:
                 
                 # Store servo configurations for pulse width conversion
                 if self.servo_kit:
-                    self.servo_configs = config.get('motor', 'servos', default={})
-                    for servo_name, servo_config in self.servo_configs.items():
-                        channel = servo_config.get('channel')
-                        min_pulse = servo_config.get('min_pulse')
-                        max_pulse = servo_config.get('max_pulse')
-                        if channel is not None and min_pulse is not None and max_pulse is not None:
-                            try:
-                                self.servo_kit.servo[channel].set_pulse_width_range(min_pulse, max_pulse)
-                                logger.info(f"Configured {servo_name} (channel {channel}): pulse range {min_pulse}-{max_pulse}")
-                            except Exception as e:
-                                logger.warning(f"Failed to configure {servo_name}: {e}")
+                    self._configure_pulse_ranges(servos)
+                    self.servo_pwm = self._open_pwm(SERVO_HAT_ADDRESS)
             except Exception as e:
                 logger.warning(f"Failed to initialize ServoKit (servos): {e}. Servo control will be disabled.")
                 self.servo_kit = None
@@ -97,18 +192,122 @@ class MotorModule:
             self.motor_kit = None
             self.servo_kit = None
 
-        # Motor state
+        # Motor state: targets, and the ramped outputs last written to the motors
         self.left_speed = 0
         self.right_speed = 0
+        self.left_output = 0.0
+        self.right_output = 0.0
+        self._written: Tuple[Optional[float], Optional[float]] = (None, None)
+        # Uncalibrated throttles held by set_raw_throttle, bypassing the ramp
+        self._raw_throttle: Optional[Tuple[float, float]] = None
+        self._loop_stats = {'i2c_writes_per_second': 0.0, 'i2c_writes': 0, 'i2c_errors': 0}
+        self._window_start = time.perf_counter()
+        self._window_writes = 0
+
+        # Ramp and write on the shared control thread; exports robbie_motor_loop_{jitter_seconds,hz}
+        self.update_task = SCHEDULER.every(self.update_rate, self._tick, name='motors', group='control',
+                                           metrics_prefix='robbie_motor_loop')
+        if self.debug:
+            logger.debug(f"[MotorModule] Update loop started (motor_kit available: {self.motor_kit is not None})")
+
+        # Servo moves follow velocity/acceleration-limited trajectories stepped on the control thread
+        servo_motion = config.get('motor', 'servo_motion', default={}) or {}
+        self.servo_motion = ServoMotion(self._build_trajectories(servo_motion, servos))
+        self.servo_channels = self._build_servo_channels(servos)
+        # Commands are counted here and reported from the servo loop instead of logged one by one
+        self._servo_commands = 0
+        self._servo_diagnostic_at = time.perf_counter()
+        self._servo_warning_at: Optional[float] = None
+        self._servo_warnings_suppressed = 0
+        self.servo_task = None
+        if self.servo_kit:
+            self.servo_task = SCHEDULER.every(servo_motion.get('update_rate', 50), self._servo_tick, name='servos',
+                                              group='control', metrics_prefix='robbie_servo_loop')
+
+    @staticmethod
+    def _build_trajectories(servo_motion: dict, servos: dict) -> Dict[str, ServoTrajectory]:
+        """One trajectory per servo, with motor.servo_motion limits unless its motor.servos entry overrides them."""
+        trajectories = {}
+        for name, (lower, upper) in SERVO_RANGES.items():
+            servo_config = {**servo_motion, **(servos.get(name) or {})}
+            trajectories[name] = ServoTrajectory(
+                position=max(lower, 0.0),
+                max_velocity=float(servo_config.get('max_velocity', 2.0)),
+                max_acceleration=float(servo_config.get('max_acceleration', 8.0)),
+                profile=servo_config.get('profile', 'trapezoidal'),
+                lower=lower,
+                upper=upper,
+            )
+        return trajectories
+
+    @staticmethod
+    def _build_servo_channels(servos: dict) -> Dict[str, ServoChannel]:
+        return {name: ServoChannel.from_config(name, servos.get(name)) for name in SERVO_DEFAULT_CHANNELS}
+
+    @staticmethod
+    def _fitted(record: Optional[dict]) -> Tuple[Dict[str, MotorCalibration], Dict[str, dict]]:
+        """Motor calibrations and fitted servo pulse ranges from a calibration revision."""
+        record = record or {}
+        servos = {name: {key: fit[key] for key in ('min_pulse', 'max_pulse', 'center_pulse') if key in fit}
+                  for name, fit in (record.get('servos') or {}).items()}
+        return MotorCalibration.from_fits(record.get('motors') or {}), servos
+
+    def _calibrated_servos(self, servos: dict) -> dict:
+        """motor.servos with fitted pulse ranges in place of the configured ones."""
+        return {name: {**(servos.get(name) or {}), **self._servo_calibration.get(name, {})}
+                for name in set(servos) | set(self._servo_calibration)}
+
+    def _configure_pulse_ranges(self, servos: dict):
+        """Give ServoKit each servo's pulse range, for writes that go through its angles."""
+        for servo_name, servo_config in servos.items():
+            channel = servo_config.get('channel', SERVO_DEFAULT_CHANNELS.get(servo_name))
+            min_pulse = servo_config.get('min_pulse')
+            max_pulse = servo_config.get('max_pulse')
+            if channel is not None and min_pulse is not None and max_pulse is not None:
+                try:
+                    self.servo_kit.servo[channel].set_pulse_width_range(min_pulse, max_pulse)
+                    logger.info(f"Configured {servo_name} (channel {channel}): pulse range {min_pulse}-{max_pulse}")
+                except Exception as e:
+                    logger.warning(f"Failed to configure {servo_name}: {e}")
+
+    def apply_calibration(self, record: Optional[dict]):
+        """
+        Use the fitted parameters of a calibration revision
+
+        Args:
+            record: Revision from the calibration store (None restores the configured values)
+        """
+        motor_calibration, servo_calibration = self._fitted(record)
+        with self._write_lock, self._lock:
+            self.calibration = record
+            self.motor_calibration = motor_calibration
+            self._servo_calibration = servo_calibration
+            # Rewritten through the new mapping on the next tick
+            if self._raw_throttle is None:
+                self._written = (None, None)
+        servos = self._calibrated_servos(Config.shared().get('motor', 'servos', default={}) or {})
+        self.servo_channels = self._build_servo_channels(servos)
+        if not self.servo_kit:
+            return
+        self._configure_pulse_ranges(servos)
+        # Servos hold their positions under the new mapping
+        try:
+            for name, position in self.servo_motion.positions().items():
+                servo = self.servo_channels[name]
+                pulse = servo.pulse(position)
+                self._set_servo(servo.channel, pulse, servo.angle(pulse))
+        except Exception as e:
+            logger.error(f"[MotorModule] Failed to set servo position: {e}")
+        self._flush_servos()
         
-        # Start update thread
-        self.is_running = True
-        self.update_thread = threading.Thread(
-            target=self._update_loop,
-            daemon=True
-        )
-        self.update_thread.start()
-        
+    def _open_pwm(self, address: int) -> Optional[PCA9685]:
+        """Open a batched writer for a HAT, or None to fall back to the kit's per-channel writes."""
+        try:
+            return PCA9685(board.I2C(), address=address, debug=self.debug)
+        except Exception as e:
+            logger.warning(f"[MotorModule] Batched PWM writes unavailable at 0x{address:02x}: {e}")
+            return None
+
     def set_motor_speeds(self, left: float, right: float):
         """
         Set motor speeds
@@ -125,154 +324,226 @@ class MotorModule:
             if not self.motor_kit:
                 return
 
+    def _on_motor_config(self, change):
+        """Apply edited DC motor and servo motion settings to the running loops."""
+        if change.changed('servo_motion') or change.changed('servos'):
+            self._apply_servo_motion((change.new or {}).get('servo_motion') or {}, (change.new or {}).get('servos') or {})
+        if not change.changed('dc_motors'):
+            return
+        dc = (change.new or {}).get('dc_motors') or {}
+        with self._lock:
+            self.max_speed = float(dc.get('max_speed', self.max_speed))
+            self.acceleration = float(dc.get('acceleration', self.acceleration))
+            update_rate = float(dc.get('update_rate', self.update_rate))
+            if update_rate > 0 and update_rate != self.update_rate:
+                self.update_rate = update_rate
+                self.update_task.set_rate(update_rate)
+            # Current targets must respect a lowered limit straight away
+            self.left_speed = max(min(self.left_speed, self.max_speed), -self.max_speed)
+            self.right_speed = max(min(self.right_speed, self.max_speed), -self.max_speed)
+        if self.debug:
+            logger.info(f"[MotorModule] Applied config: max_speed={self.max_speed}, acceleration={self.acceleration}, update_rate={self.update_rate}")
+
+    def _apply_servo_motion(self, servo_motion: dict, servos: dict):
+        # Swapped whole, so the servo loop sees either the old mapping or the new one
+        self.servo_channels = self._build_servo_channels(self._calibrated_servos(servos))
+        updated = self._build_trajectories(servo_motion, servos)
+        with self.servo_motion._lock:
+            for name, trajectory in self.servo_motion.trajectories.items():
+                trajectory.max_velocity = updated[name].max_velocity
+                trajectory.max_acceleration = updated[name].max_acceleration
+                trajectory.profile = updated[name].profile
+        if self.servo_task and servo_motion.get('update_rate'):
+            self.servo_task.set_rate(servo_motion['update_rate'])
+
     def stop(self):
-        """Stop all motors"""
-        self.set_motor_speeds(0, 0)
-        
-    def _normalized_to_pulse(self, normalized: float, min_pulse: int, max_pulse: int, center_pulse: Optional[int] = None) -> int:
+        """Stop all motors immediately, bypassing the ramp"""
+        with self._write_lock:
+            with self._lock:
+                self.left_speed = self.right_speed = 0
+                self.left_output = self.right_output = 0.0
+                self._raw_throttle = None
+            if self.motor_kit:
+                self._write_outputs(0.0, 0.0)
+
+    def set_raw_throttle(self, left: float, right: float):
         """
-        Convert normalized value (-1.0 to 1.0) to pulse width
-        
-        Args:
-            normalized: Value from -1.0 to 1.0
-            min_pulse: Minimum pulse width in microseconds
-            max_pulse: Maximum pulse width in microseconds
-            center_pulse: Optional center pulse width for asymmetric scaling. If None, uses midpoint.
-            
-        Returns:
-            Pulse width in microseconds
+        Hold uncalibrated throttles on the motors until ``release_throttle``
+
+        Written straight away, bypassing the ramp and the calibration mapping,
+        for calibration sweeps.
         """
-        normalized = max(-1.0, min(1.0, normalized))
-        
-        # If no center_pulse specified, use midpoint for symmetric scaling
-        if center_pulse is None:
-            center_pulse = (min_pulse + max_pulse) // 2
+        with self._write_lock:
+            with self._lock:
+                self.left_speed = self.right_speed = 0
+                self.left_output = self.right_output = 0.0
+                self._raw_throttle = (left, right)
+            if self.motor_kit:
+                self._write_outputs(left, right, calibrated=False)
+
+    def release_throttle(self):
+        """Stop the motors and hand them back to the update loop after ``set_raw_throttle``."""
+        with self._write_lock:
+            with self._lock:
+                self._raw_throttle = None
+            if self.motor_kit:
+                self._write_outputs(0.0, 0.0)
+
+    def set_servo_pulse(self, name: str, pulse: int):
+        """Write a pulse width (us) to a servo straight away, bypassing its trajectory (for calibration)."""
+        if not self.servo_kit:
+            self._warn_no_servos('set_servo_pulse')
+            return
+        servo = self.servo_channels[name]
+        try:
+            self._set_servo(servo.channel, pulse, max(0.0, min(180.0, servo.angle(pulse))))
+            servo.writes += 1
+        except Exception as e:
+            logger.error(f"[MotorModule] Failed to set servo pulse: {e}")
+        self._flush_servos()
         
-        if normalized < 0:
-            # Scale from center to min
-            return int(center_pulse + normalized * (center_pulse - min_pulse))
+    def _set_servo(self, channel: int, pulse: int, angle: float):
+        """Stage a servo pulse for the next ``_flush_servos`` (or write the angle through ServoKit)."""
+        if self.servo_pwm:
+            self.servo_pwm.set_pulse_width(channel, pulse)
         else:
-            # Scale from center to max
-            return int(center_pulse + normalized * (max_pulse - center_pulse))
-    
-    def _pulse_to_angle(self, pulse: int, min_pulse: int, max_pulse: int) -> float:
-        """
-        Convert pulse width to servo angle (0-180)
-        
-        Args:
-            pulse: Pulse width in microseconds
-            min_pulse: Minimum pulse width
-            max_pulse: Maximum pulse width
-            
-        Returns:
-            Angle in degrees (0-180)
-        """
-        return 180.0 * (pulse - min_pulse) / (max_pulse - min_pulse)
+            self.servo_kit.servo[channel].angle = angle
 
-    def move_head(self, pan: Optional[float] = None, tilt: Optional[float] = None):
+    def _flush_servos(self):
+        if self.servo_pwm:
+            try:
+                self.servo_pwm.flush()
+            except Exception as e:
+                logger.error(f"[MotorModule] Failed to write servo pulses: {e}")
+
+    def move_head(self, pan: Optional[float] = None, tilt: Optional[float] = None,
+                  duration: Optional[float] = None):
         """
-        Move head servos
+        Move head servos (smoothly, from the servo loop)
         
         Args:
             pan: Normalized pan position (-1.0 to 1.0, where 0 is center)
             tilt: Normalized tilt position (-1.0 to 1.0, where 0 is center)
+            duration: Seconds to take to get there (None: as fast as the servo limits allow)
         """
         if not self.servo_kit:
-            logger.warning("move_head called but servo_kit is None")
+            self._warn_no_servos('move_head')
             return
             
-        logger.info(f"move_head called with pan={pan}, tilt={tilt}")
         with self._lock:
-            # Set pan servo
+            self._servo_commands += 1
             if pan is not None:
-                pan_config = self.servo_configs.get('head_pan', {})
-                channel = pan_config.get('channel', 14)
-                min_pulse = pan_config.get('min_pulse', 500)
-                center_pulse = pan_config.get('center_pulse')  # Optional
-                max_pulse = pan_config.get('max_pulse', 2500)
-                
-                pulse = self._normalized_to_pulse(pan, min_pulse, max_pulse, center_pulse)
-                angle = self._pulse_to_angle(pulse, min_pulse, max_pulse)
-                
-                logger.info(f"Setting pan {pan} -> pulse {pulse}μs -> angle {angle:.1f}° on servo[{channel}]")
-                self.servo_kit.servo[channel].angle = angle
+                self.servo_motion.set_target('head_pan', pan, duration)
                 self._head_pan = pan
-                
-            # Set tilt servo
             if tilt is not None:
-                tilt_config = self.servo_configs.get('head_tilt', {})
-                channel = tilt_config.get('channel', 15)
-                min_pulse = tilt_config.get('min_pulse', 500)
-                center_pulse = tilt_config.get('center_pulse')  # Optional
-                max_pulse = tilt_config.get('max_pulse', 2500)
-                
-                pulse = self._normalized_to_pulse(tilt, min_pulse, max_pulse, center_pulse)
-                angle = self._pulse_to_angle(pulse, min_pulse, max_pulse)
-                
-                logger.info(f"Setting tilt {tilt} -> pulse {pulse}μs -> angle {angle:.1f}° on servo[{channel}]")
-                self.servo_kit.servo[channel].angle = angle
+                self.servo_motion.set_target('head_tilt', tilt, duration)
                 self._head_tilt = tilt
                 
-    def move_arm(self, side: str, position: float):
+    def move_arm(self, side: str, position: float, duration: Optional[float] = None):
         """
-        Move arm servo
+        Move arm servo (smoothly, from the servo loop)
         
         Args:
             side: 'left' or 'right'
             position: Position from 0 to 1 (maps to full servo range)
+            duration: Seconds to take to get there (None: as fast as the servo limits allow)
         """
         if not self.servo_kit:
-            logger.warning("move_arm called but servo_kit is None")
+            self._warn_no_servos('move_arm')
             return
             
-        logger.info(f"move_arm called with side={side}, position={position}")
         with self._lock:
-            # Get servo config
-            servo_name = f"{side.lower()}_arm"
-            arm_config = self.servo_configs.get(servo_name, {})
-            channel = arm_config.get('channel', 0 if side.lower() == 'left' else 1)
-            min_pulse = arm_config.get('min_pulse', 500)
-            max_pulse = arm_config.get('max_pulse', 2500)
-            
-            # Convert 0-1 position directly to pulse width
+            self._servo_commands += 1
             position = max(0.0, min(1.0, position))
-            pulse = int(min_pulse + position * (max_pulse - min_pulse))
-            angle = self._pulse_to_angle(pulse, min_pulse, max_pulse)
-            
-            logger.info(f"Setting {side} arm position {position} -> pulse {pulse}μs -> angle {angle:.1f}° on servo[{channel}]")
-            self.servo_kit.servo[channel].angle = angle
-            
+            self.servo_motion.set_target(f"{side.lower()}_arm", position, duration)
             if side.lower() == 'left':
                 self._left_arm_position = position
             else:
                 self._right_arm_position = position
+
+    def _warn_no_servos(self, caller: str):
+        """Warn that servo commands are being dropped, at most once per ``SERVO_DIAGNOSTIC_SECONDS``."""
+        now = time.perf_counter()
+        if self._servo_warning_at is not None and now - self._servo_warning_at < SERVO_DIAGNOSTIC_SECONDS:
+            self._servo_warnings_suppressed += 1
+            return
+        suppressed, self._servo_warnings_suppressed = self._servo_warnings_suppressed, 0
+        self._servo_warning_at = now
+        logger.warning(f"[MotorModule] {caller} called but servo_kit is None"
+                       + (f" ({suppressed} more dropped since last warning)" if suppressed else ""))
+
+    def _servo_tick(self, dt: float):
+        """Step the servo trajectories and write the ones that moved in one flush"""
+        moved = self.servo_motion.step(dt)
+        if self.debug:
+            self._log_servo_diagnostics()
+        if not moved:
+            return
+        channels = self.servo_channels
+        try:
+            for name, position in moved.items():
+                servo = channels[name]
+                pulse = servo.pulse(position)
+                self._set_servo(servo.channel, pulse, servo.angle(pulse))
+                servo.writes += 1
+        except Exception as e:
+            logger.error(f"[MotorModule] Failed to set servo position: {e}")
+        # Head pan and tilt are adjacent channels, so moving both is a single I2C write
+        self._flush_servos()
+
+    def _log_servo_diagnostics(self):
+        now = time.perf_counter()
+        elapsed = now - self._servo_diagnostic_at
+        if elapsed < SERVO_DIAGNOSTIC_SECONDS:
+            return
+        with self._lock:
+            commands, self._servo_commands = self._servo_commands, 0
+        self._servo_diagnostic_at = now
+        if commands:
+            writes = ', '.join(f"{name}={servo.writes}" for name, servo in self.servo_channels.items())
+            logger.debug(f"[MotorModule] {commands} servo commands in {elapsed:.1f}s; writes {writes}; "
+                         f"positions {self.servo_motion.positions()}")
         
     def cleanup(self):
         """Clean up resources"""
-        self.is_running = False
-        if self.update_thread:
-            self.update_thread.join()
-            
-        # Stop motors (all four channels if available)
-        if self.motor_kit:
-            try:
-                self.motor_kit.motor1.throttle = 0
-                self.motor_kit.motor2.throttle = 0
-                self.motor_kit.motor3.throttle = 0
-                self.motor_kit.motor4.throttle = 0
-            except Exception:
-                pass
-            
+        self._unsubscribe_config()
+        self.update_task.cancel()
+        if self.servo_task:
+            self.servo_task.cancel()
+
+        # Stop motors immediately (all four channels if available), bypassing the ramp
+        with self._lock:
+            self.left_speed = self.right_speed = 0
+            self.left_output = self.right_output = 0.0
+        with self._write_lock:
+            if self.motor_kit:
+                try:
+                    if self.motor_pwm:
+                        for motor in (1, 2, 3, 4):
+                            stage_throttle(self.motor_pwm, motor, 0)
+                        self.motor_pwm.flush()
+                    else:
+                        self.motor_kit.motor1.throttle = 0
+                        self.motor_kit.motor2.throttle = 0
+                        self.motor_kit.motor3.throttle = 0
+                        self.motor_kit.motor4.throttle = 0
+                except Exception:
+                    pass
+            self._written = (0.0, 0.0)
+
     def snapshot(self) -> dict:
         """Return a thread-safe snapshot of motor speeds."""
         with self._lock:
             return {
                 'left_speed': float(self.left_speed),
                 'right_speed': float(self.right_speed),
+                'left_output': float(self.left_output),
+                'right_output': float(self.right_output),
                 'left_arm_position': float(self._left_arm_position),
                 'right_arm_position': float(self._right_arm_position),
                 'head_pan': float(self._head_pan) if self._head_pan is not None else None,
                 'head_tilt': float(self._head_tilt) if self._head_tilt is not None else None,
+                'servo_positions': self.servo_motion.positions(),
             }
 
     @property
@@ -303,27 +574,100 @@ class MotorModule:
         """Alias for set_motor_speeds."""
         return self.set_motor_speeds(left, right)
 
-    def _update_loop(self):
-        """Update motor speeds with acceleration limiting"""
-        last_update = time.time()
-        if self.debug:
-            logger.debug(f"Motor update loop started (motor_kit available: {self.motor_kit is not None})")
-        while self.is_running:
-            current_time = time.time()
-            dt = current_time - last_update
-            last_update = current_time
+    def stats(self) -> dict:
+        """Achieved loop rate, I2C write rate and jitter over the last report window."""
+        task = self.update_task.stats()
+        with self._lock:
+            stats = dict(self._loop_stats)
+        stats.update({
+            'target_hz': task['rate_hz'],
+            'loop_hz': task['achieved_hz'],
+            'jitter_mean_ms': task['jitter_mean_ms'],
+            'jitter_max_ms': task['jitter_max_ms'],
+            'missed_cycles': task['missed'],
+        })
+        if self.motor_pwm:
+            stats['motor_pwm'] = self.motor_pwm.stats()
+        if self.servo_pwm:
+            stats['servo_pwm'] = self.servo_pwm.stats()
+        return stats
+
+    def _step(self, dt: float) -> Tuple[float, float]:
+        """Ramp the outputs towards the targets over ``dt`` seconds; returns the new outputs."""
+        with self._lock:
+            max_step = self.acceleration * dt
+            self.left_output = ramp(self.left_output, self.left_speed, max_step)
+            self.right_output = ramp(self.right_output, self.right_speed, max_step)
+            return self.left_output, self.right_output
 
-            # DEBUG: Log motor kit and speeds every loop
-            logger.debug(f"[DEBUG] motor_kit={self.motor_kit}, left_speed={self.left_speed:.2f}, right_speed={self.right_speed:.2f}")
+    def _write_outputs(self, left: float, right: float, calibrated: bool = True) -> int:
+        """
+        Write each side's throttle if its quantized value changed
 
+        Args:
+            left: Left output (-1 to 1)
+            right: Right output (-1 to 1)
+            calibrated: Map the outputs through the motor calibration first
+
+        Returns:
+            int: Number of I2C writes issued
+        """
+        with self._write_lock:
+            if calibrated:
+                calibration = self.motor_calibration
+                left, right = calibration['left'].throttle(left), calibration['right'].throttle(right)
+            left, right = quantize_throttle(left), quantize_throttle(right)
+            last_left, last_right = self._written
+            if left == last_left and right == last_right:
+                return 0
+            writes = 0
+            try:
+                if self.motor_pwm:
+                    # Both sides' channels staged, then sent as block writes
+                    if left != last_left:
+                        stage_throttle(self.motor_pwm, 1, left)
+                        stage_throttle(self.motor_pwm, 2, left)
+                    if right != last_right:
+                        stage_throttle(self.motor_pwm, 3, right)
+                        stage_throttle(self.motor_pwm, 4, right)
+                    writes = self.motor_pwm.flush()
+                else:
+                    if left != last_left:
+                        self.motor_kit.motor1.throttle = left
+                        self.motor_kit.motor2.throttle = left
+                        writes += 2
+                    if right != last_right:
+                        self.motor_kit.motor3.throttle = right
+                        self.motor_kit.motor4.throttle = right
+                        writes += 2
+                self._written = (left, right)
+                self._loop_stats['i2c_writes'] += writes
+            except Exception as e:
+                # Forget what was written so the next tick retries both sides
+                self._written = (None, None)
+                self._loop_stats['i2c_errors'] += 1
+                logger.error(f"[MotorModule] Failed to set motor throttle: {e}")
+            return writes
+
+    def _tick(self, dt: float):
+        """Ramp motor outputs towards their targets, writing only on change (runs at ``update_rate``)"""
+        # Step and write together, so a stop() in between isn't overwritten by the older output
+        with self._write_lock:
+            raw = self._raw_throttle
+            if raw is None:
+                left, right = self._step(dt)
+                writes = self._write_outputs(left, right) if self.motor_kit else 0
+            else:
+                writes = self._write_outputs(*raw, calibrated=False) if self.motor_kit else 0
+        if writes:
+            MOTOR_I2C_WRITES.inc(writes)
+            self._window_writes += writes
+        now = time.perf_counter()
+        elapsed = now - self._window_start
+        if elapsed >= STATS_WINDOW_SECONDS:
+            writes_per_second = self._window_writes / elapsed
+            MOTOR_I2C_WRITES_PER_SECOND.set(writes_per_second)
             with self._lock:
-                if self.motor_kit:
-                    try:
-                        self.motor_kit.motor1.throttle = self.left_speed
-                        self.motor_kit.motor2.throttle = self.left_speed
-                        self.motor_kit.motor3.throttle = self.right_speed
-                        self.motor_kit.motor4.throttle = self.right_speed
-                    except Exception as e:
-                        logger.error(f"[MOTOR] Failed to set motor throttle: {e}")
-            # Sleep to maintain update rate
-            time.sleep(1 / self.update_rate)
+                self._loop_stats['i2c_writes_per_second'] = round(writes_per_second, 2)
+            self._window_start = now
+            self._window_writes = 0
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+
+import math
+import time
+import threading
+import logging
+from array import array
+from typing import Callable, Optional, Tuple
+
+from config import Config
+from utils.scheduler import SCHEDULER
+
+logger = logging.getLogger(__name__)
+
+
+class TrajectoryHistory:
+    """
+    Ring buffer of recent poses, read incrementally by sequence number
+
+    Samples are numbered from 1 and kept in flat ``array('d')`` columns, so a
+    long history costs 32 bytes per pose and no per-sample objects. Once
+    ``capacity`` samples are stored, each new one overwrites the oldest.
+    """
+
+    def __init__(self, capacity: int = 2048):
+        self.capacity = max(1, capacity)
+        self._columns = tuple(array('d', bytes(8 * self.capacity)) for _ in range(4))  # t, x, y, heading
+        self._seq = 0
+        # Sequence number of the oldest sample still kept, before the buffer wraps
+        self._oldest = 1
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._seq - max(self._seq - self.capacity + 1, self._oldest) + 1
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the newest sample (0 when empty)."""
+        return self._seq
+
+    def append(self, t: float, x: float, y: float, heading: float) -> int:
+        with self._lock:
+            index = self._seq % self.capacity
+            for column, value in zip(self._columns, (t, x, y, heading)):
+                column[index] = value
+            self._seq += 1
+            return self._seq
+
+    def clear(self) -> None:
+        """Drop all samples; numbering carries on, so clients reading incrementally don't re-read old ones."""
+        with self._lock:
+            self._columns = tuple(array('d', bytes(8 * self.capacity)) for _ in range(4))
+            self._oldest = self._seq + 1
+
+    def since(self, seq: int = 0, limit: Optional[int] = None) -> dict:
+        """
+        Samples newer than ``seq``
+
+        Args:
+            seq: Last sequence number the caller has (0 for everything kept)
+            limit: Return at most this many of the oldest matching samples
+
+        Returns:
+            dict: ``seq`` to pass back next time, ``first`` (sequence number of
+            the first point), ``dropped`` (True if samples after ``seq`` were
+            already overwritten) and ``points`` as ``[t, x, y, heading]``
+        """
+        with self._lock:
+            newest = self._seq
+            oldest = max(newest - self.capacity + 1, self._oldest)
+            first = max(seq + 1, oldest)
+            last = newest if limit is None else min(newest, first + max(0, limit) - 1)
+            t, x, y, heading = self._columns
+            points = []
+            for s in range(first, last + 1):
+                i = (s - 1) % self.capacity
+                points.append([round(t[i], 3), round(x[i], 4), round(y[i], 4), round(heading[i], 2)])
+        return {'seq': max(seq, last), 'first': first, 'dropped': first > seq + 1, 'points': points}
+
+
+def integrate_pose(x: float, y: float, heading: float, left: float, right: float, track_width: float,
+                   dt: float) -> Tuple[float, float, float]:
+    """
+    Move a differential-drive pose for ``dt`` seconds at constant wheel speeds
+
+    Args:
+        x: X position (m, forward at heading 0)
+        y: Y position (m, to the left at heading 0)
+        heading: Heading in radians (counter-clockwise)
+        left: Left wheel ground speed (m/s)
+        right: Right wheel ground speed (m/s)
+        track_width: Distance between the wheels (m)
+        dt: Seconds
+
+    Returns:
+        Tuple[float, float, float]: New ``(x, y, heading)``, following the exact arc
+    """
+    v = (left + right) / 2
+    omega = (right - left) / track_width
+    if abs(omega) < 1e-9:
+        return x + v * math.cos(heading) * dt, y + v * math.sin(heading) * dt, heading
+    turned = heading + omega * dt
+    radius = v / omega
+    return (x + radius * (math.sin(turned) - math.sin(heading)),
+            y - radius * (math.cos(turned) - math.cos(heading)),
+            turned)
+
+
+class PoseEstimator:
+    """
+    Dead-reckoning pose from the drive wheels
+
+    A task on the control thread integrates the wheel speeds at
+    ``odometry.update_rate``. Speeds come from ``wheel_speeds`` (measured
+    wheel revolutions per second, e.g. from encoders) if given, otherwise
+    from the MotorModule's ramped outputs scaled by the calibrated top wheel
+    speed (``odometry.max_wheel_rps`` until the motors are calibrated); with
+    neither encoders nor a motor HAT nothing moves, so nothing is integrated.
+    The pose is passed to ``on_pose`` at most ``odometry.publish_rate``
+    times a second, and then only if it changed, and recorded in ``history``
+    whenever it has moved ``odometry.min_step`` meters or turned
+    ``odometry.min_turn`` degrees since the last recorded pose.
+    """
+
+    def __init__(self, motors, wheel_speeds: Optional[Callable[[], Tuple[float, float]]] = None,
+                 on_pose: Optional[Callable[[dict], None]] = None, debug: bool = False):
+        """
+        Initialize pose estimator
+
+        Args:
+            motors: MotorModule whose outputs are integrated when there are no measured speeds
+            wheel_speeds: Returns measured ``(left, right)`` wheel revolutions per second
+            on_pose: Called with ``{'position': {x, y, z}, 'rotation': degrees}`` (robot_state keys)
+            debug: Enable debug output
+        """
+        self.motors = motors
+        self.wheel_speeds = wheel_speeds
+        self.on_pose = on_pose
+        self.debug = debug
+        self._lock = threading.Lock()
+        self.x = self.y = self.heading = 0.0
+        self.distance = 0.0
+
+        config = Config.shared()
+        odometry = config.get('odometry', default={}) or {}
+        self._apply_settings(odometry)
+        self.history = TrajectoryHistory(int(odometry.get('history', 2048)))
+        self._recorded: Optional[Tuple[float, float, float]] = None
+        self._published: Optional[dict] = None
+        self._published_at = 0.0
+        self._task = SCHEDULER.every(float(odometry.get('update_rate', 50)), self._tick, name='odometry',
+                                     group='control', metrics_prefix='robbie_odometry')
+        self._unsubscribe_config = config.subscribe('odometry', self._on_odometry_config)
+
+    def _apply_settings(self, odometry: dict):
+        self.wheel_diameter = float(odometry.get('wheel_diameter', 0.065))  # m
+        self.track_width = float(odometry.get('track_width', 0.15))  # m, between wheel centers
+        self.max_wheel_rps = float(odometry.get('max_wheel_rps', 3.0))  # Wheel revolutions per second at full throttle
+        publish_rate = float(odometry.get('publish_rate', 10))
+        self.publish_interval = 1.0 / publish_rate if publish_rate > 0 else 0.0
+        self.min_step = float(odometry.get('min_step', 0.01))
+        self.min_turn = math.radians(float(odometry.get('min_turn', 2.0)))
+
+    def _on_odometry_config(self, change):
+        odometry = change.new or {}
+        with self._lock:
+            self._apply_settings(odometry)
+        if change.changed('update_rate') and odometry.get('update_rate'):
+            self._task.set_rate(float(odometry['update_rate']))
+        if self.debug:
+            logger.info(f"[PoseEstimator] Applied config: track_width={self.track_width}, "
+                        f"wheel_diameter={self.wheel_diameter}, max_wheel_rps={self.max_wheel_rps}")
+
+    def _top_speed(self, side: str) -> float:
+        """Wheel revolutions per second at output 1 on a side."""
+        calibration = getattr(self.motors, 'motor_calibration', None)
+        top_speed = calibration[side].top_speed if calibration else None
+        return top_speed or self.max_wheel_rps
+
+    def wheel_velocities(self) -> Tuple[float, float]:
+        """Left and right wheel ground speeds in m/s."""
+        if self.wheel_speeds:
+            left, right = self.wheel_speeds()
+        else:
+            left = self.motors.left_output * self._top_speed('left')
+            right = self.motors.right_output * self._top_speed('right')
+        circumference = math.pi * self.wheel_diameter
+        return left * circumference, right * circumference
+
+    def _tick(self, dt: float):
+        """Integrate the wheel speeds over ``dt`` and publish on schedule (runs at ``update_rate``)"""
+        if not self.wheel_speeds and getattr(self.motors, 'motor_kit', None) is None:
+            # Commanded outputs without a motor HAT don't move the wheels
+            return
+        try:
+            left, right = self.wheel_velocities()
+        except Exception as e:
+            logger.error(f"[PoseEstimator] Failed to read wheel speeds: {e}")
+            return
+        self.integrate(left, right, dt)
+        now = time.monotonic()
+        if now - self._published_at >= self.publish_interval:
+            self._published_at = now
+            self._publish()
+
+    def integrate(self, left: float, right: float, dt: float):
+        """Advance the pose by ``dt`` seconds at wheel ground speeds ``left``/``right`` (m/s)."""
+        if left == 0 and right == 0:
+            return
+        with self._lock:
+            self.x, self.y, self.heading = integrate_pose(self.x, self.y, self.heading, left, right,
+                                                          self.track_width, dt)
+            self.distance += abs(left + right) / 2 * dt
+
+    def _publish(self):
+        with self._lock:
+            x, y, heading = self.x, self.y, self.heading
+        recorded = self._recorded
+        if (recorded is None or math.hypot(x - recorded[0], y - recorded[1]) >= self.min_step
+                or abs(math.remainder(heading - recorded[2], math.tau)) >= self.min_turn):
+            self._recorded = (x, y, heading)
+            self.history.append(time.time(), x, y, math.degrees(math.remainder(heading, math.tau)))
+        pose = self.pose()
+        if pose == self._published or not self.on_pose:
+            return
+        self._published = pose
+        try:
+            self.on_pose(pose)
+        except Exception as e:
+            logger.error(f"[PoseEstimator] Failed to publish pose: {e}")
+
+    def pose(self) -> dict:
+        """Pose as robot_state keys: position in meters (z is height, always 0) and rotation in degrees."""
+        with self._lock:
+            x, y, heading = self.x, self.y, self.heading
+        return {'position': {'x': round(x, 3), 'y': round(y, 3), 'z': 0.0},
+                'rotation': round(math.degrees(math.remainder(heading, math.tau)), 1)}
+
+    def reset(self, x: float = 0.0, y: float = 0.0, heading: float = 0.0):
+        """
+        Set the pose and clear the trajectory history
+
+        Args:
+            x: X position (m)
+            y: Y position (m)
+            heading: Heading (degrees, counter-clockwise)
+        """
+        with self._lock:
+            self.x, self.y, self.heading = x, y, math.radians(heading)
+            self.distance = 0.0
+        self.history.clear()
+        self._recorded = None
+        self._publish()
+
+    def trajectory(self, since: int = 0, limit: Optional[int] = None) -> dict:
+        """Recorded poses after sequence number ``since`` (see ``TrajectoryHistory.since``)."""
+        return self.history.since(since, limit)
+
+    def cleanup(self):
+        self._unsubscribe_config()
+        self._task.cancel()
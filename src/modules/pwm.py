@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+import threading
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.metrics import counter
+
+logger = logging.getLogger(__name__)
+
+PWM_TRANSACTIONS = counter('robbie_pwm_i2c_transactions_total', 'I2C write transactions sent to PCA9685 PWM chips')
+PWM_BYTES = counter('robbie_pwm_i2c_bytes_total', 'Bytes written to PCA9685 PWM chips, including register addresses')
+
+# Default addresses of the Adafruit HATs
+SERVO_HAT_ADDRESS = 0x40
+MOTOR_HAT_ADDRESS = 0x60
+
+# Motor HAT DC motor channels: (speed, positive, negative), matching adafruit_motorkit
+DC_MOTOR_CHANNELS = {
+    1: (8, 9, 10),
+    2: (13, 12, 11),
+    3: (2, 3, 4),
+    4: (7, 6, 5),
+}
+
+# PCA9685 registers
+MODE1 = 0x00
+LED0_ON_L = 0x06
+PRESCALE = 0xFE
+MODE1_SLEEP = 0x10
+MODE1_AUTO_INCREMENT = 0x20
+FULL_ON = 0x1000  # Bit 12 of ON/OFF: output held fully on/off
+CHANNELS = 16
+REFERENCE_CLOCK_HZ = 25_000_000
+
+
+class PCA9685:
+    """
+    Batched PWM output for a PCA9685
+
+    Channel changes are staged with ``set_duty_cycle``/``set_pulse_width``
+    and sent by ``flush()``: each run of adjacent channels goes out as one
+    auto-increment block write instead of a transaction per channel.
+    Channels whose registers already hold the staged value are skipped.
+    Runs separated by a few channels whose values are known are merged,
+    since one longer write is cheaper than another transaction.
+
+    Duty cycles are 16-bit, like adafruit_pca9685, and are reduced to the
+    chip's 12-bit resolution the same way.
+    """
+
+    def __init__(self, i2c, address: int = SERVO_HAT_ADDRESS, bridge: int = 2,
+                 reference_clock_speed: int = REFERENCE_CLOCK_HZ, debug: bool = False):
+        """
+        Initialize the driver on an already-configured chip
+
+        Args:
+            i2c: I2C bus with ``try_lock``/``unlock``/``writeto``/``writeto_then_readfrom`` (busio.I2C)
+            address: 7-bit I2C address of the chip
+            bridge: Largest gap of known channels rewritten to merge two runs into one write
+            reference_clock_speed: Oscillator frequency used to compute the PWM frequency
+            debug: Enable debug output
+        """
+        self.i2c = i2c
+        self.address = address
+        self.bridge = bridge
+        self.reference_clock_speed = reference_clock_speed
+        self.debug = debug
+        self._lock = threading.Lock()
+        # Last (on, off) written to each channel, or None if unknown
+        self._shadow: List[Optional[Tuple[int, int]]] = [None] * CHANNELS
+        self._staged: Dict[int, Tuple[int, int]] = {}
+        self.transactions = 0
+        self.bytes_written = 0
+        self.flushes = 0
+        # Block writes rely on the register pointer advancing after each byte
+        mode1 = self._read(MODE1)
+        if not mode1 & MODE1_AUTO_INCREMENT:
+            self._write(bytes([MODE1, mode1 | MODE1_AUTO_INCREMENT]))
+        self.frequency = self.reference_clock_speed / 4096 / (self._read(PRESCALE) + 1)
+        if self.debug:
+            logger.info(f"[PCA9685] 0x{address:02x} ready at {self.frequency:.1f} Hz")
+
+    def _write(self, data: bytes) -> None:
+        while not self.i2c.try_lock():
+            pass
+        try:
+            self.i2c.writeto(self.address, data)
+        finally:
+            self.i2c.unlock()
+        self.transactions += 1
+        self.bytes_written += len(data)
+        PWM_TRANSACTIONS.inc()
+        PWM_BYTES.inc(len(data))
+
+    def _read(self, register: int) -> int:
+        result = bytearray(1)
+        while not self.i2c.try_lock():
+            pass
+        try:
+            self.i2c.writeto_then_readfrom(self.address, bytes([register]), result)
+        finally:
+            self.i2c.unlock()
+        return result[0]
+
+    def set_duty_cycle(self, channel: int, duty_cycle: int) -> None:
+        """Stage a 16-bit duty cycle (0xFFFF holds the output fully on)."""
+        if not 0 <= channel < CHANNELS:
+            raise ValueError(f"PCA9685 channel {channel} out of range")
+        duty_cycle = max(0, min(0xFFFF, int(duty_cycle)))
+        if duty_cycle == 0xFFFF:
+            registers = (FULL_ON, 0)
+        else:
+            registers = (0, (duty_cycle + 1) >> 4)
+        with self._lock:
+            self._staged[channel] = registers
+
+    def set_pulse_width(self, channel: int, microseconds: float) -> None:
+        """Stage a pulse width (servos) at the chip's configured frequency."""
+        period_us = 1_000_000 / self.frequency
+        self.set_duty_cycle(channel, int(microseconds / period_us * 0xFFFF))
+
+    def flush(self) -> int:
+        """
+        Write the staged channels
+
+        Returns:
+            int: Number of I2C transactions sent
+        """
+        with self._lock:
+            staged = {ch: regs for ch, regs in self._staged.items() if self._shadow[ch] != regs}
+            self._staged.clear()
+            if not staged:
+                return 0
+            runs = self._runs(sorted(staged))
+            sent = 0
+            for first, last in runs:
+                values = [staged.get(ch, self._shadow[ch]) for ch in range(first, last + 1)]
+                data = bytearray([LED0_ON_L + 4 * first])
+                for on, off in values:
+                    data += bytes((on & 0xFF, on >> 8, off & 0xFF, off >> 8))
+                try:
+                    self._write(bytes(data))
+                except Exception:
+                    # What reached the chip is unknown; don't skip these channels next time
+                    for ch in range(first, last + 1):
+                        self._shadow[ch] = None
+                    raise
+                for ch, regs in zip(range(first, last + 1), values):
+                    self._shadow[ch] = regs
+                sent += 1
+            self.flushes += 1
+            return sent
+
+    def _runs(self, channels: List[int]) -> List[Tuple[int, int]]:
+        """Group sorted channels into write ranges, bridging short gaps of known channels."""
+        runs = [[channels[0], channels[0]]]
+        for ch in channels[1:]:
+            last = runs[-1][1]
+            gap = range(last + 1, ch)
+            if len(gap) <= self.bridge and all(self._shadow[g] is not None for g in gap):
+                runs[-1][1] = ch
+            else:
+                runs.append([ch, ch])
+        return [(first, last) for first, last in runs]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'address': self.address,
+            'frequency_hz': round(self.frequency, 2),
+            'flushes': self.flushes,
+            'transactions': self.transactions,
+            'bytes': self.bytes_written,
+        }
+
+
+def stage_throttle(pwm: PCA9685, motor: int, throttle: Optional[float]) -> None:
+    """
+    Stage a Motor HAT DC motor throttle, as adafruit_motor's DCMotor does in fast decay mode
+
+    Args:
+        pwm: Driver for the Motor HAT
+        motor: Motor number (1-4)
+        throttle: -1 to 1; 0 brakes and None lets the motor coast
+    """
+    speed, positive, negative = DC_MOTOR_CHANNELS[motor]
+    pwm.set_duty_cycle(speed, 0xFFFF)
+    if throttle is None:
+        pwm.set_duty_cycle(positive, 0)
+        pwm.set_duty_cycle(negative, 0)
+    elif throttle == 0:
+        pwm.set_duty_cycle(positive, 0xFFFF)
+        pwm.set_duty_cycle(negative, 0xFFFF)
+    else:
+        duty_cycle = int(0xFFFF * min(1.0, abs(throttle)))
+        pwm.set_duty_cycle(positive, duty_cycle if throttle > 0 else 0)
+        pwm.set_duty_cycle(negative, duty_cycle if throttle < 0 else 0)
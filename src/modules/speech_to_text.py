@@ -4,12 +4,8 @@ import threading
 import queue
 import numpy as np
 import platform
-if platform.machine() not in ('armv6l', 'armv7l', 'aarch64'):
-    import whisper
-try:
-    from google.cloud import speech as google_speech
-except ImportError:
-    google_speech = None
+import importlib
+import importlib.util
 import io
 import logging
 from typing import Optional, Callable, Dict, List
@@ -22,11 +18,39 @@ import wave
 logger = logging.getLogger(__name__)
 
 from .audio import AudioModule
+from utils.metrics import histogram
+from utils.tracing import TRACER, NULL_SPAN
+from controller.events import BUS, Transcription
+
+def _module_available(name: str) -> bool:
+    """True if ``name`` can be imported, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+# whisper pulls in torch and google.cloud.speech pulls in grpc, which together
+# take seconds to import; only check they are installed here and import the
+# chosen backend when it is first set up
+WHISPER_AVAILABLE = (platform.machine() not in ('armv6l', 'armv7l', 'aarch64')
+                     and _module_available('whisper'))
+GOOGLE_SPEECH_AVAILABLE = _module_available('google.cloud.speech')
+google_speech = None
+
+def _import_google_speech():
+    global google_speech
+    if google_speech is None and GOOGLE_SPEECH_AVAILABLE:
+        google_speech = importlib.import_module('google.cloud.speech')
+    return google_speech
+
+ENDPOINT_TO_TRANSCRIPT_SECONDS = histogram(
+    'robbie_endpoint_to_transcript_seconds',
+    'Time from end-of-speech detection to the transcript being delivered')
 
 class SpeechToTextModule:
     """Speech-to-text conversion using Whisper or Google STT (Pi Zero)"""
     def __init__(self, *args, **kwargs):
-        self._transcription_callbacks = []
+        self._transcription_subscriptions = []
     def add_input_audio_level_callback(self, callback):
         """Register a callback for real-time input audio level (dB) via AudioModule."""
         if hasattr(self, 'audio') and hasattr(self.audio, 'add_input_audio_level_callback'):
@@ -95,16 +119,16 @@ class SpeechToTextModule:
             # Pi Zero specific: Always prefer Google STT on Pi Zero
             pi_zero_detected = self._is_pi_zero()
             logger.info(f"[SpeechToTextModule] Pi Zero detection: {pi_zero_detected}")
-            logger.info(f"[SpeechToTextModule] Available backends - whisper: {'whisper' in globals()}, google: {google_speech is not None}")
+            logger.info(f"[SpeechToTextModule] Available backends - whisper: {WHISPER_AVAILABLE}, google: {GOOGLE_SPEECH_AVAILABLE}")
             
-            if pi_zero_detected and google_speech is not None:
+            if pi_zero_detected and GOOGLE_SPEECH_AVAILABLE:
                 self.backend = "google"
                 logger.info("[SpeechToTextModule] Using backend: google (Pi Zero auto-detected)")
                 if self.debug:
                     logger.info("[SpeechToTextModule] Pi Zero detected, forcing Google STT backend for performance.")
-            elif 'whisper' in globals():
+            elif WHISPER_AVAILABLE:
                 self.backend = "whisper"
-                if pi_zero_detected and google_speech is not None:
+                if pi_zero_detected and GOOGLE_SPEECH_AVAILABLE:
                     self.backend = "google"
                     logger.info("[SpeechToTextModule] Using backend: google (auto-detected)")
                     if self.debug:
@@ -113,7 +137,7 @@ class SpeechToTextModule:
                     logger.info("[SpeechToTextModule] Using backend: whisper (default)")
                     if self.debug:
                         logger.info("[SpeechToTextModule] Using Whisper backend.")
-            elif google_speech is not None:
+            elif GOOGLE_SPEECH_AVAILABLE:
                 self.backend = "google"
                 logger.info("[SpeechToTextModule] Using backend: google (fallback, no whisper)")
             else:
@@ -121,24 +145,22 @@ class SpeechToTextModule:
                 self.backend = None
 
         # Whisper model setup
+        self._whisper_ready = threading.Event()
+        self.whisper_load_seconds = None
         if self.backend == "whisper":
             if whisper_model is not None:
                 self.whisper = whisper_model
+                self._whisper_ready.set()
                 if self.debug:
                     logger.info("Injected Whisper model (test/mock)")
             else:
-                try:
-                    self.whisper = whisper.load_model("base")
-                    if self.debug:
-                        logger.info("Whisper model loaded")
-                except Exception as e:
-                    logger.error(f"Failed to initialize Whisper: {e}")
-                    self.whisper = None
-                    return
+                # Loading takes seconds; don't hold up wake word detection for it
+                self.whisper = None
+                threading.Thread(target=self._load_whisper, daemon=True, name="whisper-loader").start()
         else:
             self.whisper = None
             # Google STT client setup
-            if google_speech is not None:
+            if _import_google_speech() is not None:
                 self.gcloud_client = google_speech.SpeechClient()
             else:
                 self.gcloud_client = None
@@ -148,7 +170,7 @@ class SpeechToTextModule:
         self._audio_buffer = []
         self._last_audio = time.time()
         self._process_thread = None
-        self._transcription_callbacks: List[Callable[[str], None]] = []
+        self._transcription_subscriptions = []
         self._timeout_callbacks: List[Callable[[], None]] = []
         self._silence_timeout = 20.0  # Seconds of silence before full standby/idle timeout
         self._phrase_timeout = 1    # Seconds of silence to trigger phrase segmentation (endpointing)
@@ -168,14 +190,32 @@ class SpeechToTextModule:
         # Always expose audio_callback for tests
         self.audio_callback = getattr(self, '_test_audio_callback', self._audio_callback)
 
+    def _load_whisper(self):
+        """Load the Whisper model; transcription waits on ``_whisper_ready``."""
+        start = time.perf_counter()
+        try:
+            import whisper
+            self.whisper = whisper.load_model("base")
+            self.whisper_load_seconds = time.perf_counter() - start
+            logger.info(f"[SpeechToTextModule] Whisper model loaded in {self.whisper_load_seconds:.1f}s")
+        except Exception as e:
+            logger.error(f"Failed to initialize Whisper: {e}")
+            self.whisper = None
+        finally:
+            self._whisper_ready.set()
+
     def _is_pi_zero(self):
         # Detect Pi Zero by platform string
         logger.info(f"[SpeechToTextModule] Platform: MACHINE={platform.uname().machine}, NODE={platform.uname().node}")
         return "armv6l" in platform.uname().machine or "raspberrypi" in platform.uname().node
 
     def add_transcription_callback(self, callback: Callable[[str], None]):
-        """Add callback for transcribed text"""
-        self._transcription_callbacks.append(callback)
+        """Add callback for text transcribed by this module; it runs on its own thread"""
+        def on_transcription(event: Transcription):
+            if event.source is self:
+                callback(event.text)
+        name = f"transcription:{getattr(callback, '__qualname__', type(callback).__name__)}"
+        self._transcription_subscriptions.append(BUS.subscribe(Transcription, on_transcription, name=name))
         
     def add_timeout_callback(self, callback: Callable[[], None]):
         """Add callback for silence timeout"""
@@ -398,9 +438,9 @@ class SpeechToTextModule:
                 # print(f"[DEBUG] rms={rms:.5f}, max={np.max(np.abs(audio_data)):.5f}, db={db:.1f}")
 
                 # print(f"\r[SpeechToTextModule] Audio dB: {db:.1f}, threshold: {self._audio_threshold}    ", end='', flush=True)
-                # Call input audio level callbacks registered via AudioModule
-                if hasattr(self, 'audio') and hasattr(self.audio, '_trigger_input_audio_level_callbacks'):
-                    self.audio._trigger_input_audio_level_callbacks(db)
+                # Publish the input level for callbacks registered via AudioModule
+                if hasattr(self, 'audio') and hasattr(self.audio, 'publish_audio_level'):
+                    self.audio.publish_audio_level('input', db)
                 # Wait for speech before buffering
                 with self._lock:
                     # Always pre-buffer audio
@@ -441,6 +481,9 @@ class SpeechToTextModule:
                 if max_amplitude > linear_threshold:
                     msg = f"[SpeechToTextModule] Silence detected for {elapsed:.2f}s, processing phrase."
                     logger.info(msg)
+                    self._endpoint_time = time.perf_counter()
+                    TRACER.ensure_turn('speech')
+                    self._stt_span = TRACER.start_span('speech_to_text', start=self._endpoint_time, backend=self.backend)
                     # logger.info(f"[SpeechToTextModule] Buffer details: size={len(self._audio_buffer)}, max_amplitude={max_amplitude:.6f}, threshold={linear_threshold:.6f}")
                     # logger.info(f"[SpeechToTextModule] Thread state: {getattr(self, '_process_thread', None)}")
                     if getattr(self, '_process_thread', None):
@@ -543,6 +586,9 @@ class SpeechToTextModule:
             # Google STT expects 16-bit PCM WAV bytes
             text = None
             if self.backend == "whisper":
+                if not self._whisper_ready.is_set():
+                    logger.info(f"[{thread_name}] Waiting for Whisper model to finish loading...")
+                    self._whisper_ready.wait(timeout=120)
                 if not self.whisper:
                     logger.error(f"[{thread_name}] Whisper model not initialized!")
                     return
@@ -641,6 +687,11 @@ class SpeechToTextModule:
                     if "audio" in str(e).lower():
                         logger.error(f"[{thread_name}] Audio format issue - check microphone/input on Pi Zero")
             if text:
+                endpoint_time = getattr(self, '_endpoint_time', None)
+                if endpoint_time is not None:
+                    ENDPOINT_TO_TRANSCRIPT_SECONDS.observe(time.perf_counter() - endpoint_time)
+                    self._endpoint_time = None
+                getattr(self, '_stt_span', NULL_SPAN).finish(chars=len(text))
                 if hasattr(self, 'command_callbacks') and isinstance(self.command_callbacks, dict):
                     cb = self.command_callbacks.get(text)
                     if cb:
@@ -648,11 +699,7 @@ class SpeechToTextModule:
                             cb()
                         except Exception as e:
                             logger.error(f"[{_threading.current_thread().name}] Error in command callback: {e}")
-                for callback in getattr(self, '_transcription_callbacks', []):
-                    try:
-                        callback(text)
-                    except Exception as e:
-                        logger.error(f"[{_threading.current_thread().name}] Error in transcription callback: {e}")
+                BUS.publish(Transcription(text, source=self))
         except Exception as e:
             logger.error(f"[{thread_name}] Error processing audio: {e}")
             logger.exception(f"[{thread_name}] Full traceback:")
@@ -665,6 +712,8 @@ class SpeechToTextModule:
             
     def cleanup(self):
         """Clean up resources"""
+        for subscription in getattr(self, '_transcription_subscriptions', []):
+            subscription.cancel()
         # Stop listening if active
         if self.is_listening:
             self.stop_listening()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+import math
+import threading
+from typing import Dict, Optional
+
+TRAPEZOIDAL = 'trapezoidal'
+MIN_JERK = 'min_jerk'
+PROFILES = (TRAPEZOIDAL, MIN_JERK)
+
+# Positions closer than this to the target count as arrived
+EPSILON = 1e-4
+
+
+class ServoTrajectory:
+    """
+    Smooth motion of one servo towards a target
+
+    Positions are in the servo's normalized units. The target can change at
+    any time: the new motion starts from the current position and velocity,
+    so it blends instead of jumping.
+
+    Profiles:
+        trapezoidal: accelerate at ``max_acceleration`` up to ``max_velocity``,
+            cruise, then decelerate to stop on the target
+        min_jerk: a quintic from the current position, velocity and
+            acceleration to rest at the target, timed so its peak velocity
+            and acceleration stay within the limits
+    """
+
+    def __init__(self, position: float = 0.0, max_velocity: float = 2.0, max_acceleration: float = 8.0,
+                 profile: str = TRAPEZOIDAL, lower: float = -1.0, upper: float = 1.0):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown motion profile {profile!r}, expected one of {PROFILES}")
+        self.max_velocity = max_velocity
+        self.max_acceleration = max_acceleration
+        self.profile = profile
+        self.lower = lower
+        self.upper = upper
+        self.position = self._clamp(position)
+        self.velocity = 0.0
+        self.acceleration = 0.0
+        self.target = self.position
+        self._cruise = max_velocity
+        self._plan: Optional[tuple] = None  # min_jerk: (coefficients, duration, elapsed)
+
+    def _clamp(self, value: float) -> float:
+        return max(self.lower, min(self.upper, value))
+
+    @property
+    def moving(self) -> bool:
+        return self.position != self.target or self.velocity != 0.0
+
+    def set_target(self, target: float, duration: Optional[float] = None) -> None:
+        """
+        Move towards ``target``
+
+        Args:
+            target: New target position (clamped to the servo's range)
+            duration: Take this long instead of moving as fast as the limits
+                allow; it is stretched if the limits can't make it
+        """
+        self.target = self._clamp(target)
+        distance = abs(self.target - self.position)
+        if self.profile == MIN_JERK:
+            self._plan_min_jerk(distance, duration)
+        else:
+            self._cruise = self._cruise_velocity(distance, duration)
+
+    def jump(self, position: float) -> None:
+        """Set the position immediately, at rest."""
+        self.position = self.target = self._clamp(position)
+        self.velocity = self.acceleration = 0.0
+        self._plan = None
+
+    def _cruise_velocity(self, distance: float, duration: Optional[float]) -> float:
+        """Slowest cruise velocity that covers ``distance`` within ``duration`` (trapezoid)."""
+        if not duration or distance < EPSILON:
+            return self.max_velocity
+        a = self.max_acceleration
+        # distance = v * (duration - v / a)  =>  v^2 - a*T*v + a*d = 0
+        discriminant = (a * duration) ** 2 - 4 * a * distance
+        if discriminant < 0:
+            return self.max_velocity
+        return min(self.max_velocity, (a * duration - math.sqrt(discriminant)) / 2)
+
+    def _plan_min_jerk(self, distance: float, duration: Optional[float]) -> None:
+        if distance < EPSILON and abs(self.velocity) < EPSILON:
+            self._plan = None
+            return
+        # A rest-to-rest quintic peaks at 1.875 d/T velocity and 5.774 d/T^2 acceleration
+        fastest = max(1.875 * distance / self.max_velocity, math.sqrt(5.774 * distance / self.max_acceleration))
+        # Leave time to bring any current velocity to rest
+        fastest = max(fastest, abs(self.velocity) / self.max_acceleration)
+        T = max(duration or 0.0, fastest, 1e-3)
+        p0, v0, a0, pf = self.position, self.velocity, self.acceleration, self.target
+        # Quintic with p(0)=p0, p'(0)=v0, p''(0)=a0, p(T)=pf, p'(T)=0, p''(T)=0
+        d = pf - p0 - v0 * T - 0.5 * a0 * T ** 2
+        dv = -v0 - a0 * T
+        da = -a0
+        c3 = (10 * d - 4 * dv * T + 0.5 * da * T ** 2) / T ** 3
+        c4 = (-15 * d + 7 * dv * T - da * T ** 2) / T ** 4
+        c5 = (6 * d - 3 * dv * T + 0.5 * da * T ** 2) / T ** 5
+        self._plan = ((p0, v0, 0.5 * a0, c3, c4, c5), T, 0.0)
+
+    def step(self, dt: float) -> float:
+        """Advance by ``dt`` seconds; returns the new position."""
+        if not self.moving or dt <= 0:
+            return self.position
+        if self.profile == MIN_JERK:
+            self._step_min_jerk(dt)
+        else:
+            self._step_trapezoidal(dt)
+        return self.position
+
+    def _step_trapezoidal(self, dt: float) -> None:
+        error = self.target - self.position
+        direction = 1.0 if error > 0 else -1.0
+        # Fastest speed from which we can still stop on the target, and no further than it this tick
+        desired = direction * min(self._cruise, math.sqrt(2 * self.max_acceleration * abs(error)), abs(error) / dt)
+        max_change = self.max_acceleration * dt
+        change = max(-max_change, min(max_change, desired - self.velocity))
+        self.velocity += change
+        self.acceleration = change / dt
+        self.position += self.velocity * dt
+        remaining = self.target - self.position
+        if abs(remaining) < EPSILON or (remaining * direction < 0 and abs(self.velocity) <= max_change):
+            self.position = self.target
+            self.velocity = self.acceleration = 0.0
+        self.position = self._clamp(self.position)
+
+    def _step_min_jerk(self, dt: float) -> None:
+        if self._plan is None:
+            self._plan_min_jerk(abs(self.target - self.position), None)
+            if self._plan is None:
+                self.position, self.velocity, self.acceleration = self.target, 0.0, 0.0
+                return
+        coefficients, T, elapsed = self._plan
+        t = min(T, elapsed + dt)
+        c0, c1, c2, c3, c4, c5 = coefficients
+        self.position = self._clamp(c0 + t * (c1 + t * (c2 + t * (c3 + t * (c4 + t * c5)))))
+        self.velocity = c1 + t * (2 * c2 + t * (3 * c3 + t * (4 * c4 + t * 5 * c5)))
+        self.acceleration = 2 * c2 + t * (6 * c3 + t * (12 * c4 + t * 20 * c5))
+        if t >= T:
+            self.position, self.velocity, self.acceleration = self.target, 0.0, 0.0
+            self._plan = None
+        else:
+            self._plan = (coefficients, T, t)
+
+
+class ServoMotion:
+    """
+    Trajectories for a set of named servos, stepped together from the control loop
+
+    ``set_target`` may be called from any thread; ``step`` is called once
+    per control tick and returns the positions that changed. Timed moves
+    (gestures) pass a ``duration`` to ``set_target``.
+    """
+
+    def __init__(self, trajectories: Dict[str, ServoTrajectory]):
+        self.trajectories = trajectories
+        self._lock = threading.Lock()
+
+    def set_target(self, name: str, target: float, duration: Optional[float] = None) -> None:
+        with self._lock:
+            self.trajectories[name].set_target(target, duration)
+
+    def step(self, dt: float) -> Dict[str, float]:
+        """Advance every trajectory by ``dt``; returns ``{name: position}`` for the servos that moved."""
+        with self._lock:
+            moved = {}
+            for name, trajectory in self.trajectories.items():
+                if trajectory.moving:
+                    moved[name] = trajectory.step(dt)
+            return moved
+
+    def positions(self) -> Dict[str, float]:
+        with self._lock:
+            return {name: t.position for name, t in self.trajectories.items()}
@@ -90,7 +90,7 @@ class VisionModule:
         self._lock = threading.Lock()
         
         # Load config
-        config = Config()
+        config = Config.shared()
         self.width = config.get('vision', 'camera', 'width', default=640)
         self.height = config.get('vision', 'camera', 'height', default=480)
         self.framerate = config.get('vision', 'camera', 'framerate', default=30)
@@ -121,6 +121,7 @@ class VisionModule:
         self.is_running = False
         self.processing_thread = None
         self.current_frame = None
+        self.frame_count = 0  # Incremented per captured frame so consumers can skip repeats
         self.detected_objects = []
         self.callbacks = []
         
@@ -194,6 +195,7 @@ class VisionModule:
                 # Store frame
                 with self._lock:
                     self.current_frame = frame
+                    self.frame_count += 1
                     
                 # Process frame (simulated object detection)
                 height, width = frame.shape[:2]
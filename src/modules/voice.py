@@ -10,7 +10,13 @@ from typing import Optional, Dict, Any, List, Tuple, Union
 import logging
 logger = logging.getLogger(__name__)
 from config import Config
-config = Config()
+from utils.metrics import histogram
+from utils.tracing import TRACER, NULL_SPAN
+config = Config.shared()
+
+TTS_FIRST_AUDIO_SECONDS = histogram(
+    'robbie_tts_first_audio_seconds',
+    'Time from say() to the start of audio playback for the first queued utterance')
 
 class VoiceModule(threading.Thread):
     """Text-to-speech module using pyttsx3 with proper event handling"""
@@ -57,6 +63,9 @@ class VoiceModule(threading.Thread):
         # Speech queue and callbacks
         self._text: List[Tuple[str, bool]] = []
         self._completion_callbacks = []
+        self._say_requested_at: Optional[float] = None  # For time-to-first-audio
+        self._tts_span = NULL_SPAN
+        self._playback_span = NULL_SPAN
         
         # Start thread
         self._is_alive.set()
@@ -218,6 +227,9 @@ class VoiceModule(threading.Thread):
             
             # Queue all text items
             with self._text_lock:
+                if not self._text and self._say_requested_at is None:
+                    self._say_requested_at = time.perf_counter()
+                    self._tts_span = TRACER.start_span('tts_first_audio', start=self._say_requested_at)
                 for t in text:
                     self._text.append(t)
                     if self.debug:
@@ -263,6 +275,8 @@ class VoiceModule(threading.Thread):
     def _notify_completion(self):
         """Notify completion callbacks"""
         logger.debug("[VoiceModule] Notifying completion callbacks")
+        self._playback_span.finish()
+        self._playback_span = NULL_SPAN
         for callback in self._completion_callbacks:
             try:
                 logger.debug(f"[VoiceModule] Calling completion callback: {callback}")
@@ -271,6 +285,16 @@ class VoiceModule(threading.Thread):
                 logger.exception(f"[VoiceModule] Error in completion callback: {e}")
         logger.debug("[VoiceModule] All completion callbacks notified")
                     
+    def _mark_playback_start(self):
+        """Record time-to-first-audio for the request that started this utterance."""
+        requested_at = self._say_requested_at
+        if requested_at is not None:
+            TTS_FIRST_AUDIO_SECONDS.observe(time.perf_counter() - requested_at)
+            self._say_requested_at = None
+            self._tts_span.finish()
+            self._tts_span = NULL_SPAN
+            self._playback_span = TRACER.start_span('playback')
+
     def add_completion_callback(self, callback):
         """Add callback to be called when speech completes"""
         self._completion_callbacks.append(callback)
@@ -399,6 +423,7 @@ class VoiceModule(threading.Thread):
                                 time.sleep(1)
                                 self._notify_completion()
                             else:
+                                self._mark_playback_start()
                                 self.engine.say(text)
                                 logger.info(f"[VoiceModule] Queued text to engine.say(): '{text}'")
                                 if blocking:
@@ -523,6 +548,7 @@ class VoiceModule(threading.Thread):
                                     
                                     # Play to USB speaker (hw:1,0) AND loopback (hw:0,1) simultaneously
                                     # Start both playbacks in background
+                                    self._mark_playback_start()
                                     usb_proc = subprocess.Popen(
                                         ['aplay', '-D', 'plughw:1,0', tmp_wav],
                                         stdout=subprocess.PIPE,
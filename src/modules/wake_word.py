@@ -14,6 +14,7 @@ import time
 from typing import Optional, Callable, List
 
 from .audio import AudioModule
+from utils.tracing import TRACER
 
 import logging
 logger = logging.getLogger(__name__)
@@ -153,6 +154,7 @@ class WakeWordModule:
             if result >= 0:  # Wake word detected
                 if self.debug:
                     logger.info("Wake word detected!")
+                TRACER.begin_turn('wake_word')
                     
                 # Notify callbacks
                 for callback in self._detection_callbacks:
@@ -0,0 +1,373 @@
+"""
+Simulated robot hardware
+
+Drop-in stand-ins for ``board``, ``adafruit_motorkit.MotorKit``,
+``adafruit_servokit.ServoKit`` and the ``unicornhat`` module. They write
+through a simulated I2C bus and PCA9685 register model (``simulation.i2c``)
+the same way the Adafruit libraries do, sleep for a modelled bus latency on
+each transaction, and record every command with a timestamp.
+
+Call ``install()`` before the motor and LED modules are imported so they
+pick up the simulated backends and see the hardware as present.
+"""
+import sys
+import threading
+import time
+import types
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from .i2c import LED0_ON_L, MODE1, PRESCALE, SimI2C, SimPCA9685
+
+# Print every recorded command
+VERBOSE = False
+
+SERVO_HAT_ADDRESS = 0x40
+MOTOR_HAT_ADDRESS = 0x60
+# Motor HAT DC motor channels (speed, positive, negative), as in adafruit_motorkit
+DC_MOTOR_CHANNELS = {1: (8, 9, 10), 2: (13, 12, 11), 3: (2, 3, 4), 4: (7, 6, 5)}
+REFERENCE_CLOCK_HZ = 25_000_000
+
+
+@dataclass(frozen=True)
+class Command:
+    """One recorded hardware command; ``timestamp`` is ``time.perf_counter()`` when it was issued."""
+    timestamp: float
+    device: str
+    command: str
+    value: Any = None
+
+
+class CommandLog:
+    """Thread-safe, bounded log of timestamped hardware commands."""
+
+    def __init__(self, maxlen: int = 100_000):
+        self._entries: deque = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self.start = time.perf_counter()
+
+    def record(self, device: str, command: str, value: Any = None) -> Command:
+        entry = Command(time.perf_counter(), device, command, value)
+        with self._lock:
+            self._entries.append(entry)
+        if VERBOSE:
+            print(f"[sim {entry.timestamp - self.start:10.6f}] {device} {command} {value}")
+        return entry
+
+    def entries(self, device: Optional[str] = None, since: Optional[float] = None) -> List[Command]:
+        """Commands, oldest first, optionally only for ``device`` and issued at or after ``since``."""
+        with self._lock:
+            entries = list(self._entries)
+        return [e for e in entries
+                if (device is None or e.device == device) and (since is None or e.timestamp >= since)]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of commands per device."""
+        counts: Dict[str, int] = {}
+        for entry in self.entries():
+            counts[entry.device] = counts.get(entry.device, 0) + 1
+        return counts
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass
+class LatencyModel:
+    """
+    Time each simulated bus operation takes
+
+    The defaults approximate a Raspberry Pi: a 400 kHz I2C bus (9 bit
+    times per byte) with about 100 us of driver overhead per transaction,
+    and the LED matrix refreshed over an 8 MHz SPI link.
+
+    Attributes:
+        i2c_transaction: Seconds per I2C transaction
+        i2c_byte: Seconds per byte on the I2C bus, including the address byte
+        spi_transaction: Seconds per LED refresh
+        spi_byte: Seconds per LED data byte
+    """
+    i2c_transaction: float = 100e-6
+    i2c_byte: float = 22.5e-6
+    spi_transaction: float = 50e-6
+    spi_byte: float = 1e-6
+
+    def scaled(self, factor: float) -> 'LatencyModel':
+        return LatencyModel(self.i2c_transaction * factor, self.i2c_byte * factor,
+                            self.spi_transaction * factor, self.spi_byte * factor)
+
+
+def _sleep(seconds: float) -> None:
+    if seconds > 0:
+        time.sleep(seconds)
+
+
+class SimHardware:
+    """The simulated I2C bus with both HATs' PCA9685s, the LED matrix and a shared command log."""
+
+    def __init__(self, latency: Optional[LatencyModel] = None, log: Optional[CommandLog] = None):
+        self.latency = latency or LatencyModel()
+        self.log = log or CommandLog()
+        self.i2c = SimI2C(latency=self.latency.i2c_transaction, byte_time=self.latency.i2c_byte, log=self.log)
+        self.servo_chip = SimPCA9685()
+        self.motor_chip = SimPCA9685()
+        self.i2c.attach(SERVO_HAT_ADDRESS, self.servo_chip)
+        self.i2c.attach(MOTOR_HAT_ADDRESS, self.motor_chip)
+        self.unicornhat = SimUnicornHat(self)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'i2c_transactions': self.i2c.transactions,
+            'i2c_bytes': self.i2c.bytes_written + self.i2c.bytes_read,
+            'i2c_by_address': {f"0x{address:02x}": n for address, n in self.i2c.by_address.items()},
+            'led_refreshes': self.unicornhat.refreshes,
+            'commands': self.log.counts(),
+        }
+
+
+_current: Optional[SimHardware] = None
+_current_lock = threading.Lock()
+
+
+def current() -> SimHardware:
+    """The installed simulated hardware, created with default latencies on first use."""
+    global _current
+    with _current_lock:
+        if _current is None:
+            _current = SimHardware()
+        return _current
+
+
+class _PCA9685Channels:
+    """Per-channel writes to a simulated PCA9685, as adafruit_pca9685 makes them."""
+
+    def __init__(self, i2c, address: int, frequency: float):
+        self.i2c = i2c
+        self.address = address
+        # adafruit_pca9685: reset, set the prescaler while asleep, then wake with auto-increment on
+        prescale = int(REFERENCE_CLOCK_HZ / 4096.0 / frequency + 0.5) - 1
+        self._write(bytes([MODE1, 0x00]))
+        self._write(bytes([MODE1, 0x10]))
+        self._write(bytes([PRESCALE, prescale]))
+        self._write(bytes([MODE1, 0x00]))
+        self._write(bytes([MODE1, 0xA0]))
+
+    def _write(self, data: bytes) -> None:
+        while not self.i2c.try_lock():
+            pass
+        try:
+            self.i2c.writeto(self.address, data)
+        finally:
+            self.i2c.unlock()
+
+    def set_duty_cycle(self, channel: int, duty_cycle: int) -> None:
+        if duty_cycle == 0xFFFF:
+            on, off = 0x1000, 0
+        else:
+            on, off = 0, (duty_cycle + 1) >> 4
+        self._write(bytes([LED0_ON_L + 4 * channel, on & 0xFF, on >> 8, off & 0xFF, off >> 8]))
+
+
+class SimDCMotor:
+    """A Motor HAT DC motor in fast decay mode, like adafruit_motor.motor.DCMotor."""
+
+    def __init__(self, kit: 'SimMotorKit', number: int):
+        self._kit = kit
+        self.number = number
+        self._speed, self._positive, self._negative = DC_MOTOR_CHANNELS[number]
+        self._throttle: Optional[float] = None
+        kit._pwm.set_duty_cycle(self._speed, 0xFFFF)
+
+    @property
+    def throttle(self) -> Optional[float]:
+        return self._throttle
+
+    @throttle.setter
+    def throttle(self, value: Optional[float]) -> None:
+        if value is not None and not -1.0 <= value <= 1.0:
+            raise ValueError("Throttle must be None or between -1.0 and +1.0")
+        self._kit._log.record('motor_kit', f'motor{self.number}.throttle', value)
+        pwm = self._kit._pwm
+        if value is None:
+            pwm.set_duty_cycle(self._positive, 0)
+            pwm.set_duty_cycle(self._negative, 0)
+        elif value == 0:
+            pwm.set_duty_cycle(self._positive, 0xFFFF)
+            pwm.set_duty_cycle(self._negative, 0xFFFF)
+        else:
+            duty_cycle = int(0xFFFF * abs(value))
+            pwm.set_duty_cycle(self._positive, duty_cycle if value > 0 else 0)
+            pwm.set_duty_cycle(self._negative, duty_cycle if value < 0 else 0)
+        self._throttle = value
+
+
+class SimMotorKit:
+    """Drop-in for ``adafruit_motorkit.MotorKit`` (DC motors only)."""
+
+    def __init__(self, address: int = MOTOR_HAT_ADDRESS, i2c=None, steppers_microsteps: int = 16,
+                 pwm_frequency: float = 1600.0):
+        hardware = current()
+        self._log = hardware.log
+        self._pwm = _PCA9685Channels(i2c or hardware.i2c, address, pwm_frequency)
+        self.motor1 = SimDCMotor(self, 1)
+        self.motor2 = SimDCMotor(self, 2)
+        self.motor3 = SimDCMotor(self, 3)
+        self.motor4 = SimDCMotor(self, 4)
+
+
+class SimServo:
+    """A servo channel, like adafruit_motor.servo.Servo."""
+
+    def __init__(self, kit: 'SimServoKit', channel: int):
+        self._kit = kit
+        self.channel = channel
+        self.actuation_range = 180
+        self._angle: Optional[float] = None
+        self.set_pulse_width_range()
+
+    def set_pulse_width_range(self, min_pulse: int = 750, max_pulse: int = 2250) -> None:
+        frequency = self._kit.frequency
+        self._min_duty = int((min_pulse * frequency) / 1_000_000 * 0xFFFF)
+        max_duty = (max_pulse * frequency) / 1_000_000 * 0xFFFF
+        self._duty_range = int(max_duty - self._min_duty)
+        self._kit._log.record('servo_kit', f'servo[{self.channel}].pulse_width_range', (min_pulse, max_pulse))
+
+    @property
+    def angle(self) -> Optional[float]:
+        return self._angle
+
+    @angle.setter
+    def angle(self, value: Optional[float]) -> None:
+        self._kit._log.record('servo_kit', f'servo[{self.channel}].angle', value)
+        if value is None:
+            self._kit._pwm.set_duty_cycle(self.channel, 0)
+        else:
+            if not 0 <= value <= self.actuation_range:
+                raise ValueError("Angle out of range")
+            fraction = value / self.actuation_range
+            self._kit._pwm.set_duty_cycle(self.channel, self._min_duty + int(fraction * self._duty_range))
+        self._angle = value
+
+
+class SimServoKit:
+    """Drop-in for ``adafruit_servokit.ServoKit`` (standard servos only)."""
+
+    def __init__(self, *, channels: int, i2c=None, address: int = SERVO_HAT_ADDRESS,
+                 reference_clock_speed: int = REFERENCE_CLOCK_HZ, frequency: float = 50):
+        if channels not in (8, 16):
+            raise ValueError("servo_channels must be 8 or 16!")
+        hardware = current()
+        self._log = hardware.log
+        self.frequency = frequency
+        self._pwm = _PCA9685Channels(i2c or hardware.i2c, address, frequency)
+        self.servo = [SimServo(self, channel) for channel in range(channels)]
+
+
+class SimUnicornHat:
+    """
+    Stand-in for the ``unicornhat`` module
+
+    Pixels are buffered by ``set_pixel`` and sent to the matrix by
+    ``show()``, which takes the modelled SPI transfer time.
+    """
+
+    PHAT = 'phat'
+    HAT = 'hat'
+    AUTO = None
+
+    def __init__(self, hardware: SimHardware):
+        self._hardware = hardware
+        self._lock = threading.Lock()
+        self.refreshes = 0
+        self._brightness = 0.5
+        self.set_layout(self.PHAT)
+
+    def set_layout(self, layout=None) -> None:
+        self.width, self.height = (8, 4) if layout == self.PHAT else (8, 8)
+        self.pixels = [[(0, 0, 0)] * self.width for _ in range(self.height)]
+        self.shown = [row[:] for row in self.pixels]
+        self._hardware.log.record('unicornhat', 'set_layout', layout)
+
+    def get_shape(self):
+        return self.width, self.height
+
+    def brightness(self, b: float = 0.2) -> None:
+        if not 0 <= b <= 1:
+            raise ValueError("Brightness must be between 0.0 and 1.0")
+        self._brightness = b
+        self._hardware.log.record('unicornhat', 'brightness', b)
+
+    def get_brightness(self) -> float:
+        return self._brightness
+
+    def set_pixel(self, x: int, y: int, r: int, g: int = None, b: int = None) -> None:
+        if g is None and b is None:
+            r, g, b = r
+        with self._lock:
+            self.pixels[y][x] = (int(r), int(g), int(b))
+        self._hardware.log.record('unicornhat', 'set_pixel', (x, y, r, g, b))
+
+    def get_pixel(self, x: int, y: int):
+        with self._lock:
+            return self.pixels[y][x]
+
+    def set_all(self, r: int, g: int, b: int) -> None:
+        with self._lock:
+            self.pixels = [[(int(r), int(g), int(b))] * self.width for _ in range(self.height)]
+        self._hardware.log.record('unicornhat', 'set_all', (r, g, b))
+
+    def clear(self) -> None:
+        self.set_all(0, 0, 0)
+
+    def off(self) -> None:
+        self.clear()
+        self.show()
+
+    def show(self) -> None:
+        latency = self._hardware.latency
+        with self._lock:
+            self.shown = [row[:] for row in self.pixels]
+            data_bytes = self.width * self.height * 3
+        _sleep(latency.spi_transaction + latency.spi_byte * data_bytes)
+        self.refreshes += 1
+        self._hardware.log.record('unicornhat', 'show', data_bytes)
+
+
+def install(latency: Optional[LatencyModel] = None, log: Optional[CommandLog] = None,
+            motors: bool = True, servos: bool = True, leds: bool = True) -> SimHardware:
+    """
+    Use the simulated hardware in this process
+
+    Registers ``board``, ``adafruit_motorkit``, ``adafruit_servokit`` and
+    ``unicornhat`` modules backed by the simulation and marks the hardware
+    as available in ``utils.hardware``. Must run before ``modules.motor``
+    and ``modules.leds`` are imported.
+
+    Returns:
+        SimHardware: The simulated bus, chips, LED matrix and command log
+    """
+    global _current
+    hardware = SimHardware(latency, log)
+    with _current_lock:
+        _current = hardware
+
+    board = types.ModuleType('board')
+    board.I2C = lambda: current().i2c
+    board.SCL, board.SDA = 3, 2
+    motorkit = types.ModuleType('adafruit_motorkit')
+    motorkit.MotorKit = SimMotorKit
+    servokit = types.ModuleType('adafruit_servokit')
+    servokit.ServoKit = SimServoKit
+    sys.modules.update({'board': board, 'adafruit_motorkit': motorkit, 'adafruit_servokit': servokit,
+                        'unicornhat': hardware.unicornhat})
+
+    from utils import hardware as detected
+    detected.MOTORS_AVAILABLE = motors
+    detected.SERVOS_AVAILABLE = servos
+    detected.LED_AVAILABLE = leds
+    return hardware
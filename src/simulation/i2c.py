@@ -0,0 +1,129 @@
+import threading
+import time
+from typing import Dict, Optional
+
+# PCA9685 registers
+MODE1 = 0x00
+LED0_ON_L = 0x06
+PRESCALE = 0xFE
+MODE1_AUTO_INCREMENT = 0x20
+
+
+class SimPCA9685:
+    """
+    Register model of a PCA9685 behind a simulated I2C bus
+
+    A write sets the register pointer from its first byte and stores the
+    rest, advancing the pointer only when MODE1's auto-increment bit is set,
+    as on the real chip.
+    """
+
+    def __init__(self, frequency: float = 50.0, auto_increment: bool = False):
+        self.registers = bytearray(256)
+        self.registers[MODE1] = 0x11 | (MODE1_AUTO_INCREMENT if auto_increment else 0)
+        self.registers[PRESCALE] = max(3, round(25_000_000 / (4096 * frequency)) - 1)
+        self._pointer = 0
+
+    def write(self, data: bytes) -> None:
+        if not data:
+            return
+        self._pointer = data[0]
+        for value in data[1:]:
+            self.registers[self._pointer] = value
+            if self.registers[MODE1] & MODE1_AUTO_INCREMENT:
+                self._pointer = (self._pointer + 1) & 0xFF
+
+    def read(self, length: int) -> bytes:
+        data = bytes(self.registers[(self._pointer + i) & 0xFF] for i in range(length))
+        if self.registers[MODE1] & MODE1_AUTO_INCREMENT:
+            self._pointer = (self._pointer + length) & 0xFF
+        return data
+
+    def channel(self, channel: int) -> tuple:
+        """``(on, off)`` register values of a channel."""
+        base = LED0_ON_L + 4 * channel
+        regs = self.registers[base:base + 4]
+        return regs[0] | regs[1] << 8, regs[2] | regs[3] << 8
+
+    def duty_cycle(self, channel: int) -> int:
+        """16-bit duty cycle as adafruit_pca9685 reports it."""
+        on, off = self.channel(channel)
+        if on & 0x1000:
+            return 0xFFFF
+        return (off & 0xFFF) << 4
+
+
+class SimI2C:
+    """
+    Simulated busio.I2C that counts transactions and bytes
+
+    Devices are attached by address; each ``writeto``, ``readfrom_into`` and
+    ``writeto_then_readfrom`` is one transaction. An optional latency per
+    transaction and per byte approximates bus time, and an optional
+    command log (``simulation.hardware.CommandLog``) records each transaction.
+    """
+
+    def __init__(self, latency: float = 0.0, byte_time: float = 0.0, log=None):
+        self.devices: Dict[int, object] = {}
+        self.latency = latency
+        self.byte_time = byte_time
+        self.log = log
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.reset_counts()
+
+    def attach(self, address: int, device) -> None:
+        self.devices[address] = device
+
+    def reset_counts(self) -> None:
+        with self._stats_lock:
+            self.transactions = 0
+            self.bytes_written = 0
+            self.bytes_read = 0
+            self.by_address: Dict[int, int] = {}
+
+    def try_lock(self) -> bool:
+        return self._lock.acquire(blocking=False)
+
+    def unlock(self) -> None:
+        self._lock.release()
+
+    def scan(self) -> list:
+        return sorted(self.devices)
+
+    def _device(self, address: int):
+        device = self.devices.get(address)
+        if device is None:
+            raise OSError(121, f"No I2C device at 0x{address:02x}")  # Remote I/O error, like Linux
+        return device
+
+    def _transaction(self, address: int, written: int, read: int) -> None:
+        with self._stats_lock:
+            self.transactions += 1
+            self.bytes_written += written
+            self.bytes_read += read
+            self.by_address[address] = self.by_address.get(address, 0) + 1
+        if self.log is not None:
+            self.log.record(f"i2c 0x{address:02x}", 'read' if read else 'write', written + read)
+        delay = self.latency + self.byte_time * (written + read + 1)
+        if delay > 0:
+            time.sleep(delay)
+
+    def writeto(self, address: int, buffer, *, start: int = 0, end: Optional[int] = None) -> None:
+        data = bytes(buffer[start:end])
+        self._device(address).write(data)
+        self._transaction(address, len(data), 0)
+
+    def readfrom_into(self, address: int, buffer, *, start: int = 0, end: Optional[int] = None) -> None:
+        end = len(buffer) if end is None else end
+        buffer[start:end] = self._device(address).read(end - start)
+        self._transaction(address, 0, end - start)
+
+    def writeto_then_readfrom(self, address: int, buffer_out, buffer_in, *, out_start: int = 0,
+                              out_end: Optional[int] = None, in_start: int = 0, in_end: Optional[int] = None) -> None:
+        device = self._device(address)
+        data = bytes(buffer_out[out_start:out_end])
+        device.write(data)
+        in_end = len(buffer_in) if in_end is None else in_end
+        buffer_in[in_start:in_end] = device.read(in_end - in_start)
+        self._transaction(address, len(data), in_end - in_start)
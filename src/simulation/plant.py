@@ -0,0 +1,169 @@
+"""
+Physical response of the simulated robot
+
+Reads what the simulated PCA9685s output and models what the wheels and
+servos do with it, so calibration and odometry can be exercised off the
+robot: wheel speed with a static-friction deadband, encoder counts, motor
+and servo current, and servo angles that stop at mechanical limits, as a
+camera would see them.
+"""
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from .hardware import DC_MOTOR_CHANNELS, REFERENCE_CLOCK_HZ, SimHardware
+from .i2c import PRESCALE
+
+# Motor HAT motors driving each side, as MotorModule wires them
+SIDE_MOTORS = {'left': (1, 2), 'right': (3, 4)}
+
+
+@dataclass
+class WheelModel:
+    """
+    One side's drive train
+
+    Attributes:
+        deadband: Throttle below which static friction holds the wheel still
+        max_rps: Wheel revolutions per second at full throttle
+        free_current: Amps drawn while powered
+        amps_per_throttle: Additional amps per unit throttle
+        overload_throttle: Throttle above which the current rises steeply
+        overload_amps_per_throttle: Extra amps per unit throttle above ``overload_throttle``
+    """
+    deadband: float = 0.12
+    max_rps: float = 3.0
+    free_current: float = 0.15
+    amps_per_throttle: float = 1.2
+    overload_throttle: float = 0.85
+    overload_amps_per_throttle: float = 8.0
+
+    def speed(self, throttle: float) -> float:
+        magnitude = max(0.0, abs(throttle) - self.deadband) / (1.0 - self.deadband)
+        return math.copysign(magnitude * self.max_rps, throttle)
+
+    def current(self, throttle: float) -> float:
+        magnitude = abs(throttle)
+        if magnitude == 0:
+            return 0.0
+        overload = max(0.0, magnitude - self.overload_throttle) * self.overload_amps_per_throttle
+        return self.free_current + magnitude * self.amps_per_throttle + overload
+
+
+@dataclass
+class ServoModel:
+    """
+    One servo and the mechanism it moves
+
+    Attributes:
+        channel: Servo HAT channel
+        center_pulse: Pulse width (us) at which the mechanism points straight ahead / level
+        us_per_degree: Pulse width change per degree
+        min_angle: Mechanical limit in degrees (negative side)
+        max_angle: Mechanical limit in degrees (positive side)
+        free_current: Amps drawn holding a position
+        stall_current: Amps drawn when driven against a limit
+    """
+    channel: int
+    center_pulse: float = 1500.0
+    us_per_degree: float = 10.0
+    min_angle: float = -90.0
+    max_angle: float = 90.0
+    free_current: float = 0.05
+    stall_current: float = 0.8
+
+    def commanded_angle(self, pulse: float) -> float:
+        return (pulse - self.center_pulse) / self.us_per_degree
+
+    def angle(self, pulse: float) -> float:
+        return max(self.min_angle, min(self.max_angle, self.commanded_angle(pulse)))
+
+    def current(self, pulse: float) -> float:
+        commanded = self.commanded_angle(pulse)
+        return self.stall_current if not self.min_angle <= commanded <= self.max_angle else self.free_current
+
+
+def default_wheels() -> Dict[str, WheelModel]:
+    # The right side is a little stiffer and slower, so calibration has something to trim
+    return {'left': WheelModel(), 'right': WheelModel(deadband=0.15, max_rps=2.7)}
+
+
+def default_servos() -> Dict[str, ServoModel]:
+    return {
+        'left_arm': ServoModel(0, center_pulse=1600, min_angle=-80, max_angle=80),
+        'right_arm': ServoModel(1, center_pulse=1550, min_angle=-75, max_angle=80),
+        'head_pan': ServoModel(14, center_pulse=1400, min_angle=-70, max_angle=70),
+        'head_tilt': ServoModel(15, center_pulse=1450, min_angle=-30, max_angle=35),
+    }
+
+
+class SimPlant:
+    """
+    Wheels, encoders, current sensors and a camera for the simulated hardware
+
+    Everything is derived from the PCA9685 registers at the time of the
+    read. Encoder counts are integrated between reads, assuming the throttle
+    was constant since the previous read.
+    """
+
+    def __init__(self, hardware: SimHardware, wheels: Optional[Dict[str, WheelModel]] = None,
+                 servos: Optional[Dict[str, ServoModel]] = None, counts_per_rev: int = 360,
+                 camera_noise: float = 0.0, seed: int = 0):
+        self.hardware = hardware
+        self.wheels = wheels or default_wheels()
+        self.servos = servos or default_servos()
+        self.counts_per_rev = counts_per_rev
+        self.camera_noise = camera_noise
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts = {side: 0.0 for side in self.wheels}
+        self._counted_at = {side: time.perf_counter() for side in self.wheels}
+
+    def throttle(self, side: str) -> float:
+        """Mean throttle the Motor HAT outputs to a side's motors (brake and coast read as 0)."""
+        chip = self.hardware.motor_chip
+        total = 0.0
+        for motor in SIDE_MOTORS[side]:
+            _, positive, negative = DC_MOTOR_CHANNELS[motor]
+            total += (chip.duty_cycle(positive) - chip.duty_cycle(negative)) / 0xFFFF
+        return total / len(SIDE_MOTORS[side])
+
+    def wheel_speed(self, side: str) -> float:
+        """Wheel revolutions per second."""
+        return self.wheels[side].speed(self.throttle(side))
+
+    def encoder_counts(self, side: str) -> int:
+        with self._lock:
+            now = time.perf_counter()
+            self._counts[side] += self.wheel_speed(side) * self.counts_per_rev * (now - self._counted_at[side])
+            self._counted_at[side] = now
+            return int(self._counts[side])
+
+    def servo_pulse(self, name: str) -> float:
+        """Pulse width (us) the Servo HAT outputs on a servo's channel."""
+        chip = self.hardware.servo_chip
+        frequency = REFERENCE_CLOCK_HZ / 4096 / (chip.registers[PRESCALE] + 1)
+        on, off = chip.channel(self.servos[name].channel)
+        return (off & 0xFFF) / 4096 * 1_000_000 / frequency
+
+    def servo_angle(self, name: str) -> Optional[float]:
+        """True angle in degrees, or None while the servo gets no pulse."""
+        pulse = self.servo_pulse(name)
+        return self.servos[name].angle(pulse) if pulse else None
+
+    def camera_angle(self, name: str) -> Optional[float]:
+        """Angle as estimated from a camera image (the true angle plus ``camera_noise`` degrees of noise)."""
+        angle = self.servo_angle(name)
+        if angle is None or not self.camera_noise:
+            return angle
+        return angle + self._random.gauss(0.0, self.camera_noise)
+
+    def current(self, name: str) -> float:
+        """Amps drawn by a side's motors (``left``/``right``) or by a servo."""
+        if name in self.wheels:
+            return self.wheels[name].current(self.throttle(name))
+        pulse = self.servo_pulse(name)
+        return self.servos[name].current(pulse) if pulse else 0.0
@@ -0,0 +1,265 @@
+import asyncio
+import inspect
+import itertools
+import threading
+import time
+import logging
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum, IntEnum
+from typing import Any, Callable, ClassVar, Deque, Dict, List, Optional, Tuple, Type
+
+from utils.metrics import counter, histogram
+
+logger = logging.getLogger(__name__)
+
+EVENTS_PUBLISHED = counter('robbie_events_published_total', 'Events published on the event bus')
+EVENTS_DROPPED = counter('robbie_events_dropped_total', 'Events dropped because a subscriber queue was full')
+EVENT_DELIVERY_LAG_SECONDS = histogram(
+    'robbie_event_delivery_lag_seconds',
+    'Time from publish to a queued subscriber starting to handle the event')
+
+
+class Priority(IntEnum):
+    """Delivery lane; a subscriber drains higher lanes first."""
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+class Executor(Enum):
+    """Where a subscriber's handler runs."""
+    INLINE = 'inline'    # On the publisher's thread; only for handlers that never block
+    THREAD = 'thread'    # On a worker thread owned by the subscription
+    ASYNCIO = 'asyncio'  # On an asyncio event loop; coroutine handlers are scheduled as tasks
+
+
+class DropPolicy(Enum):
+    """What a full subscriber lane does with a new event."""
+    DROP_OLDEST = 'drop_oldest'  # Discard the oldest queued event
+    DROP_NEWEST = 'drop_newest'  # Discard the new event
+    LATEST = 'latest'            # Keep only the newest event (for telemetry such as levels)
+
+
+@dataclass(frozen=True)
+class Event:
+    """Base class for bus events; subclasses set ``priority`` for their default lane."""
+    priority: ClassVar[Priority] = Priority.NORMAL
+
+
+class Subscription:
+    """A handler registered for an event type, with its own bounded delivery lanes."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, bus: 'EventBus', event_type: Type[Event], handler: Callable[[Any], Any],
+                 executor: Executor, name: str, queue_size: int, drop: DropPolicy,
+                 loop: Optional[asyncio.AbstractEventLoop]):
+        self.id = next(self._ids)
+        self.bus = bus
+        self.event_type = event_type
+        self.handler = handler
+        self.executor = executor
+        self.name = name
+        self.queue_size = 1 if drop == DropPolicy.LATEST else max(1, queue_size)
+        self.drop = drop
+        self.loop = loop
+        self.active = True
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_lag = 0.0
+        self._lanes: Tuple[Deque[Tuple[Event, float]], ...] = tuple(deque() for _ in Priority)
+        self._cond = threading.Condition()
+        self._drain_scheduled = False
+        self._thread: Optional[threading.Thread] = None
+        if executor == Executor.THREAD:
+            self._thread = threading.Thread(target=self._run, daemon=True, name=f"events-{name}")
+            self._thread.start()
+
+    def cancel(self) -> None:
+        """Stop delivering events to this subscriber."""
+        self.bus.unsubscribe(self)
+
+    def _offer(self, event: Event, priority: Priority, published_at: float) -> None:
+        """Queue (or, inline, handle) an event without ever blocking the publisher."""
+        if self.executor == Executor.INLINE:
+            self._call(event)
+            return
+        with self._cond:
+            if not self.active:
+                return
+            lane = self._lanes[priority]
+            if len(lane) >= self.queue_size:
+                self.dropped += 1
+                EVENTS_DROPPED.inc()
+                if self.drop == DropPolicy.DROP_NEWEST:
+                    return
+                lane.popleft()
+            lane.append((event, published_at))
+            if self.executor == Executor.THREAD:
+                self._cond.notify()
+                return
+            schedule = not self._drain_scheduled
+            self._drain_scheduled = True
+        if schedule:
+            try:
+                self.loop.call_soon_threadsafe(self._drain_async)
+            except RuntimeError:
+                # Loop closed; nothing left to deliver to
+                with self._cond:
+                    self._drain_scheduled = False
+
+    def _next(self) -> Optional[Tuple[Event, float]]:
+        for lane in self._lanes:
+            if lane:
+                return lane.popleft()
+        return None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                item = self._next()
+                while item is None and self.active:
+                    self._cond.wait()
+                    item = self._next()
+                if item is None:
+                    return
+            self._deliver(*item)
+
+    def _drain_async(self) -> None:
+        while True:
+            with self._cond:
+                item = self._next() if self.active else None
+                if item is None:
+                    self._drain_scheduled = False
+                    return
+            self._deliver(*item)
+
+    def _deliver(self, event: Event, published_at: float) -> None:
+        lag = time.perf_counter() - published_at
+        EVENT_DELIVERY_LAG_SECONDS.observe(lag)
+        if lag > self.max_lag:
+            self.max_lag = lag
+        self._call(event)
+
+    def _call(self, event: Event) -> None:
+        try:
+            result = self.handler(event)
+            if self.loop is not None and inspect.isawaitable(result):
+                asyncio.ensure_future(result, loop=self.loop)
+            self.delivered += 1
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"[EventBus] Error in {self.name} handling {type(event).__name__}: {e}", exc_info=True)
+
+    def _close(self) -> None:
+        with self._cond:
+            self.active = False
+            for lane in self._lanes:
+                lane.clear()
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            queued = sum(len(lane) for lane in self._lanes)
+        return {
+            'name': self.name,
+            'event': self.event_type.__name__,
+            'executor': self.executor.value,
+            'drop': self.drop.value,
+            'queued': queued,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'max_lag_ms': round(self.max_lag * 1000, 3),
+        }
+
+
+class EventBus:
+    """
+    Typed publish/subscribe bus
+
+    Subscribers register for an event class (and receive its subclasses).
+    ``publish`` never waits on a subscriber: inline handlers run on the
+    publisher's thread, and everything else is queued in the subscriber's
+    bounded per-priority lanes and handled on its own thread or event loop.
+    A slow subscriber only drops its own events, according to its policy.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: Tuple[Subscription, ...] = ()
+        self._routes: Dict[type, Tuple[Subscription, ...]] = {}
+
+    def subscribe(self, event_type: Type[Event], handler: Callable[[Any], Any],
+                  executor: Executor = Executor.THREAD, name: Optional[str] = None,
+                  queue_size: int = 64, drop: DropPolicy = DropPolicy.DROP_OLDEST,
+                  loop: Optional[asyncio.AbstractEventLoop] = None) -> Subscription:
+        """
+        Register ``handler`` for ``event_type`` and its subclasses
+
+        Args:
+            event_type: Event class to receive
+            handler: Called with each event; may be a coroutine function with ``Executor.ASYNCIO``
+            executor: Where the handler runs
+            name: Label used for the worker thread, logs and stats
+            queue_size: Events held per priority lane before ``drop`` applies
+            drop: What to do when a lane is full
+            loop: Event loop for ``Executor.ASYNCIO`` (defaults to the running loop)
+
+        Returns:
+            Subscription: Call ``cancel()`` to unsubscribe
+        """
+        if executor == Executor.ASYNCIO and loop is None:
+            loop = asyncio.get_running_loop()
+        name = name or getattr(handler, '__qualname__', repr(handler))
+        subscription = Subscription(self, event_type, handler, executor, name, queue_size, drop, loop)
+        with self._lock:
+            self._subscriptions = self._subscriptions + (subscription,)
+            self._routes = {}
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions = tuple(s for s in self._subscriptions if s is not subscription)
+            self._routes = {}
+        subscription._close()
+
+    def _route(self, event_type: type) -> Tuple[Subscription, ...]:
+        routes = self._routes
+        subscribers = routes.get(event_type)
+        if subscribers is None:
+            subscribers = tuple(s for s in self._subscriptions if issubclass(event_type, s.event_type))
+            with self._lock:
+                if self._routes is routes:
+                    routes[event_type] = subscribers
+        return subscribers
+
+    def publish(self, event: Event, priority: Optional[Priority] = None) -> None:
+        """
+        Deliver ``event`` to its subscribers (thread-safe, never blocks on them)
+
+        Args:
+            event: Event to publish
+            priority: Lane to use instead of the event class's default
+        """
+        EVENTS_PUBLISHED.inc()
+        subscribers = self._route(type(event))
+        if not subscribers:
+            return
+        lane = event.priority if priority is None else priority
+        published_at = time.perf_counter()
+        for subscription in subscribers:
+            subscription._offer(event, lane, published_at)
+
+    def subscriptions(self) -> List[Subscription]:
+        return list(self._subscriptions)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Queue depth, delivery, drop and error counts for every subscriber."""
+        return [s.stats() for s in self._subscriptions]
+
+
+# Process-wide bus shared by the robot's modules, controllers and API
+BUS = EventBus()
@@ -1,15 +1,132 @@
 import os
+import json
+import time
 import platform
 import subprocess
 import logging
-from typing import Tuple
+import threading
+from functools import lru_cache
+from typing import FrozenSet, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+I2C_BUS = 1
+DEFAULT_PROBE_CACHE_TTL = 86400.0
+
+_i2c_lock = threading.Lock()
+_i2c_addresses: Optional[FrozenSet[int]] = None
+
+@lru_cache(maxsize=None)
 def is_raspberry_pi() -> bool:
     """Check if running on Raspberry Pi"""
-    logger.info("Hardware detected: Running on Raspberry Pi!")
-    return platform.machine().startswith('arm') or platform.machine().startswith('aarch')
+    on_pi = platform.machine().startswith('arm') or platform.machine().startswith('aarch')
+    if on_pi:
+        logger.info("Hardware detected: Running on Raspberry Pi!")
+    else:
+        logger.info("No hardware detected: Running in simulation mode.")
+    return on_pi
+
+def _probe_cache_settings() -> Tuple[Optional[str], float]:
+    """Return the probe cache path (None if unset) and its TTL from config."""
+    try:
+        from config import Config
+        config = Config.shared()
+        path = config.get('hardware', 'probe_cache', default='data/hardware_probe.json')
+        ttl = float(config.get('hardware', 'probe_cache_ttl', default=DEFAULT_PROBE_CACHE_TTL))
+        if path and not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(config.config_path), path)
+        return path, ttl
+    except Exception as e:
+        logger.debug(f"Could not read hardware probe cache settings: {e}")
+        return None, 0.0
+
+def parse_i2cdetect(output: str) -> FrozenSet[int]:
+    """
+    Parse the table printed by ``i2cdetect -y``
+
+    Args:
+        output: i2cdetect stdout
+
+    Returns:
+        FrozenSet[int]: Addresses that responded (including ones bound to a driver, shown as UU)
+    """
+    addresses = set()
+    for line in output.splitlines()[1:]:
+        row, sep, cells = line.partition(':')
+        if not sep:
+            continue
+        try:
+            base = int(row.strip(), 16)
+        except ValueError:
+            continue
+        # Fixed-width cells of three characters; the first row starts with blanks
+        for i in range(16):
+            cell = cells[i * 3:i * 3 + 3].strip()
+            if cell and cell != '--':
+                addresses.add(base + i)
+    return frozenset(addresses)
+
+def _load_cached_scan(path: str, ttl: float) -> Optional[FrozenSet[int]]:
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+        if cached.get('bus') != I2C_BUS or time.time() - cached['timestamp'] > ttl:
+            return None
+        return frozenset(cached['addresses'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def _save_cached_scan(path: str, addresses: FrozenSet[int]) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'bus': I2C_BUS, 'timestamp': time.time(), 'addresses': sorted(addresses)}, f)
+    except OSError as e:
+        logger.warning(f"Could not save I2C scan to {path}: {e}")
+
+def scan_i2c_bus(refresh: bool = False) -> FrozenSet[int]:
+    """
+    Return the addresses present on the I2C bus
+
+    The bus is scanned with ``i2cdetect`` at most once per process, and the
+    result is persisted (``hardware.probe_cache``) and reused by later starts
+    until ``hardware.probe_cache_ttl`` seconds have passed.
+
+    Args:
+        refresh: Ignore the cached result and scan again
+
+    Returns:
+        FrozenSet[int]: Responding addresses; empty when not on a Raspberry Pi
+    """
+    global _i2c_addresses
+    with _i2c_lock:
+        if _i2c_addresses is not None and not refresh:
+            return _i2c_addresses
+        if not is_raspberry_pi():
+            _i2c_addresses = frozenset()
+            return _i2c_addresses
+        path, ttl = _probe_cache_settings()
+        if path and ttl > 0 and not refresh:
+            cached = _load_cached_scan(path, ttl)
+            if cached is not None:
+                logger.info(f"Using cached I2C scan from {path}")
+                _i2c_addresses = cached
+                return cached
+        try:
+            result = subprocess.run(['i2cdetect', '-y', str(I2C_BUS)],
+                                    capture_output=True,
+                                    text=True,
+                                    timeout=5)
+            addresses = parse_i2cdetect(result.stdout)
+        except Exception as e:
+            logger.error(f"Failed to scan I2C bus: {e}")
+            # Don't persist a failed scan; the next start tries again
+            _i2c_addresses = frozenset()
+            return _i2c_addresses
+        if path:
+            _save_cached_scan(path, addresses)
+        _i2c_addresses = addresses
+        return addresses
 
 def check_i2c_device(address: int) -> bool:
     """
@@ -21,24 +138,7 @@ def check_i2c_device(address: int) -> bool:
     Returns:
         bool: True if device is available
     """
-    try:
-        # Only attempt I2C detection on Raspberry Pi
-        if not is_raspberry_pi():
-            logger.info("No hardware detected: Running in simulation mode.")
-            return False
-            
-        # Use i2cdetect to check for device
-        result = subprocess.run(['i2cdetect', '-y', '1'], 
-                             capture_output=True, 
-                             text=True)
-        
-        # Parse output to check if address is present
-        hex_addr = hex(address)[2:] # Remove '0x' prefix
-        return hex_addr in result.stdout
-        
-    except Exception as e:
-        logger.error(f"Failed to check I2C device: {e}")
-        return False
+    return address in scan_i2c_bus()
 
 def check_camera() -> bool:
     """
@@ -50,7 +150,6 @@ def check_camera() -> bool:
     try:
         # Only attempt camera detection on Raspberry Pi
         if not is_raspberry_pi():
-            logger.info("No hardware detected: Running in simulation mode.")
             return False
             
         # Check if camera device exists
@@ -70,7 +169,6 @@ def check_unicorn_hat() -> bool:
     try:
         # Unicorn HAT uses the SPI interface
         if not is_raspberry_pi():
-            logger.info("No hardware detected: Running in simulation mode.")
             return False
             
         # Check if SPI is enabled (support both common device names)
@@ -93,7 +191,7 @@ def check_motor_controller() -> Tuple[bool, bool]:
         import os
         sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__))))
         from config import Config
-        config = Config()
+        config = Config.shared()
         force_enable = config.get('hardware', 'force_enable', default=None)
         if force_enable is not None:
             logger.info(f"Hardware override from config: motors={force_enable}, servos={force_enable}")
@@ -102,9 +200,21 @@ def check_motor_controller() -> Tuple[bool, bool]:
         logger.debug(f"Could not read hardware config override: {e}")
     
     # PCA9685 typically uses address 0x40
-    return check_i2c_device(0x40), check_i2c_device(0x40)
+    available = check_i2c_device(0x40)
+    return available, available
+
+# Hardware availability flags, probed on first access rather than at import
+_FLAG_PROBES = {
+    'CAMERA_AVAILABLE': lambda: check_camera(),
+    'MOTORS_AVAILABLE': lambda: check_motor_controller()[0],
+    'SERVOS_AVAILABLE': lambda: check_motor_controller()[1],
+    'LED_AVAILABLE': lambda: check_unicorn_hat(),
+}
 
-# Hardware availability flags
-CAMERA_AVAILABLE = check_camera()
-MOTORS_AVAILABLE, SERVOS_AVAILABLE = check_motor_controller()
-LED_AVAILABLE = check_unicorn_hat()
+def __getattr__(name: str):
+    probe = _FLAG_PROBES.get(name)
+    if probe is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = probe()
+    globals()[name] = value
+    return value
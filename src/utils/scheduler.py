@@ -0,0 +1,297 @@
+import heapq
+import itertools
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.metrics import counter, gauge, histogram
+
+logger = logging.getLogger(__name__)
+
+MISSED_CYCLES = counter('robbie_scheduler_missed_cycles_total', 'Periodic task deadlines that passed without a run')
+JITTER_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+# How often each task's achieved rate and window jitter figures are refreshed
+STATS_WINDOW_SECONDS = 1.0
+
+
+class PeriodicTask:
+    """
+    Bookkeeping for something that should happen ``rate_hz`` times a second
+
+    Deadlines advance by whole periods from the first run, so time spent in
+    the callback never stretches the period. A run that starts a full period
+    or more late skips the deadlines it missed (counted in ``missed``)
+    instead of running them back to back. Jitter is how late a run started
+    relative to its deadline.
+    """
+
+    def __init__(self, scheduler: 'Scheduler', name: str, rate_hz: float,
+                 callback: Optional[Callable[[float], Any]], group: Optional[str],
+                 metrics_prefix: Optional[str] = None):
+        self.scheduler = scheduler
+        self.name = name
+        self.callback = callback
+        self.group = group
+        self.active = True
+        self.deadline: Optional[float] = None
+        self._last_start: Optional[float] = None
+        self.period = 0.0
+        self.set_rate(rate_hz)
+        self.runs = 0
+        self.missed = 0
+        self.overruns = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._entry = 0
+        self._window = {'start': time.perf_counter(), 'runs': 0, 'jitter_total': 0.0, 'jitter_max': 0.0,
+                        'duration_max': 0.0}
+        self._window_stats = {'achieved_hz': 0.0, 'jitter_mean_ms': 0.0, 'jitter_max_ms': 0.0,
+                              'duration_max_ms': 0.0}
+        # Exported as <metrics_prefix>_jitter_seconds and <metrics_prefix>_hz when a prefix is given
+        self._jitter_histogram = histogram(
+            f'{metrics_prefix}_jitter_seconds', f'How late each {name} cycle started relative to its deadline',
+            buckets=JITTER_BUCKETS) if metrics_prefix else None
+        self._hz_gauge = gauge(
+            f'{metrics_prefix}_hz', f'Achieved {name} rate over the last report window') if metrics_prefix else None
+
+    @property
+    def rate_hz(self) -> float:
+        return 1.0 / self.period if self.period else 0.0
+
+    def set_rate(self, rate_hz: float) -> None:
+        """Change the rate; takes effect from the next deadline."""
+        rate_hz = float(rate_hz or 0.0)
+        if rate_hz <= 0 and self.callback is not None:
+            raise ValueError(f"Periodic task {self.name} needs a positive rate, got {rate_hz}")
+        self.period = 1.0 / rate_hz if rate_hz > 0 else 0.0
+        if self.group is not None and self.deadline is not None and self._last_start is not None:
+            # Don't sit out the rest of a long old period after speeding up
+            self.scheduler._reschedule(self, min(self.deadline, self._last_start + self.period))
+
+    def cancel(self) -> None:
+        """Stop running; waits for a run in progress unless called from the task itself."""
+        self.scheduler._cancel(self)
+
+    def _begin(self, start: float) -> float:
+        """Account for a run starting at ``start``; returns the deadline it was due at."""
+        with self._lock:
+            if self.deadline is None:
+                self.deadline = start
+            late = start - self.deadline
+            if late >= self.period > 0:
+                skipped = int(late // self.period)
+                self.missed += skipped
+                MISSED_CYCLES.inc(skipped)
+                self.deadline += skipped * self.period
+            due = self.deadline
+            self.deadline += self.period
+            return due
+
+    def _record(self, start: float, due: float) -> float:
+        """Record a run's jitter; returns seconds since the previous run."""
+        jitter = max(0.0, start - due)
+        if self._jitter_histogram is not None:
+            self._jitter_histogram.observe(jitter)
+        with self._lock:
+            dt = start - self._last_start if self._last_start is not None else self.period
+            self._last_start = start
+            self.runs += 1
+            window = self._window
+            window['runs'] += 1
+            window['jitter_total'] += jitter
+            window['jitter_max'] = max(window['jitter_max'], jitter)
+            elapsed = start - window['start']
+            if elapsed >= STATS_WINDOW_SECONDS:
+                achieved_hz = window['runs'] / elapsed
+                self._window_stats = {
+                    'achieved_hz': round(achieved_hz, 2),
+                    'jitter_mean_ms': round(window['jitter_total'] / window['runs'] * 1000, 3),
+                    'jitter_max_ms': round(window['jitter_max'] * 1000, 3),
+                    'duration_max_ms': round(window['duration_max'] * 1000, 3),
+                }
+                self._window = {'start': start, 'runs': 0, 'jitter_total': 0.0, 'jitter_max': 0.0,
+                                'duration_max': 0.0}
+                if self._hz_gauge is not None:
+                    self._hz_gauge.set(achieved_hz)
+        return dt
+
+    def _run(self) -> None:
+        start = time.perf_counter()
+        due = self._begin(start)
+        dt = self._record(start, due)
+        with self._run_lock:
+            if not self.active:
+                return
+            try:
+                self.callback(dt)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"[Scheduler] Error in periodic task {self.name}: {e}", exc_info=True)
+        duration = time.perf_counter() - start
+        with self._lock:
+            self._window['duration_max'] = max(self._window['duration_max'], duration)
+            if self.period and duration > self.period:
+                self.overruns += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'name': self.name,
+                'group': self.group,
+                'rate_hz': round(self.rate_hz, 2),
+                'runs': self.runs,
+                'missed': self.missed,
+                'overruns': self.overruns,
+                'errors': self.errors,
+                **self._window_stats,
+            }
+
+
+class Pacer(PeriodicTask):
+    """
+    Deadline pacing for a loop that owns its thread
+
+    Call ``wait()`` once per iteration; it sleeps until the iteration's
+    deadline. Callers on several threads get successive slots. A pause longer
+    than ``idle_after`` seconds restarts the schedule rather than counting
+    as missed cycles. A rate of 0 disables pacing.
+    """
+
+    def __init__(self, scheduler: 'Scheduler', name: str, rate_hz: float,
+                 metrics_prefix: Optional[str] = None, idle_after: float = 1.0):
+        super().__init__(scheduler, name, rate_hz, None, None, metrics_prefix)
+        self.idle_after = idle_after
+
+    def wait(self) -> float:
+        """Sleep until this iteration's deadline; returns seconds since the previous iteration."""
+        if not self.period:
+            return 0.0
+        now = time.perf_counter()
+        with self._lock:
+            if self.deadline is None or now - self.deadline > self.idle_after:
+                self.deadline = now
+            slot = max(now, self.deadline)
+        due = self._begin(slot)
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        return self._record(time.perf_counter(), due)
+
+
+class Scheduler:
+    """
+    Runs periodic tasks on deadline-driven worker threads
+
+    Tasks in the same group share one worker thread and run in deadline
+    order, so a slow task delays the others in its group but never those in
+    another group. Keep blocking work (device polling, animations) in its
+    own group away from the control loops.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tasks: List[PeriodicTask] = []
+        self._groups: Dict[str, Dict[str, Any]] = {}
+        self._seq = itertools.count()
+
+    def every(self, rate_hz: float, callback: Callable[[float], Any], name: str,
+              group: str = 'control', metrics_prefix: Optional[str] = None) -> PeriodicTask:
+        """
+        Call ``callback(dt)`` ``rate_hz`` times a second
+
+        Args:
+            rate_hz: Target rate
+            callback: Called with the seconds since its previous run
+            name: Label used for logs and stats
+            group: Worker thread to run on (``sched-<group>``)
+            metrics_prefix: Export jitter and achieved rate under this prefix
+
+        Returns:
+            PeriodicTask: Call ``cancel()`` to stop it; ``set_rate()`` changes its rate
+        """
+        task = PeriodicTask(self, name, rate_hz, callback, group, metrics_prefix)
+        with self._lock:
+            self._tasks.append(task)
+            worker = self._worker(group)
+        task.deadline = time.perf_counter()
+        self._push(worker, task, task.deadline)
+        return task
+
+    def pacer(self, name: str, rate_hz: float, metrics_prefix: Optional[str] = None,
+              idle_after: float = 1.0) -> Pacer:
+        """Create a ``Pacer`` for a loop that runs on its own thread; it is listed in ``stats()``."""
+        pacer = Pacer(self, name, rate_hz, metrics_prefix, idle_after)
+        with self._lock:
+            self._tasks.append(pacer)
+        return pacer
+
+    def _worker(self, group: str) -> Dict[str, Any]:
+        worker = self._groups.get(group)
+        if worker is None:
+            worker = self._groups[group] = {'heap': [], 'cond': threading.Condition(), 'thread': None}
+            worker['thread'] = threading.Thread(target=self._run_group, args=(worker,), daemon=True,
+                                                name=f"sched-{group}")
+            worker['thread'].start()
+        return worker
+
+    def _push(self, worker: Dict[str, Any], task: PeriodicTask, deadline: float) -> None:
+        with worker['cond']:
+            task._entry = next(self._seq)
+            heapq.heappush(worker['heap'], (deadline, task._entry, task))
+            worker['cond'].notify()
+
+    def _reschedule(self, task: PeriodicTask, deadline: float) -> None:
+        worker = self._groups.get(task.group)
+        if worker is None or not task.active:
+            return
+        with task._lock:
+            task.deadline = deadline
+        self._push(worker, task, deadline)
+
+    def _run_group(self, worker: Dict[str, Any]) -> None:
+        heap, cond = worker['heap'], worker['cond']
+        while True:
+            with cond:
+                while True:
+                    # Drop cancelled tasks and entries superseded by a reschedule
+                    while heap and (not heap[0][2].active or heap[0][1] != heap[0][2]._entry):
+                        heapq.heappop(heap)
+                    if not heap:
+                        cond.wait()
+                        continue
+                    delay = heap[0][0] - time.perf_counter()
+                    if delay <= 0:
+                        task = heapq.heappop(heap)[2]
+                        break
+                    cond.wait(delay)
+            task._run()
+            if task.active:
+                self._push(worker, task, task.deadline)
+
+    def _cancel(self, task: PeriodicTask) -> None:
+        task.active = False
+        with self._lock:
+            if task in self._tasks:
+                self._tasks.remove(task)
+            worker = self._groups.get(task.group)
+        if worker is not None:
+            with worker['cond']:
+                worker['cond'].notify()
+            if threading.current_thread() is not worker['thread']:
+                # Let a run in progress finish so the caller can safely tear down after us
+                with task._run_lock:
+                    pass
+
+    def tasks(self) -> List[PeriodicTask]:
+        with self._lock:
+            return list(self._tasks)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Rate, achieved rate, jitter, missed cycles and overruns for every task and pacer."""
+        return [task.stats() for task in self.tasks()]
+
+
+# Process-wide scheduler shared by the robot's control loops
+SCHEDULER = Scheduler()
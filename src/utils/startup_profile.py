@@ -0,0 +1,198 @@
+import sys
+import time
+import logging
+import threading
+from importlib.abc import MetaPathFinder
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _TimedLoader:
+    """Wraps a module loader to time ``exec_module``, delegating everything else."""
+
+    def __init__(self, loader, profiler: 'StartupProfiler'):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self._profiler._timing_import(module.__name__):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(MetaPathFinder):
+    """Asks the remaining finders for a spec and wraps its loader."""
+
+    def __init__(self, profiler: 'StartupProfiler'):
+        self._profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        # Our own lookups below would otherwise come straight back here
+        if getattr(self._local, 'finding', False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _TimedLoader(spec.loader, self._profiler)
+        return spec
+
+
+class _ImportTimer:
+    def __init__(self, profiler: 'StartupProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        stack = self.profiler._stack()
+        self.start = time.perf_counter()
+        self.children = 0.0
+        stack.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        stack = self.profiler._stack()
+        stack.pop()
+        cumulative = end - self.start
+        if stack:
+            stack[-1].children += cumulative
+        self.profiler._record_import({
+            'module': self.name,
+            'self': cumulative - self.children,
+            'cumulative': cumulative,
+            'thread': threading.current_thread().name,
+            'top_level': not stack,
+        })
+        return False
+
+
+class StartupProfiler:
+    """
+    Records where startup time goes: per-module import time and named phases
+
+    ``install()`` times every module imported afterwards, on any thread, so
+    imports done by subsystem init threads are attributed to those threads.
+    ``mark()`` records the end of a startup phase, and ``report()`` formats
+    both together with the robot's per-subsystem init timings.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._imports: List[Dict[str, Any]] = []
+        self._marks: List[tuple] = []
+        self._finder: Optional[_TimingFinder] = None
+
+    def install(self) -> None:
+        """Start timing imports."""
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self) -> None:
+        """Stop timing imports; modules already loaded keep their wrapped loaders."""
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _timing_import(self, name: str) -> _ImportTimer:
+        return _ImportTimer(self, name)
+
+    def _record_import(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._imports.append(entry)
+
+    def mark(self, phase: str) -> float:
+        """Record that ``phase`` has finished; returns seconds since the profiler started."""
+        elapsed = time.perf_counter() - self.start
+        with self._lock:
+            self._marks.append((phase, elapsed))
+        return elapsed
+
+    def elapsed(self, phase: str) -> Optional[float]:
+        """Seconds from start until ``phase`` was marked, or None."""
+        with self._lock:
+            for name, elapsed in self._marks:
+                if name == phase:
+                    return elapsed
+        return None
+
+    def imports(self, limit: int = 25) -> List[Dict[str, Any]]:
+        """The ``limit`` imports with the highest self time, slowest first."""
+        with self._lock:
+            entries = list(self._imports)
+        return sorted(entries, key=lambda e: e['self'], reverse=True)[:limit]
+
+    def import_time_by_thread(self) -> Dict[str, float]:
+        """Total time spent importing on each thread."""
+        totals: Dict[str, float] = {}
+        with self._lock:
+            for entry in self._imports:
+                if entry['top_level']:
+                    totals[entry['thread']] = totals.get(entry['thread'], 0.0) + entry['cumulative']
+        return totals
+
+    def report(self, startup: Optional[Dict[str, Any]] = None, limit: int = 25) -> str:
+        """
+        Format the breakdown as text
+
+        Args:
+            startup: ``RobotController.startup_report()``, for per-subsystem timings
+            limit: Number of slowest imports to list
+        """
+        with self._lock:
+            marks = list(self._marks)
+        lines = ["Startup profile"]
+        api_ready = self.elapsed('api_ready')
+        if api_ready is not None:
+            lines.append(f"  time to API ready: {api_ready:.3f}s")
+
+        lines.append("Phases (end time, duration):")
+        previous = 0.0
+        for phase, elapsed in marks:
+            lines.append(f"  {phase:<24}{elapsed:>8.3f}s{elapsed - previous:>9.3f}s")
+            previous = elapsed
+
+        lines.append("Import time by thread:")
+        for thread, seconds in sorted(self.import_time_by_thread().items(), key=lambda i: -i[1]):
+            lines.append(f"  {thread:<24}{seconds:>8.3f}s")
+
+        lines.append(f"Slowest imports (self, cumulative, thread):")
+        for entry in self.imports(limit):
+            lines.append(f"  {entry['module']:<40}{entry['self']:>8.3f}s{entry['cumulative']:>9.3f}s  {entry['thread']}")
+
+        if startup:
+            lines.append("Subsystems (status, started at, init time, thread):")
+            for entry in startup.get('subsystems', []):
+                started = f"{entry['started_at']:.3f}s" if entry.get('started_at') is not None else '-'
+                seconds = f"{entry['seconds']:.3f}s" if entry.get('seconds') is not None else '-'
+                lines.append(f"  {entry['name']:<24}{entry['status']:<14}{started:>9}{seconds:>9}  {entry.get('thread') or ''}")
+            whisper = startup.get('whisper')
+            if whisper:
+                seconds = f"{whisper['seconds']:.3f}s" if whisper.get('seconds') is not None else 'still loading'
+                lines.append(f"  {'whisper model':<24}{seconds}")
+        return "\n".join(lines)
@@ -0,0 +1,207 @@
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# Stages reported by ``Tracer.breakdown``, in pipeline order
+STAGES = ('wake_to_listen', 'speech_to_text', 'chat', 'llm_first_token', 'llm', 'tts_first_audio', 'playback')
+
+
+class Span:
+    """A timed section of a conversation turn."""
+
+    __slots__ = ('name', 'start', 'end', 'thread', 'attrs')
+
+    def __init__(self, name: str, start: float, attrs: Dict[str, Any]):
+        self.name = name
+        self.start = start
+        self.end: Optional[float] = None
+        self.thread = threading.current_thread().name
+        self.attrs = attrs
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.end is None else self.end - self.start
+
+    def finish(self, **attrs: Any) -> None:
+        """End the span now (from any thread); only the first call counts."""
+        if self.end is None:
+            self.end = time.perf_counter()
+            self.attrs.update(attrs)
+
+
+class Turn:
+    """One exchange, from wake word or speech endpoint to the end of playback."""
+
+    def __init__(self, turn_id: int, trigger: str, start: float):
+        self.id = turn_id
+        self.trigger = trigger
+        self.start = start
+        self.end: Optional[float] = None
+        self.wall_time = time.time()
+        self.spans: List[Span] = []
+
+
+class _NullSpan:
+    """Returned when no turn is open, so callers never need to check."""
+
+    name = None
+    duration = None
+
+    def finish(self, **attrs: Any) -> None:
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Records conversation turns as named spans in a ring buffer.
+
+    The speech pipeline hops between the audio callback, the transcription
+    thread, API workers and the voice thread, so the open turn is held by the
+    tracer rather than per thread: the robot only has one conversation at a
+    time. Spans started while no turn is open are dropped.
+    """
+
+    def __init__(self, max_turns: int = 50):
+        """
+        Initialize the tracer
+
+        Args:
+            max_turns: Number of finished turns kept for export
+        """
+        self._lock = threading.Lock()
+        self._turns = deque(maxlen=max_turns)
+        self._current: Optional[Turn] = None
+        self._ids = itertools.count(1)
+        self._epoch = time.perf_counter()
+
+    @property
+    def current_turn(self) -> Optional[Turn]:
+        return self._current
+
+    def begin_turn(self, trigger: str) -> Turn:
+        """Start a new turn, ending any turn still open."""
+        with self._lock:
+            self._end_locked()
+            turn = Turn(next(self._ids), trigger, time.perf_counter())
+            self._current = turn
+            return turn
+
+    def ensure_turn(self, trigger: str) -> Turn:
+        """Return the open turn, starting one if there is none."""
+        with self._lock:
+            if self._current is None:
+                self._current = Turn(next(self._ids), trigger, time.perf_counter())
+            return self._current
+
+    def end_turn(self) -> None:
+        """Close the open turn and move it to the ring buffer."""
+        with self._lock:
+            self._end_locked()
+
+    def _end_locked(self) -> None:
+        turn = self._current
+        if turn is None:
+            return
+        turn.end = time.perf_counter()
+        for span in turn.spans:
+            if span.end is None:
+                span.end = turn.end
+                span.attrs['unfinished'] = True
+        self._turns.append(turn)
+        self._current = None
+
+    def start_span(self, name: str, start: Optional[float] = None, **attrs: Any):
+        """
+        Start a span in the open turn; call ``finish()`` on the result to end it
+
+        Args:
+            name: Stage name
+            start: ``time.perf_counter()`` timestamp if the stage began earlier
+            attrs: Extra values shown in the trace viewer
+        """
+        with self._lock:
+            turn = self._current
+            if turn is None:
+                return NULL_SPAN
+            span = Span(name, time.perf_counter() if start is None else start, attrs)
+            turn.spans.append(span)
+            return span
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Any]:
+        """Context manager form of ``start_span``."""
+        span = self.start_span(name, **attrs)
+        try:
+            yield span
+        finally:
+            span.finish()
+
+    def turns(self, limit: Optional[int] = None) -> List[Turn]:
+        """Return finished turns (oldest first) plus the open one, at most ``limit``."""
+        with self._lock:
+            turns = list(self._turns)
+            if self._current is not None:
+                turns.append(self._current)
+        return turns[-limit:] if limit else turns
+
+    def breakdown(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Per-stage durations in milliseconds for the last ``limit`` turns, newest first."""
+        result = []
+        for turn in reversed(self.turns(limit)):
+            stages: Dict[str, float] = {}
+            for span in turn.spans:
+                if span.duration is not None:
+                    stages[span.name] = round(stages.get(span.name, 0.0) + span.duration * 1000, 1)
+            end = turn.end if turn.end is not None else time.perf_counter()
+            result.append({
+                'turn': turn.id,
+                'trigger': turn.trigger,
+                'started_at': turn.wall_time,
+                'open': turn.end is None,
+                'total_ms': round((end - turn.start) * 1000, 1),
+                'stages': {name: stages[name] for name in STAGES if name in stages},
+                'other': {name: ms for name, ms in stages.items() if name not in STAGES},
+            })
+        return result
+
+    def chrome_trace(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Export turns in the Chrome trace event format
+
+        The result loads in chrome://tracing or https://ui.perfetto.dev; each
+        turn is a top-level slice with its stages nested by thread.
+        """
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+        threads: Dict[str, int] = {'turns': 0}
+
+        def us(t: float) -> float:
+            return round((t - self._epoch) * 1e6, 1)
+
+        for turn in self.turns(limit):
+            end = turn.end if turn.end is not None else time.perf_counter()
+            events.append({'name': f'turn {turn.id} ({turn.trigger})', 'cat': 'turn', 'ph': 'X',
+                           'ts': us(turn.start), 'dur': round((end - turn.start) * 1e6, 1),
+                           'pid': pid, 'tid': 0, 'args': {'turn': turn.id}})
+            for span in list(turn.spans):
+                tid = threads.setdefault(span.thread, len(threads))
+                span_end = span.end if span.end is not None else end
+                args = {'turn': turn.id}
+                args.update(span.attrs)
+                events.append({'name': span.name, 'cat': 'stage', 'ph': 'X',
+                               'ts': us(span.start), 'dur': round((span_end - span.start) * 1e6, 1),
+                               'pid': pid, 'tid': tid, 'args': args})
+        for name, tid in threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+# Process-wide tracer used by the speech pipeline and /api/trace
+TRACER = Tracer()
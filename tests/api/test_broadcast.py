@@ -0,0 +1,81 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import unittest
+import asyncio
+import threading
+
+from src.api.state import VersionedState
+from src.api.broadcast import BroadcastScheduler
+
+class TestBroadcastScheduler(unittest.TestCase):
+    def setUp(self):
+        """Set up a scheduler that records sent messages"""
+        self.state = VersionedState({
+            "robot_state": "standby",
+            "input_audio_level_db": 0.0,
+        })
+        self.sent = []
+
+        async def send(topic, seq, changes):
+            self.sent.append({"topic": topic, "seq": seq, "changes": changes})
+
+        self.scheduler = BroadcastScheduler(self.state, send, rates={"audio": 20})
+
+    def run_with_scheduler(self, body, settle=0.15):
+        async def main():
+            self.scheduler.start(asyncio.get_running_loop())
+            await body()
+            await asyncio.sleep(settle)
+            self.scheduler.stop()
+        asyncio.run(main())
+
+    def test_rate_limited_topic_is_coalesced(self):
+        """Test that a burst of audio levels from another thread is merged into few messages"""
+        async def body():
+            def producer():
+                for i in range(1, 101):
+                    self.scheduler.publish("audio", {"input_audio_level_db": float(i)})
+            thread = threading.Thread(target=producer)
+            thread.start()
+            await asyncio.get_running_loop().run_in_executor(None, thread.join)
+
+        self.run_with_scheduler(body)
+        self.assertLessEqual(len(self.sent), 5)
+        self.assertEqual(self.sent[-1]["changes"], {"input_audio_level_db": 100.0})
+        stats = self.scheduler.stats()["audio"]
+        self.assertEqual(stats["published"], 100)
+        self.assertGreater(stats["coalesced"], 90)
+        self.assertEqual(stats["rate_hz"], 20.0)
+
+    def test_unconfigured_topic_is_immediate(self):
+        """Test that state changes bypass the rate limit"""
+        async def body():
+            self.scheduler.publish("state", {"robot_state": "listening"})
+            await asyncio.sleep(0.01)
+            self.assertEqual(len(self.sent), 1)
+
+        self.run_with_scheduler(body, settle=0)
+        self.assertEqual(self.sent[0]["changes"], {"robot_state": "listening"})
+        self.assertIsNone(self.scheduler.stats()["state"]["rate_hz"])
+
+    def test_unchanged_values_are_not_sent(self):
+        """Test that a flush with no effective change sends nothing"""
+        async def body():
+            self.scheduler.publish("state", {"robot_state": "standby"})
+
+        self.run_with_scheduler(body, settle=0.05)
+        self.assertEqual(self.sent, [])
+        self.assertEqual(self.scheduler.stats()["state"]["unchanged"], 1)
+
+    def test_publish_before_start_updates_state(self):
+        """Test that updates published before the API loop starts still reach the snapshot"""
+        self.scheduler.publish("audio", {"input_audio_level_db": -12.0})
+        self.assertEqual(self.state["input_audio_level_db"], -12.0)
+        self.assertEqual(self.scheduler.stats()["audio"]["dropped"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import unittest
+import asyncio
+import json
+
+from src.api.connections import ConnectionManager
+from src.api.protocol import SUBPROTOCOL, decode_frame, decode_header
+
+class FakeWebSocket:
+    """WebSocket stand-in that records messages and can be made slow"""
+    def __init__(self, delay=0.0, fail=False, subprotocols=()):
+        self.delay = delay
+        self.fail = fail
+        self.messages = []
+        self.client = None
+        self.scope = {"subprotocols": list(subprotocols)}
+        self.accepted_subprotocol = None
+
+    async def accept(self, subprotocol=None):
+        self.accepted_subprotocol = subprotocol
+
+    async def send_bytes(self, data):
+        seq, changes = decode_frame(data)
+        message = {"type": "binary", "seq": seq, "changes": changes}
+        from_seq = decode_header(data)[1]
+        if from_seq != seq:
+            message["from_seq"] = from_seq
+        self.messages.append(message)
+
+    async def send_text(self, message):
+        if self.fail:
+            raise ConnectionError("gone")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.messages.append(json.loads(message))
+
+def resyncs(messages):
+    """Replay the web client's gap check (web-interface/src/services/api.js); returns the seqs it resyncs at"""
+    state_seq = snapshot_seq = -1
+    resynced = []
+    for message in messages:
+        if message["type"] == "state_snapshot":
+            state_seq = snapshot_seq = message["seq"]
+        elif message["type"] in ("state_delta", "binary") and message["seq"] > snapshot_seq:
+            if message.get("from_seq", message["seq"]) > state_seq + 1:
+                resynced.append(message["seq"])
+            state_seq = max(state_seq, message["seq"])
+    return resynced
+
+class TestConnectionManager(unittest.TestCase):
+    def setUp(self):
+        """Set up a manager whose snapshot is a fixed message"""
+        self.snapshot = {"type": "state_snapshot", "seq": 0, "state": {}}
+        self.manager = ConnectionManager(lambda: json.dumps(self.snapshot), max_pending=8)
+
+    def test_slow_client_does_not_block_fast_client(self):
+        """Test that a slow client merges superseded deltas while a fast one gets them all"""
+        fast, slow = FakeWebSocket(), FakeWebSocket(delay=0.05)
+
+        async def main():
+            await self.manager.connect(fast)
+            await self.manager.connect(slow)
+            for seq in range(1, 21):
+                await self.manager.broadcast_delta("audio", seq, {"input_audio_level_db": float(seq)})
+                await asyncio.sleep(0.001)
+            await asyncio.sleep(0.2)
+            return self.manager.stats()
+
+        stats = asyncio.run(main())
+        fast_deltas = [m for m in fast.messages if m["type"] == "state_delta"]
+        slow_deltas = [m for m in slow.messages if m["type"] == "state_delta"]
+        self.assertEqual(len(fast_deltas), 20)
+        self.assertLess(len(slow_deltas), 20)
+        self.assertEqual(slow_deltas[-1]["changes"], {"input_audio_level_db": 20.0})
+        slow_stats = [s for s in stats if s["sent"] == len(slow.messages)][0]
+        self.assertGreater(slow_stats["superseded"], 0)
+
+    def test_merged_delta_keeps_all_keys(self):
+        """Test that merging deltas of one topic keeps keys only the older delta had"""
+        ws = FakeWebSocket(delay=0.05)
+
+        async def main():
+            await self.manager.connect(ws)
+            await asyncio.sleep(0)  # Let the writer start sending the snapshot
+            await self.manager.broadcast_delta("leds", 1, {"led_matrix": [[1]]})
+            await self.manager.broadcast_delta("leds", 2, {"led_animation": {"currentAnimation": "rainbow"}})
+            await asyncio.sleep(0.2)
+
+        asyncio.run(main())
+        self.assertEqual(ws.messages[-1], {
+            "type": "state_delta",
+            "seq": 2,
+            "from_seq": 1,
+            "changes": {"led_matrix": [[1]], "led_animation": {"currentAnimation": "rainbow"}},
+        })
+
+    def test_merged_deltas_do_not_look_like_gaps(self):
+        """Test a lagging client's merged deltas stay in order so the client doesn't resync, but a lost one does"""
+        binary_ws, json_ws = FakeWebSocket(subprotocols=[SUBPROTOCOL]), FakeWebSocket()
+
+        async def main():
+            for ws in (binary_ws, json_ws):
+                ws.delay = 0.05
+                await self.manager.connect(ws)
+            await asyncio.sleep(0)  # Let the writers start sending the snapshots
+            await self.manager.broadcast_delta("audio", 1, {"input_audio_level_db": -10.0})
+            await self.manager.broadcast_delta("leds", 2, {"led_matrix": [[[1, 2, 3]]]})
+            await self.manager.broadcast_delta("audio", 3, {"input_audio_level_db": -5.0})
+            await asyncio.sleep(0.2)
+
+        asyncio.run(main())
+        for ws in (binary_ws, json_ws):
+            deltas = ws.messages[1:]
+            self.assertEqual([(m.get("from_seq"), m["seq"]) for m in deltas], [(1, 3), (None, 2)])
+            self.assertEqual(deltas[0]["changes"], {"input_audio_level_db": -5.0})
+            self.assertEqual(resyncs(ws.messages), [])
+        self.assertEqual(resyncs([self.snapshot, {"type": "state_delta", "seq": 2, "changes": {}}]), [2])
+
+    def test_snapshot_replaces_queued_deltas(self):
+        """Test a snapshot drops the deltas queued before it, which it already contains"""
+        ws = FakeWebSocket(delay=0.05)
+
+        async def main():
+            client = await self.manager.connect(ws)
+            await asyncio.sleep(0)
+            await self.manager.broadcast_delta("audio", 1, {"input_audio_level_db": -10.0})
+            self.snapshot = {"type": "state_snapshot", "seq": 1, "state": {}}
+            client.send_snapshot()
+            await asyncio.sleep(0.2)
+
+        asyncio.run(main())
+        self.assertEqual([m["type"] for m in ws.messages], ["state_snapshot", "state_snapshot"])
+
+    def test_overflow_falls_back_to_snapshot(self):
+        """Test that too many undeliverable messages are replaced by one snapshot"""
+        ws = FakeWebSocket(delay=0.05)
+
+        async def main():
+            client = await self.manager.connect(ws)
+            for i in range(20):
+                await self.manager.broadcast(json.dumps({"type": "event", "n": i}))
+            self.assertLessEqual(client.stats()["queued"], 8)
+            self.assertGreater(client.overflows, 0)
+            await asyncio.sleep(0.6)
+
+        asyncio.run(main())
+        # Dropped events are replaced by the snapshot that precedes the newest ones
+        self.assertEqual(ws.messages[0]["type"], "state_snapshot")
+        self.assertLess(len(ws.messages), 21)
+        self.assertEqual(ws.messages[-1], {"type": "event", "n": 19})
+
+    def test_binary_subprotocol_negotiation(self):
+        """Test that only clients offering the subprotocol receive binary frames"""
+        binary_ws, json_ws = FakeWebSocket(subprotocols=[SUBPROTOCOL]), FakeWebSocket()
+
+        async def main():
+            await self.manager.connect(binary_ws)
+            await self.manager.connect(json_ws)
+            await self.manager.broadcast_delta("audio", 5, {"input_audio_level_db": -6.0})
+            await asyncio.sleep(0.01)
+
+        asyncio.run(main())
+        self.assertEqual(binary_ws.accepted_subprotocol, SUBPROTOCOL)
+        self.assertIsNone(json_ws.accepted_subprotocol)
+        self.assertEqual(binary_ws.messages[-1], {"type": "binary", "seq": 5, "changes": {"input_audio_level_db": -6.0}})
+        self.assertEqual(json_ws.messages[-1], {"type": "state_delta", "seq": 5, "changes": {"input_audio_level_db": -6.0}})
+
+    def test_failed_client_is_removed(self):
+        """Test that a client whose send fails is dropped from the manager"""
+        async def main():
+            await self.manager.connect(FakeWebSocket(fail=True))
+            await asyncio.sleep(0.01)
+
+        asyncio.run(main())
+        self.assertEqual(self.manager.clients, {})
+
+if __name__ == '__main__':
+    unittest.main()
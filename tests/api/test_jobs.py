@@ -0,0 +1,82 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import unittest
+import threading
+import time
+
+from src.api.jobs import JobRunner
+
+class TestJobRunner(unittest.TestCase):
+    def setUp(self):
+        """Set up a runner that records emitted events"""
+        self.events = []
+        self.done = threading.Event()
+
+        def emit(event):
+            self.events.append(event)
+            if event["status"] in ("done", "error"):
+                self.done.set()
+
+        self.runner = JobRunner(emit, max_workers=1)
+
+    def tearDown(self):
+        self.runner.shutdown(wait=True)
+
+    def test_submit_returns_before_job_finishes(self):
+        """Test that a blocking job does not block submit and reports its lifecycle"""
+        release = threading.Event()
+
+        def slow(report, text):
+            report({"stage": "thinking"})
+            release.wait(1)
+            return {"response": text.upper()}
+
+        start = time.monotonic()
+        request_id = self.runner.submit("chat", slow, "hello")
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertEqual(self.events[0]["status"], "accepted")
+        release.set()
+        self.assertTrue(self.done.wait(1))
+        self.assertEqual([e["status"] for e in self.events], ["accepted", "running", "progress", "done"])
+        self.assertTrue(all(e["request_id"] == request_id for e in self.events))
+        self.assertEqual(self.events[2]["progress"], {"stage": "thinking"})
+        self.assertEqual(self.events[-1]["result"], {"response": "HELLO"})
+
+    def test_error_is_reported(self):
+        """Test that an exception becomes an error event with the client's request ID"""
+        def broken(report):
+            raise RuntimeError("LLM unavailable")
+
+        self.runner.submit("chat", broken, request_id="chat-1")
+        self.assertTrue(self.done.wait(1))
+        self.assertEqual(self.events[-1]["status"], "error")
+        self.assertEqual(self.events[-1]["request_id"], "chat-1")
+        self.assertIn("LLM unavailable", self.events[-1]["error"])
+        self.assertEqual(self.runner.recent()["finished"][0]["status"], "error")
+
+    def test_serial_kind_runs_one_at_a_time(self):
+        """Test that two chats submitted at once don't interleave their turns, while other kinds still run"""
+        runner = JobRunner(lambda event: None, max_workers=2, serial=("chat",))
+        history = []
+        woke = threading.Event()
+
+        def chat(report, text):
+            history.append(("user", text))
+            time.sleep(0.05)
+            history.append(("assistant", text.upper()))
+
+        try:
+            runner.submit("chat", chat, "one")
+            runner.submit("chat", chat, "two")
+            runner.submit("wake", lambda report: woke.set())
+            self.assertTrue(woke.wait(0.04))
+        finally:
+            runner.shutdown(wait=True)
+        self.assertEqual(history, [("user", "one"), ("assistant", "ONE"), ("user", "two"), ("assistant", "TWO")])
+
+if __name__ == '__main__':
+    unittest.main()
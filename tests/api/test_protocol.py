@@ -0,0 +1,65 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import unittest
+import json
+
+from src.api.protocol import encode_delta, decode_frame, decode_header, pack_buttons, unpack_buttons
+
+class TestBinaryProtocol(unittest.TestCase):
+    def test_led_frame_round_trip(self):
+        """Test that an LED matrix survives encoding as raw RGB bytes"""
+        matrix = [[[x * 10, y * 20, 255] for x in range(8)] for y in range(4)]
+        message = encode_delta("leds", 7, {"led_matrix": matrix}, binary=True)
+        self.assertIsNone(message.text)
+        self.assertEqual(len(message.binary), 5 + 2 + 8 * 4 * 3)
+        self.assertEqual(decode_frame(message.binary), (7, {"led_matrix": matrix}))
+
+    def test_audio_levels_round_trip(self):
+        """Test that only the audio levels present are packed as float16"""
+        message = encode_delta("audio", 3, {"output_audio_level_db": -20.5}, binary=True)
+        self.assertEqual(decode_frame(message.binary), (3, {"output_audio_level_db": -20.5}))
+
+    def test_joystick_round_trip(self):
+        """Test joystick axes (float16) and bit-packed buttons"""
+        buttons = [True, False, False, True, False, False, False, False, True, True, False]
+        joystick = {"connected": True, "axes": [0.5, -1.0, 0.0, 0.25], "buttons": buttons}
+        message = encode_delta("joystick", 9, {"joystick": joystick}, binary=True)
+        self.assertEqual(decode_frame(message.binary), (9, {"joystick": joystick}))
+
+    def test_uncovered_keys_stay_json(self):
+        """Test that keys without a binary encoding go into a JSON delta with the same seq"""
+        joystick = {"connected": False, "axes": [], "buttons": []}
+        motor = {"enabled": True, "left_speed": 0.5}
+        message = encode_delta("joystick", 4, {"joystick": joystick, "motor": motor}, binary=True)
+        self.assertEqual(decode_frame(message.binary)[0], 4)
+        self.assertEqual(json.loads(message.text), {"type": "state_delta", "seq": 4, "changes": {"motor": motor}})
+
+    def test_merged_delta_carries_from_seq(self):
+        """Test that a merged delta records the oldest seq it covers in the binary frame and the JSON delta"""
+        motor = {"enabled": True}
+        message = encode_delta("joystick", 6, {"joystick": {"connected": False, "axes": [], "buttons": []},
+                                               "motor": motor}, binary=True, from_seq=4)
+        self.assertEqual(decode_header(message.binary)[:3], (3, 4, 6))
+        self.assertEqual(decode_frame(message.binary)[0], 6)
+        self.assertEqual(json.loads(message.text), {"type": "state_delta", "seq": 6, "from_seq": 4,
+                                                    "changes": {"motor": motor}})
+        unmerged = encode_delta("audio", 6, {"input_audio_level_db": -3.0}, binary=True, from_seq=6)
+        self.assertEqual(len(unmerged.binary), 5 + 1 + 2)
+
+    def test_json_fallback(self):
+        """Test that non-binary clients get the plain JSON delta"""
+        message = encode_delta("leds", 1, {"led_matrix": [[[1, 2, 3]]]})
+        self.assertIsNone(message.binary)
+        self.assertEqual(json.loads(message.text)["changes"], {"led_matrix": [[[1, 2, 3]]]})
+
+    def test_button_packing(self):
+        """Test that buttons are packed LSB-first into whole bytes"""
+        self.assertEqual(pack_buttons([True] + [False] * 7 + [True]), bytes([0x01, 0x01]))
+        self.assertEqual(unpack_buttons(bytes([0x05]), 3), [True, False, True])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import unittest
+import json
+
+from src.api.state import VersionedState
+
+class TestVersionedState(unittest.TestCase):
+    def setUp(self):
+        """Set up a small state"""
+        self.state = VersionedState({
+            "robot_state": "standby",
+            "joystick": {"axes": [], "buttons": []},
+            "led_matrix": [],
+        })
+
+    def test_delta_contains_only_changed_keys(self):
+        """Test that unchanged keys are left out of the delta"""
+        seq, delta = self.state.update({"robot_state": "listening", "led_matrix": []})
+        self.assertEqual(seq, 1)
+        self.assertEqual(delta, {"robot_state": "listening"})
+
+    def test_no_change_keeps_sequence(self):
+        """Test that a no-op update does not advance the sequence number"""
+        self.state.update({"robot_state": "listening"})
+        seq, delta = self.state.update({"robot_state": "listening"})
+        self.assertEqual(seq, 1)
+        self.assertEqual(delta, {})
+
+    def test_unknown_keys_ignored(self):
+        """Test that keys outside the state schema are dropped"""
+        seq, delta = self.state.update({"type": "update_audio_level", "joystick_action": {}})
+        self.assertEqual(delta, {})
+        self.assertNotIn("type", self.state)
+
+    def test_nested_values_compared_by_value(self):
+        """Test that equal nested values do not produce a delta"""
+        self.state.update({"joystick": {"axes": [0.5], "buttons": [True]}})
+        _, delta = self.state.update({"joystick": {"axes": [0.5], "buttons": [True]}})
+        self.assertEqual(delta, {})
+
+    def test_messages(self):
+        """Test the wire format of snapshot and delta messages"""
+        seq, delta = self.state.update({"robot_state": "speaking"})
+        msg = json.loads(VersionedState.delta_message(seq, delta))
+        self.assertEqual(msg, {"type": "state_delta", "seq": 1, "changes": {"robot_state": "speaking"}})
+        snap = json.loads(self.state.snapshot_message())
+        self.assertEqual(snap["type"], "state_snapshot")
+        self.assertEqual(snap["seq"], 1)
+        self.assertEqual(snap["state"]["robot_state"], "speaking")
+
+if __name__ == '__main__':
+    unittest.main()
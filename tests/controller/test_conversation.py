@@ -0,0 +1,48 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import unittest
+import tempfile
+
+from config import Config
+from src.modules.conversation_store import ConversationStore
+
+
+class TestConversationRestore(unittest.TestCase):
+    def setUp(self):
+        """Set up a store and a config that restores two exchanges"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmpdir.name, 'config.yaml')
+        with open(path, 'w') as f:
+            f.write("conversation:\n  resume_last_session: true\n  restore_turns: 2\n")
+        self.saved_shared = Config._shared
+        Config._shared = Config(path)
+        self.store = ConversationStore(os.path.join(self.tmpdir.name, 'conversation.db'))
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.store.close()
+        Config._shared = self.saved_shared
+        self.tmpdir.cleanup()
+
+    def test_restore_starts_on_user_turn(self):
+        """Test a restore window that starts on an assistant reply is trimmed to the next user turn"""
+        from src.controller.conversation import ConversationController
+        session = self.store.new_session()
+        for role, content in [('user', "hi"), ('assistant', "hello"), ('assistant', "anything else?"),
+                              ('user', "tell me about mars"), ('assistant', "it's red")]:
+            self.store.append(session, role, content)
+        conversation = ConversationController(store=self.store)
+        try:
+            self.assertEqual(conversation.session_id, session)
+            self.assertEqual([m['role'] for m in conversation.conversation_history], ['system', 'user', 'assistant'])
+            self.assertEqual(conversation.conversation_history[1]['content'], "tell me about mars")
+            self.assertEqual(conversation.get_chat_history()[0], {'sender': 'user', 'text': "tell me about mars"})
+        finally:
+            conversation._unsubscribe_config()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import time
+import unittest
+
+from src.controller.drive_controller import DriveController
+from src.controller.motion_sequencer import MotionSequencer
+
+class RecordingMotors:
+    def __init__(self):
+        self.calls = []
+
+    def set_motor_speeds(self, left, right):
+        self.calls.append(('drive', left, right))
+
+    def move_head(self, pan=None, tilt=None, duration=None):
+        self.calls.append(('head', pan, tilt))
+
+    def move_arm(self, side, position, duration=None):
+        self.calls.append((f'{side}_arm', position))
+
+    def stop(self):
+        self.set_motor_speeds(0.0, 0.0)
+
+class TestDriveController(unittest.TestCase):
+    def setUp(self):
+        """Set up a drive controller whose control tick is stepped by hand"""
+        self.motors = RecordingMotors()
+        self.drive = DriveController(self.motors)
+        self.drive._control_task.cancel()
+        self.drive.set_enabled(True)
+        self.motors.calls.clear()
+        self.axes = [0.0] * 6
+
+    def tearDown(self):
+        self.drive.cleanup()
+
+    def forward(self, speed):
+        self.axes[self.drive.joystick_mappings['drive_movement']] = -speed
+        self.drive.on_joystick_update(self.axes, [False])
+
+    def test_input_applied_on_tick(self):
+        """Test joystick updates are only stored, and the tick sends each command once"""
+        self.forward(0.5)
+        self.assertEqual(self.motors.calls, [])
+        self.drive._control_tick(0.02)
+        self.assertEqual(self.motors.calls, [('drive', 0.5, 0.5)])
+        self.drive._control_tick(0.02)
+        self.forward(0.5)
+        self.drive._control_tick(0.02)
+        self.assertEqual(len(self.motors.calls), 1)
+        self.forward(0.8)
+        self.drive._control_tick(0.02)
+        self.assertEqual(self.motors.calls[-1], ('drive', 0.8, 0.8))
+
+    def test_watchdog_stops_stale_input(self):
+        """Test the motors stop once when input goes stale and restart when it resumes"""
+        self.drive.command_timeout = 0.05
+        self.forward(0.6)
+        self.drive._control_tick(0.02)
+        time.sleep(0.08)
+        self.drive._control_tick(0.02)
+        self.drive._control_tick(0.02)
+        self.assertEqual(self.motors.calls, [('drive', 0.6, 0.6), ('drive', 0.0, 0.0)])
+        self.forward(0.6)
+        self.drive._control_tick(0.02)
+        self.assertEqual(self.motors.calls[-1], ('drive', 0.6, 0.6))
+
+    def test_watchdog_stop_is_not_deduplicated(self):
+        """Test the watchdog stops motors driven by someone else after the stick last sent a stop"""
+        self.drive.command_timeout = 0.05
+        self.forward(0.0)
+        self.drive._control_tick(0.02)
+        self.motors.set_motor_speeds(0.4, -0.4)
+        time.sleep(0.08)
+        self.drive._control_tick(0.02)
+        self.assertEqual(self.motors.calls[-1], ('drive', 0.0, 0.0))
+
+    def test_fixed_rate_loop(self):
+        """Test the scheduled control loop applies input without a tick being called"""
+        drive = DriveController(self.motors)
+        try:
+            drive.set_enabled(True)
+            drive.on_joystick_update(self.axes[:1] + [-0.4] + self.axes[2:], [False])
+            time.sleep(0.1)
+            self.assertIn(('drive', 0.4, 0.4), self.motors.calls)
+        finally:
+            drive.cleanup()
+
+class TestDriveDuringGesture(unittest.TestCase):
+    def setUp(self):
+        """Set up a drive controller and a sequencer playing a driving gesture, both stepped by hand"""
+        self.motors = RecordingMotors()
+        self.sequencer = MotionSequencer(self.motors)
+        self.sequencer._task.cancel()
+        self.drive = DriveController(self.motors, sequencer=self.sequencer)
+        self.drive._control_task.cancel()
+        self.axes = [0.0] * 6
+
+    def tearDown(self):
+        self.drive.cleanup()
+        self.sequencer.cleanup()
+
+    def play_dance(self, buttons):
+        self.drive.on_joystick_update(self.axes, buttons)
+        self.drive._control_tick(0.02)
+        self.sequencer.play('dance')
+        for _ in range(20):
+            self.sequencer._tick(1.0 / self.sequencer.rate_hz)
+            self.drive.on_joystick_update(self.axes, buttons)
+            self.drive._control_tick(0.02)
+        self.assertNotEqual(self.motors.calls[-1], ('drive', 0.0, 0.0))
+        self.assertEqual(self.motors.calls[-1][0], 'drive')
+
+    def test_watchdog_stops_gesture_drive(self):
+        """Test the watchdog stops wheels a gesture is driving, though the stick last sent a stop"""
+        self.drive.set_enabled(True)
+        self.play_dance([False])
+        self.drive.command_timeout = 0.01
+        time.sleep(0.02)
+        self.drive._control_tick(0.02)
+        self.assertEqual(self.motors.calls[-1], ('drive', 0.0, 0.0))
+        self.assertFalse(self.sequencer.is_playing('drive'))
+
+    def test_disabling_stops_gesture_drive(self):
+        """Test releasing the enable button or disabling driving stops wheels a gesture is driving"""
+        self.play_dance([True])
+        self.drive.on_joystick_update(self.axes, [False])
+        self.drive._control_tick(0.02)
+        self.assertEqual(self.motors.calls[-1], ('drive', 0.0, 0.0))
+
+        self.drive.set_enabled(True)
+        self.play_dance([False])
+        self.drive.set_enabled(False)
+        self.assertEqual(self.motors.calls[-1], ('drive', 0.0, 0.0))
+        count = len(self.motors.calls)
+        for _ in range(10):
+            self.sequencer._tick(1.0 / self.sequencer.rate_hz)
+        self.assertFalse(any(call[0] == 'drive' for call in self.motors.calls[count:]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import unittest
+
+from src.controller.motion_sequencer import Keyframe, MotionSequencer, compile_gesture, load_gestures
+from src.controller.drive_controller import DriveController
+
+GESTURES_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../gestures.yaml'))
+
+
+class RecordingMotors:
+    def __init__(self):
+        self.calls = []
+
+    def move_head(self, pan=None, tilt=None, duration=None):
+        self.calls.append(('head', pan, tilt, duration))
+
+    def move_arm(self, side, position, duration=None):
+        self.calls.append((f'{side}_arm', position, duration))
+
+    def set_motor_speeds(self, left, right):
+        self.calls.append(('drive', left, right))
+
+    def stop(self):
+        self.set_motor_speeds(0.0, 0.0)
+
+
+class TestMotionSequencer(unittest.TestCase):
+    def setUp(self):
+        """Set up a sequencer stepped by hand"""
+        self.motors = RecordingMotors()
+        self.sequencer = MotionSequencer(self.motors)
+        self.sequencer._task.cancel()
+
+    def tearDown(self):
+        self.sequencer.cleanup()
+
+    def run_ticks(self, count):
+        for _ in range(count):
+            self.sequencer._tick(1.0 / self.sequencer.rate_hz)
+
+    def test_compile_schedules_servo_moves(self):
+        """Test servo keyframes become timed moves and the gesture lasts until the last one arrives"""
+        gesture = compile_gesture('nod', [
+            Keyframe(0.0, {'head_tilt': 0.0}),
+            Keyframe(0.5, {'head_tilt': 0.5, 'left_arm': 2.0}, 0.2),
+        ], rate_hz=10)
+        self.assertEqual(gesture.moves, ((0, 'head_tilt', 0.0, None), (5, 'head_tilt', 0.5, 0.2),
+                                         (5, 'left_arm', 1.0, 0.2)))
+        self.assertEqual(gesture.tracks, {})
+        self.assertEqual(gesture.length, 8)
+        self.assertEqual(gesture.groups, frozenset({'head', 'left_arm'}))
+
+    def test_compile_samples_drive(self):
+        """Test drive keyframes are sampled with eased moves and holds between them"""
+        gesture = compile_gesture('spin', [
+            Keyframe(0.0, {'drive_left': 0.0}),
+            Keyframe(0.5, {'drive_left': 0.5}, 0.2),
+        ], rate_hz=10)
+        start, samples = gesture.tracks['drive_left']
+        self.assertEqual(start, 0)
+        self.assertEqual(list(samples[:5]), [0.0] * 5)
+        self.assertEqual(len(samples), 7)
+        self.assertEqual(samples[6], 0.5)
+        self.assertEqual(samples[5], 0.25)
+        self.assertEqual(gesture.groups, frozenset({'drive'}))
+
+    def test_compile_rejects_unknown_joints(self):
+        """Test a gesture naming an unknown joint is rejected"""
+        with self.assertRaises(ValueError):
+            compile_gesture('bad', [Keyframe(0.0, {'tail': 1.0})], rate_hz=10)
+
+    def test_gestures_file_compiles(self):
+        """Test every gesture in gestures.yaml loads and compiles"""
+        definitions = load_gestures(GESTURES_FILE)
+        for name in ('wave', 'dance', 'look_left', 'look_right', 'center_head', 'reset_position'):
+            self.assertIn(name, definitions)
+            self.assertIn(name, self.sequencer.gestures)
+        self.assertIn('drive', self.sequencer.gestures['dance'].groups)
+
+    def test_play_sends_moves_and_finishes(self):
+        """Test a gesture sends each servo move once and stops when the last one should have arrived"""
+        self.assertTrue(self.sequencer.play('look_left'))
+        self.run_ticks(100)
+        self.assertEqual(self.motors.calls, [('head', -0.8, None, 0.4)])
+        self.assertFalse(self.sequencer.is_playing())
+        self.assertFalse(self.sequencer.play('moonwalk'))
+
+    def test_groups_play_concurrently(self):
+        """Test gestures on different joint groups play together and are pre-empted separately"""
+        self.sequencer.play('wave')
+        self.sequencer.play('look_left')
+        self.assertEqual(self.sequencer.playing(), {'right_arm': 'wave', 'head': 'look_left'})
+        self.run_ticks(2)
+        self.sequencer.preempt('head')
+        self.assertEqual(self.sequencer.playing(), {'right_arm': 'wave'})
+        count = len(self.motors.calls)
+        self.run_ticks(5)
+        self.assertFalse(any(call[0] == 'head' for call in self.motors.calls[count:]))
+
+    def test_preempt_stops_whole_gesture(self):
+        """Test pre-empting one group of a gesture stops all of it and the wheels"""
+        self.sequencer.play('dance')
+        self.run_ticks(5)
+        self.sequencer.preempt('left_arm')
+        self.assertFalse(self.sequencer.is_playing())
+        self.assertEqual(self.motors.calls[-1], ('drive', 0.0, 0.0))
+
+    def test_joystick_preempts_gesture(self):
+        """Test moving the head stick takes the head back from a gesture"""
+        drive = DriveController(self.motors, sequencer=self.sequencer)
+        drive._control_task.cancel()
+        try:
+            self.sequencer.play('look_right')
+            drive.set_enabled(True)
+            axes = [0.0] * 6
+            drive.on_joystick_update(axes, [False])
+            drive._control_tick(0.02)
+            self.assertTrue(self.sequencer.is_playing('head'))
+            axes[drive.joystick_mappings['head_pan']] = 0.9
+            drive.on_joystick_update(axes, [False])
+            drive._control_tick(0.02)
+            self.assertFalse(self.sequencer.is_playing('head'))
+        finally:
+            drive.cleanup()
+
+    def test_drive_tracks_need_driving_enabled(self):
+        """Test a gesture's drive tracks don't move the wheels while driving is disabled"""
+        drive = DriveController(self.motors, sequencer=self.sequencer)
+        drive._control_task.cancel()
+        try:
+            drive.on_joystick_update([0.0] * 6, [False])
+            for _ in range(3):
+                drive._control_tick(0.02)
+            self.sequencer.play('dance')
+            for _ in range(30):
+                self.run_ticks(1)
+                drive._control_tick(0.02)
+            drive_calls = [call for call in self.motors.calls if call[0] == 'drive']
+            self.assertTrue(all(call == ('drive', 0.0, 0.0) for call in drive_calls))
+            self.assertTrue(self.sequencer.is_playing('left_arm'))
+            self.assertTrue(any(call[0] == 'left_arm' for call in self.motors.calls))
+        finally:
+            drive.cleanup()
+
+    def test_preempting_drive_stops_wheels(self):
+        """Test pre-empting a gesture's drive group stops the wheels it was driving"""
+        self.sequencer.set_drive_gate(lambda: True)
+        self.sequencer.play('dance')
+        self.run_ticks(30)
+        self.assertTrue(any(call[0] == 'drive' and call != ('drive', 0.0, 0.0) for call in self.motors.calls))
+        self.assertTrue(self.sequencer.preempt('drive'))
+        self.assertEqual(self.motors.calls[-1], ('drive', 0.0, 0.0))
+        self.assertFalse(self.sequencer.preempt('drive'))
+
+if __name__ == '__main__':
+    unittest.main()
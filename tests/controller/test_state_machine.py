@@ -0,0 +1,107 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import threading
+import time
+import unittest
+
+from src.controller.state import RobotState
+from src.controller.state_machine import StateMachine, Transition
+
+S = RobotState
+
+class TestStateMachine(unittest.TestCase):
+    def setUp(self):
+        """Set up the robot's conversation transitions with recording hooks"""
+        self.entered = []
+        self.actions = []
+        self.allow_timeout = True
+        self.wake_ok = True
+        self.machine = StateMachine(S.STANDBY, [
+            Transition('wake', (S.STANDBY,), S.LISTENING, action=self.wake_action),
+            Transition('transcript', (S.LISTENING,), S.PROCESSING),
+            Transition('response', (S.PROCESSING,), S.SPEAKING, action=lambda c: self.actions.append(('say', c['text']))),
+            Transition('speech_complete', (S.SPEAKING,), S.LISTENING),
+            Transition('silence_timeout', (S.LISTENING,), S.STANDBY, guard=lambda c: self.allow_timeout),
+            Transition('standby', tuple(S), S.STANDBY),
+        ])
+        self.machine.on_enter(lambda old, new, context: self.entered.append((old, new, threading.current_thread().name)))
+        self.machine.start()
+
+    def tearDown(self):
+        self.machine.stop()
+
+    def wake_action(self, context):
+        self.actions.append(('wake',))
+        return self.wake_ok
+
+    def fire(self, trigger, **context):
+        return self.machine.fire(trigger, **context).result(timeout=1)
+
+    def test_declared_transitions(self):
+        """Test a full conversation turn and that hooks run on the machine's thread"""
+        self.assertTrue(self.fire('wake'))
+        self.assertTrue(self.fire('transcript'))
+        self.assertTrue(self.fire('response', text='hello'))
+        self.assertTrue(self.fire('speech_complete'))
+        self.assertEqual(self.machine.state, S.LISTENING)
+        self.assertEqual([new for _, new, _ in self.entered],
+                         [S.STANDBY, S.LISTENING, S.PROCESSING, S.SPEAKING, S.LISTENING])
+        self.assertEqual(self.entered[0][0], None)
+        self.assertEqual({thread for _, _, thread in self.entered}, {'state-machine'})
+        self.assertIn(('say', 'hello'), self.actions)
+
+    def test_undeclared_events_ignored(self):
+        """Test that late or duplicate events don't change state"""
+        self.fire('wake')
+        self.assertFalse(self.fire('speech_complete'))
+        self.assertFalse(self.fire('response', text='late'))
+        self.assertEqual(self.machine.state, S.LISTENING)
+        self.assertEqual(self.machine.stats()['outcomes']['ignored'], 2)
+
+    def test_guard_and_failed_action(self):
+        """Test that a false guard or failing action leaves the state unchanged"""
+        self.wake_ok = False
+        self.assertFalse(self.fire('wake'))
+        self.assertEqual(self.machine.state, S.STANDBY)
+        self.wake_ok = True
+        self.fire('wake')
+        self.allow_timeout = False
+        self.assertFalse(self.fire('silence_timeout'))
+        self.assertEqual(self.machine.state, S.LISTENING)
+        outcomes = self.machine.stats()['outcomes']
+        self.assertEqual((outcomes['failed'], outcomes['rejected']), (1, 1))
+
+    def test_redundant_transition_skips_hooks(self):
+        """Test that returning to the current state doesn't rerun enter hooks"""
+        self.assertTrue(self.fire('standby'))
+        self.assertTrue(self.fire('standby'))
+        self.assertEqual(len(self.entered), 1)
+        self.assertEqual(self.machine.stats()['outcomes']['redundant'], 2)
+
+    def test_concurrent_events_serialized(self):
+        """Test that racing wake events from several threads make one transition"""
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.fire('wake'))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results.count(True), 1)
+        self.assertEqual(self.actions, [('wake',)])
+
+    def test_dwell_time(self):
+        """Test that time spent in a state is recorded when leaving it"""
+        self.fire('wake')
+        time.sleep(0.05)
+        self.fire('standby')
+        dwell = self.machine.stats()['dwell']['listening']
+        self.assertEqual(dwell['count'], 1)
+        self.assertGreaterEqual(dwell['last_seconds'], 0.05)
+        self.assertEqual(self.machine.stats()['history'][-1]['trigger'], 'standby')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import unittest
+import threading
+import time
+
+from src.controller.subsystems import SubsystemInitializer, SubsystemError
+
+class TestSubsystemInitializer(unittest.TestCase):
+    def setUp(self):
+        """Set up an initializer and a log of construction order"""
+        self.init = SubsystemInitializer()
+        self.built = []
+
+    def factory(self, name, delay=0.0):
+        def build(**deps):
+            time.sleep(delay)
+            self.built.append(name)
+            return {'name': name, 'deps': deps}
+        return build
+
+    def test_independent_subsystems_run_concurrently(self):
+        """Test that two slow independent subsystems take about as long as one"""
+        self.init.add('speech', self.factory('speech', 0.2))
+        self.init.add('motors', self.factory('motors', 0.2))
+        start = time.perf_counter()
+        self.init.start()
+        self.init.wait()
+        self.assertLess(time.perf_counter() - start, 0.35)
+        self.assertEqual({e['status'] for e in self.init.timings()}, {'ready'})
+
+    def test_dependencies_are_passed_in(self):
+        """Test that a subsystem is built after, and receives, its dependencies"""
+        self.init.add('audio', self.factory('audio', 0.05))
+        self.init.add('leds', self.factory('leds'), depends=('audio',))
+        self.init.start()
+        leds = self.init.get('leds', timeout=1)
+        self.assertEqual(self.built, ['audio', 'leds'])
+        self.assertEqual(leds['deps']['audio']['name'], 'audio')
+
+    def test_lazy_subsystem_built_on_first_use(self):
+        """Test that a lazy subsystem is not built until asked for"""
+        self.init.add('vision', self.factory('vision'), lazy=True)
+        self.init.start()
+        self.init.wait()
+        self.assertEqual(self.built, [])
+        self.assertIsNone(self.init.peek('vision'))
+        self.assertEqual(self.init.timings()[0]['status'], 'deferred')
+        self.assertEqual(self.init.get('vision', timeout=1)['name'], 'vision')
+        self.assertEqual(self.built, ['vision'])
+
+    def test_failure_propagates_to_dependents(self):
+        """Test that a failed subsystem fails its dependents and reports the error"""
+        def broken():
+            raise OSError("no I2C bus")
+        self.init.add('motors', broken)
+        self.init.add('drive', self.factory('drive'), depends=('motors',))
+        self.init.start()
+        with self.assertRaises(SubsystemError):
+            self.init.get('drive', timeout=1)
+        self.assertIsNone(self.init.get_or_none('motors'))
+        self.assertIsNone(self.init.get_or_none('not_registered'))
+        timings = {e['name']: e for e in self.init.timings()}
+        self.assertEqual(timings['motors']['status'], 'failed')
+        self.assertIn("no I2C bus", timings['motors']['error'])
+        self.assertEqual(self.built, [])
+
+    def test_when_ready_callback(self):
+        """Test that ready callbacks fire once built, but not for lazy or failed subsystems"""
+        ready = []
+        self.init.add('leds', self.factory('leds', 0.05))
+        self.init.add('vision', self.factory('vision'), lazy=True)
+        self.init.when_ready('leds', lambda leds: ready.append(leds['name']))
+        self.init.when_ready('vision', lambda vision: ready.append(vision['name']))
+        self.init.start()
+        self.init.wait()
+        self.assertEqual(ready, ['leds'])
+        self.init.when_ready('leds', lambda leds: ready.append('again'))
+        self.assertEqual(ready, ['leds', 'again'])
+
+    def test_unknown_dependency_rejected(self):
+        """Test that dependencies must be registered first"""
+        with self.assertRaises(ValueError):
+            self.init.add('leds', self.factory('leds'), depends=('audio',))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -40,6 +40,18 @@ class MockRobot:
         self._state = state
         print(f"  [State changed to: {state}]")
     
+    @property
+    def state(self):
+        return self._state
+
+    def fire(self, trigger, **context):
+        """Mock state machine: accept every event"""
+        from concurrent.futures import Future
+        print(f"  [Event: {trigger}]")
+        future = Future()
+        future.set_result(True)
+        return future
+
     def _return_to_standby(self):
         self._state = "STANDBY"
         print("  [Returning to standby]")
@@ -82,27 +82,27 @@ print()
 
 # Test 6.4: Check robot state
 print("Test 6.4: Checking robot state...")
-print(f"Current state: {robot._state}")
+print(f"Current state: {robot.state}")
 print("✓ Robot state accessible")
 
 # Test 6.5: Test state transitions (if voice is enabled)
 if hasattr(robot, 'speech') and robot.speech:
     print("\nTest 6.5: Testing state transitions...")
     
-    print("Setting state to LISTENING...")
-    robot._set_state(robot._state.__class__.LISTENING if hasattr(robot._state, '__class__') else "LISTENING")
+    print("Waking (STANDBY -> LISTENING)...")
+    print(f"  accepted: {robot.fire('wake').result(timeout=10)}, state: {robot.state}")
     time.sleep(0.5)
     
-    print("Setting state to PROCESSING...")
-    robot._set_state(robot._state.__class__.PROCESSING if hasattr(robot._state, '__class__') else "PROCESSING")
+    print("Transcript (LISTENING -> PROCESSING)...")
+    print(f"  accepted: {robot.fire('transcript').result(timeout=10)}, state: {robot.state}")
     time.sleep(0.5)
     
-    print("Setting state to SPEAKING...")
-    robot._set_state(robot._state.__class__.SPEAKING if hasattr(robot._state, '__class__') else "SPEAKING")
-    robot.speech.voice.say("Testing speaking state", blocking=True)
+    print("Response (PROCESSING -> SPEAKING)...")
+    print(f"  accepted: {robot.fire('response', text='Testing speaking state').result(timeout=10)}, state: {robot.state}")
+    time.sleep(3)
     
     print("Returning to STANDBY...")
-    robot._return_to_standby()
+    robot._return_to_standby().result(timeout=10)
     time.sleep(0.5)
     
     print("✓ State transition tests completed")
@@ -0,0 +1,139 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import json
+import shutil
+import tempfile
+import unittest
+
+from config import Config
+from src.modules.calibration import (CalibrationController, CalibrationError, CalibrationStore, CameraFeedback,
+                                     CurrentFeedback, EncoderFeedback, MotorCalibration)
+from src.modules.motor import MotorModule
+from src.modules.pwm import PCA9685
+from src.simulation import hardware as sim
+from src.simulation.plant import SimPlant
+
+CONFIG = """\
+motor:
+  calibration_file: calibration.json
+  servos:
+    head_tilt:
+      min_pulse: 1000
+      center_pulse: 1500
+      max_pulse: 1800
+calibration:
+  settle: 0
+  window: 0.05
+"""
+
+
+class TestCalibration(unittest.TestCase):
+    def setUp(self):
+        """Set up a motor module on simulated hardware with a temporary calibration store"""
+        self.tmpdir = tempfile.mkdtemp()
+        path = os.path.join(self.tmpdir, 'config.yaml')
+        with open(path, 'w') as f:
+            f.write(CONFIG)
+        self.saved_shared = Config._shared
+        Config._shared = Config(path)
+        self.previous = sim._current
+        self.hw = sim._current = sim.SimHardware(sim.LatencyModel().scaled(0))
+        # A fine encoder, so speeds measured over a short window are exact enough to fit
+        self.plant = SimPlant(self.hw, counts_per_rev=4096)
+        self.modules = []
+        self.mc = self.motor_module()
+
+    def tearDown(self):
+        for module in self.modules:
+            module.cleanup()
+        sim._current = self.previous
+        Config._shared = self.saved_shared
+        shutil.rmtree(self.tmpdir)
+
+    def motor_module(self):
+        """A MotorModule wired to the simulated HATs."""
+        mc = MotorModule()
+        self.modules.append(mc)
+        mc.motor_kit = sim.SimMotorKit()
+        mc.servo_kit = sim.SimServoKit(channels=16)
+        mc.motor_pwm = PCA9685(self.hw.i2c, address=sim.MOTOR_HAT_ADDRESS)
+        mc.servo_pwm = PCA9685(self.hw.i2c, address=sim.SERVO_HAT_ADDRESS)
+        return mc
+
+    def controller(self):
+        return CalibrationController(self.mc, {
+            'speed': EncoderFeedback(self.plant.encoder_counts, self.plant.counts_per_rev),
+            'current': CurrentFeedback(self.plant.current, samples=1),
+            'angle': CameraFeedback(self.plant.camera_angle),
+        })
+
+    def test_calibrate_end_to_end(self):
+        """Test sweeps fit the simulated plant, are stored and are applied at the next boot"""
+        record = self.controller().calibrate()
+        left, right = record['motors']['left'], record['motors']['right']
+        self.assertAlmostEqual(left['deadband'], 0.12, delta=0.02)
+        self.assertAlmostEqual(right['deadband'], 0.15, delta=0.02)
+        self.assertAlmostEqual(left['gain'], 3.0 / 0.88, delta=0.2)
+        self.assertAlmostEqual(left['max_throttle'], 0.85)
+        tilt = record['servos']['head_tilt']
+        self.assertAlmostEqual(tilt['min_pulse'], 1150, delta=10)
+        self.assertAlmostEqual(tilt['max_pulse'], 1800, delta=10)
+        self.assertAlmostEqual(tilt['center_pulse'], 1450, delta=5)
+        self.assertAlmostEqual(record['servos']['left_arm']['min_pulse'], 800, delta=10)
+        self.assertNotIn('center_pulse', record['servos']['left_arm'])
+
+        # Calibrated, equal speeds drive both wheels at the same rate, and small speeds still move them
+        self.mc._write_outputs(0.5, 0.5)
+        self.assertAlmostEqual(self.plant.wheel_speed('left'), self.plant.wheel_speed('right'), delta=0.05)
+        self.mc._write_outputs(0.02, 0.02)
+        self.assertGreater(self.plant.wheel_speed('right'), 0)
+
+        rebooted = self.motor_module()
+        self.assertEqual(rebooted.calibration['revision'], 1)
+        self.assertEqual(rebooted.servo_channels['head_tilt'].min_pulse, tilt['min_pulse'])
+        self.assertEqual(rebooted.servo_channels['head_tilt'].pulse(0.0), tilt['center_pulse'])
+
+    def test_servo_calibration_from_current_only(self):
+        """Test a servo sweep stops at the stall current when there is no camera"""
+        controller = CalibrationController(self.mc, {'current': CurrentFeedback(self.plant.current, samples=1)})
+        result = controller.calibrate_servo('head_pan')
+        self.assertAlmostEqual(result['min_pulse'], 700, delta=10)
+        self.assertAlmostEqual(result['max_pulse'], 2100, delta=10)
+        self.assertEqual(result['center_pulse'], (result['min_pulse'] + result['max_pulse']) // 2)
+        with self.assertRaises(CalibrationError):
+            controller.calibrate_motors()
+
+    def test_store_revisions(self):
+        """Test each save adds a revision over the previous one and can be rolled back"""
+        store = CalibrationStore(os.path.join(self.tmpdir, 'store', 'calibration.json'), keep=3)
+        self.assertIsNone(store.load())
+        store.save(motors={'left': {'deadband': 0.1, 'gain': 3.0}})
+        second = store.save(servos={'head_pan': {'min_pulse': 700, 'max_pulse': 2100}})
+        self.assertEqual(second['revision'], 2)
+        self.assertIn('left', second['motors'])
+        rolled_back = store.rollback(1)
+        self.assertEqual(rolled_back['revision'], 3)
+        self.assertEqual(rolled_back['servos'], {})
+        store.save()
+        self.assertEqual(store.revisions(), [2, 3, 4])
+
+        with open(store.path, 'w') as f:
+            json.dump({'schema': 99, 'revisions': [{'revision': 1}]}, f)
+        self.assertIsNone(store.load())
+
+    def test_motor_calibration_mapping(self):
+        """Test speeds start at the deadband and both sides share the slower side's top speed"""
+        calibrations = MotorCalibration.from_fits({'left': {'deadband': 0.1, 'gain': 4.0, 'max_throttle': 1.0},
+                                                   'right': {'deadband': 0.2, 'gain': 4.0, 'max_throttle': 0.9}})
+        self.assertEqual(calibrations['left'].throttle(0.0), 0.0)
+        self.assertAlmostEqual(calibrations['left'].throttle(1.0), 0.8)
+        self.assertAlmostEqual(calibrations['right'].throttle(-1.0), -0.9)
+        self.assertAlmostEqual(calibrations['right'].top_speed, 2.8)
+        self.assertEqual(MotorCalibration.from_fits({})['left'].throttle(0.5), 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import unittest
+import asyncio
+import time
+
+from src.modules.camera_stream import MjpegStreamer
+
+class FakeSource:
+    """Frame source whose frame id advances every millisecond, like a camera"""
+    def __init__(self):
+        self.started = False
+        self.reads = 0
+
+    @property
+    def frame_count(self):
+        return int(time.monotonic() * 1000)
+
+    def start(self):
+        self.started = True
+
+    def get_frame(self):
+        self.reads += 1
+        return self.frame_count
+
+class TestMjpegStreamer(unittest.TestCase):
+    def setUp(self):
+        """Set up a streamer with a counting encoder"""
+        self.source = FakeSource()
+        self.encoded = []
+
+        def encoder(frame):
+            self.encoded.append(frame)
+            return f"jpeg-{frame}".encode()
+
+        self.streamer = MjpegStreamer(self.source, max_fps=100, encoder=encoder)
+
+    def tearDown(self):
+        self.streamer.cleanup()
+
+    def test_no_encoding_without_viewers(self):
+        """Test that frames are neither read nor encoded when nobody is watching"""
+        time.sleep(0.05)
+        self.assertEqual(self.source.reads, 0)
+        self.assertEqual(self.encoded, [])
+
+    def test_frames_shared_between_viewers(self):
+        """Test that each frame is encoded once and delivered to every viewer"""
+        async def main():
+            streams = [self.streamer.mjpeg(), self.streamer.mjpeg()]
+            chunks = await asyncio.gather(*(stream.__anext__() for stream in streams))
+            stats = self.streamer.stats()
+            for stream in streams:
+                await stream.aclose()
+            return chunks, stats
+
+        chunks, stats = asyncio.run(main())
+        self.assertTrue(self.source.started)
+        self.assertEqual(stats["viewers"], 2)
+        for chunk in chunks:
+            self.assertTrue(chunk.startswith(b"--frame\r\nContent-Type: image/jpeg\r\n"))
+            self.assertIn(b"jpeg-", chunk)
+        # Every encoded frame is a distinct capture
+        self.assertEqual(len(self.encoded), len(set(self.encoded)))
+        self.assertEqual(self.streamer.stats()["viewers"], 0)
+
+    def test_unchanged_frame_is_not_re_encoded(self):
+        """Test that a stalled camera does not cause repeated encodes"""
+        class StalledSource:
+            frame_count = 1
+            def get_frame(self):
+                return "still"
+
+        self.streamer.source = StalledSource()
+
+        async def main():
+            stream = self.streamer.mjpeg()
+            first = await stream.__anext__()
+            await asyncio.sleep(0.05)
+            await stream.aclose()
+            # A late viewer still gets the last frame straight away
+            late = self.streamer.mjpeg()
+            second = await asyncio.wait_for(late.__anext__(), 1)
+            await late.aclose()
+            return first, second
+
+        first, second = asyncio.run(main())
+        self.assertEqual(self.encoded, ["still"])
+        self.assertEqual(first, second)
+        self.assertGreater(self.streamer.stats()["frames_skipped"], 0)
+
+    def test_slow_viewer_gets_latest_frame(self):
+        """Test that a viewer that stops reading only holds the newest frame"""
+        async def main():
+            loop = asyncio.get_running_loop()
+            queue = self.streamer.add_viewer(loop)
+            await asyncio.sleep(0.1)
+            self.assertEqual(queue.qsize(), 1)
+            latest = await queue.get()
+            self.streamer.remove_viewer(loop, queue)
+            return latest
+
+        latest = asyncio.run(main())
+        self.assertGreater(len(self.encoded), 1)
+        # The newest frame at the time it was read (one more may have been encoded since)
+        self.assertIn(latest, [f"jpeg-{frame}".encode() for frame in self.encoded[-2:]])
+
+if __name__ == '__main__':
+    unittest.main()
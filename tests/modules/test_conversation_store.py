@@ -0,0 +1,60 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import unittest
+import tempfile
+
+from src.modules.conversation_store import ConversationStore
+
+class TestConversationStore(unittest.TestCase):
+    def setUp(self):
+        """Set up a store in a temporary directory"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'nested', 'conversation.db')
+        self.store = ConversationStore(self.path)
+
+    def test_append_and_recent(self):
+        """Test that recent messages come back in chronological order"""
+        session = self.store.new_session()
+        for i in range(6):
+            self.store.append(session, 'user' if i % 2 == 0 else 'assistant', f"msg {i}")
+        recent = self.store.recent_messages(session, limit=4)
+        self.assertEqual([m['content'] for m in recent], ["msg 2", "msg 3", "msg 4", "msg 5"])
+        self.assertEqual(recent[0]['role'], 'user')
+
+    def test_sessions_are_isolated(self):
+        """Test that messages are scoped to their session"""
+        first = self.store.new_session()
+        second = self.store.new_session()
+        self.store.append(first, 'user', "hello")
+        self.store.append(second, 'user', "other")
+        self.assertEqual([m['content'] for m in self.store.recent_messages(first, 10)], ["hello"])
+        self.assertEqual(self.store.latest_session(), second)
+
+    def test_survives_reopen(self):
+        """Test that the log persists across restarts"""
+        session = self.store.new_session()
+        self.store.append(session, 'user', "remember me")
+        self.store.close()
+
+        self.store = ConversationStore(self.path)
+        self.assertEqual(self.store.latest_session(), session)
+        self.assertEqual(self.store.recent_messages(session, 1)[0]['content'], "remember me")
+        sessions = self.store.list_sessions()
+        self.assertEqual(sessions[0]['messages'], 1)
+
+    def test_empty_store(self):
+        """Test queries on an empty log"""
+        self.assertIsNone(self.store.latest_session())
+        self.assertEqual(self.store.recent_messages("missing", 5), [])
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.store.close()
+        self.tmpdir.cleanup()
+
+if __name__ == '__main__':
+    unittest.main()
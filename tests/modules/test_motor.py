@@ -6,7 +6,6 @@ if src_path not in sys.path:
 
 import unittest
 from unittest.mock import MagicMock, patch
-import numpy as np
 import sys
 import os
 src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
@@ -16,12 +15,17 @@ modules_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../sr
 if modules_path not in sys.path:
     sys.path.insert(0, modules_path)
 
-from src.modules.motor import MotorModule
+from src.modules.motor import MotorModule, ServoChannel, quantize_throttle, ramp
+from src.modules.pwm import PCA9685
+from src.simulation.i2c import SimI2C, SimPCA9685
 
 class TestMotorModule(unittest.TestCase):
     def setUp(self):
         """Set up test environment"""
         self.mc = MotorModule(debug=True)
+
+    def tearDown(self):
+        self.mc.cleanup()
         
     def test_set_motor_speeds(self):
         """Test setting motor speeds"""
@@ -56,5 +60,96 @@ class TestMotorModule(unittest.TestCase):
         self.assertEqual(self.mc.left_speed, 1.0)
         self.assertEqual(self.mc.right_speed, -1.0)
 
+    def test_ramp_limits_step(self):
+        """Test outputs move towards the target by at most the step"""
+        self.assertAlmostEqual(ramp(0.0, 1.0, 0.1), 0.1)
+        self.assertAlmostEqual(ramp(0.5, -1.0, 0.25), 0.25)
+        self.assertEqual(ramp(0.95, 1.0, 0.1), 1.0)
+        self.assertEqual(ramp(0.0, 1.0, 0.0), 1.0)
+
+    def test_acceleration_ramp(self):
+        """Test the output reaches the target at the configured acceleration"""
+        self.mc.update_task.cancel()
+        self.mc.acceleration = 2.0
+        self.mc.set_speeds(1.0, -1.0)
+        left, right = self.mc._step(0.25)
+        self.assertAlmostEqual(left, 0.5)
+        self.assertAlmostEqual(right, -0.5)
+        left, right = self.mc._step(0.5)
+        self.assertEqual((left, right), (1.0, -1.0))
+
+    def test_writes_only_on_change(self):
+        """Test throttles are only written when the quantized value changes"""
+        self.mc.update_task.cancel()
+        self.mc.motor_kit = MagicMock()
+        self.assertEqual(self.mc._write_outputs(0.5, 0.5), 4)
+        self.assertEqual(self.mc._write_outputs(0.5, 0.5), 0)
+        # Below the PWM resolution, so nothing changes on the wire
+        self.assertEqual(self.mc._write_outputs(0.5 + 1e-5, 0.5), 0)
+        self.assertEqual(self.mc._write_outputs(0.5, -0.5), 2)
+        self.assertEqual(self.mc.motor_kit.motor3.throttle, quantize_throttle(-0.5))
+        self.assertEqual(self.mc.stats()['i2c_writes'], 6)
+
+    def test_stop_bypasses_ramp(self):
+        """Test stop zeroes the outputs and writes the motors straight away"""
+        self.mc.update_task.cancel()
+        self.mc.motor_kit = MagicMock()
+        self.mc.set_speeds(1.0, 1.0)
+        self.mc._tick(0.5)
+        self.assertGreater(self.mc.left_output, 0.0)
+        self.mc.stop()
+        self.assertEqual((self.mc.left_output, self.mc.right_output), (0.0, 0.0))
+        self.assertEqual(self.mc.motor_kit.motor1.throttle, quantize_throttle(0.0))
+        self.assertEqual(self.mc.motor_kit.motor4.throttle, quantize_throttle(0.0))
+
+    def test_batched_motor_writes(self):
+        """Test both sides' throttles reach the Motor HAT in one I2C transaction per tick"""
+        self.mc.update_task.cancel()
+        bus = SimI2C()
+        bus.attach(0x60, SimPCA9685(frequency=1600, auto_increment=True))
+        self.mc.motor_kit = MagicMock()
+        self.mc.motor_pwm = PCA9685(bus, address=0x60)
+        self.mc._write_outputs(0.0, 0.0)
+        bus.reset_counts()
+        self.assertEqual(self.mc._write_outputs(0.5, -0.5), 1)
+        self.assertEqual(bus.transactions, 1)
+        self.assertEqual(self.mc._write_outputs(0.5, -0.5), 0)
+        # Nothing went through the kit's per-channel writes
+        self.assertIsInstance(self.mc.motor_kit.motor1.throttle, MagicMock)
+
+    def test_servo_moves_smoothly(self):
+        """Test a head command ramps the servo pulse over several ticks instead of jumping"""
+        self.mc.update_task.cancel()
+        bus = SimI2C()
+        chip = SimPCA9685(frequency=50)
+        bus.attach(0x40, chip)
+        self.mc.servo_kit = MagicMock()
+        self.mc.servo_channels = MotorModule._build_servo_channels(
+            {'head_pan': {'channel': 14, 'min_pulse': 500, 'max_pulse': 2500}})
+        self.mc.servo_pwm = PCA9685(bus, address=0x40)
+        self.mc.move_head(pan=1.0)
+        self.mc._servo_tick(0.02)
+        first = chip.channel(14)[1]
+        for _ in range(100):
+            self.mc._servo_tick(0.02)
+        final = chip.channel(14)[1]
+        self.assertLess(first, final * 0.7)
+        self.assertAlmostEqual(final, 2500 / 20000 * 4096, delta=2)
+        self.assertEqual(self.mc.snapshot()['servo_positions']['head_pan'], 1.0)
+
+    def test_servo_channel_mapping(self):
+        """Test precomputed servo pulses match the configured pulse ranges"""
+        arm = ServoChannel.from_config('left_arm', {'channel': 0, 'min_pulse': 800, 'max_pulse': 2500})
+        self.assertEqual(arm.pulse(0.0), 800)
+        self.assertEqual(arm.pulse(0.5), 1650)
+        self.assertEqual(arm.pulse(1.0), 2500)
+        self.assertAlmostEqual(arm.angle(1650), 90.0)
+        tilt = ServoChannel.from_config('head_tilt', {'min_pulse': 1000, 'center_pulse': 1500, 'max_pulse': 1800})
+        self.assertEqual(tilt.channel, 15)
+        self.assertEqual(tilt.pulse(-1.0), 1000)
+        self.assertEqual(tilt.pulse(0.0), 1500)
+        self.assertEqual(tilt.pulse(0.5), 1650)
+        self.assertEqual(ServoChannel.from_config('head_pan', None).pulse(0.0), 1500)
+
 if __name__ == '__main__':
     unittest.main()
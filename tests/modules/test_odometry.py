@@ -0,0 +1,113 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import math
+import unittest
+
+from src.modules.calibration import MotorCalibration
+from src.modules.odometry import PoseEstimator, TrajectoryHistory, integrate_pose
+
+
+class StubMotors:
+    def __init__(self):
+        self.left_output = 0.0
+        self.right_output = 0.0
+        self.motor_kit = object()
+        self.motor_calibration = MotorCalibration.from_fits({})
+
+
+class TestOdometry(unittest.TestCase):
+    def setUp(self):
+        """Set up a pose estimator stepped by hand"""
+        self.motors = StubMotors()
+        self.poses = []
+        self.estimator = PoseEstimator(self.motors, on_pose=self.poses.append)
+        self.estimator._task.cancel()
+        self.estimator.track_width = 0.2
+        self.estimator.wheel_diameter = 1 / math.pi  # one meter per wheel revolution
+        self.estimator.max_wheel_rps = 1.0
+
+    def tearDown(self):
+        self.estimator.cleanup()
+
+    def test_integrate_straight_and_turn(self):
+        """Test straight driving, turning in place and a full circle"""
+        self.assertEqual(integrate_pose(0, 0, 0, 1.0, 1.0, 0.2, 2.0), (2.0, 0.0, 0.0))
+        x, y, heading = integrate_pose(0, 0, 0, -0.1, 0.1, 0.2, math.pi / 2)
+        self.assertAlmostEqual(x, 0.0)
+        self.assertAlmostEqual(y, 0.0)
+        self.assertAlmostEqual(heading, math.pi / 2)
+        # Left wheel on a 0.1 m radius, right on 0.3 m: the center drives a 0.2 m circle to the left
+        x, y, heading = integrate_pose(0, 0, 0, 0.1, 0.3, 0.2, 0.5 * math.pi)
+        self.assertAlmostEqual(x, 0.2)
+        self.assertAlmostEqual(y, 0.2)
+        self.assertAlmostEqual(heading, math.pi / 2)
+
+    def test_commanded_outputs_use_calibrated_top_speed(self):
+        """Test motor outputs are scaled by the calibrated top wheel speed, or max_wheel_rps without one"""
+        self.motors.left_output = self.motors.right_output = 0.5
+        for _ in range(50):
+            self.estimator._tick(0.02)
+        self.assertAlmostEqual(self.estimator.x, 0.5)
+        self.motors.motor_calibration = MotorCalibration.from_fits({
+            'left': {'deadband': 0.1, 'gain': 2.0}, 'right': {'deadband': 0.1, 'gain': 3.0}})
+        self.assertEqual(self.estimator.wheel_velocities(), (0.9, 0.9))
+
+    def test_no_motor_hat_does_not_move(self):
+        """Test commanded outputs aren't integrated when there is no motor HAT to drive the wheels"""
+        self.motors.motor_kit = None
+        self.motors.left_output = self.motors.right_output = 0.5
+        for _ in range(50):
+            self.estimator._tick(0.02)
+        self.assertEqual(self.estimator.x, 0.0)
+        self.estimator.wheel_speeds = lambda: (0.5, 0.5)
+        self.estimator._tick(0.02)
+        self.assertGreater(self.estimator.x, 0.0)
+
+    def test_measured_speeds_and_throttled_publish(self):
+        """Test measured wheel speeds are integrated and the pose is published at most once per interval"""
+        self.estimator.wheel_speeds = lambda: (-0.1, 0.1)
+        for _ in range(25):
+            self.estimator._tick(0.02 * math.pi)
+        self.assertAlmostEqual(self.estimator.heading, math.pi / 2)
+        self.assertEqual(len(self.poses), 1)
+        self.estimator._published_at = 0.0
+        self.estimator._tick(0.0)
+        self.assertEqual(self.poses[-1]['rotation'], 90.0)
+        self.assertEqual(self.poses[-1]['position'], {'x': 0.0, 'y': 0.0, 'z': 0.0})
+
+    def test_history_since(self):
+        """Test the history is read incrementally and reports samples lost to wrapping"""
+        history = TrajectoryHistory(capacity=4)
+        for i in range(3):
+            history.append(float(i), i * 0.1, 0.0, 0.0)
+        first = history.since(0)
+        self.assertEqual([p[1] for p in first['points']], [0.0, 0.1, 0.2])
+        self.assertEqual(first['seq'], 3)
+        self.assertEqual(history.since(first['seq'])['points'], [])
+        for i in range(3, 9):
+            history.append(float(i), i * 0.1, 0.0, 0.0)
+        wrapped = history.since(first['seq'], limit=2)
+        self.assertTrue(wrapped['dropped'])
+        self.assertEqual(wrapped['first'], 6)
+        self.assertEqual(wrapped['seq'], 7)
+        self.assertEqual(len(history), 4)
+        history.clear()
+        self.assertEqual(history.since(0)['points'], [])
+        self.assertEqual(len(history), 0)
+
+    def test_reset_clears_history(self):
+        """Test resetting sets the pose and starts a new trajectory"""
+        self.estimator.integrate(1.0, 1.0, 1.0)
+        self.estimator._publish()
+        self.estimator.reset(1.0, 2.0, 90.0)
+        self.assertEqual(self.estimator.pose(), {'position': {'x': 1.0, 'y': 2.0, 'z': 0.0}, 'rotation': 90.0})
+        trajectory = self.estimator.trajectory()
+        self.assertEqual(len(trajectory['points']), 1)
+        self.assertEqual(trajectory['points'][0][1:], [1.0, 2.0, 90.0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import unittest
+
+from src.modules.pwm import PCA9685, DC_MOTOR_CHANNELS, MODE1, MODE1_AUTO_INCREMENT, stage_throttle
+from src.simulation.i2c import SimI2C, SimPCA9685
+
+class TestPCA9685(unittest.TestCase):
+    def setUp(self):
+        """Set up a driver on a simulated chip"""
+        self.bus = SimI2C()
+        self.chip = SimPCA9685(frequency=50)
+        self.bus.attach(0x40, self.chip)
+        self.pwm = PCA9685(self.bus, address=0x40)
+        self.bus.reset_counts()
+
+    def test_enables_auto_increment(self):
+        """Test block writes are enabled on a chip that had auto-increment off"""
+        self.assertTrue(self.chip.registers[MODE1] & MODE1_AUTO_INCREMENT)
+        self.assertAlmostEqual(self.pwm.frequency, 50, delta=0.5)
+
+    def test_adjacent_channels_one_write(self):
+        """Test adjacent channels go out in a single transaction"""
+        self.pwm.set_duty_cycle(14, 0x8000)
+        self.pwm.set_duty_cycle(15, 0xFFFF)
+        self.assertEqual(self.pwm.flush(), 1)
+        self.assertEqual(self.bus.transactions, 1)
+        self.assertEqual(self.bus.bytes_written, 1 + 2 * 4)
+        self.assertEqual(self.chip.duty_cycle(14), 0x8000)
+        self.assertEqual(self.chip.duty_cycle(15), 0xFFFF)
+
+    def test_unchanged_channels_skipped(self):
+        """Test flushing values the chip already holds sends nothing"""
+        self.pwm.set_duty_cycle(3, 0x1000)
+        self.pwm.flush()
+        self.pwm.set_duty_cycle(3, 0x1000)
+        self.assertEqual(self.pwm.flush(), 0)
+        self.assertEqual(self.bus.transactions, 1)
+
+    def test_runs_and_bridging(self):
+        """Test distant channels are separate writes and short known gaps are bridged"""
+        self.pwm.set_duty_cycle(0, 0x1000)
+        self.pwm.set_duty_cycle(8, 0x1000)
+        self.assertEqual(self.pwm.flush(), 2)
+        for ch in range(0, 4):
+            self.pwm.set_duty_cycle(ch, 0x2000)
+        self.pwm.flush()
+        # Channels 4 and 5 are unknown, so 3 and 6 can't be merged yet
+        self.pwm.set_duty_cycle(3, 0x3000)
+        self.pwm.set_duty_cycle(6, 0x3000)
+        self.assertEqual(self.pwm.flush(), 2)
+        self.pwm.set_duty_cycle(4, 0)
+        self.pwm.set_duty_cycle(5, 0)
+        self.pwm.flush()
+        self.pwm.set_duty_cycle(3, 0x4000)
+        self.pwm.set_duty_cycle(6, 0x4000)
+        self.assertEqual(self.pwm.flush(), 1)
+        self.assertEqual(self.chip.duty_cycle(4), 0)
+        self.assertEqual(self.chip.duty_cycle(6), 0x4000)
+
+    def test_pulse_width(self):
+        """Test a servo pulse maps to the chip's 12-bit counts at its frequency"""
+        self.pwm.set_pulse_width(0, 1500)
+        self.pwm.flush()
+        on, off = self.chip.channel(0)
+        self.assertEqual(on, 0)
+        self.assertAlmostEqual(off, 1500 / (1_000_000 / self.pwm.frequency) * 4096, delta=1)
+
+    def test_motor_hat_tick_is_one_transaction(self):
+        """Test all four DC motors change in one write per tick, versus eight per-channel writes"""
+        bus = SimI2C()
+        chip = SimPCA9685(frequency=1600, auto_increment=True)
+        bus.attach(0x60, chip)
+        pwm = PCA9685(bus, address=0x60)
+        for motor in DC_MOTOR_CHANNELS:
+            stage_throttle(pwm, motor, 0)
+        pwm.flush()
+        bus.reset_counts()
+        for motor, throttle in ((1, 0.5), (2, 0.5), (3, -0.25), (4, -0.25)):
+            stage_throttle(pwm, motor, throttle)
+        self.assertEqual(pwm.flush(), 1)
+        self.assertEqual(bus.transactions, 1)
+        speed, positive, negative = DC_MOTOR_CHANNELS[3]
+        self.assertEqual(chip.duty_cycle(speed), 0xFFFF)
+        self.assertEqual(chip.duty_cycle(positive), 0)
+        self.assertEqual(chip.duty_cycle(negative), (int(0xFFFF * 0.25) + 1) >> 4 << 4)
+
+if __name__ == '__main__':
+    unittest.main()
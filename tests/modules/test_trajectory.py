@@ -0,0 +1,95 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import unittest
+
+from src.modules.trajectory import ServoMotion, ServoTrajectory
+
+DT = 0.02
+
+def run(trajectory, limit=1000):
+    """Step until the trajectory stops; returns (seconds, peak velocity, peak acceleration)"""
+    steps = peak_v = peak_a = 0
+    while trajectory.moving and steps < limit:
+        trajectory.step(DT)
+        steps += 1
+        peak_v = max(peak_v, abs(trajectory.velocity))
+        peak_a = max(peak_a, abs(trajectory.acceleration))
+    return steps * DT, peak_v, peak_a
+
+class TestServoTrajectory(unittest.TestCase):
+    def test_trapezoidal_respects_limits(self):
+        """Test a trapezoidal move arrives without exceeding its limits"""
+        trajectory = ServoTrajectory(0.0, max_velocity=2.0, max_acceleration=8.0)
+        trajectory.set_target(1.0)
+        seconds, peak_v, peak_a = run(trajectory)
+        self.assertEqual(trajectory.position, 1.0)
+        self.assertLessEqual(peak_v, 2.0 + 1e-9)
+        self.assertLessEqual(peak_a, 8.0 + 1e-9)
+        # 0.25s ramp up and down plus 0.25s cruise, give or take a tick
+        self.assertAlmostEqual(seconds, 0.75, delta=0.1)
+
+    def test_min_jerk_respects_limits(self):
+        """Test a minimum-jerk move arrives without exceeding its limits"""
+        trajectory = ServoTrajectory(0.0, max_velocity=2.0, max_acceleration=8.0, profile='min_jerk')
+        trajectory.set_target(1.0)
+        seconds, peak_v, peak_a = run(trajectory)
+        self.assertEqual(trajectory.position, 1.0)
+        self.assertLessEqual(peak_v, 2.0 + 1e-3)
+        self.assertLessEqual(peak_a, 8.0 + 1e-3)
+
+    def test_duration(self):
+        """Test a timed move takes about the requested time with either profile"""
+        for profile in ('trapezoidal', 'min_jerk'):
+            trajectory = ServoTrajectory(0.0, profile=profile)
+            trajectory.set_target(0.5, duration=1.0)
+            seconds, _, _ = run(trajectory)
+            self.assertAlmostEqual(seconds, 1.0, delta=0.1, msg=profile)
+
+    def test_retarget_blends(self):
+        """Test a new target mid-motion keeps position and velocity continuous"""
+        for profile in ('trapezoidal', 'min_jerk'):
+            trajectory = ServoTrajectory(0.0, max_velocity=2.0, max_acceleration=8.0, profile=profile)
+            trajectory.set_target(1.0)
+            for _ in range(10):
+                trajectory.step(DT)
+            position, velocity = trajectory.position, trajectory.velocity
+            trajectory.set_target(-1.0)
+            trajectory.step(DT)
+            self.assertLessEqual(abs(trajectory.position - position), 2.0 * DT + 1e-6, msg=profile)
+            self.assertLessEqual(abs(trajectory.velocity - velocity), 8.0 * DT + 1e-3, msg=profile)
+            run(trajectory)
+            self.assertEqual(trajectory.position, -1.0)
+
+    def test_target_clamped(self):
+        """Test targets outside the servo's range are clamped"""
+        trajectory = ServoTrajectory(0.0, lower=0.0, upper=1.0)
+        trajectory.set_target(3.0)
+        run(trajectory)
+        self.assertEqual(trajectory.position, 1.0)
+
+class TestServoMotion(unittest.TestCase):
+    def setUp(self):
+        """Set up head and arm trajectories"""
+        self.motion = ServoMotion({
+            'head_pan': ServoTrajectory(0.0),
+            'right_arm': ServoTrajectory(0.0, lower=0.0, upper=1.0),
+        })
+
+    def test_timed_targets(self):
+        """Test a target with a duration is reached at the duration, not as fast as the limits allow"""
+        self.motion.set_target('head_pan', 0.1, 0.6)
+        seconds = run(self.motion.trajectories['head_pan'])[0]
+        self.assertAlmostEqual(seconds, 0.6, delta=2 * DT)
+        self.assertEqual(self.motion.positions()['head_pan'], 0.1)
+
+    def test_step_reports_only_moving_servos(self):
+        """Test step returns just the servos that moved"""
+        self.motion.set_target('right_arm', 1.0)
+        self.assertEqual(set(self.motion.step(DT)), {'right_arm'})
+
+if __name__ == '__main__':
+    unittest.main()
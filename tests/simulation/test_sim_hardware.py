@@ -0,0 +1,95 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import time
+import unittest
+
+from src.simulation import hardware as sim
+
+class TestSimHardware(unittest.TestCase):
+    def setUp(self):
+        """Set up fresh simulated hardware with an instant bus"""
+        self.previous = sim._current
+        self.hw = sim._current = sim.SimHardware(sim.LatencyModel().scaled(0))
+
+    def tearDown(self):
+        sim._current = self.previous
+
+    def test_motor_throttle(self):
+        """Test a throttle change writes both direction channels like adafruit_motor and is logged"""
+        kit = sim.SimMotorKit()
+        self.hw.i2c.reset_counts()
+        self.hw.log.clear()
+        kit.motor3.throttle = -0.5
+        speed, positive, negative = sim.DC_MOTOR_CHANNELS[3]
+        self.assertEqual(self.hw.motor_chip.duty_cycle(speed), 0xFFFF)
+        self.assertEqual(self.hw.motor_chip.duty_cycle(positive), 0)
+        self.assertEqual(self.hw.motor_chip.duty_cycle(negative), (0xFFFF // 2 + 1) >> 4 << 4)
+        self.assertEqual(self.hw.i2c.transactions, 2)
+        commands = self.hw.log.entries(device='motor_kit')
+        self.assertEqual([(c.command, c.value) for c in commands], [('motor3.throttle', -0.5)])
+        with self.assertRaises(ValueError):
+            kit.motor1.throttle = 1.5
+
+    def test_servo_angle(self):
+        """Test a servo angle maps to the configured pulse range at 50 Hz"""
+        kit = sim.SimServoKit(channels=16)
+        kit.servo[14].set_pulse_width_range(500, 2500)
+        kit.servo[14].angle = 90
+        on, off = self.hw.servo_chip.channel(14)
+        self.assertAlmostEqual(off, 1500 / 20000 * 4096, delta=2)
+        self.assertEqual(kit.servo[14].angle, 90)
+
+    def test_latency_model(self):
+        """Test each I2C transaction takes the modelled bus time"""
+        self.hw = sim._current = sim.SimHardware(sim.LatencyModel(i2c_transaction=0.002, i2c_byte=0.0))
+        kit = sim.SimMotorKit()
+        start = time.perf_counter()
+        kit.motor1.throttle = 0.3
+        self.assertGreaterEqual(time.perf_counter() - start, 0.004)
+        writes = self.hw.log.entries(device='i2c 0x60', since=start)
+        self.assertEqual(len(writes), 2)
+        self.assertGreaterEqual(writes[1].timestamp - writes[0].timestamp, 0.002)
+
+    def test_unicornhat(self):
+        """Test pixels reach the matrix only when shown"""
+        hat = self.hw.unicornhat
+        hat.set_pixel(1, 2, 255, 0, 0)
+        self.assertEqual(hat.shown[2][1], (0, 0, 0))
+        hat.show()
+        self.assertEqual(hat.shown[2][1], (255, 0, 0))
+        self.assertEqual(hat.refreshes, 1)
+        self.assertEqual(hat.get_shape(), (8, 4))
+
+    def test_install(self):
+        """Test install provides the hardware modules and marks the hardware present"""
+        # install() marks the hardware present in utils.hardware, as imported by the modules
+        import utils.hardware as detected
+        saved_modules = {name: sys.modules.get(name) for name in ('board', 'adafruit_motorkit', 'adafruit_servokit', 'unicornhat')}
+        saved_flags = {name: detected.__dict__.get(name) for name in ('MOTORS_AVAILABLE', 'SERVOS_AVAILABLE', 'LED_AVAILABLE')}
+        try:
+            installed = sim.install()
+            import board
+            from adafruit_motorkit import MotorKit
+            self.assertIs(board.I2C(), installed.i2c)
+            MotorKit(i2c=board.I2C()).motor1.throttle = 1.0
+            self.assertEqual(installed.motor_chip.duty_cycle(9), 0xFFFF)
+            self.assertTrue(detected.MOTORS_AVAILABLE)
+        finally:
+            for name, module in saved_modules.items():
+                if module is None:
+                    sys.modules.pop(name, None)
+                else:
+                    sys.modules[name] = module
+            flags = detected.__dict__
+            for name, value in saved_flags.items():
+                if value is None:
+                    flags.pop(name, None)
+                else:
+                    flags[name] = value
+
+if __name__ == '__main__':
+    unittest.main()
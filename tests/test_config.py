@@ -0,0 +1,135 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import unittest
+import tempfile
+import shutil
+import time
+
+from src.config import Config
+
+class TestConfig(unittest.TestCase):
+    def setUp(self):
+        """Set up a config backed by a temporary YAML file"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'config.yaml')
+        self._write("lights:\n  update_rate: 30\n  width: 8\njoystick:\n  deadzone: 0.1\n")
+        self.config = Config(self.path)
+        self.changes = []
+
+    def tearDown(self):
+        self.config.stop_watching()
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, text):
+        with open(self.path, 'w') as f:
+            f.write(text)
+
+    def test_shared_instance(self):
+        """Test that the shared config is parsed once and reused"""
+        self.assertIs(Config.shared(), Config.shared())
+
+    def test_update_notifies_changed_sections(self):
+        """Test that subscribers only hear about their own section, with the changed keys"""
+        self.config.subscribe('lights', self.changes.append)
+        joystick_changes = []
+        self.config.subscribe('joystick', joystick_changes.append)
+
+        self.config.update_from_dict({'lights': {'update_rate': 60}})
+        [change] = self.changes
+        self.assertEqual(change.section, 'lights')
+        self.assertEqual(change.changed_keys, ('update_rate',))
+        self.assertEqual(change.old['update_rate'], 30)
+        self.assertEqual(change.new, {'update_rate': 60, 'width': 8})
+        self.assertEqual(change.source, 'update')
+        self.assertEqual(joystick_changes, [])
+
+        # Re-applying the same values is not a change
+        self.config.update_from_dict({'lights': {'update_rate': 60}})
+        self.assertEqual(len(self.changes), 1)
+
+    def test_snapshots_are_not_modified(self):
+        """Test that updates swap in a new dict instead of editing the old one"""
+        before = self.config.snapshot()
+        self.config.update_from_dict({'lights': {'width': 16}})
+        self.assertEqual(before['lights']['width'], 8)
+        self.assertEqual(self.config.get('lights', 'width'), 16)
+
+    def test_unsubscribe(self):
+        """Test that an unsubscribed callback is no longer called"""
+        unsubscribe = self.config.subscribe('lights', self.changes.append)
+        unsubscribe()
+        self.config.update_from_dict({'lights': {'width': 16}})
+        self.assertEqual(self.changes, [])
+
+    def test_failing_subscriber_does_not_block_others(self):
+        """Test that one broken handler doesn't stop the rest from applying"""
+        def broken(change):
+            raise ValueError("bad value")
+        self.config.subscribe('lights', broken)
+        self.config.subscribe('lights', self.changes.append)
+        self.config.update_from_dict({'lights': {'width': 16}})
+        self.assertEqual(len(self.changes), 1)
+
+    def test_file_watcher_reloads(self):
+        """Test that editing the file on disk is picked up by the watcher"""
+        self.config.subscribe('joystick', self.changes.append)
+        self.config.start_watching(interval=0.01)
+        # Ensure the new mtime differs even on coarse-grained filesystems
+        self._write("lights:\n  update_rate: 30\n  width: 8\njoystick:\n  deadzone: 0.25\n")
+        os.utime(self.path, (time.time() + 5, time.time() + 5))
+        deadline = time.monotonic() + 2
+        while not self.changes and time.monotonic() < deadline:
+            time.sleep(0.01)
+        [change] = self.changes
+        self.assertEqual(change.source, 'file')
+        self.assertEqual(change.new['deadzone'], 0.25)
+
+    def test_save_is_not_reloaded(self):
+        """Test that the watcher ignores the config's own writes"""
+        self.config.update_from_dict({'lights': {'width': 16}})
+        self.config.save()
+        self.assertFalse(self.config._file_changed())
+
+class TestLiveApply(unittest.TestCase):
+    def setUp(self):
+        """Set up a drive controller on a temporary shared config"""
+        from config import Config as SharedConfig
+        from controller.drive_controller import DriveController
+        self.tmpdir = tempfile.mkdtemp()
+        path = os.path.join(self.tmpdir, 'config.yaml')
+        with open(path, 'w') as f:
+            f.write("joystick:\n  deadzone: 0.1\n  head_control:\n    mode: absolute\n    update_rate: 30\n")
+        self.saved_shared = SharedConfig._shared
+        self.config = SharedConfig._shared = SharedConfig(path)
+
+        class NullMotors:
+            def stop(self):
+                pass
+        self.drive = DriveController(NullMotors())
+
+    def tearDown(self):
+        from config import Config as SharedConfig
+        self.drive.cleanup()
+        SharedConfig._shared = self.saved_shared
+        shutil.rmtree(self.tmpdir)
+
+    def test_joystick_changes_apply_without_rebuild(self):
+        """Test that deadzone and head control edits reach the running controller"""
+        self.config.update_from_dict({'joystick': {'deadzone': 0.25, 'head_control': {'update_rate': 10}}})
+        self.assertEqual(self.drive.deadzone, 0.25)
+        self.assertEqual(self.drive.head_control['mode'], 'absolute')
+        self.assertAlmostEqual(self.drive._head_task.period, 0.1)
+
+    def test_cleanup_unsubscribes(self):
+        """Test that a cleaned-up controller no longer receives changes"""
+        self.drive.cleanup()
+        self.drive.cleanup = lambda: None
+        self.config.update_from_dict({'joystick': {'deadzone': 0.3}})
+        self.assertEqual(self.drive.deadzone, 0.1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import asyncio
+import threading
+import time
+import unittest
+from dataclasses import dataclass
+from typing import ClassVar
+
+from src.utils.event_bus import DropPolicy, Event, EventBus, Executor, Priority
+
+@dataclass(frozen=True)
+class Ping(Event):
+    n: int
+
+@dataclass(frozen=True)
+class LoudPing(Ping):
+    priority: ClassVar[Priority] = Priority.HIGH
+
+class TestEventBus(unittest.TestCase):
+    def setUp(self):
+        """Set up a private bus and a gate that holds thread subscribers"""
+        self.bus = EventBus()
+        self.gate = threading.Event()
+        self.received = []
+        self.done = threading.Event()
+
+    def tearDown(self):
+        self.gate.set()
+        for subscription in self.bus.subscriptions():
+            subscription.cancel()
+
+    def gated(self, expected):
+        """Handler that waits for the gate, then records events until ``expected`` arrive"""
+        def handler(event):
+            self.gate.wait(1)
+            self.received.append(event.n)
+            if len(self.received) >= expected:
+                self.done.set()
+        return handler
+
+    def test_inline_runs_on_publisher_thread(self):
+        """Test that inline handlers run synchronously, including for subclasses"""
+        threads = []
+        self.bus.subscribe(Ping, lambda e: threads.append((e.n, threading.current_thread())), executor=Executor.INLINE)
+        self.bus.publish(Ping(1))
+        self.bus.publish(LoudPing(2))
+        self.assertEqual([n for n, _ in threads], [1, 2])
+        self.assertTrue(all(t is threading.current_thread() for _, t in threads))
+
+    def test_slow_subscriber_does_not_block_publisher(self):
+        """Test that publishing to a stalled thread subscriber returns immediately and drops its oldest"""
+        subscription = self.bus.subscribe(Ping, self.gated(5), queue_size=4)
+        self.bus.publish(Ping(0))
+        time.sleep(0.02)
+        start = time.perf_counter()
+        for n in range(1, 10):
+            self.bus.publish(Ping(n))
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.gate.set()
+        self.assertTrue(self.done.wait(1))
+        # Event 0 was already being handled; 1-5 were pushed out by 6-9
+        self.assertEqual(self.received, [0, 6, 7, 8, 9])
+        self.assertEqual(subscription.stats()['dropped'], 5)
+
+    def test_drop_newest(self):
+        """Test that DROP_NEWEST keeps what was already queued"""
+        self.bus.subscribe(Ping, self.gated(3), queue_size=2, drop=DropPolicy.DROP_NEWEST)
+        for n in range(6):
+            self.bus.publish(Ping(n))
+            time.sleep(0.01)
+        self.gate.set()
+        self.assertTrue(self.done.wait(1))
+        self.assertEqual(self.received, [0, 1, 2])
+
+    def test_latest_keeps_only_newest(self):
+        """Test that LATEST coalesces a backlog to the newest event"""
+        self.bus.subscribe(Ping, self.gated(2), drop=DropPolicy.LATEST)
+        for n in range(6):
+            self.bus.publish(Ping(n))
+            time.sleep(0.01)
+        self.gate.set()
+        self.assertTrue(self.done.wait(1))
+        self.assertEqual(self.received, [0, 5])
+
+    def test_high_priority_lane_drained_first(self):
+        """Test that queued HIGH events are handled before queued NORMAL ones"""
+        self.bus.subscribe(Ping, self.gated(4))
+        self.bus.publish(Ping(0))
+        time.sleep(0.02)
+        self.bus.publish(Ping(1))
+        self.bus.publish(LoudPing(2))
+        self.bus.publish(Ping(3), priority=Priority.HIGH)
+        self.gate.set()
+        self.assertTrue(self.done.wait(1))
+        self.assertEqual(self.received, [0, 2, 3, 1])
+
+    def test_asyncio_executor(self):
+        """Test that asyncio subscribers are called on the loop, awaiting coroutine handlers"""
+        async def run():
+            loop = asyncio.get_running_loop()
+            got = asyncio.Queue()
+
+            async def handler(event):
+                got.put_nowait((event.n, threading.current_thread()))
+            self.bus.subscribe(Ping, handler, executor=Executor.ASYNCIO)
+            threading.Thread(target=lambda: self.bus.publish(Ping(7))).start()
+            return await asyncio.wait_for(got.get(), 1), threading.current_thread()
+        (n, thread), loop_thread = asyncio.run(run())
+        self.assertEqual(n, 7)
+        self.assertIs(thread, loop_thread)
+
+    def test_cancel_and_errors(self):
+        """Test that handler errors are counted and cancelled subscriptions get nothing"""
+        def broken(event):
+            raise ValueError("boom")
+        failing = self.bus.subscribe(Ping, broken, executor=Executor.INLINE)
+        self.bus.publish(Ping(1))
+        self.assertEqual(failing.stats()['errors'], 1)
+        failing.cancel()
+        self.bus.publish(Ping(2))
+        self.assertEqual(failing.stats()['errors'], 1)
+        self.assertEqual(self.bus.stats(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+from src.utils import hardware
+
+I2CDETECT_OUTPUT = """     0  1  2  3  4  5  6  7  8  9  a  b  c  d  e  f
+00:                         -- -- -- -- -- -- -- --
+10: -- -- -- -- -- -- -- -- -- -- -- -- -- -- -- --
+20: -- -- -- -- -- -- -- -- -- -- -- -- -- -- -- --
+30: -- -- -- -- -- -- -- -- -- -- -- -- -- -- -- --
+40: 40 -- -- -- -- -- -- -- -- -- -- -- -- -- -- --
+50: -- -- -- -- -- -- -- -- -- -- -- -- -- -- -- --
+60: -- -- -- -- -- -- -- -- -- -- -- -- -- -- -- --
+70: 70 -- -- -- -- -- -- UU
+"""
+
+class TestI2cProbe(unittest.TestCase):
+    def setUp(self):
+        """Set up a temporary probe cache and a fake Raspberry Pi with i2cdetect"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.tmpdir, 'hardware_probe.json')
+        hardware._i2c_addresses = None
+        self.run = MagicMock(return_value=MagicMock(stdout=I2CDETECT_OUTPUT))
+        patches = [
+            patch.object(hardware, 'is_raspberry_pi', return_value=True),
+            patch.object(hardware, '_probe_cache_settings', return_value=(self.cache_path, 60.0)),
+            patch.object(hardware.subprocess, 'run', self.run),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def tearDown(self):
+        hardware._i2c_addresses = None
+        shutil.rmtree(self.tmpdir)
+
+    def test_parse_i2cdetect(self):
+        """Test that responding and driver-bound addresses are found, not row labels"""
+        self.assertEqual(hardware.parse_i2cdetect(I2CDETECT_OUTPUT), {0x40, 0x70, 0x77})
+
+    def test_bus_scanned_once_per_process(self):
+        """Test that repeated device checks share a single i2cdetect scan"""
+        self.assertTrue(hardware.check_i2c_device(0x40))
+        self.assertTrue(hardware.check_i2c_device(0x70))
+        self.assertFalse(hardware.check_i2c_device(0x41))
+        self.assertEqual(self.run.call_count, 1)
+
+    def test_scan_persisted_and_reused_until_ttl(self):
+        """Test that a later start reuses the saved scan until it expires"""
+        hardware.scan_i2c_bus()
+        with open(self.cache_path) as f:
+            self.assertEqual(json.load(f)['addresses'], [0x40, 0x70, 0x77])
+
+        hardware._i2c_addresses = None
+        self.assertEqual(hardware.scan_i2c_bus(), {0x40, 0x70, 0x77})
+        self.assertEqual(self.run.call_count, 1)
+
+        expired = time.time() - 120
+        with open(self.cache_path) as f:
+            cached = json.load(f)
+        cached['timestamp'] = expired
+        with open(self.cache_path, 'w') as f:
+            json.dump(cached, f)
+        hardware._i2c_addresses = None
+        hardware.scan_i2c_bus()
+        self.assertEqual(self.run.call_count, 2)
+
+    def test_failed_scan_not_persisted(self):
+        """Test that an i2cdetect failure is not cached for later starts"""
+        self.run.side_effect = FileNotFoundError('i2cdetect')
+        self.assertEqual(hardware.scan_i2c_bus(), frozenset())
+        self.assertFalse(os.path.exists(self.cache_path))
+
+if __name__ == '__main__':
+    unittest.main()
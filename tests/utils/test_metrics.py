@@ -0,0 +1,56 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import unittest
+
+from src.utils.metrics import MetricsRegistry
+
+class TestMetricsRegistry(unittest.TestCase):
+    def setUp(self):
+        """Set up an empty registry"""
+        self.registry = MetricsRegistry()
+
+    def test_histogram_buckets_and_quantile(self):
+        """Test that observations land in cumulative buckets"""
+        histogram = self.registry.histogram('robbie_test_seconds', 'Test latency', buckets=(0.01, 0.1, 1.0))
+        for value in (0.005, 0.05, 0.05, 0.5, 5.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.count, 5)
+        self.assertAlmostEqual(histogram.sum, 5.605)
+        self.assertEqual(histogram.quantile(0.5), 0.1)
+        self.assertEqual(histogram.quantile(1.0), float('inf'))
+
+        text = self.registry.render()
+        self.assertIn('# TYPE robbie_test_seconds histogram', text)
+        self.assertIn('robbie_test_seconds_bucket{le="0.01"} 1', text)
+        self.assertIn('robbie_test_seconds_bucket{le="0.1"} 3', text)
+        self.assertIn('robbie_test_seconds_bucket{le="+Inf"} 5', text)
+        self.assertIn('robbie_test_seconds_count 5', text)
+
+    def test_timer_observes_block(self):
+        """Test that the timer context manager records one observation"""
+        histogram = self.registry.histogram('robbie_block_seconds')
+        with histogram.time():
+            pass
+        self.assertEqual(histogram.count, 1)
+        self.assertIsNone(self.registry.histogram('robbie_empty_seconds').quantile(0.5))
+
+    def test_get_or_create(self):
+        """Test that metrics are shared by name and types can't be mixed"""
+        counter = self.registry.counter('robbie_events_total', 'Events')
+        counter.inc()
+        self.registry.counter('robbie_events_total').inc(2)
+        self.assertEqual(counter.value, 3)
+        with self.assertRaises(ValueError):
+            self.registry.gauge('robbie_events_total')
+
+        gauge = self.registry.gauge('robbie_clients')
+        gauge.set(4)
+        gauge.dec()
+        self.assertIn('robbie_clients 3', self.registry.render())
+
+if __name__ == '__main__':
+    unittest.main()
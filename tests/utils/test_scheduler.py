@@ -0,0 +1,119 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import threading
+import time
+import unittest
+
+from src.utils.scheduler import Scheduler
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        """Set up a private scheduler"""
+        self.scheduler = Scheduler()
+
+    def tearDown(self):
+        for task in self.scheduler.tasks():
+            task.cancel()
+
+    def test_runs_at_rate(self):
+        """Test a task runs close to its rate and is passed the time between runs"""
+        dts = []
+        self.scheduler.every(100, dts.append, name='fast', group='test-rate')
+        time.sleep(0.3)
+        self.assertGreaterEqual(len(dts), 20)
+        self.assertLessEqual(len(dts), 35)
+        self.assertAlmostEqual(sum(dts[1:]) / len(dts[1:]), 0.01, delta=0.005)
+
+    def test_overrun_skips_missed_cycles(self):
+        """Test a slow run counts the deadlines it missed instead of bursting to catch up"""
+        runs = []
+
+        def tick(dt):
+            runs.append(time.perf_counter())
+            if len(runs) == 3:
+                time.sleep(0.055)
+
+        task = self.scheduler.every(100, tick, name='slow', group='test-overrun')
+        time.sleep(0.2)
+        stats = task.stats()
+        self.assertGreaterEqual(stats['missed'], 4)
+        self.assertEqual(stats['overruns'], 1)
+        # No back-to-back runs after the stall
+        gaps = [b - a for a, b in zip(runs[3:], runs[4:])]
+        self.assertGreater(min(gaps[1:]), 0.004)
+
+    def test_groups_are_isolated(self):
+        """Test a blocking task doesn't delay a task in another group"""
+        release = threading.Event()
+        fast = []
+        self.scheduler.every(100, lambda dt: release.wait(1), name='blocked', group='test-slow')
+        self.scheduler.every(100, fast.append, name='free', group='test-fast')
+        time.sleep(0.1)
+        release.set()
+        self.assertGreaterEqual(len(fast), 5)
+
+    def test_cancel_waits_for_run(self):
+        """Test cancel returns only after a run in progress has finished"""
+        started = threading.Event()
+        finished = []
+
+        def tick(dt):
+            started.set()
+            time.sleep(0.05)
+            finished.append(dt)
+
+        task = self.scheduler.every(100, tick, name='cancel', group='test-cancel')
+        self.assertTrue(started.wait(1))
+        task.cancel()
+        count = len(finished)
+        self.assertGreaterEqual(count, 1)
+        time.sleep(0.05)
+        self.assertEqual(len(finished), count)
+        self.assertEqual(self.scheduler.stats(), [])
+
+    def test_set_rate(self):
+        """Test changing the rate takes effect without waiting out the old period"""
+        runs = []
+        task = self.scheduler.every(2, runs.append, name='rate', group='test-set-rate')
+        time.sleep(0.05)
+        task.set_rate(100)
+        time.sleep(0.2)
+        self.assertGreaterEqual(len(runs), 10)
+
+    def test_errors_are_counted(self):
+        """Test a failing callback keeps being scheduled"""
+        def tick(dt):
+            raise RuntimeError("boom")
+
+        task = self.scheduler.every(100, tick, name='errors', group='test-errors')
+        time.sleep(0.05)
+        self.assertGreaterEqual(task.stats()['errors'], 2)
+
+    def test_pacer(self):
+        """Test a pacer spaces iterations by its period and treats a long pause as idle"""
+        pacer = self.scheduler.pacer('pacer', 100)
+        start = time.perf_counter()
+        for _ in range(6):
+            pacer.wait()
+        self.assertGreaterEqual(time.perf_counter() - start, 0.045)
+        time.sleep(0.15)
+        pacer.idle_after = 0.1
+        before = time.perf_counter()
+        pacer.wait()
+        self.assertLess(time.perf_counter() - before, 0.005)
+        self.assertEqual(pacer.stats()['missed'], 0)
+
+    def test_pacer_disabled(self):
+        """Test a pacer with rate 0 never waits"""
+        pacer = self.scheduler.pacer('unpaced', 0)
+        start = time.perf_counter()
+        for _ in range(100):
+            pacer.wait()
+        self.assertLess(time.perf_counter() - start, 0.01)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import tempfile
+import shutil
+import threading
+import unittest
+
+from src.utils.startup_profile import StartupProfiler
+
+class TestStartupProfiler(unittest.TestCase):
+    def setUp(self):
+        """Set up a profiler and a throwaway package to import"""
+        self.tmpdir = tempfile.mkdtemp()
+        with open(os.path.join(self.tmpdir, 'profiled_outer.py'), 'w') as f:
+            f.write("import time\ntime.sleep(0.02)\nimport profiled_inner\n")
+        with open(os.path.join(self.tmpdir, 'profiled_inner.py'), 'w') as f:
+            f.write("import time\ntime.sleep(0.05)\nVALUE = 42\n")
+        sys.path.insert(0, self.tmpdir)
+        self.profiler = StartupProfiler()
+        self.profiler.install()
+
+    def tearDown(self):
+        self.profiler.uninstall()
+        sys.path.remove(self.tmpdir)
+        for name in ('profiled_outer', 'profiled_inner'):
+            sys.modules.pop(name, None)
+        shutil.rmtree(self.tmpdir)
+
+    def test_self_and_cumulative_import_time(self):
+        """Test that nested import time is charged to the inner module"""
+        thread = threading.Thread(target=lambda: __import__('profiled_outer'), name='init-test')
+        thread.start()
+        thread.join()
+        entries = {e['module']: e for e in self.profiler.imports()}
+        outer, inner = entries['profiled_outer'], entries['profiled_inner']
+        self.assertGreaterEqual(inner['self'], 0.05)
+        self.assertGreaterEqual(outer['cumulative'], 0.07)
+        self.assertLess(outer['self'], 0.05)
+        self.assertEqual(outer['thread'], 'init-test')
+        self.assertTrue(outer['top_level'])
+        self.assertFalse(inner['top_level'])
+        self.assertEqual(sys.modules['profiled_inner'].VALUE, 42)
+
+    def test_report_includes_phases_and_subsystems(self):
+        """Test that the report lists phases, imports and subsystem timings"""
+        __import__('profiled_outer')
+        self.profiler.mark('imports')
+        self.profiler.mark('api_ready')
+        report = self.profiler.report({'subsystems': [
+            {'name': 'audio', 'status': 'ready', 'started_at': 0.01, 'seconds': 0.4, 'thread': 'init-audio'},
+        ]})
+        self.assertIn('time to API ready', report)
+        self.assertIn('profiled_inner', report)
+        self.assertIn('init-audio', report)
+
+if __name__ == '__main__':
+    unittest.main()
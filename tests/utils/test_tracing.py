@@ -0,0 +1,74 @@
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import unittest
+import threading
+import time
+
+from src.utils.tracing import Tracer
+
+class TestTracer(unittest.TestCase):
+    def setUp(self):
+        """Set up a tracer with a small ring buffer"""
+        self.tracer = Tracer(max_turns=3)
+
+    def test_spans_without_turn_are_dropped(self):
+        """Test that spans outside a turn cost nothing and are not recorded"""
+        with self.tracer.span('llm'):
+            pass
+        self.tracer.start_span('playback').finish()
+        self.assertEqual(self.tracer.turns(), [])
+
+    def test_turn_spans_cross_threads(self):
+        """Test that a span started on one thread can be finished on another"""
+        self.tracer.begin_turn('wake_word')
+        start = time.perf_counter()
+        self.tracer.start_span('wake_to_listen', start=start).finish()
+        with self.tracer.span('chat'):
+            with self.tracer.span('llm', model='test'):
+                time.sleep(0.01)
+        tts = self.tracer.start_span('tts_first_audio')
+        worker = threading.Thread(target=tts.finish, name='voice')
+        worker.start()
+        worker.join()
+        self.tracer.end_turn()
+
+        [turn] = self.tracer.breakdown()
+        self.assertEqual(turn['trigger'], 'wake_word')
+        self.assertFalse(turn['open'])
+        self.assertEqual(list(turn['stages']), ['wake_to_listen', 'chat', 'llm', 'tts_first_audio'])
+        self.assertGreaterEqual(turn['stages']['llm'], 10)
+        self.assertGreaterEqual(turn['stages']['chat'], turn['stages']['llm'])
+
+    def test_unfinished_spans_closed_with_turn(self):
+        """Test that ending a turn closes spans that never finished"""
+        self.tracer.begin_turn('chat')
+        self.tracer.start_span('playback')
+        self.tracer.begin_turn('wake')
+        first = self.tracer.turns()[0]
+        self.assertIsNotNone(first.spans[0].end)
+        self.assertTrue(first.spans[0].attrs['unfinished'])
+        self.assertEqual(self.tracer.ensure_turn('speech').trigger, 'wake')
+
+    def test_ring_buffer_and_chrome_export(self):
+        """Test that only the newest turns are kept and exported as complete events"""
+        for i in range(5):
+            self.tracer.begin_turn('chat')
+            with self.tracer.span('llm'):
+                pass
+        self.tracer.end_turn()
+        turns = self.tracer.turns()
+        self.assertEqual([turn.id for turn in turns], [3, 4, 5])
+
+        trace = self.tracer.chrome_trace(limit=2)
+        slices = [e for e in trace['traceEvents'] if e['ph'] == 'X']
+        self.assertEqual([e['name'] for e in slices], ['turn 4 (chat)', 'llm', 'turn 5 (chat)', 'llm'])
+        self.assertTrue(all(e['dur'] >= 0 for e in slices))
+        names = {e['args']['name'] for e in trace['traceEvents'] if e['ph'] == 'M'}
+        self.assertIn('MainThread', names)
+
+if __name__ == '__main__':
+    unittest.main()
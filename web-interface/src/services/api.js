@@ -1,4 +1,5 @@
 import axios from 'axios';
+import { BINARY_SUBPROTOCOL, decodeBinaryFrame } from './protocol';
 console.log("API_HOST:", import.meta.env.VITE_API_HOST);
 const API_HOST = import.meta.env.VITE_API_HOST || 'http://localhost:8000';
 const API_URL = `${API_HOST}/api`;
@@ -7,9 +8,13 @@ export const api = {
     // WebSocket connection
     ws: null,
     reconnectDelay: 1000,
+    stateSeq: -1,
+    snapshotSeq: -1,
     _audioLevelListeners: [],
     _transcriptionListeners: [],
     _stateListeners: [],
+    _jobListeners: [],
+    _jobCounter: 0,
 
     // Listener registration (Hybrid Approach)
     registerAudioLevelListener(cb) {right 
@@ -30,6 +35,13 @@ export const api = {
     unregisterStateListener(cb) {
         this._stateListeners = this._stateListeners.filter(fn => fn !== cb);
     },
+    // Job events: {type: 'job', request_id, kind, status, progress?, result?, error?}
+    registerJobListener(cb) {
+        this._jobListeners.push(cb);
+    },
+    unregisterJobListener(cb) {
+        this._jobListeners = this._jobListeners.filter(fn => fn !== cb);
+    },
 
     // WebSocket connection
     initWebSocket() {
@@ -41,7 +53,11 @@ export const api = {
         if (!API_HOST.match(/^https?:\/\//)) {
             wsHost = API_HOST;
         }
-        this.ws = new WebSocket(`ws://${wsHost}/ws`);
+        this.stateSeq = -1;
+        this.snapshotSeq = -1;
+        // Offer the binary telemetry protocol; the server falls back to JSON for other clients
+        this.ws = new WebSocket(`ws://${wsHost}/ws`, [BINARY_SUBPROTOCOL]);
+        this.ws.binaryType = 'arraybuffer';
 
         this.ws.onopen = () => {
             console.log("[api.js] WebSocket connected");
@@ -68,11 +84,43 @@ export const api = {
         this.ws.onmessage = (event) => {
             let data;
             try {
-                data = JSON.parse(event.data);
+                if (event.data instanceof ArrayBuffer) {
+                    // Binary telemetry frames are state deltas
+                    const frame = decodeBinaryFrame(event.data);
+                    data = { type: 'state_delta', seq: frame.seq, from_seq: frame.fromSeq, changes: frame.changes };
+                } else {
+                    data = JSON.parse(event.data);
+                }
             } catch (e) {
                 console.error('[api.js] Failed to parse WebSocket message:', event.data, e);
                 return;
             }
+            // Progress of long-running commands (chat, wake)
+            if (data.type === 'job') {
+                this._jobListeners.forEach(cb => cb(data));
+                return;
+            }
+            // Versioned state: full snapshot on connect/resync, then per-key deltas
+            if (data.type === 'state_snapshot') {
+                this.stateSeq = this.snapshotSeq = data.seq;
+                data = data.state;
+            } else if (data.type === 'state_delta') {
+                // Deltas up to the last snapshot are already included in it
+                if (data.seq <= this.snapshotSeq) {
+                    return;
+                }
+                // Deltas arrive in order of the oldest change they hold: a lagging
+                // client gets merged deltas covering from_seq..seq, and a delta may
+                // come as a binary frame plus a JSON message with the same seq. A
+                // delta starting past the next seq means some were lost.
+                const fromSeq = data.from_seq ?? data.seq;
+                if (fromSeq > this.stateSeq + 1) {
+                    console.warn(`[api.js] Missed state deltas ${this.stateSeq + 1}-${fromSeq - 1}, resyncing`);
+                    this.resync();
+                }
+                this.stateSeq = Math.max(this.stateSeq, data.seq);
+                data = data.changes;
+            }
             // Only handle audio level as a special case
             if (typeof data.audio_level !== 'undefined') {
                 this._audioLevelListeners.forEach(cb => cb(data.audio_level));
@@ -101,12 +149,15 @@ export const api = {
     // onAudioLevel: null,
     // onTranscription: null,
     
-    // Send a chat message to the robot (typed chat)
+    // Send a chat message to the robot (typed chat); returns the job request ID
     sendChat(text) {
+        const request_id = `chat-${Date.now()}-${++this._jobCounter}`;
         this.sendCommand({
             type: 'chat',
-            text
+            text,
+            request_id
         });
+        return request_id;
     },
 
     // Listeners for robot state updates (already handled above; do not duplicate)
@@ -116,6 +167,11 @@ export const api = {
         this._stateListeners.forEach(cb => cb(state));
     },
     
+    // Ask the server for a fresh full-state snapshot
+    resync() {
+        this.sendCommand({ type: 'resync' });
+    },
+
     // Send command through WebSocket
     sendCommand(command) {
         if (this.ws && this.ws.readyState === WebSocket.OPEN) {
@@ -196,6 +252,18 @@ export const api = {
             throw error;
         }
     },
+    async getTraceTurns(limit = 10) {
+        try {
+            const response = await axios.get(`${API_URL}/trace/turns`, { params: { limit } });
+            return response.data;
+        } catch (error) {
+            console.error('Error fetching trace turns:', error);
+            throw error;
+        }
+    },
+    traceDownloadUrl() {
+        return `${API_URL}/trace/chrome`;
+    },
     async getStatus() {
         try {
             const response = await axios.get(`${API_URL}/status`);
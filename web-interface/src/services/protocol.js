@@ -0,0 +1,82 @@
+// Decoder for the robbie.bin.v1 binary WebSocket subprotocol (see src/api/protocol.py)
+export const BINARY_SUBPROTOCOL = 'robbie.bin.v1';
+
+const TOPIC_LEDS = 1;
+const TOPIC_AUDIO = 2;
+const TOPIC_JOYSTICK = 3;
+const FLAG_MERGED = 0x80;
+const HEADER_SIZE = 5;
+
+function float16(bits) {
+    const sign = bits & 0x8000 ? -1 : 1;
+    const exponent = (bits >> 10) & 0x1f;
+    const fraction = bits & 0x3ff;
+    if (exponent === 0) {
+        return sign * Math.pow(2, -14) * (fraction / 1024);
+    }
+    if (exponent === 0x1f) {
+        return fraction ? NaN : sign * Infinity;
+    }
+    return sign * Math.pow(2, exponent - 15) * (1 + fraction / 1024);
+}
+
+// Returns {seq, fromSeq, changes} in the same shape as a JSON state_delta
+export function decodeBinaryFrame(buffer) {
+    const view = new DataView(buffer);
+    let topic = view.getUint8(0);
+    const seq = view.getUint32(1, true);
+    let offset = HEADER_SIZE;
+    // Merged frames carry the oldest seq they cover after the header
+    let fromSeq = seq;
+    if (topic & FLAG_MERGED) {
+        topic &= ~FLAG_MERGED;
+        fromSeq = view.getUint32(offset, true);
+        offset += 4;
+    }
+
+    if (topic === TOPIC_LEDS) {
+        const height = view.getUint8(offset);
+        const width = view.getUint8(offset + 1);
+        const pixels = new Uint8Array(buffer, offset + 2, height * width * 3);
+        const matrix = [];
+        for (let y = 0; y < height; y++) {
+            const row = [];
+            for (let x = 0; x < width; x++) {
+                const i = (y * width + x) * 3;
+                row.push([pixels[i], pixels[i + 1], pixels[i + 2]]);
+            }
+            matrix.push(row);
+        }
+        return { seq, fromSeq, changes: { led_matrix: matrix } };
+    }
+
+    if (topic === TOPIC_AUDIO) {
+        const flags = view.getUint8(offset++);
+        const changes = {};
+        ['input_audio_level_db', 'output_audio_level_db'].forEach((key, bit) => {
+            if (flags & (1 << bit)) {
+                changes[key] = float16(view.getUint16(offset, true));
+                offset += 2;
+            }
+        });
+        return { seq, fromSeq, changes };
+    }
+
+    if (topic === TOPIC_JOYSTICK) {
+        const flags = view.getUint8(offset);
+        const axisCount = view.getUint8(offset + 1);
+        const buttonCount = view.getUint8(offset + 2);
+        offset += 3;
+        const axes = [];
+        for (let i = 0; i < axisCount; i++, offset += 2) {
+            axes.push(float16(view.getUint16(offset, true)));
+        }
+        const buttons = [];
+        for (let i = 0; i < buttonCount; i++) {
+            buttons.push(Boolean(view.getUint8(offset + (i >> 3)) & (1 << (i & 7))));
+        }
+        return { seq, fromSeq, changes: { joystick: { connected: Boolean(flags & 1), axes, buttons } } };
+    }
+
+    throw new Error(`Unknown binary topic ${topic}`);
+}